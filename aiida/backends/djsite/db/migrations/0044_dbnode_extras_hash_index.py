@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods
+"""Add an index on the `_aiida_hash` extra of nodes.
+
+The caching mechanism looks up nodes by their hash, which without an index requires a scan of the entire node table.
+Creating the index automatically fills it for all existing nodes.
+"""
+
+# Remove when https://github.com/PyCQA/pylint/issues/1931 is fixed
+# pylint: disable=no-name-in-module,import-error
+from django.db import migrations
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.44'
+DOWN_REVISION = '1.0.43'
+
+
+class Migration(migrations.Migration):
+    """Migrate."""
+
+    dependencies = [
+        ('db', '0043_default_link_label'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=r"""
+                CREATE INDEX db_dbnode_extras_aiida_hash ON db_dbnode ((extras ->> '_aiida_hash'));
+                """,
+            reverse_sql=r"""
+                DROP INDEX IF EXISTS db_dbnode_extras_aiida_hash;
+                """
+        ),
+        upgrade_schema_version(REVISION, DOWN_REVISION)
+    ]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name
+"""Add an index on the `_aiida_hash` extra of nodes.
+
+The caching mechanism looks up nodes by their hash, which without an index requires a scan of the entire node table.
+Creating the index automatically fills it for all existing nodes.
+
+Revision ID: 3bd7f1c8ea9d
+Revises: 118349c10896
+Create Date: 2020-01-20 10:12:31.558202
+
+"""
+
+# pylint: disable=no-member,no-name-in-module,import-error
+from alembic import op
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = '3bd7f1c8ea9d'
+down_revision = '118349c10896'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Migrations for the upgrade."""
+    conn = op.get_bind()
+
+    statement = text("""
+        CREATE INDEX db_dbnode_extras_aiida_hash ON db_dbnode ((extras ->> '_aiida_hash'));
+    """)
+    conn.execute(statement)
+
+
+def downgrade():
+    """Migrations for the downgrade."""
+    conn = op.get_bind()
+
+    statement = text("""
+        DROP INDEX IF EXISTS db_dbnode_extras_aiida_hash;
+    """)
+    conn.execute(statement)
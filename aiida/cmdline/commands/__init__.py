@@ -18,5 +18,5 @@ click_completion.init()
 from aiida.cmdline.commands import (
     cmd_calcjob, cmd_code, cmd_comment, cmd_completioncommand, cmd_computer, cmd_config, cmd_data, cmd_database,
     cmd_daemon, cmd_devel, cmd_export, cmd_graph, cmd_group, cmd_help, cmd_import, cmd_node, cmd_plugin, cmd_process,
-    cmd_profile, cmd_rehash, cmd_restapi, cmd_run, cmd_setup, cmd_shell, cmd_status, cmd_user
+    cmd_profile, cmd_rehash, cmd_repository, cmd_restapi, cmd_run, cmd_setup, cmd_shell, cmd_status, cmd_user
 )
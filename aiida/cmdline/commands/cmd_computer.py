@@ -574,6 +574,117 @@ def computer_delete(computer):
     echo.echo_success("Computer '{}' deleted.".format(compname))
 
 
+@verdi_computer.group('cache')
+def computer_cache():
+    """Manage the remote cache of input files of a computer."""
+
+
+@computer_cache.command('enable')
+@arguments.COMPUTER()
+@click.argument('directory', type=click.STRING)
+@click.option(
+    '--link-mode',
+    type=click.Choice(['symlink', 'hardlink']),
+    default='symlink',
+    show_default=True,
+    help='How cached files are linked into the working directories. Hard links require the cache directory to be on '
+    'the same file system as the work directory.'
+)
+@with_dbenv()
+def computer_cache_enable(computer, directory, link_mode):
+    """Enable the remote cache of a computer, in the absolute remote DIRECTORY.
+
+    Files of input nodes that are copied to calculations, like pseudopotentials, are then uploaded to the cache
+    directory only once and linked into the working directories. The directory may contain the `{username}` field.
+    """
+    try:
+        computer.set_remote_cache_directory(directory)
+        computer.set_remote_cache_link_mode(link_mode)
+        computer.store()
+    except ValidationError as exception:
+        echo.echo_critical('Invalid input! {}'.format(exception))
+
+    echo.echo_success('Remote cache of Computer<{}> enabled in {}'.format(computer.name, directory))
+
+
+@computer_cache.command('disable')
+@arguments.COMPUTER()
+@with_dbenv()
+def computer_cache_disable(computer):
+    """Disable the remote cache of a computer, without removing the cached files."""
+    computer.set_remote_cache_directory(None)
+    computer.store()
+
+    echo.echo_success('Remote cache of Computer<{}> disabled'.format(computer.name))
+
+
+@computer_cache.command('show')
+@arguments.COMPUTER()
+@with_dbenv()
+def computer_cache_show(computer):
+    """Show the size and the hit rate of the remote cache of a computer."""
+    import tabulate
+    from aiida.engine.daemon.remote_cache import RemoteCache
+
+    with computer.get_transport() as transport:
+        remote_cache = RemoteCache.from_computer(computer, transport)
+
+        if remote_cache is None:
+            echo.echo_critical('The remote cache of Computer<{}> is not enabled'.format(computer.name))
+
+        try:
+            statistics = remote_cache.get_statistics()
+        except IOError as exception:
+            echo.echo_critical('Failed to inspect the remote cache: {}'.format(exception))
+
+    hit_rate = '-' if statistics.hit_rate is None else '{:.1%}'.format(statistics.hit_rate)
+    table = [
+        ('Directory', remote_cache.directory),
+        ('Link mode', remote_cache.link_mode),
+        ('Cached files', statistics.objects),
+        ('Size', '{} kB'.format(statistics.size_kb)),
+        ('Hits', statistics.hits),
+        ('Misses', statistics.misses),
+        ('Hit rate', hit_rate),
+    ]
+    echo.echo(tabulate.tabulate(table, tablefmt='plain'))
+
+
+@computer_cache.command('clean')
+@arguments.COMPUTER()
+@click.option(
+    '--older-than',
+    type=click.INT,
+    default=None,
+    help='Only remove files that were not used by any calculation in this number of days.'
+)
+@options.FORCE()
+@with_dbenv()
+def computer_cache_clean(computer, older_than, force):
+    """Remove files from the remote cache of a computer.
+
+    With the default symlink link mode, calculations that link to a removed file can no longer read it, so only
+    remove files that are no longer needed by calculations that may still run.
+    """
+    from aiida.engine.daemon.remote_cache import RemoteCache
+
+    if not force:
+        click.confirm('Are you sure you want to remove files from the remote cache?', abort=True)
+
+    with computer.get_transport() as transport:
+        remote_cache = RemoteCache.from_computer(computer, transport)
+
+        if remote_cache is None:
+            echo.echo_critical('The remote cache of Computer<{}> is not enabled'.format(computer.name))
+
+        try:
+            removed = remote_cache.clean(older_than=older_than)
+        except IOError as exception:
+            echo.echo_critical('Failed to clean the remote cache: {}'.format(exception))
+
+    echo.echo_success('Removed {} files from the remote cache of Computer<{}>'.format(removed, computer.name))
+
+
 @verdi_computer.group('configure')
 def computer_configure():
     """Configure the Authinfo details for a computer (and user)."""
@@ -279,6 +279,24 @@ def start_circus(foreground, number):
         }]
     }  # yapf: disable
 
+    if client.is_autoscaling:
+        arbiter_config['watchers'].append({
+            'cmd': client.autoscaler_cmd_string,
+            'name': client.autoscaler_name,
+            'numprocesses': 1,
+            'virtualenv': client.virtualenv,
+            'copy_env': True,
+            'stdout_stream': {
+                'class': 'FileStream',
+                'filename': client.daemon_log_file,
+            },
+            'stderr_stream': {
+                'class': 'FileStream',
+                'filename': client.daemon_log_file,
+            },
+            'env': get_env_with_venv_bin(),
+        })  # yapf: disable
+
     if not foreground:
         daemonize()
 
@@ -56,6 +56,14 @@ def devel_run_daemon():
     start_daemon()
 
 
+@verdi_devel.command('run_autoscaler')
+@decorators.with_dbenv()
+def devel_run_autoscaler():
+    """Run the daemon autoscaler in the current interpreter."""
+    from aiida.engine.daemon.autoscaler import start_autoscaler
+    start_autoscaler()
+
+
 @verdi_devel.command('validate-plugins')
 @decorators.with_dbenv()
 def devel_validate_plugins():
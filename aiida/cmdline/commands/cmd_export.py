@@ -146,59 +146,22 @@ def create(
 @options.FORCE(help='overwrite output file if it already exists')
 @options.SILENT()
 def migrate(input_file, output_file, force, silent, archive_format):
-    # pylint: disable=too-many-locals,too-many-statements,too-many-branches
     """
     Migrate an old export archive file to the most recent format.
     """
-    import tarfile
-    import zipfile
-
-    from aiida.common import json
-    from aiida.common.folders import SandboxFolder
-    from aiida.tools.importexport import migration, extract_zip, extract_tar
+    from aiida.common.exceptions import ContentNotExistent
+    from aiida.tools.importexport import migration
+    from aiida.tools.importexport.common.exceptions import ArchiveMigrationError, CorruptArchive, DanglingLinkError
 
     if os.path.exists(output_file) and not force:
         echo.echo_critical('the output file already exists')
 
-    with SandboxFolder(sandbox_in_repo=False) as folder:
-
-        if zipfile.is_zipfile(input_file):
-            extract_zip(input_file, folder, silent=silent)
-        elif tarfile.is_tarfile(input_file):
-            extract_tar(input_file, folder, silent=silent)
-        else:
-            echo.echo_critical('invalid file format, expected either a zip archive or gzipped tarball')
-
-        try:
-            with open(folder.get_abs_path('data.json'), 'r', encoding='utf8') as fhandle:
-                data = json.load(fhandle)
-            with open(folder.get_abs_path('metadata.json'), 'r', encoding='utf8') as fhandle:
-                metadata = json.load(fhandle)
-        except IOError:
-            echo.echo_critical('export archive does not contain the required file {}'.format(fhandle.filename))
-
-        old_version = migration.verify_metadata_version(metadata)
-        new_version = migration.migrate_recursively(metadata, data, folder)
-
-        with open(folder.get_abs_path('data.json'), 'wb') as fhandle:
-            json.dump(data, fhandle, indent=4)
-
-        with open(folder.get_abs_path('metadata.json'), 'wb') as fhandle:
-            json.dump(metadata, fhandle)
-
-        if archive_format in ['zip', 'zip-uncompressed']:
-            compression = zipfile.ZIP_DEFLATED if archive_format == 'zip' else zipfile.ZIP_STORED
-            with zipfile.ZipFile(output_file, mode='w', compression=compression, allowZip64=True) as archive:
-                src = folder.abspath
-                for dirpath, dirnames, filenames in os.walk(src):
-                    relpath = os.path.relpath(dirpath, src)
-                    for filename in dirnames + filenames:
-                        real_src = os.path.join(dirpath, filename)
-                        real_dest = os.path.join(relpath, filename)
-                        archive.write(real_src, real_dest)
-        elif archive_format == 'tar.gz':
-            with tarfile.open(output_file, 'w:gz', format=tarfile.PAX_FORMAT, dereference=True) as archive:
-                archive.add(folder.abspath, arcname='')
-
-        if not silent:
-            echo.echo_success('migrated the archive from version {} to {}'.format(old_version, new_version))
+    try:
+        old_version, new_version = migration.migrate_archive(input_file, output_file, archive_format=archive_format)
+    except DanglingLinkError:
+        echo.echo_critical('Export file is invalid because it contains dangling links')
+    except (ArchiveMigrationError, ContentNotExistent, CorruptArchive, ValueError) as exception:
+        echo.echo_critical(str(exception))
+
+    if not silent:
+        echo.echo_success('migrated the archive from version {} to {}'.format(old_version, new_version))
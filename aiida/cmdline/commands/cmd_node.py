@@ -295,15 +295,25 @@ def tree(nodes, depth):
 @options.DRY_RUN()
 @options.FORCE()
 @options.graph_traversal_rules(GraphTraversalRules.DELETE.value)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='Number of nodes that are deleted from the database per transaction.'
+)
 @with_dbenv()
-def node_delete(nodes, dry_run, verbose, force, **kwargs):
+def node_delete(nodes, dry_run, verbose, force, batch_size, **kwargs):
     """Delete nodes from the provenance graph.
 
     This will not only delete the nodes explicitly provided via the command line, but will also include
     the nodes necessary to keep a consistent graph, according to the rules outlined in the documentation.
     You can modify some of those rules using options of this command.
+
+    If a previous deletion was interrupted, it is completed first.
     """
-    from aiida.manage.database.delete.nodes import delete_nodes
+    from aiida.manage.database.delete.nodes import delete_nodes, get_checkpoint
 
     verbosity = 1
     if force:
@@ -313,7 +323,15 @@ def node_delete(nodes, dry_run, verbose, force, **kwargs):
 
     node_pks_to_delete = [node.pk for node in nodes]
 
-    delete_nodes(node_pks_to_delete, dry_run=dry_run, verbosity=verbosity, force=force, **kwargs)
+    delete_nodes(
+        node_pks_to_delete,
+        dry_run=dry_run,
+        verbosity=verbosity,
+        force=force,
+        batch_size=batch_size,
+        checkpoint=get_checkpoint(),
+        **kwargs
+    )
 
 
 @verdi_node.command('rehash')
@@ -325,14 +343,39 @@ def node_delete(nodes, dry_run, verbose, force, **kwargs):
     default=None,
     help='Only include nodes that are class or sub class of the class identified by this entry point.'
 )
+@click.option(
+    '-P',
+    '--processes',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of worker processes that compute the hashes in parallel.'
+)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='Number of nodes whose hashes are computed and written to the database at once.'
+)
+@click.option(
+    '--restart',
+    is_flag=True,
+    help='Ignore the progress of a previous run that was interrupted and rehash all nodes from the start.'
+)
 @options.FORCE()
 @with_dbenv()
-def rehash(nodes, entry_point, force):
+def rehash(nodes, entry_point, processes, batch_size, restart, force):
     """Recompute the hash for nodes in the database.
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
+
+    When rehashing all nodes of the selected class, the progress is recorded after every batch, such that an
+    interrupted run is resumed the next time the command is called, unless the `--restart` flag is specified.
     """
-    from aiida.orm import Data, ProcessNode, QueryBuilder
+    from aiida.manage.database.rehash import count_nodes, get_checkpoint, rehash_nodes
+    from aiida.orm import Data, ProcessNode
 
     if not force:
         echo.echo_warning('This command will recompute and overwrite the hashes of all nodes.')
@@ -352,23 +395,34 @@ def rehash(nodes, entry_point, force):
     if entry_point is None:
         entry_point = (Data, ProcessNode)
 
-    if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
-        num_nodes = len(to_hash)
-    else:
-        builder = QueryBuilder()
-        builder.append(entry_point, tag='node')
-        to_hash = builder.all()
-        num_nodes = builder.count()
+    pks = [node.pk for node in nodes] if nodes else None
+    checkpoint = get_checkpoint(entry_point) if pks is None else None
 
-    if not to_hash:
-        echo.echo_critical('no matching nodes found')
+    if checkpoint is not None and restart:
+        checkpoint.clear()
 
-    with click.progressbar(to_hash, label='Rehashing Nodes:') as iter_hash:
-        for node, in iter_hash:
-            node.rehash()
+    start_pk = checkpoint.load() if checkpoint is not None else None
+
+    if start_pk is not None:
+        echo.echo_info('resuming interrupted run from the node with pk {}'.format(start_pk))
+
+    num_nodes = count_nodes(entry_point, pks=pks, start_pk=start_pk)
+
+    if not num_nodes:
+        echo.echo_critical('no matching nodes found')
 
-    echo.echo_success('{} nodes re-hashed.'.format(num_nodes))
+    with click.progressbar(length=num_nodes, label='Rehashing Nodes:') as progress:
+        num_nodes, elapsed = rehash_nodes(
+            entry_point,
+            pks=pks,
+            batch_size=batch_size,
+            processes=processes,
+            checkpoint=checkpoint,
+            callback=progress.update
+        )
+
+    rate = num_nodes / elapsed if elapsed else float(num_nodes)
+    echo.echo_success('{} nodes re-hashed in {:.1f} s ({:.1f} nodes/s).'.format(num_nodes, elapsed, rate))
 
 
 @verdi_node.group('graph')
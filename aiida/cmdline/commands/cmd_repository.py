@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""`verdi repository` commands."""
+
+import click
+
+from aiida.cmdline.commands.cmd_verdi import verdi
+from aiida.cmdline.params import options
+from aiida.cmdline.utils import echo
+
+
+@verdi.group('repository')
+def verdi_repository():
+    """Inspect and manage the file repository."""
+
+
+def _abort_if_daemon_running():
+    """Abort the command if the daemon of the current profile is running."""
+    from aiida.engine.daemon.client import get_daemon_client
+
+    if get_daemon_client().is_daemon_running:
+        echo.echo_critical('the daemon for the profile is still running, stop it first with `verdi daemon stop`.')
+
+
+@verdi_repository.command('info')
+def repository_info():
+    """Show statistics of the object container of the file repository."""
+    from aiida.manage.configuration import get_config_option
+    from aiida.repository import get_container
+
+    container = get_container()
+
+    echo.echo_info('configured backend: {}'.format(get_config_option('repository.backend')))
+
+    if not container.is_initialised:
+        echo.echo_info('the object container has not been initialised')
+        return
+
+    echo.echo_dictionary(container.get_statistics(), fmt='json+date')
+
+
+@verdi_repository.command('migrate')
+@click.option(
+    '--remove-folders',
+    is_flag=True,
+    help='Move the files into the object container and remove the node repository folders afterwards.'
+)
+@click.option('--pack/--no-pack', default=True, show_default=True, help='Pack the objects after the migration.')
+@options.FORCE()
+def repository_migrate(remove_folders, pack, force):
+    """Migrate the node repository folders to the object container.
+
+    Files of each node are added to the content-addressable object container, such that identical files are stored
+    only once, and are subsequently concatenated into pack files. The migration can be interrupted and resumed. Once
+    it has completed, set the `repository.backend` option to `container` with `verdi config`.
+    """
+    from aiida.manage.configuration import get_profile
+    from aiida.repository import get_container
+    from aiida.repository.migrate import migrate_repository_folders
+
+    _abort_if_daemon_running()
+
+    if remove_folders and not force:
+        click.confirm('The node repository folders will be removed. Make sure you have a backup. Continue?', abort=True)
+
+    container = get_container()
+    num_migrated = 0
+    num_skipped = 0
+
+    for _, migrated in migrate_repository_folders(container, get_profile().repository_path, remove_folders):
+        if migrated:
+            num_migrated += 1
+        else:
+            num_skipped += 1
+
+    echo.echo_info('migrated {} node repositories, skipped {} already migrated'.format(num_migrated, num_skipped))
+
+    if pack:
+        echo.echo_info('packed {} objects'.format(container.pack_loose_objects()))
+
+    echo.echo_success('repository migration completed')
+
+
+@verdi_repository.command('pack')
+def repository_pack():
+    """Concatenate the loose objects of the object container into pack files.
+
+    This can safely be run while the daemon is running.
+    """
+    from aiida.repository import get_container
+
+    echo.echo_success('packed {} objects'.format(get_container().pack_loose_objects()))
+
+
+@verdi_repository.command('clean')
+@options.FORCE()
+def repository_clean(force):
+    """Delete loose objects of the object container that are no longer referenced by any node."""
+    from aiida.repository import get_container
+
+    _abort_if_daemon_running()
+
+    if not force:
+        click.confirm('Unreferenced objects will be permanently deleted. Continue?', abort=True)
+
+    echo.echo_success('deleted {} unreferenced objects'.format(get_container().delete_unreferenced_loose_objects()))
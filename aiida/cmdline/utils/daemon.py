@@ -47,6 +47,7 @@ def get_daemon_status(client):
     :param client: the DaemonClient
     """
     from aiida.cmdline.utils.common import format_local_time
+    from aiida.engine.daemon.slots import read_worker_load
 
     if not client.is_daemon_running:
         return 'The daemon is not running'
@@ -68,13 +69,23 @@ def get_daemon_status(client):
     if 'info' not in worker_response or 'info' not in daemon_response:
         return 'Call to the circus controller timed out'
 
-    workers = [['PID', 'MEM %', 'CPU %', 'started']]
+    workers = [['PID', 'MEM %', 'CPU %', 'started', 'slots', 'latency [s]']]
+    statistics = [['PID', 'statistics', 'values']]
     for worker_pid, worker_info in worker_response['info'].items():
         if isinstance(worker_info, dict):
             row = [worker_pid, worker_info['mem'], worker_info['cpu'], format_local_time(worker_info['create_time'])]
         else:
             row = [worker_pid, '-', '-', '-']
 
+        load = read_worker_load(client.get_worker_load_file(worker_pid))
+
+        if load is not None:
+            row.extend(['{:.1f} / {:.1f}'.format(load['load'], load['capacity']), '{:.3f}'.format(load['latency'])])
+            for name, values in sorted(load.get('statistics', {}).items()):
+                statistics.append([worker_pid, name, format_statistics(values)])
+        else:
+            row.extend(['-', '-'])
+
         workers.append(row)
 
     if len(workers) > 1:
@@ -86,17 +97,38 @@ def get_daemon_status(client):
         'pid': daemon_response['info']['pid'],
         'time': format_local_time(daemon_response['info']['create_time']),
         'nworkers': len(workers) - 1,
-        'workers': workers_info
+        'workers': workers_info,
+        'statistics': '',
     }
 
+    if len(statistics) > 1:
+        statistics_info = tabulate(statistics, headers='firstrow', tablefmt='simple')
+        info['statistics'] = 'Worker statistics:\n{}\n'.format(statistics_info)
+
     template = (
-        'Daemon is running as PID {pid} since {time}\nActive workers [{nworkers}]:\n{workers}\n'
+        'Daemon is running as PID {pid} since {time}\nActive workers [{nworkers}]:\n{workers}\n{statistics}'
         'Use verdi daemon [incr | decr] [num] to increase / decrease the amount of workers'
     )
 
     return template.format(**info)
 
 
+def format_statistics(statistics):
+    """Format the statistics of a daemon worker as a single line.
+
+    :param statistics: flat dictionary of numbers
+    :return: string with the comma separated `key=value` pairs, where floats are rounded to milliseconds
+    """
+    values = []
+
+    for key, value in sorted(statistics.items()):
+        if isinstance(value, float):
+            value = '{:.3f}'.format(value)
+        values.append('{}={}'.format(key, value))
+
+    return ', '.join(values)
+
+
 def delete_stale_pid_file(client):
     """Delete a potentially state daemon PID file.
 
@@ -381,7 +381,7 @@ class Folder:
         # Create parent dir, if needed, with the right mode
         pardir = os.path.dirname(self.abspath)
         if not os.path.exists(pardir):
-            os.makedirs(pardir, mode=self.mode_dir)
+            os.makedirs(pardir, mode=self.mode_dir, exist_ok=True)
 
         if move:
             shutil.move(srcdir, self.abspath)
@@ -43,6 +43,9 @@ HASHING_KEY = 'HashingKey'
 # The key that is used to store the hash in the node extras
 _HASH_EXTRA_KEY = '_aiida_hash'
 
+# Size of the chunks in which files are read when computing the digest of their content
+FILE_CONTENT_CHUNK_SIZE = 2**16
+
 ###################################################################
 # THE FOLLOWING WAS TAKEN FROM DJANGO BUT IT CAN BE EASILY REPLACED
 ###################################################################
@@ -268,7 +271,7 @@ def _(folder, **kwargs):
             if isfile:
                 yield _single_digest('fname', name.encode('utf-8'))
                 with subfolder.open(name, mode='rb') as fhandle:
-                    yield _single_digest('fcontent', fhandle.read())
+                    yield get_file_content_digest(fhandle)
             else:
                 yield _single_digest('dir(', name.encode('utf-8'))
                 for digest in folder_digests(subfolder.get_subfolder(name)):
@@ -278,6 +281,65 @@ def _(folder, **kwargs):
     return [_single_digest('folder')] + list(folder_digests(folder))
 
 
+class FolderDigests:
+    """Representation of the content of a folder through the digests of the content of its files.
+
+    The hash of an instance is identical to that of a `Folder` with the same content, but can be computed without
+    reading any file, provided the content digests are known, e.g. because they were cached.
+    """
+
+    def __init__(self, digests):
+        """Construct a new instance.
+
+        :param digests: nested dictionary where a directory is represented by a dictionary and a file by the digest of
+            its content as returned by `get_file_content_digest`
+        """
+        self.digests = digests
+
+
+@_make_hash.register(FolderDigests)
+def _(folder_digests, **kwargs):
+    """
+    Hash the content of a folder represented by the digests of its files, identically to the hash of a Folder.
+    :param ignored_folder_content: list of filenames to be ignored for the hashing
+    """
+
+    ignored_folder_content = kwargs.get('ignored_folder_content', [])
+
+    def iter_digests(digests):
+        """traverses the given digests dictionary and yields digests for the contained objects"""
+        for name, value in sorted(digests.items(), key=itemgetter(0)):
+            if name in ignored_folder_content:
+                continue
+
+            if isinstance(value, dict):
+                yield _single_digest('dir(', name.encode('utf-8'))
+                for digest in iter_digests(value):
+                    yield digest
+                yield _END_DIGEST
+            else:
+                yield _single_digest('fname', name.encode('utf-8'))
+                yield value
+
+    return [_single_digest('folder')] + list(iter_digests(folder_digests.digests))
+
+
+def get_file_content_digest(handle):
+    """Return the digest of the content of a binary file-like object, as used for the hash of a `Folder`.
+
+    The content is read in chunks, such that the memory usage does not depend on the size of the file.
+
+    :param handle: a binary file-like object
+    :return: the digest as bytes
+    """
+    hasher = blake2b(person=b'fcontent', node_depth=0, **BLAKE2B_OPTIONS)
+
+    for chunk in iter(lambda: handle.read(FILE_CONTENT_CHUNK_SIZE), b''):
+        hasher.update(chunk)
+
+    return hasher.digest()
+
+
 def float_to_text(value, sig):
     """
     Convert float to text string for computing hash.
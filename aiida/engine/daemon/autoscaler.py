@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Automatic scaling of the number of daemon workers based on the load of the daemon."""
+import collections
+import logging
+import math
+import time
+
+from aiida.common.log import LOG_LEVEL_REPORT
+
+__all__ = ('DaemonAutoscaler', 'DaemonMetrics', 'start_autoscaler')
+
+LOGGER = logging.getLogger(__name__)
+
+DaemonMetrics = collections.namedtuple(
+    'DaemonMetrics', ['workers', 'queue_depth', 'tasks', 'load', 'capacity', 'slots']
+)
+DaemonMetrics.__doc__ = """Snapshot of the load of the daemon on which scaling decisions are based.
+
+The number of tasks, the load, the capacity and the number of slots are summed over the workers that reported their
+load metrics and are None if none of them did.
+"""
+
+
+class DaemonAutoscaler:
+    """Scale the number of workers of a daemon between a minimum and a maximum, based on the load of the daemon.
+
+    Workers are added when tasks are waiting in the launch queue of RabbitMQ while the workers use most of their slots,
+    see `get_utilisation`: since workers prefetch tasks up to their number of slots, tasks only remain in the queue when
+    all workers are full or reject them. A worker is removed when the queue is empty and the workers have been using
+    only a small fraction of their slots for a number of consecutive checks. The gap between the two utilisation
+    thresholds, the number of checks required to scale down and a cooldown period after every change prevent the number
+    of workers from oscillating.
+    """
+
+    SCALE_UP_UTILISATION = 0.8
+    SCALE_DOWN_UTILISATION = 0.2
+    SCALE_DOWN_CHECKS = 5
+    COOLDOWN_CHECKS = 2
+
+    def __init__(self, client, minimum_workers, maximum_workers, interval):
+        """Construct a new instance.
+
+        :param client: the daemon client of the daemon to scale
+        :type client: :class:`aiida.engine.daemon.client.DaemonClient`
+        :param minimum_workers: the minimum number of workers
+        :param maximum_workers: the maximum number of workers
+        :param interval: the time in seconds between two checks of the load of the daemon
+        :raises ValueError: if the bounds are invalid
+        """
+        if minimum_workers < 1 or maximum_workers < minimum_workers:
+            raise ValueError(
+                'invalid bounds: minimum {} and maximum {} workers'.format(minimum_workers, maximum_workers)
+            )
+
+        self._client = client
+        self._minimum_workers = minimum_workers
+        self._maximum_workers = maximum_workers
+        self._interval = interval
+        self._num_idle_checks = 0
+        self._num_cooldown_checks = 0
+
+    def get_queue_depth(self):
+        """Return the number of tasks that are waiting in the launch queue of RabbitMQ.
+
+        :return: the number of messages that are ready to be delivered, or None if the queue cannot be inspected
+        """
+        import pika
+        from aiida.manage.external import rmq
+
+        queue = rmq.get_launch_queue_name(self._client.profile.rmq_prefix)
+
+        try:
+            connection = pika.BlockingConnection(pika.URLParameters(rmq.get_rmq_url()))
+        except pika.exceptions.AMQPError:
+            LOGGER.exception('could not connect to RabbitMQ to inspect the launch queue')
+            return None
+
+        try:
+            return connection.channel().queue_declare(queue, passive=True).method.message_count
+        except pika.exceptions.AMQPError:
+            # The queue does not exist until the first communicator of the profile declares it
+            return 0
+        finally:
+            if connection.is_open:
+                connection.close()
+
+    def get_metrics(self):
+        """Collect the metrics of the load of the daemon.
+
+        :return: the metrics or None if the circus daemon could not be reached
+        :rtype: :class:`DaemonMetrics`
+        """
+        from aiida.engine.daemon.slots import read_worker_load
+
+        response = self._client.get_worker_info()
+
+        if 'info' not in response:
+            return None
+
+        queue_depth = self.get_queue_depth()
+        loads = [read_worker_load(self._client.get_worker_load_file(pid)) for pid in response['info']]
+        loads = [load for load in loads if load is not None]
+
+        if not loads:
+            return DaemonMetrics(len(response['info']), queue_depth, None, None, None, None)
+
+        return DaemonMetrics(
+            workers=len(response['info']),
+            queue_depth=queue_depth,
+            tasks=sum(load['tasks'] for load in loads),
+            load=sum(load['load'] for load in loads),
+            capacity=sum(load['capacity'] for load in loads),
+            slots=sum(load['slots'] for load in loads),
+        )
+
+    @staticmethod
+    def get_utilisation(metrics):
+        """Return the fraction of the resources of the workers that is in use.
+
+        A worker is saturated either when the weighted load of its tasks reaches its capacity, or when it holds as many
+        tasks as it prefetches, i.e. its number of slots. The latter limits workers that run calculation jobs, which
+        weigh only a fraction of a slot each, so the utilisation is the largest of the two fractions.
+
+        :param metrics: the metrics of the load of the daemon
+        :type metrics: :class:`DaemonMetrics`
+        :return: the utilisation or None if it is unknown
+        """
+        fractions = []
+
+        if metrics.capacity:
+            fractions.append(metrics.load / metrics.capacity)
+
+        if metrics.slots:
+            fractions.append(metrics.tasks / metrics.slots)
+
+        return max(fractions) if fractions else None
+
+    def get_target(self, metrics):
+        """Return the number of workers the daemon should have for the given metrics.
+
+        Successive calls are not independent: a decrease is only returned after the daemon has been idle for
+        `SCALE_DOWN_CHECKS` consecutive calls, and no change is returned for `COOLDOWN_CHECKS` calls after a change.
+
+        :param metrics: the metrics of the load of the daemon
+        :type metrics: :class:`DaemonMetrics`
+        :return: tuple of the target number of workers and the reason for the change, or None if there is no change
+        """
+        workers = metrics.workers
+
+        if workers < self._minimum_workers:
+            return self._minimum_workers, 'fewer workers than the minimum'
+
+        if workers > self._maximum_workers:
+            return self._maximum_workers, 'more workers than the maximum'
+
+        if self._num_cooldown_checks > 0:
+            self._num_cooldown_checks -= 1
+            return workers, None
+
+        utilisation = self.get_utilisation(metrics)
+
+        if metrics.queue_depth and (utilisation is None or utilisation >= self.SCALE_UP_UTILISATION):
+            self._num_idle_checks = 0
+
+            # Add as many workers as are needed to provide the slots for the waiting tasks
+            slots_per_worker = metrics.capacity / workers if metrics.capacity else None
+            number = math.ceil(metrics.queue_depth / slots_per_worker) if slots_per_worker else 1
+
+            return min(workers + number, self._maximum_workers), 'tasks are waiting and the workers are busy'
+
+        if metrics.queue_depth == 0 and utilisation is not None and utilisation <= self.SCALE_DOWN_UTILISATION:
+            self._num_idle_checks += 1
+
+            # Only remove a worker if the remaining workers would not immediately have to scale up again
+            if self._num_idle_checks >= self.SCALE_DOWN_CHECKS and workers > self._minimum_workers:
+                if utilisation * workers / (workers - 1) < self.SCALE_UP_UTILISATION:
+                    self._num_idle_checks = 0
+                    return workers - 1, 'the workers have been idle for {} checks'.format(self.SCALE_DOWN_CHECKS)
+
+            return workers, None
+
+        self._num_idle_checks = 0
+
+        return workers, None
+
+    def scale(self, metrics):
+        """Scale the daemon to the number of workers that is appropriate for the given metrics.
+
+        :param metrics: the metrics of the load of the daemon
+        :type metrics: :class:`DaemonMetrics`
+        :return: the change in the number of workers
+        """
+        target, reason = self.get_target(metrics)
+        change = target - metrics.workers
+
+        if change == 0:
+            LOGGER.debug('keeping %d workers: %s', metrics.workers, metrics)
+            return 0
+
+        LOGGER.log(
+            LOG_LEVEL_REPORT, 'scaling from %d to %d workers because %s: %s', metrics.workers, target, reason, metrics
+        )
+
+        if change > 0:
+            response = self._client.increase_workers(change)
+        else:
+            response = self._client.decrease_workers(-change)
+
+        if response.get('status') != 'ok':
+            LOGGER.warning('scaling the daemon failed: %s', response)
+            return 0
+
+        self._num_cooldown_checks = self.COOLDOWN_CHECKS
+
+        return change
+
+    def run(self):
+        """Check the load of the daemon and scale it at a regular interval for as long as the daemon is running."""
+        LOGGER.log(
+            LOG_LEVEL_REPORT, 'starting the autoscaler with %d to %d workers', self._minimum_workers,
+            self._maximum_workers
+        )
+
+        while self._client.is_daemon_running:
+            metrics = self.get_metrics()
+
+            if metrics is not None:
+                self.scale(metrics)
+
+            time.sleep(self._interval)
+
+
+def start_autoscaler():
+    """Start the autoscaler of the daemon of the currently configured profile."""
+    from aiida.common.log import configure_logging
+    from aiida.engine.daemon.client import get_daemon_client
+    from aiida.manage.configuration import get_config
+
+    client = get_daemon_client()
+    configure_logging(daemon=True, daemon_log_file=client.daemon_log_file)
+
+    config = get_config()
+    scope = client.profile.name
+
+    autoscaler = DaemonAutoscaler(
+        client,
+        minimum_workers=config.get_option('daemon.autoscale.minimum_workers', scope),
+        maximum_workers=config.get_option('daemon.autoscale.maximum_workers', scope),
+        interval=config.get_option('daemon.autoscale.interval', scope),
+    )
+
+    try:
+        autoscaler.run()
+    except KeyboardInterrupt:
+        pass
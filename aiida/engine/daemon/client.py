@@ -63,6 +63,7 @@ class DaemonClient:  # pylint: disable=too-many-public-methods
     DAEMON_ERROR_TIMEOUT = 'daemon-error-timeout'
 
     _DAEMON_NAME = 'aiida-{name}'
+    _AUTOSCALER_NAME = 'aiida-{name}-autoscaler'
     _DEFAULT_LOGLEVEL = 'INFO'
     _ENDPOINT_PROTOCOL = ControllerProtocol.IPC
 
@@ -101,6 +102,29 @@ class DaemonClient:  # pylint: disable=too-many-public-methods
             )
         return '{} -p {} devel run_daemon'.format(VERDI_BIN, self.profile.name)
 
+    @property
+    def autoscaler_name(self):
+        """
+        Get the name of the autoscaler of the daemon which is tied to the profile name
+        """
+        return self._AUTOSCALER_NAME.format(name=self.profile.name)
+
+    @property
+    def autoscaler_cmd_string(self):
+        """
+        Return the command string to start the autoscaler of the AiiDA daemon
+        """
+        return self.cmd_string.replace('devel run_daemon', 'devel run_autoscaler')
+
+    @property
+    def is_autoscaling(self):
+        """
+        Return whether the daemon automatically scales its number of workers, as set by the `daemon.autoscale` option
+
+        :return: True if the daemon scales automatically, False otherwise
+        """
+        return get_config().get_option('daemon.autoscale', self.profile.name)
+
     @property
     def loglevel(self):
         return self._DEFAULT_LOGLEVEL
@@ -137,6 +161,14 @@ class DaemonClient:  # pylint: disable=too-many-public-methods
     def daemon_pid_file(self):
         return self.profile.filepaths['daemon']['pid']
 
+    def get_worker_load_file(self, pid):
+        """Return the path of the file to which the daemon worker with the given pid writes its load metrics.
+
+        :param pid: the process id of the daemon worker
+        :return: the absolute path of the load file
+        """
+        return self.profile.filepaths['daemon']['load'].format(pid=pid)
+
     def get_circus_port(self):
         """
         Retrieve the port for the circus controller, which should be written to the circus port file. If the
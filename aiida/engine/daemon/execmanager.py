@@ -13,12 +13,16 @@ results. These are general and contain only the main logic; where appropriate,
 the routines make reference to the suitable plugins for all
 plugin-specific operations.
 """
+import collections
 import os
+import shutil
 
 from aiida.common import AIIDA_LOGGER, exceptions
 from aiida.common.datastructures import CalcJobState
+from aiida.common.escaping import escape_for_bash
 from aiida.common.folders import SandboxFolder
 from aiida.common.links import LinkType
+from aiida.manage.configuration import get_config_option
 from aiida.orm import FolderData, Node
 from aiida.orm.utils.log import get_dblogger_extra
 from aiida.plugins import DataFactory
@@ -26,6 +30,9 @@ from aiida.schedulers.datastructures import JobState
 
 REMOTE_WORK_DIRECTORY_LOST_FOUND = 'lost+found'
 
+# Marker line after which a batched remote script prints the stderr of a failed calculation, see `_parse_failures`
+_FAILURE_MARKER = '__AIIDA_FAILED__'
+
 execlogger = AIIDA_LOGGER.getChild('execmanager')
 
 
@@ -37,237 +44,428 @@ def upload_calculation(node, transport, calc_info, folder, inputs=None, dry_run=
     :param calc_info: the calculation info datastructure returned by `CalcJob.presubmit`
     :param folder: temporary local file system folder containing the inputs written by `CalcJob.prepare_for_submission`
     """
-    from logging import LoggerAdapter
-    from tempfile import NamedTemporaryFile
-    from aiida.orm import load_node, Code, RemoteData
+    if not dry_run:
+        result = upload_calculations([(node, calc_info, folder, inputs)], transport)[0]
 
-    # If the calculation already has a `remote_folder`, simply return. The upload was apparently already completed
-    # before, which can happen if the daemon is restarted and it shuts down after uploading but before getting the
-    # chance to perform the state transition. Upon reloading this calculation, it will re-attempt the upload.
-    link_label = 'remote_folder'
-    if node.get_outgoing(RemoteData, link_label_filter=link_label).first():
-        execlogger.warning('CalcJobNode<{}> already has a `{}` output: skipping upload'.format(node.pk, link_label))
-        return calc_info
+        if isinstance(result, Exception):
+            raise result
 
-    computer = node.computer
+        return result
 
-    codes_info = calc_info.codes_info
-    input_codes = [load_node(_.code_uuid, sub_classes=(Code,)) for _ in codes_info]
+    # If we are performing a dry-run, the working directory should actually be a local folder that should already exist
+    workdir = transport.getcwd()
+    logger = _get_upload_logger(node, transport)
+    upload = _UploadPlan(node, calc_info, folder, inputs, logger)
 
-    logger_extra = get_dblogger_extra(node)
-    transport.set_logger_extra(logger_extra)
-    logger = LoggerAdapter(logger=execlogger, extra=logger_extra)
+    # In a dry_run, the working directory is the raw input folder, which will already contain the sandbox resources
+    for code_object in upload.code_objects:
+        _put_object(transport, *code_object)
 
-    if not dry_run and node.has_cached_links():
-        raise ValueError('Cannot submit calculation {} because it has cached input links! If you just want to test the '
-                         'submission, set `metadata.dry_run` to True in the inputs.'.format(node.pk))
+    for executable in upload.executables:
+        transport.chmod(executable, 0o755)  # rwxr-xr-x
 
-    # If we are performing a dry-run, the working directory should actually be a local folder that should already exist
-    if dry_run:
-        workdir = transport.getcwd()
-    else:
-        remote_user = transport.whoami()
-        # TODO Doc: {username} field
-        # TODO: if something is changed here, fix also 'verdi computer test'
-        remote_working_directory = computer.get_workdir().format(username=remote_user)
-        if not remote_working_directory.strip():
-            raise exceptions.ConfigurationError(
-                "[submission of calculation {}] No remote_working_directory configured for computer '{}'".format(
-                    node.pk, computer.name))
-
-        # If it already exists, no exception is raised
-        try:
-            transport.chdir(remote_working_directory)
-        except IOError:
-            logger.debug(
-                '[submission of calculation {}] Unable to chdir in {}, trying to create it'.format(
-                    node.pk, remote_working_directory))
-            try:
-                transport.makedirs(remote_working_directory)
-                transport.chdir(remote_working_directory)
-            except EnvironmentError as exc:
-                raise exceptions.ConfigurationError(
-                    '[submission of calculation {}] '
-                    'Unable to create the remote directory {} on '
-                    "computer '{}': {}".format(
-                        node.pk, remote_working_directory, computer.name, exc))
-        # Store remotely with sharding (here is where we choose
-        # the folder structure of remote jobs; then I store this
-        # in the calculation properties using _set_remote_dir
-        # and I do not have to know the logic, but I just need to
-        # read the absolute path from the calculation properties.
-        transport.mkdir(calc_info.uuid[:2], ignore_existing=True)
-        transport.chdir(calc_info.uuid[:2])
-        transport.mkdir(calc_info.uuid[2:4], ignore_existing=True)
-        transport.chdir(calc_info.uuid[2:4])
+    for local_copy_object in upload.local_copy_objects:
+        _put_object(transport, *local_copy_object)
 
-        try:
-            # The final directory may already exist, most likely because this function was already executed once, but
-            # failed and as a result was rescheduled by the eninge. In this case it would be fine to delete the folder
-            # and create it from scratch, except that we cannot be sure that this the actual case. Therefore, to err on
-            # the safe side, we move the folder to the lost+found directory before recreating the folder from scratch
-            transport.mkdir(calc_info.uuid[4:])
-        except OSError:
-            # Move the existing directory to lost+found, log a warning and create a clean directory anyway
-            path_existing = os.path.join(transport.getcwd(), calc_info.uuid[4:])
-            path_lost_found = os.path.join(remote_working_directory, REMOTE_WORK_DIRECTORY_LOST_FOUND)
-            path_target = os.path.join(path_lost_found, calc_info.uuid)
-            logger.warning('tried to create path {} but it already exists, moving the entire folder to {}'.format(
-                path_existing, path_target))
-
-            # Make sure the lost+found directory exists, then copy the existing folder there and delete the original
-            transport.mkdir(path_lost_found, ignore_existing=True)
-            transport.copytree(path_existing, path_target)
-            transport.rmtree(path_existing)
-
-            # Now we can create a clean folder for this calculation
-            transport.mkdir(calc_info.uuid[4:])
-        finally:
-            transport.chdir(calc_info.uuid[4:])
+    if upload.remote_copy_list:
+        with open(os.path.join(workdir, '_aiida_remote_copy_list.txt'), 'w') as handle:
+            for remote_computer_uuid, remote_abs_path, dest_rel_path in upload.remote_copy_list:
+                handle.write('would have copied {} to {} in working directory on remote {}'.format(
+                    remote_abs_path, dest_rel_path, node.computer.name))
 
-        # I store the workdir of the calculation for later file retrieval
-        workdir = transport.getcwd()
-        node.set_remote_workdir(workdir)
-
-    # I first create the code files, so that the code can put
-    # default files to be overwritten by the plugin itself.
-    # Still, beware! The code file itself could be overwritten...
-    # But I checked for this earlier.
-    for code in input_codes:
-        if code.is_local():
-            # Note: this will possibly overwrite files
-            for f in code.list_object_names():
-                # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
-                # combination with the new `Transport.put_object_from_filelike`
-                # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
-                with NamedTemporaryFile(mode='wb+') as handle:
-                    handle.write(code.get_object_content(f, mode='rb'))
-                    handle.flush()
-                    transport.put(handle.name, f)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
-
-    # In a dry_run, the working directory is the raw input folder, which will already contain these resources
-    if not dry_run:
-        for filename in folder.get_content_list():
-            logger.debug('[submission of calculation {}] copying file/folder {}...'.format(node.pk, filename))
-            transport.put(folder.get_abs_path(filename), filename)
-
-    # local_copy_list is a list of tuples, each with (uuid, dest_rel_path)
-    # NOTE: validation of these lists are done inside calculation.presubmit()
-    local_copy_list = calc_info.local_copy_list or []
-    remote_copy_list = calc_info.remote_copy_list or []
-    remote_symlink_list = calc_info.remote_symlink_list or []
-
-    for uuid, filename, target in local_copy_list:
-        logger.debug('[submission of calculation {}] copying local file/folder to {}'.format(node.uuid, target))
-
-        def find_data_node(inputs, uuid):
-            """Find and return the node with the given UUID from a nested mapping of input nodes.
-
-            :param inputs: (nested) mapping of nodes
-            :param uuid: UUID of the node to find
-            :return: instance of `Node` or `None` if not found
-            """
-            from collections import Mapping
-            data_node = None
-
-            for link_label, input_node in inputs.items():
-                if isinstance(input_node, Mapping):
-                    data_node = find_data_node(input_node, uuid)
-                elif isinstance(input_node, Node) and input_node.uuid == uuid:
-                    data_node = input_node
-                if data_node is not None:
-                    break
-
-            return data_node
+    if upload.remote_symlink_list:
+        with open(os.path.join(workdir, '_aiida_remote_symlink_list.txt'), 'w') as handle:
+            for remote_computer_uuid, remote_abs_path, dest_rel_path in upload.remote_symlink_list:
+                handle.write('would have created symlinks from {} to {} in working directory on remote {}'.format(
+                    remote_abs_path, dest_rel_path, node.computer.name))
+
+    upload.store_in_repository()
+
+
+def upload_calculations(uploads, transport):
+    """Upload `CalcJobs` of the same computer and user with a number of remote operations independent of their number.
+
+    The working directories of all calculations are created with a single remote command and the sandbox folders are
+    put with a single call to `Transport.puttrees`, which the SSH transport performs as one tar stream. Local copies
+    that go through the remote cache take two remote commands in total, and all remote copies and symlinks are created
+    with one more remote command.
+
+    :param uploads: list of tuples of the `CalcJobNode`, the calculation info datastructure returned by
+        `CalcJob.presubmit`, the temporary local file system folder containing the inputs written by
+        `CalcJob.prepare_for_submission` and the (nested) mapping of input nodes, or None
+    :param transport: an already opened transport to use to upload the calculations.
+    :return: list with, for each calculation, None if it was uploaded or the exception that was raised when uploading
+        it. If an exception is raised for a remote operation that concerns all calculations, it is raised directly.
+    """
+    from aiida.orm import RemoteData
+    from .remote_cache import RemoteCache
+
+    results = [None] * len(uploads)
+    plans = {}
+
+    for index, (node, calc_info, folder, inputs) in enumerate(uploads):
+
+        # If the calculation already has a `remote_folder`, simply skip it. The upload was apparently already completed
+        # before, which can happen if the daemon is restarted and it shuts down after uploading but before getting the
+        # chance to perform the state transition. Upon reloading this calculation, it will re-attempt the upload.
+        link_label = 'remote_folder'
+        if node.get_outgoing(RemoteData, link_label_filter=link_label).first():
+            execlogger.warning('CalcJobNode<{}> already has a `{}` output: skipping upload'.format(node.pk, link_label))
+            continue
 
         try:
-            data_node = load_node(uuid=uuid)
-        except exceptions.NotExistent:
-            data_node = find_data_node(inputs, uuid)
+            if node.has_cached_links():
+                raise ValueError('Cannot submit calculation {} because it has cached input links! If you just want to '
+                                 'test the submission, set `metadata.dry_run` to True in the inputs.'.format(node.pk))
+            plans[index] = _UploadPlan(node, calc_info, folder, inputs, _get_upload_logger(node, transport))
+        except Exception as exception:  # pylint: disable=broad-except
+            results[index] = exception
+
+    if not plans:
+        return results
+
+    computer = uploads[min(plans)][0].computer
+    remote_user = transport.whoami()
+    # TODO Doc: {username} field
+    # TODO: if something is changed here, fix also 'verdi computer test'
+    remote_working_directory = computer.get_workdir().format(username=remote_user)
+    if not remote_working_directory.strip():
+        raise exceptions.ConfigurationError(
+            "[submission of calculations] No remote_working_directory configured for computer '{}'".format(
+                computer.name))
+
+    # Store remotely with sharding (here is where we choose the folder structure of remote jobs; then I store this in
+    # the calculation properties using `set_remote_workdir` and I do not have to know the logic, but I just need to read
+    # the absolute path from the calculation properties.
+    for upload in plans.values():
+        uuid = upload.calc_info.uuid
+        upload.workdir = os.path.join(remote_working_directory, uuid[:2], uuid[2:4], uuid[4:])
+
+    _create_working_directories(transport, remote_working_directory, list(plans.values()))
+
+    for upload in plans.values():
+        # I store the workdir of the calculation for later file retrieval
+        upload.node.set_remote_workdir(upload.workdir)
 
-        if data_node is None:
-            logger.warning('failed to load Node<{}> specified in the `local_copy_list`'.format(uuid))
-        else:
-            # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
-            # combination with the new `Transport.put_object_from_filelike`
-            # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
-            with NamedTemporaryFile(mode='wb+') as handle:
-                handle.write(data_node.get_object_content(filename, mode='rb'))
-                handle.flush()
-                transport.put(handle.name, target)
-
-    if dry_run:
-        if remote_copy_list:
-            with open(os.path.join(workdir, '_aiida_remote_copy_list.txt'), 'w') as handle:
-                for remote_computer_uuid, remote_abs_path, dest_rel_path in remote_copy_list:
-                    handle.write('would have copied {} to {} in working directory on remote {}'.format(
-                        remote_abs_path, dest_rel_path, computer.name))
-
-        if remote_symlink_list:
-            with open(os.path.join(workdir, '_aiida_remote_symlink_list.txt'), 'w') as handle:
-                for remote_computer_uuid, remote_abs_path, dest_rel_path in remote_symlink_list:
-                    handle.write('would have created symlinks from {} to {} in working directory on remote {}'.format(
-                        remote_abs_path, dest_rel_path, computer.name))
+    # The objects of local codes and of the `local_copy_list` are shared through the remote cache, if it is enabled
+    remote_cache = RemoteCache.from_computer(computer, transport, remote_user)
 
-    else:
+    # I first create the code files, so that the code can put default files to be overwritten by the plugin itself.
+    # Still, beware! The code file itself could be overwritten... But I checked for this earlier. Some code files are
+    # never linked from the remote cache, see `_UploadPlan.get_uncached_code_paths`.
+    code_objects = [(code, key, os.path.join(upload.workdir, remotepath))
+                    for upload in plans.values()
+                    for code, key, remotepath in upload.code_objects]
+    _copy_objects(transport, remote_cache, code_objects, excluded=[
+        os.path.join(upload.workdir, path) for upload in plans.values() for path in upload.get_uncached_code_paths()
+    ])
 
-        for (remote_computer_uuid, remote_abs_path, dest_rel_path) in remote_copy_list:
-            if remote_computer_uuid == computer.uuid:
-                logger.debug('[submission of calculation {}] copying {} remotely, directly on the machine {}'.format(
-                    node.pk, dest_rel_path, computer.name))
-                try:
-                    transport.copy(remote_abs_path, dest_rel_path)
-                except (IOError, OSError):
-                    logger.warning('[submission of calculation {}] Unable to copy remote resource from {} to {}! '
-                                   'Stopping.'.format(node.pk, remote_abs_path, dest_rel_path))
-                    raise
-            else:
-                raise NotImplementedError(
-                    '[submission of calculation {}] Remote copy between two different machines is '
-                    'not implemented yet'.format(node.pk))
-
-        for (remote_computer_uuid, remote_abs_path, dest_rel_path) in remote_symlink_list:
-            if remote_computer_uuid == computer.uuid:
-                logger.debug('[submission of calculation {}] copying {} remotely, directly on the machine {}'.format(
-                    node.pk, dest_rel_path, computer.name))
-                try:
-                    transport.symlink(remote_abs_path, dest_rel_path)
-                except (IOError, OSError):
-                    logger.warning('[submission of calculation {}] Unable to create remote symlink from {} to {}! '
-                                   'Stopping.'.format(node.pk, remote_abs_path, dest_rel_path))
-                    raise
-            else:
-                raise IOError('It is not possible to create a symlink between two different machines for '
-                              'calculation {}'.format(node.pk))
-
-    provenance_exclude_list = calc_info.provenance_exclude_list or []
-
-    # Loop recursively over content of the sandbox folder copying all that are not in `provenance_exclude_list`. Note
-    # that directories are not created explicitly. The `node.put_object_from_filelike` call will create intermediate
-    # directories for nested files automatically when needed. This means though that empty folders in the sandbox or
-    # folders that would be empty when considering the `provenance_exclude_list` will *not* be copied to the repo. The
-    # advantage of this explicit copying instead of deleting the files from `provenance_exclude_list` from the sandbox
-    # first before moving the entire remaining content to the node's repository, is that in this way we are guaranteed
-    # not to accidentally move files to the repository that should not go there at all cost.
-    for root, dirnames, filenames in os.walk(folder.abspath):
-        for filename in filenames:
-            filepath = os.path.join(root, filename)
-            relpath = os.path.relpath(filepath, folder.abspath)
-            if relpath not in provenance_exclude_list:
-                with open(filepath, 'rb') as handle:
-                    node.put_object_from_filelike(handle, relpath, 'wb', force=True)
+    transport.puttrees([(upload.folder.abspath, upload.workdir) for upload in plans.values()])
+
+    local_copy_objects = [(node, key, os.path.join(upload.workdir, remotepath))
+                          for upload in plans.values()
+                          for node, key, remotepath in upload.local_copy_objects]
+    hits, misses = _copy_objects(transport, remote_cache, local_copy_objects)
+    execlogger.debug('[submission of calculations] copied {} objects from the remote cache and uploaded {}'.format(
+        hits, misses))
+
+    for index, exception in _finish_working_directories(transport, plans).items():
+        results[index] = exception
+        del plans[index]
+
+    for upload in plans.values():
+        upload.store_in_repository()
 
-    if not dry_run:
         # Make sure that attaching the `remote_folder` with a link is the last thing we do. This gives the biggest
         # chance of making this method idempotent. That is to say, if a runner gets interrupted during this action, it
         # will simply retry the upload, unless we got here and managed to link it up, in which case we move to the next
         # task. Because in that case, the check for the existence of this link at the top of this function will exit
         # early from this command.
-        remotedata = RemoteData(computer=computer, remote_path=workdir)
-        remotedata.add_incoming(node, link_type=LinkType.CREATE, link_label='remote_folder')
+        remotedata = RemoteData(computer=computer, remote_path=upload.workdir)
+        remotedata.add_incoming(upload.node, link_type=LinkType.CREATE, link_label='remote_folder')
         remotedata.store()
 
+    return results
+
+
+class _UploadPlan:
+    """The files to upload for a `CalcJob`, as determined from its calculation info, without any remote operation."""
+
+    def __init__(self, node, calc_info, folder, inputs, logger):
+        """Construct a new instance.
+
+        :param node: the `CalcJobNode`.
+        :param calc_info: the calculation info datastructure returned by `CalcJob.presubmit`
+        :param folder: temporary local file system folder containing the inputs written by
+            `CalcJob.prepare_for_submission`
+        :param inputs: (nested) mapping of the input nodes, or None
+        :param logger: the logger adapter of the calculation
+        """
+        from aiida.orm import load_node, Code
+
+        self.node = node
+        self.calc_info = calc_info
+        self.folder = folder
+        self.logger = logger
+        self.workdir = None
+
+        # Tuples of the node, the key of the object in its repository and the path relative to the working directory
+        self.code_objects = []
+        self.local_copy_objects = []
+        self.executables = []
+
+        input_codes = [load_node(_.code_uuid, sub_classes=(Code,)) for _ in calc_info.codes_info]
+
+        for code in input_codes:
+            if code.is_local():
+                # Note: this will possibly overwrite files
+                self.code_objects.extend((code, key, key) for key in code.list_object_names())
+                self.executables.append(code.get_local_executable())
+
+        # local_copy_list is a list of tuples, each with (uuid, dest_rel_path)
+        # NOTE: validation of these lists are done inside calculation.presubmit()
+        self.remote_copy_list = calc_info.remote_copy_list or []
+        self.remote_symlink_list = calc_info.remote_symlink_list or []
+
+        for uuid, filename, target in calc_info.local_copy_list or []:
+            logger.debug('[submission of calculation {}] copying local file/folder to {}'.format(node.uuid, target))
+
+            try:
+                data_node = load_node(uuid=uuid)
+            except exceptions.NotExistent:
+                data_node = _find_data_node(inputs or {}, uuid)
+
+            if data_node is None:
+                logger.warning('failed to load Node<{}> specified in the `local_copy_list`'.format(uuid))
+            else:
+                self.local_copy_objects.append((data_node, filename, target))
+
+    def get_uncached_code_paths(self):
+        """Return the paths of the code files that should be uploaded directly rather than linked from the remote cache.
+
+        These are the executables, whose permissions are changed after the upload, and the files that are overwritten
+        by a file of the sandbox folder, which would otherwise be written through the link into the read-only cache.
+
+        :return: list of paths relative to the working directory
+        """
+        return [
+            remotepath for _, _, remotepath in self.code_objects
+            if remotepath in self.executables or os.path.lexists(self.folder.get_abs_path(remotepath))
+        ]
+
+    def store_in_repository(self):
+        """Copy the content of the sandbox folder, except what is in the `provenance_exclude_list`, to the repository.
+
+        Directories are not created explicitly. The `node.put_object_from_filelike` call will create intermediate
+        directories for nested files automatically when needed. This means though that empty folders in the sandbox or
+        folders that would be empty when considering the `provenance_exclude_list` will *not* be copied to the repo. The
+        advantage of this explicit copying instead of deleting the files from `provenance_exclude_list` from the sandbox
+        first before moving the entire remaining content to the node's repository, is that in this way we are guaranteed
+        not to accidentally move files to the repository that should not go there at all cost.
+        """
+        provenance_exclude_list = self.calc_info.provenance_exclude_list or []
+
+        for root, _, filenames in os.walk(self.folder.abspath):
+            for filename in filenames:
+                filepath = os.path.join(root, filename)
+                relpath = os.path.relpath(filepath, self.folder.abspath)
+                if relpath not in provenance_exclude_list:
+                    with open(filepath, 'rb') as handle:
+                        self.node.put_object_from_filelike(handle, relpath, 'wb', force=True)
+
+
+def _get_upload_logger(node, transport):
+    """Return the logger adapter for the upload of the given calculation and set its extra on the transport."""
+    from logging import LoggerAdapter
+
+    logger_extra = get_dblogger_extra(node)
+    transport.set_logger_extra(logger_extra)
+    return LoggerAdapter(logger=execlogger, extra=logger_extra)
+
+
+def _find_data_node(inputs, uuid):
+    """Find and return the node with the given UUID from a nested mapping of input nodes.
+
+    :param inputs: (nested) mapping of nodes
+    :param uuid: UUID of the node to find
+    :return: instance of `Node` or `None` if not found
+    """
+    from collections.abc import Mapping
+    data_node = None
+
+    for input_node in inputs.values():
+        if isinstance(input_node, Mapping):
+            data_node = _find_data_node(input_node, uuid)
+        elif isinstance(input_node, Node) and input_node.uuid == uuid:
+            data_node = input_node
+        if data_node is not None:
+            break
+
+    return data_node
+
+
+def _put_object(transport, node, key, remotepath):
+    """Put an object of the repository of a node to a remote file.
+
+    Since the content of the node could potentially be binary, the raw bytes are streamed.
+    """
+    with node.open(key, mode='rb') as handle:
+        transport.put_object_from_filelike(handle, remotepath)
+
+
+def _copy_objects(transport, remote_cache, objects, excluded=()):
+    """Copy objects of node repositories to their remote path, through the remote cache if it is enabled.
+
+    :param objects: list of tuples of a node, the key of an object in its repository and the remote path
+    :param excluded: remote paths that should never be linked from the remote cache
+    :return: tuple of the number of objects that were already cached and the number of objects that were uploaded
+    """
+    cached_objects = []
+    uploaded = 0
+
+    for node, key, remotepath in objects:
+        if remote_cache is not None and remotepath not in excluded:
+            cached_objects.append((node, key, remotepath))
+        else:
+            _put_object(transport, node, key, remotepath)
+            uploaded += 1
+
+    hits, misses = remote_cache.copy_objects(cached_objects) if cached_objects else (0, 0)
+
+    return hits, misses + uploaded
+
+
+def _create_working_directories(transport, remote_working_directory, uploads):
+    """Create the working directories of calculations with a single remote command.
+
+    A working directory may already exist, most likely because the upload was already executed once, but failed and as
+    a result was rescheduled by the engine. In this case it would be fine to delete the folder and create it from
+    scratch, except that we cannot be sure that this the actual case. Therefore, to err on the safe side, we move the
+    folder to the lost+found directory before recreating the folder from scratch.
+
+    :param remote_working_directory: the absolute remote path of the working directory of the computer
+    :param uploads: list of `_UploadPlan` instances, whose `workdir` is set
+    :raise ConfigurationError: if the working directory of the computer cannot be created
+    :raise IOError: if a working directory of a calculation cannot be created
+    """
+    path_lost_found = os.path.join(remote_working_directory, REMOTE_WORK_DIRECTORY_LOST_FOUND)
+    lines = ['mkdir -p {} || exit 2'.format(escape_for_bash(remote_working_directory))]
+
+    # Every command is checked explicitly: with `set -e` the failure of a command that is not the last of an `&&` list
+    # is ignored, such that an existing working directory that could not be moved would silently be reused
+    for upload in uploads:
+        workdir = escape_for_bash(upload.workdir)
+        path_target = escape_for_bash(os.path.join(path_lost_found, upload.calc_info.uuid))
+        lines.append('if [ -e {} ]; then'.format(workdir))
+        lines.append('    mkdir -p {} || exit 1'.format(escape_for_bash(path_lost_found)))
+        lines.append('    cp -r {} {} || exit 1'.format(workdir, path_target))
+        lines.append('    rm -rf {} || exit 1'.format(workdir))
+        lines.append('    echo {}'.format(escape_for_bash(upload.calc_info.uuid)))
+        lines.append('fi')
+        lines.append('mkdir -p {} || exit 1'.format(workdir))
+
+    # The script is run in a subshell, since transports may prefix the command with a change of directory
+    retval, stdout, stderr = transport.exec_command_wait('(\n{}\n)'.format('\n'.join(lines)))
+
+    if retval == 2:
+        raise exceptions.ConfigurationError(
+            '[submission of calculations] Unable to create the remote directory {}: {}'.format(
+                remote_working_directory, stderr.strip()))
+
+    if retval != 0:
+        raise IOError('[submission of calculations] Unable to create the working directories: {}'.format(
+            stderr.strip()))
+
+    moved = set(stdout.split())
+
+    for upload in uploads:
+        if upload.calc_info.uuid in moved:
+            upload.logger.warning('tried to create path {} but it already exists, moved the entire folder to {}'.format(
+                upload.workdir, os.path.join(path_lost_found, upload.calc_info.uuid)))
+
+
+def _finish_working_directories(transport, uploads):
+    """Make the executables of local codes executable and perform the remote copies and symlinks with one command.
+
+    Resources whose source path contains a pattern are copied or symlinked separately through the transport.
+
+    :param uploads: mapping of indices to `_UploadPlan` instances, whose `workdir` is set
+    :return: mapping of the indices of the calculations whose working directory could not be finished to the exception
+    """
+    failures = {}
+    lines = []
+
+    for index, upload in uploads.items():
+        commands = ['chmod 755 {}'.format(escape_for_bash(executable)) for executable in upload.executables]
+
+        try:
+            for resources, command, method in [
+                (upload.remote_copy_list, 'cp -f -r', transport.copy),
+                (upload.remote_symlink_list, 'ln -s', transport.symlink),
+            ]:
+                for (remote_computer_uuid, remote_abs_path, dest_rel_path) in resources:
+                    if remote_computer_uuid != upload.node.computer.uuid:
+                        raise NotImplementedError(
+                            '[submission of calculation {}] Remote copies and symlinks between two different machines '
+                            'are not implemented'.format(upload.node.pk))
+
+                    upload.logger.debug('[submission of calculation {}] copying {} remotely, directly on the machine '
+                                        '{}'.format(upload.node.pk, dest_rel_path, upload.node.computer.name))
+
+                    if transport.has_magic(remote_abs_path):
+                        method(remote_abs_path, os.path.join(upload.workdir, dest_rel_path))
+                    else:
+                        commands.append('{} {} {}'.format(
+                            command, escape_for_bash(remote_abs_path), escape_for_bash(dest_rel_path)))
+        except (IOError, OSError, NotImplementedError) as exception:
+            upload.logger.warning('[submission of calculation {}] Unable to copy remote resources: {}'.format(
+                upload.node.pk, exception))
+            failures[index] = exception
+            continue
+
+        if commands:
+            # The commands of each calculation run in a command substitution that stops at the first failing command
+            # and captures its stderr, which is printed after a marker line with the index if the calculation fails
+            lines.append('error=$(')
+            lines.append('    exec 2>&1 >/dev/null')
+            lines.append('    cd {} || exit 1'.format(escape_for_bash(upload.workdir)))
+            lines.extend('    {} || exit 1'.format(command) for command in commands)
+            lines.append(') || printf \'%s %s\\n%s\\n\' {} {} "$error"'.format(_FAILURE_MARKER, index))
+
+    if not lines:
+        return failures
+
+    # The script is run in a subshell, since transports may prefix the command with a change of directory
+    _, stdout, _ = transport.exec_command_wait('(\n{}\n)'.format('\n'.join(lines)))
+
+    for index, error in _parse_failures(stdout).items():
+        upload = uploads[index]
+        upload.logger.warning('[submission of calculation {}] Unable to copy remote resources! Stopping.'.format(
+            upload.node.pk))
+        failures[index] = IOError('[submission of calculation {}] Unable to copy remote resources: {}'.format(
+            upload.node.pk, error))
+
+    return failures
+
+
+def _parse_failures(stdout):
+    """Parse the output of a script that prints the index and the stderr of each failed block after a marker line.
+
+    :param stdout: the stdout of the script
+    :return: mapping of the indices of the failed blocks to their stderr
+    """
+    failures = {}
+    index = None
+
+    for line in stdout.splitlines():
+        if line.startswith(_FAILURE_MARKER + ' '):
+            index = int(line[len(_FAILURE_MARKER) + 1:])
+            failures[index] = []
+        elif index is not None:
+            failures[index].append(line)
+
+    return {index: '\n'.join(lines).strip() for index, lines in failures.items()}
+
 
 def submit_calculation(calculation, transport, calc_info, script_filename):
     """Submit a previously uploaded `CalcJob` to the scheduler.
@@ -278,24 +476,46 @@ def submit_calculation(calculation, transport, calc_info, script_filename):
     :param script_filename: the job launch script returned by `CalcJobNode._presubmit`
     :return: the job id as returned by the scheduler `submit_from_script` call
     """
-    job_id = calculation.get_job_id()
+    result = submit_calculations([(calculation, script_filename)], transport)[0]
+
+    if isinstance(result, Exception):
+        raise result
+
+    return result
+
+
+def submit_calculations(submissions, transport):
+    """Submit previously uploaded `CalcJobs` of the same computer and user to the scheduler with one remote command.
+
+    :param submissions: list of tuples of the instance of CalcJobNode to submit and the job launch script returned by
+        `CalcJobNode._presubmit`
+    :param transport: an already opened transport to use to submit the calculations.
+    :return: list with, for each calculation, the job id as returned by the scheduler or the exception that was raised
+        when submitting it, such that the failure of one submission does not lose the job ids of the others
+    """
+    results = [calculation.get_job_id() for calculation, _ in submissions]
 
     # If the `job_id` attribute is already set, that means this function was already executed once and the scheduler
     # submit command was successful as the job id it returned was set on the node. This scenario can happen when the
     # daemon runner gets shutdown right after accomplishing the submission task, but before it gets the chance to
     # finalize the state transition of the `CalcJob` to the `UPDATE` transport task. Since the job is already submitted
     # we do not want to submit it a second time, so we simply return the existing job id here.
-    if job_id is not None:
-        return job_id
+    pending = [index for index, job_id in enumerate(results) if job_id is None]
+
+    if not pending:
+        return results
 
-    scheduler = calculation.computer.get_scheduler()
+    scheduler = submissions[pending[0]][0].computer.get_scheduler()
     scheduler.set_transport(transport)
 
-    workdir = calculation.get_remote_workdir()
-    job_id = scheduler.submit_from_script(workdir, script_filename)
-    calculation.set_job_id(job_id)
+    scripts = [(submissions[index][0].get_remote_workdir(), submissions[index][1]) for index in pending]
+
+    for index, job_id in zip(pending, scheduler.submit_from_scripts(scripts)):
+        if not isinstance(job_id, Exception):
+            submissions[index][0].set_job_id(job_id)
+        results[index] = job_id
 
-    return job_id
+    return results
 
 
 def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
@@ -326,19 +546,20 @@ def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
 
     # Create the FolderData node into which to store the files that are to be retrieved
     retrieved_files = FolderData()
+    compress = get_config_option('transport.compress_retrieval')
 
     with transport:
         transport.chdir(workdir)
 
-        # First, retrieve the files of folderdata
         retrieve_list = calculation.get_retrieve_list()
         retrieve_temporary_list = calculation.get_retrieve_temporary_list()
         retrieve_singlefile_list = calculation.get_retrieve_singlefile_list()
 
-        with SandboxFolder() as folder:
-            retrieve_files_from_list(calculation, transport, folder.abspath, retrieve_list)
-            # Here I retrieved everything; now I store them inside the calculation
-            retrieved_files.put_object_from_tree(folder.abspath)
+        # The patterns of both lists are expanded on the remote, with a single listing
+        targets, temporary_targets = _get_retrieve_targets(transport, [retrieve_list, retrieve_temporary_list or []])
+
+        # First, stream the files of the `retrieve_list` directly into the repository of the folder data
+        _retrieve_targets_into_node(transport, targets, retrieved_files, compress)
 
         # Second, retrieve the singlefiles, if any files were specified in the 'retrieve_temporary_list' key
         if retrieve_singlefile_list:
@@ -348,7 +569,7 @@ def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
         # Retrieve the temporary files in the retrieved_temporary_folder if any files were
         # specified in the 'retrieve_temporary_list' key
         if retrieve_temporary_list:
-            retrieve_files_from_list(calculation, transport, retrieved_temporary_folder, retrieve_temporary_list)
+            _retrieve_targets_into_folder(transport, temporary_targets, retrieved_temporary_folder, compress)
 
             # Log the files that were retrieved in the temporary folder
             for filename in os.listdir(retrieved_temporary_folder):
@@ -375,28 +596,52 @@ def kill_calculation(calculation, transport):
     :param calculation: the instance of CalcJobNode to kill.
     :param transport: an already opened transport to use to address the scheduler
     """
-    job_id = calculation.get_job_id()
+    result = kill_calculations([calculation], transport)[0]
+
+    if isinstance(result, Exception):
+        raise result
+
+    return result
+
+
+def kill_calculations(calculations, transport):
+    """Kill calculations of the same computer and user through the scheduler, with one remote command.
+
+    :param calculations: list of instances of CalcJobNode to kill.
+    :param transport: an already opened transport to use to address the scheduler
+    :return: list with, for each calculation, True or the exception if the kill really failed
+    """
+    if not calculations:
+        return []
+
+    job_ids = [calculation.get_job_id() for calculation in calculations]
 
     # Get the scheduler plugin class and initialize it with the correct transport
-    scheduler = calculation.computer.get_scheduler()
+    scheduler = calculations[0].computer.get_scheduler()
     scheduler.set_transport(transport)
 
-    # Call the proper kill method for the job ID of this calculation
-    result = scheduler.kill(job_id)
+    # Call the proper kill method for the job IDs of these calculations
+    killed = scheduler.kill_jobs(job_ids)
 
-    if result is not True:
+    # Failing to kill may be because the job has already been completed, so check the jobs that are still running
+    failed = [job_id for job_id, result in zip(job_ids, killed) if result is not True]
+    running_jobs = scheduler.get_jobs(jobs=failed, as_dict=True) if failed else {}
+    results = []
 
-        # Failed to kill because the job might have already been completed
-        running_jobs = scheduler.get_jobs(jobs=[job_id], as_dict=True)
+    for job_id, result in zip(job_ids, killed):
         job = running_jobs.get(job_id, None)
 
-        # If the job is returned it is still running and the kill really failed, so we raise
-        if job is not None and job.job_state != JobState.DONE:
-            raise exceptions.RemoteOperationError('scheduler.kill({}) was unsuccessful'.format(job_id))
-        else:
+        # If the job is returned it is still running and the kill really failed
+        if result is not True and job is not None and job.job_state != JobState.DONE:
+            results.append(exceptions.RemoteOperationError('scheduler.kill({}) was unsuccessful'.format(job_id)))
+            continue
+
+        if result is not True:
             execlogger.warning('scheduler.kill() failed but job<{%s}> no longer seems to be running regardless', job_id)
 
-    return True
+        results.append(True)
+
+    return results
 
 
 def parse_results(process, retrieved_temporary_folder=None):
@@ -512,36 +757,147 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     :param folder: an absolute path to a folder to copy files in
     :param retrieve_list: the list of files to retrieve
     """
-    for item in retrieve_list:
-        if isinstance(item, list):
-            tmp_rname, tmp_lname, depth = item
-            # if there are more than one file I do something differently
-            if transport.has_magic(tmp_rname):
-                remote_names = transport.glob(tmp_rname)
-                local_names = []
-                for rem in remote_names:
-                    to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
-                    local_names.append(os.path.sep.join([tmp_lname] + to_append))
-            else:
-                remote_names = [tmp_rname]
-                to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
-                local_names = [os.path.sep.join([tmp_lname] + to_append)]
-            if depth > 1:  # create directories in the folder, if needed
-                for this_local_file in local_names:
-                    new_folder = os.path.join(
-                        folder,
-                        os.path.split(this_local_file)[0])
-                    if not os.path.exists(new_folder):
-                        os.makedirs(new_folder)
-        else:  # it is a string
-            if transport.has_magic(item):
-                remote_names = transport.glob(item)
-                local_names = [os.path.split(rem)[1] for rem in remote_names]
-            else:
-                remote_names = [item]
-                local_names = [os.path.split(item)[1]]
+    targets = _get_retrieve_targets(transport, [retrieve_list])[0]
+
+    for remotepath, _ in targets:
+        transport.logger.debug(
+            "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, remotepath))
+
+    _retrieve_targets_into_folder(transport, targets, folder)
+
+
+def _get_retrieve_targets(transport, retrieve_lists):
+    """Return the remote paths of the entries of retrieve lists and the relative local paths to retrieve them to.
+
+    The patterns of the entries of all lists are expanded with a single call of `Transport.glob_many`. Entries that do
+    not match any existing remote path are ignored. See `retrieve_files_from_list` for the format of the entries.
+
+    :param transport: an open transport, whose current directory is the working directory of the calculation
+    :param retrieve_lists: list of retrieve lists
+    :return: list with, for each retrieve list, a list of tuples of a remote path and the relative local path
+    """
+    entries = [entry for retrieve_list in retrieve_lists for entry in retrieve_list]
+    pathnames = [entry[0] if isinstance(entry, (list, tuple)) else entry for entry in entries]
+    matches = iter(transport.glob_many(pathnames))
+    targets = []
+
+    for retrieve_list in retrieve_lists:
+        list_targets = []
+
+        for entry, remotepaths in zip(retrieve_list, matches):
+            for remotepath in remotepaths:
+                if isinstance(entry, (list, tuple)):
+                    _, localpath, depth = entry
+                    parts = os.path.normpath(remotepath).split(os.sep)[-depth:] if depth > 0 else []
+                    list_targets.append((remotepath, os.path.normpath(os.path.join(localpath, *parts))))
+                else:
+                    list_targets.append((remotepath, os.path.basename(os.path.normpath(remotepath))))
+
+        targets.append(list_targets)
+
+    return targets
+
+
+def _get_parent_paths(path):
+    """Return the paths of the parent folders of a normalized path, up to the current or root folder."""
+    parents = []
+
+    while path not in (os.curdir, os.sep):
+        path = os.path.dirname(path) or os.curdir
+        parents.append(path)
+
+    return parents
+
+
+def _iter_retrieve_targets(transport, targets, compress=False):
+    """Iterate over the content of the remote files and folders of retrieve targets, with a single transfer.
+
+    Remote paths that are contained in a folder that is retrieved as well, are transferred only once, as part of it.
+    Each file object can only be read until the next item is requested from the iterator.
+
+    :param transport: an open transport
+    :param targets: list of tuples of a remote path and the relative local path, as returned by `_get_retrieve_targets`
+    :param compress: whether the content is compressed on the remote while it is transferred
+    :return: iterator of tuples of the list of relative local paths of a file or folder and a binary file-like object
+        with the content of the file, or None for a folder
+    """
+    localpaths = collections.defaultdict(list)
+
+    for remotepath, localpath in targets:
+        localpaths[os.path.normpath(remotepath)].append(localpath)
+
+    remotepaths = [path for path in localpaths if not any(parent in localpaths for parent in _get_parent_paths(path))]
+
+    for remotepath, handle in transport.iter_objects(remotepaths, compress=compress):
+        remotepath = os.path.normpath(remotepath)
+        paths = []
+
+        for prefix in [remotepath] + _get_parent_paths(remotepath):
+            for localpath in localpaths.get(prefix, []):
+                path = os.path.normpath(os.path.join(localpath, os.path.relpath(remotepath, prefix)))
+
+                if path not in paths:
+                    paths.append(path)
+
+        yield paths, handle
+
+
+def _retrieve_targets_into_node(transport, targets, node, compress=False):
+    """Stream the remote files and folders of retrieve targets into the repository of an unstored node.
+
+    :param transport: an open transport
+    :param targets: list of tuples of a remote path and the relative local path, as returned by `_get_retrieve_targets`
+    :param node: the unstored node
+    :param compress: whether the content is compressed on the remote while it is transferred
+    """
+    folders = []
+    files = []
+
+    for keys, handle in _iter_retrieve_targets(transport, targets, compress):
+        if handle is None:
+            folders.extend(key for key in keys if key != os.curdir)
+            continue
+
+        node.put_object_from_filelike(handle, keys[0], mode='wb', encoding=None)
+
+        # The content can only be read once, so other copies of the same file are made from the repository
+        for key in keys[1:]:
+            with node.open(keys[0], mode='rb') as source:
+                node.put_object_from_filelike(source, key, mode='wb', encoding=None)
+
+        files.extend(keys)
+
+    # Folders are created implicitly by the files they contain, so only the empty ones have to be created explicitly
+    parents = {parent for key in files + folders for parent in _get_parent_paths(key)}
+    empty_folders = [key for key in folders if key not in parents]
+
+    if empty_folders:
+        with SandboxFolder() as empty_folder:
+            for key in empty_folders:
+                node.put_object_from_tree(empty_folder.abspath, key)
+
+
+def _retrieve_targets_into_folder(transport, targets, folder, compress=False):
+    """Retrieve the remote files and folders of retrieve targets into a local folder.
+
+    :param transport: an open transport
+    :param targets: list of tuples of a remote path and the relative local path, as returned by `_get_retrieve_targets`
+    :param folder: the absolute path of an existing local folder
+    :param compress: whether the content is compressed on the remote while it is transferred
+    """
+    for paths, handle in _iter_retrieve_targets(transport, targets, compress):
+        paths = [os.path.join(folder, path) for path in paths]
+
+        if handle is None:
+            for path in paths:
+                os.makedirs(path, exist_ok=True)
+            continue
+
+        for path in paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(paths[0], 'wb') as target:
+            shutil.copyfileobj(handle, target)
 
-        for rem, loc in zip(remote_names, local_names):
-            transport.logger.debug(
-                "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
-            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+        for path in paths[1:]:
+            shutil.copyfile(paths[0], path)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Cache of the objects of node repositories in a directory on a remote computer.
+
+Files of input nodes, like pseudopotentials, are often copied into the working directory of many calculations. When a
+remote cache is enabled for a computer, each object is uploaded only once, into the cache directory under the digest of
+its content, and is then linked into the working directories. Checking which objects are cached and creating the links
+each take a single remote command, regardless of the number of objects.
+"""
+import collections
+import os
+import time
+from uuid import uuid4
+
+from aiida.common.escaping import escape_for_bash
+
+__all__ = ('RemoteCache', 'RemoteCacheStatistics', 'LINK_MODES')
+
+LINK_MODES = ('symlink', 'hardlink')
+
+RemoteCacheStatistics = collections.namedtuple(
+    'RemoteCacheStatistics', ['objects', 'size_kb', 'hits', 'misses', 'hit_rate']
+)
+
+
+class RemoteCache:
+    """Directory on a remote computer in which objects of node repositories are stored under their content digest."""
+
+    STATISTICS_FILENAME = '.statistics'
+    TEMPORARY_SUFFIX = '.tmp'
+
+    def __init__(self, transport, directory, link_mode='symlink'):
+        """Construct a new instance.
+
+        :param transport: an open transport to the computer
+        :param directory: the absolute path of the cache directory on the computer, which is created when needed
+        :param link_mode: how cached objects are linked into working directories, one of `LINK_MODES`. Hard links keep
+            the content of an object available to calculations even if it is removed from the cache, but require the
+            cache and the working directories to be on the same file system.
+        :raise ValueError: if the directory is not absolute or the link mode is invalid
+        """
+        if not os.path.isabs(directory):
+            raise ValueError('the remote cache directory must be an absolute path, got: {}'.format(directory))
+
+        if link_mode not in LINK_MODES:
+            raise ValueError('invalid link mode `{}`, should be one of {}'.format(link_mode, LINK_MODES))
+
+        self._transport = transport
+        self._directory = directory
+        self._link_mode = link_mode
+
+    @classmethod
+    def from_computer(cls, computer, transport, username=None):
+        """Return the remote cache of the given computer, if it is enabled.
+
+        :param computer: the computer
+        :param transport: an open transport to the computer
+        :param username: the name of the remote user, which is substituted in the directory. If not specified, it is
+            determined through the transport.
+        :return: a `RemoteCache` instance or None if the remote cache is not enabled for the computer
+        """
+        directory = computer.get_remote_cache_directory()
+
+        if directory is None:
+            return None
+
+        if username is None:
+            username = transport.whoami()
+
+        return cls(transport, directory.format(username=username), computer.get_remote_cache_link_mode())
+
+    @property
+    def directory(self):
+        """Return the absolute path of the cache directory on the remote computer."""
+        return self._directory
+
+    @property
+    def link_mode(self):
+        """Return how cached objects are linked into working directories."""
+        return self._link_mode
+
+    def copy_objects(self, objects):
+        """Copy objects of node repositories to the remote computer, through the cache.
+
+        Objects whose content is not cached yet are uploaded into the cache first. All objects are then linked to their
+        remote path, which is relative to the current directory of the transport and is replaced if it already exists.
+        Cached objects are read-only, such that calculations cannot modify them through the links.
+
+        :param objects: list of tuples of a node, the key of an object in its repository and the remote path
+        :return: tuple of the number of objects that were already cached and the number of objects that were uploaded
+        :raise IOError: if a remote command fails
+        """
+        digests = [node.get_object_digest(key) for node, key, _ in objects]
+        cached = self._get_cached_digests(set(digests))
+        uploaded = collections.OrderedDict()
+
+        for (node, key, _), digest in zip(objects, digests):
+            if digest in cached or digest in uploaded:
+                continue
+
+            # Upload to a unique temporary name, such that concurrent uploads of the same object never expose a
+            # partially written object, which is moved into place by the script below, atomically
+            temporary_path = self._get_path('{}.{}{}'.format(digest, uuid4().hex, self.TEMPORARY_SUFFIX))
+
+            with node.open(key, mode='rb') as handle:
+                self._transport.put_object_from_filelike(handle, temporary_path)
+
+            uploaded[digest] = temporary_path
+
+        link_command = 'ln -sfn' if self._link_mode == 'symlink' else 'ln -f'
+        hits = len(objects) - len(uploaded)
+        lines = ['set -e']
+
+        for digest, temporary_path in uploaded.items():
+            lines.append('chmod 444 {}'.format(escape_for_bash(temporary_path)))
+            lines.append('mv -f {} {}'.format(escape_for_bash(temporary_path), escape_for_bash(self._get_path(digest))))
+
+        for (_, _, remotepath), digest in zip(objects, digests):
+            cached_path = self._get_path(digest)
+            lines.append('{} {} {}'.format(link_command, escape_for_bash(cached_path), escape_for_bash(remotepath)))
+
+        lines.append('echo {} {} {} >> {}'.format(
+            int(time.time()), hits, len(uploaded), escape_for_bash(self._get_path(self.STATISTICS_FILENAME))
+        ))
+
+        self._exec('\n'.join(lines))
+
+        return hits, len(uploaded)
+
+    def get_statistics(self):
+        """Return the statistics of the cache.
+
+        The number of hits and misses are accumulated over all uploads through the cache since it was created.
+
+        :return: a `RemoteCacheStatistics` tuple, with the hit rate as a fraction or None if there were no uploads
+        :raise IOError: if the remote command fails
+        """
+        script = '\n'.join([
+            'cd {} 2>/dev/null || exit 0'.format(escape_for_bash(self._directory)),
+            "find . ! -name . -prune -type f ! -name '.*' ! -name '*{}' | wc -l".format(self.TEMPORARY_SUFFIX),
+            'du -sk . | cut -f1',
+            'cat {} 2>/dev/null || true'.format(self.STATISTICS_FILENAME),
+        ])
+        lines = self._exec(script).splitlines()
+
+        if not lines:
+            return RemoteCacheStatistics(0, 0, 0, 0, None)
+
+        hits = 0
+        misses = 0
+
+        for line in lines[2:]:
+            try:
+                _, line_hits, line_misses = line.split()
+                hits += int(line_hits)
+                misses += int(line_misses)
+            except ValueError:
+                # A line may be incomplete if an upload was interrupted while writing the statistics
+                continue
+
+        hit_rate = hits / (hits + misses) if hits + misses else None
+
+        return RemoteCacheStatistics(int(lines[0]), int(lines[1]), hits, misses, hit_rate)
+
+    def clean(self, older_than=None):
+        """Remove objects from the cache.
+
+        .. warning:: with the `symlink` link mode, calculations whose working directory links to a removed object can
+            no longer access it. Only remove objects that are no longer used by calculations that may still run.
+
+        :param older_than: only remove objects that were last uploaded or used at least this number of days ago. If
+            not specified, all objects are removed. The statistics are retained.
+        :return: the number of removed objects, including leftovers of interrupted uploads
+        :raise IOError: if the remote command fails
+        """
+        age_filter = '-mtime +{} '.format(older_than - 1) if older_than else ''
+        script = '\n'.join([
+            'cd {} 2>/dev/null || exit 0'.format(escape_for_bash(self._directory)),
+            "find . ! -name . -prune -type f ! -name '.*' {}-exec rm -f {{}} + -print".format(age_filter),
+        ])
+
+        return len(self._exec(script).splitlines())
+
+    def _get_cached_digests(self, digests):
+        """Return which of the given digests have an object in the cache, creating the cache directory if needed.
+
+        The modification time of the cached objects is updated, such that `clean` only removes unused objects.
+
+        :param digests: set of content digests
+        :return: the set of cached digests
+        """
+        if not digests:
+            return set()
+
+        escaped_directory = escape_for_bash(self._directory)
+        script = '\n'.join([
+            'mkdir -p {} && cd {} || exit 1'.format(escaped_directory, escaped_directory),
+            'for name in {}; do'.format(' '.join(sorted(digests))),
+            '    if [ -f "$name" ]; then touch -c "$name" 2>/dev/null; echo "$name"; fi',
+            'done',
+        ])
+
+        return set(self._exec(script).split()) & digests
+
+    def _get_path(self, filename):
+        """Return the absolute remote path of the given file in the cache directory."""
+        return os.path.join(self._directory, filename)
+
+    def _exec(self, script):
+        """Execute a script on the remote computer and return its standard output.
+
+        :raise IOError: if the script returns a non-zero exit status
+        """
+        # The script is run in a subshell, since transports may prefix the command with a change of directory
+        retval, stdout, stderr = self._transport.exec_command_wait('(\n{}\n)'.format(script))
+
+        if retval != 0:
+            raise IOError('remote cache command failed with exit status {}: {}'.format(retval, stderr.strip()))
+
+        return stdout
@@ -10,6 +10,7 @@
 """Function that starts a daemon runner."""
 
 import logging
+import os
 import signal
 
 from aiida.common.log import configure_logging
@@ -24,9 +25,15 @@ def start_daemon():
     daemon_client = get_daemon_client()
     configure_logging(daemon=True, daemon_log_file=daemon_client.daemon_log_file)
 
+    from aiida.engine.daemon.slots import SlotScheduler
+    from aiida.manage.external import rmq
+
+    load_file = daemon_client.get_worker_load_file(os.getpid())
+    slot_scheduler = SlotScheduler(rmq._RMQ_TASK_PREFETCH_COUNT, load_file)  # pylint: disable=protected-access
+
     try:
         manager = get_manager()
-        runner = manager.create_daemon_runner()
+        runner = manager.create_daemon_runner(slot_scheduler=slot_scheduler)
         manager.set_runner(runner)
     except Exception as exception:
         LOGGER.exception('daemon runner failed to start')
@@ -46,5 +53,7 @@ def start_daemon():
     except SystemError as exception:
         LOGGER.info('Received a SystemError: %s', exception)
         runner.close()
+    finally:
+        slot_scheduler.stop()
 
     LOGGER.info('Daemon runner stopped')
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Load-aware admission of process tasks by daemon workers."""
+import logging
+import os
+import time
+
+from tornado import gen
+
+__all__ = ('SlotScheduler', 'read_worker_load')
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SlotScheduler:
+    """Admission control of the process tasks that are received by a daemon worker, based on the load of the worker.
+
+    Every task occupies a number of slots that depends on the type of its process: calculation jobs spend most of their
+    time waiting for the transport and the scheduler, so they weigh less than other processes, such as process functions,
+    which keep the event loop of the worker busy for as long as they are running. A task is only accepted if its weight
+    fits in the current capacity of the worker; otherwise it is rejected, such that RabbitMQ can hand it to another
+    worker.
+
+    The capacity starts at the number of slots, which is also the number of tasks RabbitMQ prefetches for the worker and
+    so remains the upper bound. It is reduced whenever the latency of the event loop or the CPU usage of the worker is
+    too high and increased again when both are low.
+    """
+
+    WEIGHT_CALCJOB = 0.2
+    WEIGHT_DEFAULT = 1.
+
+    MONITOR_INTERVAL = 5.
+    REJECT_DELAY = 5.
+    MINIMUM_CAPACITY = 1.
+
+    LATENCY_HIGH = 0.5
+    LATENCY_LOW = 0.1
+    CPU_HIGH = 90.
+    CPU_LOW = 50.
+
+    def __init__(self, slots, load_file=None):
+        """Construct a new instance.
+
+        :param slots: the maximum number of slots, which should be the task prefetch count of the communicator
+        :param load_file: optional path of a file to which the load metrics are written periodically
+        """
+        import psutil
+
+        self._loop = None
+        self._slots = float(slots)
+        self._capacity = float(slots)
+        self._load_file = load_file
+        self._tasks = {}  # Mapping: {key: weight}
+        self._latency = 0.
+        self._cpu = 0.
+        self._num_rejected = 0
+        self._process = psutil.Process()
+        self._monitor_handle = None
+        self._monitor_scheduled = None
+        self._statistics = {}  # Mapping: {name: getter}
+
+    @property
+    def load(self):
+        """Return the number of slots that are occupied by the active tasks.
+
+        :return: the load
+        :rtype: float
+        """
+        return sum(self._tasks.values())
+
+    @property
+    def capacity(self):
+        """Return the current number of slots that tasks may occupy.
+
+        :return: the capacity
+        :rtype: float
+        """
+        return self._capacity
+
+    def get_metrics(self):
+        """Return the load metrics of the worker.
+
+        :return: dictionary with the load metrics
+        """
+        return {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'tasks': len(self._tasks),
+            'load': self.load,
+            'capacity': self._capacity,
+            'slots': self._slots,
+            'latency': self._latency,
+            'cpu': self._cpu,
+            'rejected': self._num_rejected,
+            'statistics': {name: getter() for name, getter in self._statistics.items()},
+        }
+
+    def add_statistics(self, name, getter):
+        """Add statistics of the worker that are included in the load metrics under the given name.
+
+        :param name: the name of the statistics
+        :param getter: callable without arguments that returns the statistics as a flat dictionary of numbers
+        """
+        self._statistics[name] = getter
+
+    def start(self, loop):
+        """Start monitoring the load of the worker.
+
+        :param loop: the event loop of the daemon runner
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        """
+        self._loop = loop
+
+        if self._monitor_handle is None:
+            self._schedule_monitor()
+
+    def stop(self):
+        """Stop monitoring the load of the worker and remove the load file."""
+        if self._monitor_handle is not None:
+            self._loop.remove_timeout(self._monitor_handle)
+            self._monitor_handle = None
+
+        if self._load_file is not None:
+            try:
+                os.remove(self._load_file)
+            except OSError:
+                pass
+
+    @staticmethod
+    def get_weight(pid):
+        """Return the number of slots that the process with the given pid occupies.
+
+        :param pid: the pk of the process node
+        :return: the weight
+        :rtype: float
+        """
+        from aiida.orm import CalcJobNode, QueryBuilder
+
+        # Only the type of the node matters, so it is queried without loading the node itself
+        builder = QueryBuilder().append(CalcJobNode, filters={'id': pid}, project=['id'])
+
+        if builder.first() is not None:
+            return SlotScheduler.WEIGHT_CALCJOB
+
+        return SlotScheduler.WEIGHT_DEFAULT
+
+    def acquire(self, pid):
+        """Try to occupy the slots for the task of the process with the given pid.
+
+        A task is always accepted if the worker has no other tasks, such that a worker can never starve.
+
+        :param pid: the pk of the process node or None if the task does not concern an existing process
+        :return: a key to release the slots with, or None if the worker does not have enough free slots for the task
+        """
+        weight = self.get_weight(pid) if pid is not None else self.WEIGHT_DEFAULT
+
+        if self._tasks and self.load + weight > self._capacity:
+            self._num_rejected += 1
+            return None
+
+        key = object()
+        self._tasks[key] = weight
+
+        return key
+
+    def release(self, key):
+        """Free the slots occupied by a task.
+
+        :param key: the key returned by `acquire` for the task
+        """
+        self._tasks.pop(key, None)
+
+    def wrap(self, task_receiver):
+        """Wrap a task receiver such that it only handles tasks for which the worker has enough free slots.
+
+        Tasks that are not accepted are rejected after `REJECT_DELAY` seconds. The delay prevents a task from being
+        passed back and forth at a high rate between RabbitMQ and workers that are all at capacity.
+
+        :param task_receiver: coroutine function that is called with the communicator and the task
+        :return: coroutine function with the same signature
+        """
+        import kiwipy
+
+        @gen.coroutine
+        def receive(communicator, task):
+            """Handle the task if there are enough free slots, otherwise reject it."""
+            pid = task.get('pid', None) if isinstance(task, dict) else None
+
+            key = self.acquire(pid)
+
+            if key is None:
+                LOGGER.info('rejecting task for process<%s>: load %.1f of capacity %.1f', pid, self.load, self._capacity)
+                yield gen.sleep(self.REJECT_DELAY)
+                raise kiwipy.TaskRejected('the daemon worker is at capacity')
+
+            try:
+                result = yield gen.maybe_future(task_receiver(communicator, task))
+            finally:
+                self.release(key)
+
+            raise gen.Return(result)
+
+        return receive
+
+    def _schedule_monitor(self):
+        """Schedule the next call of the monitor and record when it is due."""
+        self._monitor_scheduled = self._loop.time() + self.MONITOR_INTERVAL
+        self._monitor_handle = self._loop.call_later(self.MONITOR_INTERVAL, self._monitor)
+
+    def _monitor(self):
+        """Measure the load of the worker, adjust the capacity accordingly and write the load metrics."""
+        # The delay with which this callback is called compared to when it was due measures how busy the event loop is
+        self._latency = max(self._loop.time() - self._monitor_scheduled, 0.)
+        self._cpu = self._process.cpu_percent(None)
+
+        capacity = self._capacity
+
+        if self._latency > self.LATENCY_HIGH or self._cpu > self.CPU_HIGH:
+            self._capacity = max(self._capacity * 0.8, self.MINIMUM_CAPACITY)
+        elif self._latency < self.LATENCY_LOW and self._cpu < self.CPU_LOW:
+            self._capacity = min(self._capacity + 0.1 * self._slots, self._slots)
+
+        if self._capacity != capacity:
+            LOGGER.info(
+                'changed capacity from %.1f to %.1f slots: event loop latency %.3f s, CPU %.0f%%', capacity,
+                self._capacity, self._latency, self._cpu
+            )
+
+        if self._load_file is not None:
+            self._write_load_file()
+
+        self._schedule_monitor()
+
+    def _write_load_file(self):
+        """Write the load metrics to the load file."""
+        from aiida.common import json
+
+        temporary = '{}.tmp'.format(self._load_file)
+
+        try:
+            with open(temporary, 'w', encoding='utf8') as handle:
+                json.dump(self.get_metrics(), handle)
+            os.replace(temporary, self._load_file)
+        except OSError:
+            LOGGER.exception('failed to write the load file')
+
+
+def read_worker_load(load_file, maximum_age=3 * SlotScheduler.MONITOR_INTERVAL):
+    """Read the load metrics that a daemon worker has written to its load file.
+
+    :param load_file: the path of the load file
+    :param maximum_age: the maximum age in seconds of the metrics, older metrics are considered stale
+    :return: dictionary with the load metrics or None if the file does not exist or the metrics are stale
+    """
+    from aiida.common import json
+
+    try:
+        with open(load_file, 'r', encoding='utf8') as handle:
+            metrics = json.load(handle)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if time.time() - metrics.get('time', 0) > maximum_age:
+        return None
+
+    return metrics
@@ -10,9 +10,13 @@
 # pylint: disable=global-statement
 """Definition of AiiDA's process persister and the necessary object loaders."""
 
+import base64
+import hashlib
 import importlib
 import logging
 import traceback
+import weakref
+import zlib
 
 import plumpy
 
@@ -23,6 +27,9 @@ __all__ = ('AiiDAPersister', 'ObjectLoader', 'get_object_loader')
 LOGGER = logging.getLogger(__name__)
 OBJECT_LOADER = None
 
+CHECKPOINT_COMPRESSED_PREFIX = 'zlib+base64:'
+CHECKPOINT_COMPRESSION_LEVEL = 1
+
 
 class ObjectLoader(plumpy.DefaultObjectLoader):
     """Custom object loader for `aiida-core`."""
@@ -61,8 +68,53 @@ def get_object_loader():
     return OBJECT_LOADER
 
 
+def encode_checkpoint(serialized):
+    """Compress a serialized checkpoint and encode it as a string that can be stored as a node attribute.
+
+    :param serialized: the yaml serialized bundle as a byte string
+    :return: the encoded checkpoint string
+    """
+    compressed = zlib.compress(serialized, CHECKPOINT_COMPRESSION_LEVEL)
+    return CHECKPOINT_COMPRESSED_PREFIX + base64.b64encode(compressed).decode('ascii')
+
+
+def decode_checkpoint(checkpoint):
+    """Decode a checkpoint string into the yaml serialized bundle.
+
+    Checkpoints that were written before they were compressed are plain yaml strings and are returned as is.
+
+    :param checkpoint: the checkpoint string as stored in the node attribute
+    :return: the yaml serialized bundle
+    """
+    if checkpoint.startswith(CHECKPOINT_COMPRESSED_PREFIX):
+        compressed = base64.b64decode(checkpoint[len(CHECKPOINT_COMPRESSED_PREFIX):])
+        return zlib.decompress(compressed).decode('utf-8')
+
+    return checkpoint
+
+
 class AiiDAPersister(plumpy.Persister):
-    """Persister to take saved process instance states and persisting them to the database."""
+    """Persister to take saved process instance states and persisting them to the database.
+
+    The checkpoint is stored in an attribute of the process node as compressed yaml. The persister keeps a digest of the
+    last checkpoint that it saved for each live process instance, such that a checkpoint that is identical to the one
+    that is already stored is not written again.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Keyed on the process instance, such that entries disappear with the process and a process that is recreated
+        # from its checkpoint, possibly by another runner, always writes its first checkpoint.
+        self._checkpoint_digests = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _get_digest(serialized):
+        """Return the digest of a yaml serialized bundle.
+
+        :param serialized: the yaml serialized bundle as a byte string
+        :return: the hexdigest
+        """
+        return hashlib.sha256(serialized).hexdigest()
 
     def save_checkpoint(self, process, tag=None):
         """Persist a Process instance.
@@ -85,7 +137,12 @@ class AiiDAPersister(plumpy.Persister):
             )
 
         try:
-            process.node.set_checkpoint(serialize.serialize(bundle))
+            serialized = serialize.serialize(bundle, encoding='utf-8')
+            digest = self._get_digest(serialized)
+
+            if self._checkpoint_digests.get(process) != digest:
+                process.node.set_checkpoint(encode_checkpoint(serialized))
+                self._checkpoint_digests[process] = digest
         except Exception:
             raise plumpy.PersistenceError(
                 "Failed to store a checkpoint for '{}': {}".format(process, traceback.format_exc())
@@ -121,7 +178,7 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
 
         try:
-            bundle = serialize.deserialize(checkpoint)
+            bundle = serialize.deserialize(decode_checkpoint(checkpoint))
         except Exception:
             raise plumpy.PersistenceError(
                 'Failed to load the checkpoint for process<{}>: {}'.format(pid, traceback.format_exc())
@@ -150,6 +207,9 @@ class AiiDAPersister(plumpy.Persister):
         """
         from aiida.orm import load_node
 
+        for process in [process for process in self._checkpoint_digests if process.pid == pid]:
+            self._checkpoint_digests.pop(process)
+
         calc = load_node(pid)
         calc.delete_checkpoint()
 
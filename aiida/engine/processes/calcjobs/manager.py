@@ -8,15 +8,17 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Module containing utilities and classes relating to job calculations running on systems that require transport."""
+import collections
 import contextlib
 import logging
 import time
+import uuid
 
 from tornado import concurrent, gen
 
 from aiida.common import lang
 
-__all__ = ('JobsList', 'JobManager')
+__all__ = ('JobsList', 'JobCommandQueue', 'JobManager')
 
 
 class JobsList:
@@ -27,16 +29,23 @@ class JobsList:
 
     In addition, the :py:class:`~aiida.orm.computers.Computer` for which the :py:class:`~aiida.orm.authinfos.AuthInfo`
     is configured, can define a minimum polling interval. This class will guarantee that the time between update calls
-    to the scheduler is larger or equal to that minimum interval.
-
-    Note that since each instance operates on a specific authinfo, the guarantees of batching scheduler update calls
-    and the limiting of number of calls per unit time, through the minimum polling interval, is only applicable for jobs
-    launched with that particular authinfo. If multiple authinfo instances with the same computer, have active jobs
-    these limitations are not respected between them, since there is no communication between ``JobsList`` instances.
+    to the scheduler is larger or equal to that minimum interval. As long as the state of none of the jobs changes,
+    the interval is gradually increased up to `MAXIMUM_BACKOFF` times the minimum interval. It is reset to the minimum
+    interval as soon as the state of a job changes, where a job that is polled for the first time counts as changed.
+
+    If a communicator is passed, the jobs lists of all runners that are connected to the same communicator, e.g. all
+    the daemon workers of a profile, share their scheduler updates for the same authinfo. Every update is broadcast
+    and a jobs list that receives it uses it to resolve its own pending requests and postpones its own next update as
+    if it had made the update itself. As a result, the scheduler is typically polled only once per interval for each
+    authinfo, instead of once per interval for each authinfo and runner.
     See the :py:class:`~aiida.engine.processes.calcjobs.manager.JobManager` for example usage.
     """
 
-    def __init__(self, authinfo, transport_queue, last_updated=None):
+    BACKOFF_FACTOR = 1.5
+    MAXIMUM_BACKOFF = 5.
+    STATISTICS = ('polls', 'broadcasts', 'jobs_resolved')
+
+    def __init__(self, authinfo, transport_queue, last_updated=None, communicator=None):
         """Construct an instance for the given authinfo and transport queue.
 
         :param authinfo: The authinfo used to check the jobs list
@@ -45,6 +54,8 @@ class JobsList:
         :type: :class:`aiida.engine.transports.TransportQueue`
         :param last_updated: initialize the last updated timestamp
         :type: float
+        :param communicator: optional communicator over which to share the scheduler updates with other runners
+        :type communicator: :class:`kiwipy.Communicator`
         """
         lang.type_check(last_updated, float, allow_none=True)
 
@@ -55,8 +66,45 @@ class JobsList:
 
         self._jobs_cache = {}
         self._job_update_requests = {}  # Mapping: {job_id: Future}
+        self._job_update_request_times = {}  # Mapping: {job_id: time of the request}
+        self._polled_job_ids = set()
         self._last_updated = last_updated
         self._update_handle = None
+        self._backoff = 1.
+        self._statistics = collections.Counter()
+
+        self._communicator = communicator
+        self._identifier = uuid.uuid4().hex
+        self._broadcast_filter = None
+
+        if communicator is not None:
+            self._subscribe_to_updates()
+
+    @property
+    def broadcast_subject(self):
+        """Return the subject of the broadcasts with the scheduler updates of the authinfo of this instance.
+
+        :return: the subject
+        :rtype: str
+        """
+        return 'jobs_list.{}'.format(self._authinfo.id)
+
+    def close(self):
+        """Stop receiving the scheduler updates of other runners."""
+        if self._broadcast_filter is not None:
+            self._communicator.remove_broadcast_subscriber(self._broadcast_filter)
+            self._broadcast_filter = None
+
+    def get_statistics(self):
+        """Return the statistics of the scheduler updates of this instance.
+
+        :return: dictionary with the number of `polls` of the scheduler made by this instance, the number of updates
+            received from other runners (`broadcasts`), and the number of job update requests that were resolved by
+            either (`jobs_resolved`)
+        """
+        statistics = {key: 0 for key in self.STATISTICS}
+        statistics.update(self._statistics)
+        return statistics
 
     @property
     def logger(self):
@@ -74,6 +122,14 @@ class JobsList:
         """
         return self._authinfo.computer.get_minimum_job_poll_interval()
 
+    def get_update_interval(self):
+        """Get the current interval between updates of the list, which is the minimum interval times the backoff.
+
+        :return: the interval
+        :rtype: float
+        """
+        return self.get_minimum_update_interval() * self._backoff
+
     @property
     def last_updated(self):
         """Get the timestamp of when the list was last updated as produced by `time.time()`
@@ -100,10 +156,13 @@ class JobsList:
             kwargs = {'as_dict': True}
             if scheduler.get_feature('can_query_by_user'):
                 kwargs['user'] = '$USER'
+                job_ids = None
             else:
-                kwargs['jobs'] = self._get_jobs_with_scheduler()
+                kwargs['jobs'] = job_ids = self._get_jobs_with_scheduler()
 
+            poll_started = time.time()
             scheduler_response = scheduler.get_jobs(**kwargs)
+            self._statistics['polls'] += 1
 
             # Update the last update time and clear the jobs cache
             self._last_updated = time.time()
@@ -113,6 +172,8 @@ class JobsList:
             for job_id, job_info in scheduler_response.items():
                 jobs_cache[job_id] = job_info
 
+            self._broadcast_update(jobs_cache, job_ids, poll_started)
+
             raise gen.Return(jobs_cache)
 
     @gen.coroutine
@@ -127,7 +188,7 @@ class JobsList:
                 return
 
             # Update our cache of the job states
-            self._jobs_cache = yield self._get_jobs_from_scheduler()
+            jobs_cache = yield self._get_jobs_from_scheduler()
         except Exception as exception:
             # Set the exception on all the update futures
             for future in self._job_update_requests.values():
@@ -139,14 +200,119 @@ class JobsList:
             # `_ensure_updating` will falsely conclude we are still updating, since the handle is not `None` and so it
             # will not schedule the next update, causing the job update futures to never be resolved.
             self._update_handle = None
+            self._job_update_requests = {}
+            self._job_update_request_times = {}
 
             raise
         else:
-            for job_id, future in self._job_update_requests.items():
-                if not future.done():
-                    future.set_result(self._jobs_cache.get(job_id, None))
-        finally:
-            self._job_update_requests = {}
+            self._resolve_requests(jobs_cache)
+
+    def _resolve_requests(self, jobs_cache, job_ids=None, poll_started=None):
+        """Replace the jobs cache and resolve the pending update requests with it.
+
+        The interval until the next update is increased if the state of none of the jobs of the resolved requests has
+        changed since the last update, and reset to the minimum interval otherwise. Jobs that were not polled in the
+        last update, e.g. because they were just submitted, count as changed.
+
+        :param jobs_cache: mapping of job ids to `JobInfo` instances as returned by the scheduler
+        :param job_ids: optional list of the job ids that the scheduler was queried for. If specified, only requests for
+            these jobs are resolved, otherwise the update is considered to contain all jobs of the user.
+        :param poll_started: optional time at which the scheduler was queried. If specified, only requests that were
+            made before that time are resolved, since later requests may concern jobs that were submitted afterwards.
+        """
+        changed = False
+        resolved = []
+
+        for job_id, future in self._job_update_requests.items():
+            if job_ids is not None and job_id not in job_ids:
+                continue
+
+            if poll_started is not None and self._job_update_request_times[job_id] > poll_started:
+                continue
+
+            resolved.append(job_id)
+
+            if job_id not in self._polled_job_ids or self._has_job_state_changed(
+                self._jobs_cache.get(job_id, None), jobs_cache.get(job_id, None)
+            ):
+                changed = True
+
+            if not future.done():
+                future.set_result(jobs_cache.get(job_id, None))
+
+        for job_id in resolved:
+            self._job_update_requests.pop(job_id)
+            self._job_update_request_times.pop(job_id)
+
+        self._jobs_cache = jobs_cache
+        self._polled_job_ids = set(resolved)
+        self._statistics['jobs_resolved'] += len(resolved)
+
+        if changed:
+            self._backoff = 1.
+        elif resolved:
+            self._backoff = min(self._backoff * self.BACKOFF_FACTOR, self.MAXIMUM_BACKOFF)
+
+        self.logger.debug(
+            'AuthInfo<{}>: resolved {} job update requests, next update interval {:.1f} s'.format(
+                self._authinfo.pk, len(resolved), self.get_update_interval()
+            )
+        )
+
+    def _subscribe_to_updates(self):
+        """Subscribe to the broadcasts of the scheduler updates of other runners for the authinfo of this instance."""
+        import kiwipy
+
+        def on_broadcast(_communicator, body, sender, _subject, _correlation_id):
+            # Broadcasts are received on the thread of the communicator so hand over to the event loop
+            if sender != self._identifier:
+                self._loop.add_callback(self._on_update_received, body)
+
+        self._broadcast_filter = kiwipy.BroadcastFilter(on_broadcast, subject=self.broadcast_subject)
+        self._communicator.add_broadcast_subscriber(self._broadcast_filter)
+
+    def _broadcast_update(self, jobs_cache, job_ids, poll_started):
+        """Broadcast a scheduler update to the jobs lists of other runners.
+
+        :param jobs_cache: mapping of job ids to `JobInfo` instances as returned by the scheduler
+        :param job_ids: the list of job ids that the scheduler was queried for or None if it was queried for all jobs
+        :param poll_started: the time at which the scheduler was queried
+        """
+        if self._communicator is None:
+            return
+
+        body = {
+            'jobs': {job_id: job_info.serialize() for job_id, job_info in jobs_cache.items()},
+            'job_ids': job_ids,
+            'poll_started': poll_started,
+            'last_updated': self._last_updated,
+        }
+
+        try:
+            self._communicator.broadcast_send(body, sender=self._identifier, subject=self.broadcast_subject)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception('AuthInfo<{}>: failed to broadcast the scheduler update'.format(self._authinfo.pk))
+
+    def _on_update_received(self, body):
+        """Use a scheduler update that was broadcast by another runner.
+
+        The update is ignored if it is older than the last update of this instance. Otherwise it resolves the pending
+        requests that it covers and the next update of this instance is postponed as if it had made the update itself.
+
+        :param body: the body of the broadcast
+        """
+        from aiida.schedulers.datastructures import JobInfo
+
+        if self._last_updated is not None and body['last_updated'] <= self._last_updated:
+            return
+
+        self._statistics['broadcasts'] += 1
+        self._last_updated = body['last_updated']
+
+        jobs_cache = {job_id: JobInfo.load_from_serialized(data) for job_id, data in body['jobs'].items()}
+        job_ids = set(body['job_ids']) if body['job_ids'] is not None else None
+
+        self._resolve_requests(jobs_cache, job_ids, body['poll_started'])
 
     @contextlib.contextmanager
     def request_job_info_update(self, job_id):
@@ -158,6 +324,9 @@ class JobsList:
         :return: future that will resolve to a `JobInfo` object when the job changes state
         """
         # Get or create the future
+        if job_id not in self._job_update_requests:
+            self._job_update_request_times[job_id] = time.time()
+
         request = self._job_update_requests.setdefault(job_id, concurrent.Future())
         assert not request.done(), 'Expected pending job info future, found in done state.'
 
@@ -176,6 +345,12 @@ class JobsList:
         @gen.coroutine
         def updating():
             """Do the actual update, stop if not requests left."""
+            delay = self._get_next_update_delay()
+            if delay > 0:
+                # An update was received from another runner in the meantime, so postpone our own update accordingly
+                self._update_handle = self._loop.call_later(delay, updating)
+                return
+
             yield self._update_job_info()
             # Any outstanding requests?
             if self._update_requests_outstanding():
@@ -207,8 +382,8 @@ class JobsList:
     def _get_next_update_delay(self):
         """Calculate when we are next allowed to poll the scheduler.
 
-        This delay is calculated as the minimum polling interval defined by the authentication info for this instance,
-        minus time elapsed since the last update.
+        This delay is calculated as the current update interval, i.e. the minimum polling interval defined by the
+        computer of the authentication info for this instance times the backoff, minus time elapsed since the last update.
 
         :return: delay (in seconds) after which the scheduler may be polled again
         :rtype: float
@@ -217,11 +392,11 @@ class JobsList:
             # Never updated, so do it straight away
             return 0.
 
-        # Make sure to actually 'get' the minimum interval here, in case the user changed since last time
-        minimum_interval = self.get_minimum_update_interval()
+        # Make sure to actually 'get' the interval here, in case the user changed the minimum interval since last time
+        interval = self.get_update_interval()
         elapsed = time.time() - self.last_updated
 
-        delay = max(minimum_interval - elapsed, 0.)
+        delay = max(interval - elapsed, 0.)
 
         return delay
 
@@ -237,6 +412,115 @@ class JobsList:
         return [str(job_id) for job_id, _ in self._job_update_requests.items()]
 
 
+class JobCommandQueue:
+    """Queue of remote operations, e.g. to upload, submit or kill jobs, for a specific ``AuthInfo`` run in batches.
+
+    Requests that arrive within `window` seconds of the first pending request, or while the transport for the batch is
+    being opened, are passed together to the batch function, which is expected to handle all of them with a single
+    remote command. This way, when many calculation jobs are launched or killed on the same computer at once, the
+    scheduler command is not triggered over the transport for each job individually.
+    """
+
+    STATISTICS = ('batches', 'requests')
+
+    def __init__(self, authinfo, transport_queue, batch_function, window=0):
+        """Construct an instance for the given authinfo and transport queue.
+
+        :param authinfo: The authinfo for which the commands are run
+        :type authinfo: :class:`aiida.orm.AuthInfo`
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.engine.transports.TransportQueue`
+        :param batch_function: function that is called with the list of items of the batched requests and an open
+            transport, and returns a list with for each item the result or the exception with which to resolve its
+            request
+        :param window: time in seconds to wait after the first pending request before running the batch
+        """
+        self._authinfo = authinfo
+        self._transport_queue = transport_queue
+        self._loop = transport_queue.loop()
+        self._batch_function = batch_function
+        self._window = window
+        self._logger = logging.getLogger(__name__)
+
+        self._requests = []  # List of tuples: (item, Future)
+        self._batch_handle = None
+        self._statistics = collections.Counter()
+
+    def get_statistics(self):
+        """Return the statistics of the batches run by this instance.
+
+        :return: dictionary with the number of `batches` that were run and the number of `requests` that they resolved
+        """
+        statistics = {key: 0 for key in self.STATISTICS}
+        statistics.update(self._statistics)
+        return statistics
+
+    @contextlib.contextmanager
+    def request(self, item):
+        """Request the command to be run for the given item in the next batch.
+
+        :param item: the item to pass to the batch function
+        :return: future that will resolve to the result of the batch function for the item
+        """
+        request = concurrent.Future()
+        self._requests.append((item, request))
+
+        try:
+            self._ensure_running()
+            yield request
+        finally:
+            if not request.done():
+                request.cancel()
+
+    def _ensure_running(self):
+        """Ensure that a batch is scheduled to be run for the pending requests."""
+        if self._batch_handle is None:
+            self._batch_handle = self._loop.call_later(self._window, self._run_batch)
+
+    def _pop_requests(self):
+        """Return the pending requests that were not cancelled and clear them.
+
+        :return: list of tuples of the item and the future of each request
+        """
+        requests = [(item, request) for item, request in self._requests if not request.done()]
+        self._requests = []
+        return requests
+
+    @gen.coroutine
+    def _run_batch(self):
+        """Run the batch function for all pending requests and resolve them with its results.
+
+        The requests are only collected once the transport is open, such that requests that arrive while it is being
+        opened are included in the batch. If the transport cannot be opened or the batch function raises, the
+        exception is set on all requests of the batch.
+        """
+        requests = None
+
+        try:
+            with self._transport_queue.request_transport(self._authinfo) as transport_request:
+                transport = yield transport_request
+                requests = self._pop_requests()
+                results = self._batch_function([item for item, _ in requests], transport) if requests else []
+        except Exception as exception:  # pylint: disable=broad-except
+            requests = requests if requests is not None else self._pop_requests()
+            results = [exception] * len(requests)
+
+        self._batch_handle = None
+
+        if requests:
+            self._statistics['batches'] += 1
+            self._statistics['requests'] += len(requests)
+            self._logger.debug('AuthInfo<{}>: ran a batch of {} requests'.format(self._authinfo.pk, len(requests)))
+
+        for (_, request), result in zip(requests, results):
+            if request.done():
+                continue
+            if isinstance(result, Exception):
+                request.set_exception(result)
+            else:
+                request.set_result(result)
+
+
 class JobManager:
     """A manager for :py:class:`~aiida.engine.processes.calcjobs.calcjob.CalcJob` submitted to ``Computer`` instances.
 
@@ -249,12 +533,63 @@ class JobManager:
     As long as a :py:class:`~aiida.engine.runners.Runner` will create a single ``JobManager`` instance and use that for
     its lifetime, the guarantees made by the ``JobsList`` about respecting the minimum polling interval of the scheduler
     will be maintained. Note, however, that since each ``Runner`` will create its own job manager, these guarantees
-    only hold per runner.
+    only hold per runner, unless the job manager is given the communicator of the runner, in which case the jobs lists
+    of all runners with the same communicator share their scheduler updates.
+
+    In the same way, the job manager maintains a :py:class:`~aiida.engine.processes.calcjobs.manager.JobCommandQueue`
+    for each authinfo to upload calculations, one to submit jobs and one to kill jobs, such that many calculations that
+    are launched or killed at once are handled with a fixed number of remote operations over the transport.
     """
 
-    def __init__(self, transport_queue):
+    def __init__(self, transport_queue, communicator=None, batch_window=0):
+        """Construct a new instance.
+
+        :param transport_queue: the transport queue
+        :type: :class:`aiida.engine.transports.TransportQueue`
+        :param communicator: optional communicator over which the jobs lists share their scheduler updates
+        :type communicator: :class:`kiwipy.Communicator`
+        :param batch_window: time in seconds during which requests to upload, submit or kill jobs are gathered into
+            a batch
+        """
         self._transport_queue = transport_queue
+        self._communicator = communicator
+        self._batch_window = batch_window
         self._job_lists = {}
+        self._upload_queues = {}
+        self._submit_queues = {}
+        self._kill_queues = {}
+
+    def close(self):
+        """Close all the jobs lists."""
+        for jobs_list in self._job_lists.values():
+            jobs_list.close()
+
+    def get_statistics(self):
+        """Return the statistics of the scheduler updates of all the jobs lists of this instance.
+
+        :return: dictionary with the statistics of :meth:`JobsList.get_statistics` summed over all authinfos
+        """
+        statistics = collections.Counter({key: 0 for key in JobsList.STATISTICS})
+
+        for jobs_list in self._job_lists.values():
+            statistics.update(jobs_list.get_statistics())
+
+        return dict(statistics)
+
+    def get_command_statistics(self):
+        """Return the statistics of the batches run by the queues to upload, submit and kill jobs of this instance.
+
+        :return: dictionary with the statistics of :meth:`JobCommandQueue.get_statistics` summed over all authinfos,
+            where the keys are prefixed with the command, e.g. `upload_batches` and `upload_requests`
+        """
+        statistics = {}
+        commands = [('upload', self._upload_queues), ('submit', self._submit_queues), ('kill', self._kill_queues)]
+
+        for command, queues in commands:
+            for key in JobCommandQueue.STATISTICS:
+                statistics['{}_{}'.format(command, key)] = sum(queue.get_statistics()[key] for queue in queues.values())
+
+        return statistics
 
     def get_jobs_list(self, authinfo):
         """Get or create a new `JobLists` instance for the given authinfo.
@@ -263,7 +598,7 @@ class JobManager:
         :return: a `JobsList` instance
         """
         if authinfo.id not in self._job_lists:
-            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue)
+            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue, communicator=self._communicator)
 
         return self._job_lists[authinfo.id]
 
@@ -282,3 +617,88 @@ class JobManager:
             finally:
                 if not request.done():
                     request.cancel()
+
+    def get_upload_queue(self, authinfo):
+        """Get or create a new `JobCommandQueue` instance that uploads calculations for the given authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :return: a `JobCommandQueue` instance
+        """
+        from aiida.engine.daemon.execmanager import upload_calculations
+        return self._get_command_queue(self._upload_queues, authinfo, upload_calculations)
+
+    def get_submit_queue(self, authinfo):
+        """Get or create a new `JobCommandQueue` instance that submits jobs for the given authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :return: a `JobCommandQueue` instance
+        """
+        from aiida.engine.daemon.execmanager import submit_calculations
+        return self._get_command_queue(self._submit_queues, authinfo, submit_calculations)
+
+    def get_kill_queue(self, authinfo):
+        """Get or create a new `JobCommandQueue` instance that kills jobs for the given authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :return: a `JobCommandQueue` instance
+        """
+        from aiida.engine.daemon.execmanager import kill_calculations
+        return self._get_command_queue(self._kill_queues, authinfo, kill_calculations)
+
+    def _get_command_queue(self, queues, authinfo, batch_function):
+        """Get or create a new `JobCommandQueue` instance for the given authinfo in the given mapping of queues.
+
+        :param queues: mapping of authinfo ids to `JobCommandQueue` instances
+        :param authinfo: the `AuthInfo`
+        :param batch_function: the batch function of the queue, if it has to be created
+        :return: a `JobCommandQueue` instance
+        """
+        if authinfo.id not in queues:
+            queues[authinfo.id] = JobCommandQueue(
+                authinfo, self._transport_queue, batch_function, window=self._batch_window
+            )
+
+        return queues[authinfo.id]
+
+    @contextlib.contextmanager
+    def request_job_upload(self, authinfo, node, calc_info, folder):
+        """Get a future that will resolve once the files of the given calculation are uploaded.
+
+        The upload is batched with those of other calculations of the same authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :param node: the `CalcJobNode` to upload
+        :param calc_info: the calculation info datastructure returned by `CalcJob.presubmit`
+        :param folder: the sandbox folder containing the inputs written by `CalcJob.prepare_for_submission`, which
+            should exist until the future is resolved
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        with self.get_upload_queue(authinfo).request((node, calc_info, folder, None)) as request:
+            yield request
+
+    @contextlib.contextmanager
+    def request_job_submission(self, authinfo, node, script_filename):
+        """Get a future that will resolve to the job id once the job of the given calculation is submitted.
+
+        The submission is batched with those of other calculations of the same authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :param node: the `CalcJobNode` whose job to submit, which should already be uploaded
+        :param script_filename: the job launch script returned by `CalcJobNode._presubmit`
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        with self.get_submit_queue(authinfo).request((node, script_filename)) as request:
+            yield request
+
+    @contextlib.contextmanager
+    def request_job_kill(self, authinfo, node):
+        """Get a future that will resolve to True once the job of the given calculation is killed.
+
+        The kill is batched with those of other calculations of the same authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :param node: the `CalcJobNode` whose job to kill
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        with self.get_kill_queue(authinfo).request(node) as request:
+            yield request
@@ -41,16 +41,18 @@ class PreSubmitException(Exception):
 
 
 @coroutine
-def task_upload_job(process, transport_queue, cancellable):
+def task_upload_job(process, job_manager, cancellable):
     """Transport task that will attempt to upload the files of a job calculation to the remote.
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
+    The task will prepare the files of the calculation and request the upload from the job manager, which uploads the
+    files of all calculations of the same authinfo whose requests arrive within a short window together. The request is
+    wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will retry after an
+    interval that increases exponentially with the number of retries, for a maximum number of retries.
     If all retries fail, the task will raise a TransportTaskException
 
-    :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param process: the process of the job calculation
+    :param job_manager: The job manager
+    :type job_manager: :class:`aiida.engine.processes.calcjobs.manager.JobManager`
     :param cancellable: the cancelled flag that will be queried to determine whether the task was cancelled
     :type cancellable: :class:`aiida.engine.utils.InterruptableFuture`
     :raises: Return if the tasks was successfully completed
@@ -69,19 +71,18 @@ def task_upload_job(process, transport_queue, cancellable):
 
     @coroutine
     def do_upload():
-        with transport_queue.request_transport(authinfo) as request:
-            transport = yield cancellable.with_interrupt(request)
+        with SandboxFolder() as folder:
+            # Any exception thrown in `presubmit` call is not transient so we circumvent the exponential backoff
+            try:
+                calc_info, script_filename = process.presubmit(folder)
+            except Exception as exception:  # pylint: disable=broad-except
+                raise PreSubmitException('exception occurred in presubmit call') from exception
 
-            with SandboxFolder() as folder:
-                # Any exception thrown in `presubmit` call is not transient so we circumvent the exponential backoff
-                try:
-                    calc_info, script_filename = process.presubmit(folder)
-                except Exception as exception:  # pylint: disable=broad-except
-                    raise PreSubmitException('exception occurred in presubmit call') from exception
-                else:
-                    execmanager.upload_calculation(node, transport, calc_info, folder)
+            # The sandbox folder has to exist until the batch that includes this upload has been run
+            with job_manager.request_job_upload(authinfo, node, calc_info, folder) as request:
+                yield cancellable.with_interrupt(request)
 
-            raise Return((calc_info, script_filename))
+        raise Return((calc_info, script_filename))
 
     try:
         logger.info('scheduled request to upload CalcJob<{}>'.format(node.pk))
@@ -102,16 +103,18 @@ def task_upload_job(process, transport_queue, cancellable):
 
 
 @coroutine
-def task_submit_job(node, transport_queue, calc_info, script_filename, cancellable):
+def task_submit_job(node, job_manager, calc_info, script_filename, cancellable):  # pylint: disable=unused-argument
     """Transport task that will attempt to submit a job calculation.
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
+    The task will request the submission from the job manager, which submits the jobs of all calculations of the same
+    authinfo whose requests arrive within a short window with a single scheduler command. The request is wrapped in the
+    exponential_backoff_retry coroutine, which, in case of a caught exception, will retry after an interval that
+    increases exponentially with the number of retries, for a maximum number of retries.
     If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param job_manager: The job manager
+    :type job_manager: :class:`aiida.engine.processes.calcjobs.manager.JobManager`
     :param calc_info: the calculation info datastructure returned by `CalcJobNode._presubmit`
     :param script_filename: the job launch script returned by `CalcJobNode._presubmit`
     :param cancellable: the cancelled flag that will be queried to determine whether the task was cancelled
@@ -131,9 +134,9 @@ def task_submit_job(node, transport_queue, calc_info, script_filename, cancellab
 
     @coroutine
     def do_submit():
-        with transport_queue.request_transport(authinfo) as request:
-            transport = yield cancellable.with_interrupt(request)
-            raise Return(execmanager.submit_calculation(node, transport, calc_info, script_filename))
+        with job_manager.request_job_submission(authinfo, node, script_filename) as request:
+            job_id = yield cancellable.with_interrupt(request)
+            raise Return(job_id)
 
     try:
         logger.info('scheduled request to submit CalcJob<{}>'.format(node.pk))
@@ -273,16 +276,18 @@ def task_retrieve_job(node, transport_queue, retrieved_temporary_folder, cancell
 
 
 @coroutine
-def task_kill_job(node, transport_queue, cancellable):
+def task_kill_job(node, job_manager, cancellable):
     """Transport task that will attempt to kill a job calculation.
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
+    The task will request the kill from the job manager, which kills the jobs of all calculations of the same authinfo
+    whose requests arrive within a short window with a single scheduler command. The request is wrapped in the
+    exponential_backoff_retry coroutine, which, in case of a caught exception, will retry after an interval that
+    increases exponentially with the number of retries, for a maximum number of retries.
     If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param job_manager: The job manager
+    :type job_manager: :class:`aiida.engine.processes.calcjobs.manager.JobManager`
     :param cancellable: the cancelled flag that will be queried to determine whether the task was cancelled
     :type cancellable: :class:`aiida.engine.utils.InterruptableFuture`
     :raises: Return if the tasks was successfully completed
@@ -299,9 +304,9 @@ def task_kill_job(node, transport_queue, cancellable):
 
     @coroutine
     def do_kill():
-        with transport_queue.request_transport(authinfo) as request:
-            transport = yield cancellable.with_interrupt(request)
-            raise Return(execmanager.kill_calculation(node, transport))
+        with job_manager.request_job_kill(authinfo, node) as request:
+            result = yield cancellable.with_interrupt(request)
+            raise Return(result)
 
     try:
         logger.info('scheduled request to kill CalcJob<{}>'.format(node.pk))
@@ -348,12 +353,14 @@ class Waiting(plumpy.Waiting):
 
             if command == UPLOAD_COMMAND:
                 node.set_process_status(process_status)
-                calc_info, script_filename = yield self._launch_task(task_upload_job, self.process, transport_queue)
+                calc_info, script_filename = yield self._launch_task(
+                    task_upload_job, self.process, self.process.runner.job_manager
+                )
                 raise Return(self.submit(calc_info, script_filename))
 
             elif command == SUBMIT_COMMAND:
                 node.set_process_status(process_status)
-                yield self._launch_task(task_submit_job, node, transport_queue, *args)
+                yield self._launch_task(task_submit_job, node, self.process.runner.job_manager, *args)
                 raise Return(self.update())
 
             elif self.data == UPDATE_COMMAND:
@@ -381,7 +388,7 @@ class Waiting(plumpy.Waiting):
         except TransportTaskException as exception:
             raise plumpy.PauseInterruption('Pausing after failed transport task: {}'.format(exception))
         except plumpy.KillInterruption:
-            yield self._launch_task(task_kill_job, node, transport_queue)
+            yield self._launch_task(task_kill_job, node, self.process.runner.job_manager)
             self._killing.set_result(True)
             raise
         except Return:
@@ -585,11 +585,21 @@ class Process(plumpy.Process):
         outputs_stored = self.node.get_outgoing(link_type=(LinkType.CREATE, LinkType.RETURN)).all_link_labels()
         outputs_new = set(outputs_flat.keys()) - set(outputs_stored)
 
+        # New outputs created by a calculation are stored in bulk, which is a lot faster for large numbers of outputs
+        outputs_created = []
+        links_created = []
+
         for link_label, output in outputs_flat.items():
 
             if link_label not in outputs_new:
                 continue
 
+            if isinstance(self.node, orm.CalculationNode) and not output.is_stored:
+                if not any(node is output for node in outputs_created):
+                    outputs_created.append(output)
+                links_created.append((self.node, output, LinkType.CREATE, link_label))
+                continue
+
             if isinstance(self.node, orm.CalculationNode):
                 output.add_incoming(self.node, LinkType.CREATE, link_label)
             elif isinstance(self.node, orm.WorkflowNode):
@@ -597,6 +607,9 @@ class Process(plumpy.Process):
 
             output.store()
 
+        if outputs_created:
+            orm.Node.objects.bulk_store(outputs_created, links_created)
+
     def _setup_db_record(self):
         """
         Create the database record for this process and the links with respect to its inputs
@@ -19,8 +19,7 @@ from plumpy.workchains import if_, while_, return_, _PropagateReturn
 from aiida.common import exceptions
 from aiida.common.extendeddicts import AttributeDict
 from aiida.common.lang import override
-from aiida.orm import Node, WorkChainNode
-from aiida.orm.utils import load_node
+from aiida.orm import Node, QueryBuilder, WorkChainNode
 
 from ..exit_code import ExitCode
 from ..process_spec import ProcessSpec
@@ -68,6 +67,7 @@ class WorkChain(Process):
 
         self._stepper = None
         self._awaitables = []
+        self._finished_awaitables = []
         self._context = AttributeDict()
 
     @property
@@ -104,6 +104,7 @@ class WorkChain(Process):
 
         # Recreate the stepper
         self._stepper = None
+        self._finished_awaitables = []
         stepper_state = saved_state.get(self._STEPPER_STATE, None)
         if stepper_state is not None:
             self._stepper = self.spec().get_outline().recreate_stepper(stepper_state, self)
@@ -145,7 +146,9 @@ class WorkChain(Process):
         for key, value in kwargs.items():
             awaitable = construct_awaitable(value)
             awaitable.key = key
-            self.insert_awaitable(awaitable)
+            self._awaitables.append(awaitable)
+
+        self._update_process_status()
 
     def _update_process_status(self):
         """Set the process status with a message accounting the current sub processes that we are waiting for."""
@@ -250,30 +253,82 @@ class WorkChain(Process):
     def on_process_finished(self, awaitable, pk):
         """Callback function called by the runner when the process instance identified by pk is completed.
 
-        The awaitable will be effectuated on the context of the work chain and removed from the internal list. If all
-        awaitables have been dealt with, the work chain process is resumed.
+        The awaitable is not resolved straight away but queued. The runner calls the callbacks of all processes whose
+        termination it detects at once within the same iteration of the event loop, so by deferring the resolution to
+        the next iteration, all those awaitables are resolved together by `_resolve_finished_awaitables`.
 
         :param awaitable: an Awaitable instance
         :param pk: the pk of the awaitable's target
         :type pk: int
         """
-        try:
-            node = load_node(pk)
-        except (exceptions.MultipleObjectsError, exceptions.NotExistent):
-            raise ValueError('provided pk<{}> could not be resolved to a valid Node instance'.format(pk))
+        if not self._finished_awaitables:
+            self.call_soon(self._resolve_finished_awaitables)
 
-        if awaitable.outputs:
-            value = {entry.link_label: entry.node for entry in node.get_outgoing()}
-        else:
-            value = node
+        self._finished_awaitables.append((awaitable, pk))
 
-        if awaitable.action == AwaitableAction.ASSIGN:
-            self.ctx[awaitable.key] = value
-        elif awaitable.action == AwaitableAction.APPEND:
-            self.ctx.setdefault(awaitable.key, []).append(value)
-        else:
-            assert "invalid awaitable action '{}'".format(awaitable.action)
+    def _resolve_finished_awaitables(self):
+        """Resolve all queued awaitables whose target process has completed.
+
+        The nodes of all completed processes and, for awaitables that request them, their outputs are loaded with a
+        single query each. Each awaitable is effectuated on the context of the work chain, in the order in which the
+        processes completed, and removed from the internal list. If all awaitables have been dealt with, the work chain
+        process is resumed.
+        """
+        finished, self._finished_awaitables = self._finished_awaitables, []
+
+        if not finished:
+            return
+
+        nodes = self._load_finished_nodes({pk for _, pk in finished})
+        outputs = self._load_finished_outputs({pk for awaitable, pk in finished if awaitable.outputs})
+
+        for awaitable, pk in finished:
+            if pk not in nodes:
+                raise ValueError('provided pk<{}> could not be resolved to a valid Node instance'.format(pk))
+
+            value = outputs.get(pk, {}) if awaitable.outputs else nodes[pk]
+
+            if awaitable.action == AwaitableAction.ASSIGN:
+                self.ctx[awaitable.key] = value
+            elif awaitable.action == AwaitableAction.APPEND:
+                self.ctx.setdefault(awaitable.key, []).append(value)
+            else:
+                assert "invalid awaitable action '{}'".format(awaitable.action)
+
+            self._awaitables.remove(awaitable)
+
+        self._update_process_status()
 
-        self.remove_awaitable(awaitable)
         if self.state == ProcessState.WAITING and not self._awaitables:
             self.resume()
+
+    @staticmethod
+    def _load_finished_nodes(pks):
+        """Load the nodes with the given pks with a single query.
+
+        :param pks: set of node pks
+        :return: dictionary mapping the pk of each node that exists onto the node
+        """
+        builder = QueryBuilder().append(Node, filters={'id': {'in': list(pks)}}, project=['id', '*'])
+        return dict(builder.all())
+
+    @staticmethod
+    def _load_finished_outputs(pks):
+        """Load the outgoing nodes of the nodes with the given pks with a single query.
+
+        :param pks: set of node pks
+        :return: dictionary mapping the pk of each node with outgoing nodes onto a dictionary of those nodes by label
+        """
+        outputs = collections.defaultdict(dict)
+
+        if not pks:
+            return outputs
+
+        builder = QueryBuilder()
+        builder.append(Node, filters={'id': {'in': list(pks)}}, project=['id'], tag='parent')
+        builder.append(Node, with_incoming='parent', project=['*'], edge_project=['label'], edge_tag='link', tag='child')
+
+        for entry in builder.iterdict():
+            outputs[entry['parent']['id']][entry['link']['label']] = entry['child']['*']
+
+        return outputs
@@ -18,7 +18,6 @@ import tornado.ioloop
 import plumpy
 
 from aiida.common import exceptions
-from aiida.orm import load_node
 from aiida.plugins.utils import PluginVersionProvider
 
 from .processes import futures
@@ -41,8 +40,18 @@ class Runner:  # pylint: disable=too-many-public-methods
     _communicator = None
     _controller = None
     _closed = False
-
-    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None):
+    _broadcast_filter = None
+
+    def __init__(
+        self,
+        poll_interval=0,
+        loop=None,
+        communicator=None,
+        rmq_submit=False,
+        persister=None,
+        transport_idle_timeout=0,
+        scheduler_batch_window=0
+    ):
         """
         Construct a new runner
 
@@ -54,6 +63,9 @@ class Runner:  # pylint: disable=too-many-public-methods
         :param rmq_submit: if True, processes will be submitted to RabbitMQ, otherwise they will be scheduled here
         :param persister: the persister to use to persist processes
         :type persister: :class:`plumpy.Persister`
+        :param transport_idle_timeout: time in seconds to keep a transport open after its last use
+        :param scheduler_batch_window: time in seconds during which requests to upload, submit or kill jobs are gathered
+            into a batch that is handled with a fixed number of remote operations
         """
         assert not (rmq_submit and persister is None), \
             'Must supply a persister if you want to submit using communicator'
@@ -61,11 +73,17 @@ class Runner:  # pylint: disable=too-many-public-methods
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
-        self._job_manager = manager.JobManager(self._transport)
+        self._transport = transports.TransportQueue(self._loop, idle_timeout=transport_idle_timeout)
         self._persister = persister
         self._plugin_version_provider = PluginVersionProvider()
 
+        # Callbacks of calculations whose termination is awaited, the pks of calculations that have just been registered
+        # and are still to be checked, and whether the periodic poll of all awaited calculations is scheduled.
+        self._calculation_callbacks = collections.OrderedDict()
+        self._calculations_to_check = set()
+        self._poll_scheduled = False
+        self._close_callbacks = []
+
         if communicator is not None:
             self._communicator = communicator
             self._controller = plumpy.RemoteProcessThreadController(communicator)
@@ -73,6 +91,10 @@ class Runner:  # pylint: disable=too-many-public-methods
             LOGGER.warning('Disabling RabbitMQ submission, no communicator provided')
             self._rmq_submit = False
 
+        self._job_manager = manager.JobManager(
+            self._transport, communicator=self._communicator, batch_window=scheduler_batch_window
+        )
+
     def __enter__(self):
         return self
 
@@ -149,6 +171,22 @@ class Runner:  # pylint: disable=too-many-public-methods
         assert not self._closed
         self.stop()
         self._closed = True
+        self._transport.close()
+        self._job_manager.close()
+
+        if self._broadcast_filter is not None:
+            self._communicator.remove_broadcast_subscriber(self._broadcast_filter)
+            self._broadcast_filter = None
+
+        for callback in self._close_callbacks:
+            callback()
+
+    def add_close_callback(self, callback):
+        """Add a callback that is called without arguments when the runner is closed.
+
+        :param callback: the callable, for example to release a resource that is tied to the lifetime of the runner
+        """
+        self._close_callbacks.append(callback)
 
     def instantiate_process(self, process, *args, **inputs):
         from .utils import instantiate_process
@@ -267,11 +305,25 @@ class Runner:  # pylint: disable=too-many-public-methods
         """
         Callback to be called when the calculation of the given pk is terminated
 
+        If the runner has a communicator, the callback is triggered by the broadcast that the process sends when it
+        reaches a terminal state. As a fallback, in case a broadcast is missed or there is no communicator, the state of
+        all awaited calculations is polled with a single query every `poll_interval` seconds.
+
         :param pk: the pk of the calculation
         :param callback: the function to be called upon calculation termination
         """
-        calculation = load_node(pk=pk)
-        self._poll_calculation(calculation, callback)
+        self._subscribe_to_terminations()
+        self._calculation_callbacks.setdefault(pk, []).append(callback)
+
+        # The calculation may already have terminated before the callback was registered. All calculations that are
+        # registered in the same iteration of the event loop are checked with a single query in the next iteration.
+        if not self._calculations_to_check:
+            self._loop.add_callback(self._check_calculations)
+        self._calculations_to_check.add(pk)
+
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self._loop.call_later(self._poll_interval, self._poll_calculations)
 
     def get_calculation_future(self, pk):
         """
@@ -282,8 +334,62 @@ class Runner:  # pylint: disable=too-many-public-methods
         """
         return futures.CalculationFuture(pk, self._loop, self._poll_interval, self._communicator)
 
-    def _poll_calculation(self, calc_node, callback):
-        if calc_node.is_terminated:
-            self._loop.add_callback(callback, calc_node.pk)
+    def _subscribe_to_terminations(self):
+        """Subscribe to the broadcasts of processes reaching a terminal state, if not already subscribed."""
+        import kiwipy
+        from plumpy import ProcessState
+
+        if self._communicator is None or self._broadcast_filter is not None:
+            return
+
+        def on_broadcast(_communicator, _body, sender, _subject, _correlation_id):
+            # Broadcasts are received on the thread of the communicator so hand over to the event loop
+            self._loop.add_callback(self._on_calculation_terminated, sender)
+
+        self._broadcast_filter = kiwipy.BroadcastFilter(on_broadcast)
+        for state in [ProcessState.FINISHED, ProcessState.KILLED, ProcessState.EXCEPTED]:
+            self._broadcast_filter.add_subject_filter('state_changed.*.{}'.format(state.value))
+        self._communicator.add_broadcast_subscriber(self._broadcast_filter)
+
+    def _get_terminated_calculations(self, pks):
+        """Return the pks of those calculations among the given ones that have reached a terminal state.
+
+        :param pks: collection of calculation pks
+        :return: set of pks of the terminated calculations
+        """
+        from plumpy import ProcessState
+        from aiida.orm import ProcessNode, QueryBuilder
+
+        terminal_states = [ProcessState.FINISHED.value, ProcessState.KILLED.value, ProcessState.EXCEPTED.value]
+        filters = {'id': {'in': list(pks)}, 'attributes.process_state': {'in': terminal_states}}
+        builder = QueryBuilder().append(ProcessNode, filters=filters, project=['id'])
+
+        return {pk for pk, in builder.iterall()}
+
+    def _check_calculations(self):
+        """Check whether any of the calculations that have just been registered has already terminated."""
+        pks = [pk for pk in self._calculations_to_check if pk in self._calculation_callbacks]
+        self._calculations_to_check = set()
+
+        if pks:
+            for pk in self._get_terminated_calculations(pks):
+                self._on_calculation_terminated(pk)
+
+    def _poll_calculations(self):
+        """Poll the state of all awaited calculations with a single query and reschedule while any remain."""
+        if self._calculation_callbacks:
+            for pk in self._get_terminated_calculations(self._calculation_callbacks.keys()):
+                self._on_calculation_terminated(pk)
+
+        if self._calculation_callbacks and not self._closed:
+            self._loop.call_later(self._poll_interval, self._poll_calculations)
         else:
-            self._loop.call_later(self._poll_interval, self._poll_calculation, calc_node, callback)
+            self._poll_scheduled = False
+
+    def _on_calculation_terminated(self, pk):
+        """Schedule the callbacks registered for the calculation with the given pk, which has terminated.
+
+        :param pk: the pk of the calculation
+        """
+        for callback in self._calculation_callbacks.pop(pk, []):
+            self._loop.add_callback(callback, pk)
@@ -8,9 +8,10 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """A transport queue to batch process multiple tasks that require a Transport."""
-from collections import namedtuple
+import collections
 import contextlib
 import logging
+import time
 import traceback
 from tornado import concurrent, gen, ioloop
 
@@ -25,6 +26,9 @@ class TransportRequest:
         super().__init__()
         self.future = concurrent.Future()
         self.count = 0
+        self.open_callback_handle = None
+        self.close_callback_handle = None
+        self.broken = False
 
 
 class TransportQueue:
@@ -37,21 +41,87 @@ class TransportQueue:
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    All clients that request a transport for the same authinfo share the same
+    open transport. Once the last client is done with it, the transport is kept
+    open for `idle_timeout` seconds, such that clients that request it in the
+    meantime get it straight away instead of having to wait for a new transport
+    to be opened after the safe open interval.
     """
-    AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
+    AuthInfoEntry = collections.namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
 
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, idle_timeout=0):
         """
         :param loop: The event loop to use, will use `tornado.ioloop.IOLoop.current()` if not supplied
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param idle_timeout: The time in seconds to keep a transport open after the last client is done with it
         """
         self._loop = loop if loop is not None else ioloop.IOLoop.current()
+        self._idle_timeout = idle_timeout
         self._transport_requests = {}
+        self._statistics = collections.Counter()
 
     def loop(self):
         """ Get the loop being used by this transport queue """
         return self._loop
 
+    def get_statistics(self):
+        """Return the statistics of the transport requests that have been handled by this queue.
+
+        :return: dictionary with the number of `requests`, the number of those that got an already open transport
+            (`reused`), the number of transports that were `opened` and `closed`, and the total and maximum time in
+            seconds that requests waited for their transport (`wait_time` and `max_wait_time`)
+        """
+        statistics = {key: 0 for key in ['requests', 'reused', 'opened', 'closed', 'wait_time', 'max_wait_time']}
+        statistics.update(self._statistics)
+        return statistics
+
+    def _record_wait_time(self, wait_time):
+        """Record the time that a request had to wait for its transport."""
+        self._statistics['wait_time'] += wait_time
+        self._statistics['max_wait_time'] = max(self._statistics['max_wait_time'], wait_time)
+
+    def _is_reusable(self, transport_request):
+        """Return whether the transport of a request that no client uses anymore should be kept open while idle.
+
+        :param transport_request: the transport request whose transport was opened
+        """
+        return self._idle_timeout > 0 and not transport_request.broken and transport_request.future.exception() is None
+
+    def _close_transport(self, authinfo, transport_request):
+        """Close the transport of a request that no client uses anymore and remove the request.
+
+        :param authinfo: the authinfo of the transport
+        :param transport_request: the transport request whose transport to close
+        """
+        transport_request.close_callback_handle = None
+
+        if self._transport_requests.get(authinfo.id, None) is transport_request:
+            self._transport_requests.pop(authinfo.id)
+
+        if transport_request.future.exception() is None:
+            _LOGGER.debug('Transport request closing transport for %s', authinfo)
+            try:
+                transport_request.future.result().close()
+            except Exception as exception:  # pylint: disable=broad-except
+                # The connection of a broken transport may already be gone
+                _LOGGER.warning('exception occurred while closing transport for %s: %s', authinfo, exception)
+            self._statistics['closed'] += 1
+
+    def close(self):
+        """Close all the transports that are kept open while idle."""
+        for transport_request in list(self._transport_requests.values()):
+            if transport_request.close_callback_handle is not None:
+                self._loop.remove_timeout(transport_request.close_callback_handle)
+                transport_request.close_callback_handle = None
+                if transport_request.future.exception() is None:
+                    transport_request.future.result().close()
+                    self._statistics['closed'] += 1
+
+        self._transport_requests = {
+            key: request for key, request in self._transport_requests.items() if request.count > 0
+        }
+
     @contextlib.contextmanager
     def request_transport(self, authinfo):
         """
@@ -68,8 +138,18 @@ class TransportQueue:
         :param authinfo: The authinfo to be used to get transport
         :return: A future that can be yielded to give the transport
         """
-        open_callback_handle = None
         transport_request = self._transport_requests.get(authinfo.id, None)
+        self._statistics['requests'] += 1
+
+        if transport_request is not None and transport_request.close_callback_handle is not None:
+            # The transport is open and idle, so cancel its closing and reuse it, unless its connection was lost
+            self._loop.remove_timeout(transport_request.close_callback_handle)
+            transport_request.close_callback_handle = None
+
+            if not transport_request.future.result().is_alive():
+                _LOGGER.warning('Transport request found the idle transport for %s no longer alive', authinfo)
+                self._close_transport(authinfo, transport_request)
+                transport_request = None
 
         if transport_request is None:
             # There is no existing request for this transport (i.e. on this authinfo)
@@ -81,6 +161,7 @@ class TransportQueue:
 
             def do_open():
                 """ Actually open the transport """
+                transport_request.open_callback_handle = None
                 if transport_request.count > 0:
                     # The user still wants the transport so open it
                     _LOGGER.debug('Transport request opening transport for %s', authinfo)
@@ -91,12 +172,20 @@ class TransportQueue:
                         transport_request.future.set_exception(exception)
 
                         # Cleanup of the stale TransportRequest with the excepted transport future
-                        self._transport_requests.pop(authinfo.id, None)
+                        if self._transport_requests.get(authinfo.id, None) is transport_request:
+                            self._transport_requests.pop(authinfo.id)
                     else:
+                        self._statistics['opened'] += 1
                         transport_request.future.set_result(transport)
 
             # Save the handle so that we can cancel the callback if the user no longer wants it
-            open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
+            transport_request.open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
+
+        if transport_request.future.done():
+            self._statistics['reused'] += 1
+        else:
+            time_requested = time.time()
+            transport_request.future.add_done_callback(lambda _: self._record_wait_time(time.time() - time_requested))
 
         try:
             transport_request.count += 1
@@ -106,16 +195,27 @@ class TransportQueue:
             raise
         except Exception:
             _LOGGER.error('Exception whilst using transport:\n%s', traceback.format_exc())
+            # The transport may no longer work, so it is closed once it is released instead of being kept open, and
+            # new requests get a new transport
+            transport_request.broken = True
+            if self._transport_requests.get(authinfo.id, None) is transport_request:
+                self._transport_requests.pop(authinfo.id)
             raise
         finally:
             transport_request.count -= 1
             assert transport_request.count >= 0, 'Transport request count dropped below 0!'
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
-                if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
-                elif open_callback_handle is not None:
-                    self._loop.remove_timeout(open_callback_handle)
-
-                self._transport_requests.pop(authinfo.id, None)
+                if not transport_request.future.done():
+                    if transport_request.open_callback_handle is not None:
+                        self._loop.remove_timeout(transport_request.open_callback_handle)
+                        transport_request.open_callback_handle = None
+
+                    if self._transport_requests.get(authinfo.id, None) is transport_request:
+                        self._transport_requests.pop(authinfo.id)
+                elif self._is_reusable(transport_request):
+                    transport_request.close_callback_handle = self._loop.call_later(
+                        self._idle_timeout, self._close_transport, authinfo, transport_request
+                    )
+                else:
+                    self._close_transport(authinfo, transport_request)
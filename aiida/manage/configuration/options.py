@@ -30,6 +30,33 @@ CONFIG_OPTIONS = {
         'description': 'The polling interval in seconds to be used by process runners',
         'global_only': False,
     },
+    'transport.idle_timeout': {
+        'key': 'transport_idle_timeout',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 30,
+        'description': 'The time in seconds that process runners keep a transport open after its last use, such that it '
+        'can be reused without having to be opened again',
+        'global_only': False,
+    },
+    'transport.compress_retrieval': {
+        'key': 'transport_compress_retrieval',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Whether the files retrieved from computers are compressed on the remote while they are '
+        'transferred, which reduces the transferred data of large text outputs at the cost of remote CPU time',
+        'global_only': False,
+    },
+    'scheduler.batch_window': {
+        'key': 'scheduler_batch_window',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1,
+        'description': 'The time in seconds during which process runners gather requests to upload, submit or kill jobs '
+        'on the same computer, such that they are handled with a fixed number of remote operations',
+        'global_only': False,
+    },
     'daemon.timeout': {
         'key': 'daemon_timeout',
         'valid_type': 'int',
@@ -38,6 +65,38 @@ CONFIG_OPTIONS = {
         'description': 'The timeout in seconds for calls to the circus client',
         'global_only': False,
     },
+    'daemon.autoscale': {
+        'key': 'daemon_autoscale',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Boolean whether the daemon automatically scales its number of workers to its load',
+        'global_only': False,
+    },
+    'daemon.autoscale.minimum_workers': {
+        'key': 'daemon_autoscale_minimum_workers',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1,
+        'description': 'The minimum number of workers of the daemon when it scales automatically',
+        'global_only': False,
+    },
+    'daemon.autoscale.maximum_workers': {
+        'key': 'daemon_autoscale_maximum_workers',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 4,
+        'description': 'The maximum number of workers of the daemon when it scales automatically',
+        'global_only': False,
+    },
+    'daemon.autoscale.interval': {
+        'key': 'daemon_autoscale_interval',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 30,
+        'description': 'The interval in seconds at which the daemon checks its load when it scales automatically',
+        'global_only': False,
+    },
     'db.batch_size': {
         'key': 'db_batch_size',
         'valid_type': 'int',
@@ -48,6 +107,16 @@ CONFIG_OPTIONS = {
         '(1GB) when creating large numbers of database records in one go.',
         'global_only': False,
     },
+    'repository.backend': {
+        'key': 'repository_backend',
+        'valid_type': 'string',
+        'valid_values': ['folder', 'container'],
+        'default': 'folder',
+        'description':
+        'Backend for the file repository of nodes: `folder` stores the files of each node in a separate folder, '
+        '`container` stores the content of each file once in a content-addressable object container',
+        'global_only': False,
+    },
     'verdi.shell.auto_import': {
         'key': 'verdi_shell_auto_import',
         'valid_type': 'string',
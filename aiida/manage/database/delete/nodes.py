@@ -8,12 +8,177 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Function to delete nodes from the database."""
+import concurrent.futures
+import os
 
 import click
 from aiida.cmdline.utils import echo
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_THREADS = 4
 
-def delete_nodes(pks, verbosity=0, dry_run=False, force=False, **kwargs):
+
+class DeleteCheckpoint:
+    """Record of the nodes of a deletion that is in progress, stored in a file, such that an interrupted deletion can
+    be resumed.
+
+    The pk and uuid of every node to delete are recorded before anything is deleted. Deleting the nodes and their
+    repositories is idempotent, so an interrupted deletion is resumed by simply deleting all recorded nodes again. The
+    uuids are required because the repository of a node can no longer be determined once the node has been deleted
+    from the database.
+    """
+
+    def __init__(self, filepath):
+        """Construct a new instance.
+
+        :param filepath: absolute path of the checkpoint file
+        """
+        self._filepath = filepath
+
+    @property
+    def filepath(self):
+        """Return the absolute path of the checkpoint file."""
+        return self._filepath
+
+    def load(self):
+        """Return the nodes of an interrupted deletion, if any.
+
+        :return: list of tuples of the pk and uuid of the nodes or None if there is no checkpoint
+        """
+        from aiida.common import json
+
+        try:
+            with open(self._filepath, 'r', encoding='utf8') as handle:
+                checkpoint = json.load(handle)
+        except (IOError, OSError, ValueError):
+            return None
+
+        return [tuple(node) for node in checkpoint.get('nodes', [])]
+
+    def save(self, nodes):
+        """Record the nodes that are going to be deleted.
+
+        The file is written atomically, such that an interruption while saving cannot corrupt the checkpoint.
+
+        :param nodes: list of tuples of the pk and uuid of the nodes
+        """
+        from aiida.common import json
+
+        temporary = '{}.tmp'.format(self._filepath)
+
+        with open(temporary, 'w', encoding='utf8') as handle:
+            json.dump({'nodes': [list(node) for node in nodes]}, handle)
+
+        os.replace(temporary, self._filepath)
+
+    def clear(self):
+        """Remove the checkpoint file."""
+        try:
+            os.remove(self._filepath)
+        except FileNotFoundError:
+            pass
+
+
+def get_checkpoint(profile=None):
+    """Return the `DeleteCheckpoint` of the node deletions for a profile.
+
+    :param profile: the profile, by default the currently loaded profile
+    :return: `DeleteCheckpoint` instance
+    """
+    from aiida.manage.configuration import get_profile, settings
+
+    profile = profile or get_profile()
+    filepath = os.path.join(settings.AIIDA_CONFIG_FOLDER, 'delete_checkpoint_{}.json'.format(profile.name))
+
+    return DeleteCheckpoint(filepath)
+
+
+def _get_existing_pks(pks):
+    """Return the subset of the given pks that belong to existing nodes, with a single query.
+
+    :param pks: list of node pks
+    :return: set of node pks
+    """
+    from aiida.orm import Node, QueryBuilder
+
+    builder = QueryBuilder().append(Node, filters={'id': {'in': list(pks)}}, project=['id'])
+
+    return {pk for pk, in builder.iterall()}
+
+
+def _get_uuids(pks, batch_size):
+    """Return the pks and uuids of the nodes with the given pks, in order of increasing pk.
+
+    :param pks: collection of node pks
+    :param batch_size: the number of nodes per query
+    :return: list of tuples of the pk and uuid of the nodes
+    """
+    from aiida.orm import Node, QueryBuilder
+
+    pks = sorted(pks)
+    nodes = []
+
+    for start in range(0, len(pks), batch_size):
+        builder = QueryBuilder().append(Node, filters={'id': {'in': pks[start:start + batch_size]}}, project=['id', 'uuid'])
+        nodes.extend(sorted(builder.all()))
+
+    return nodes
+
+
+def _erase_repositories(uuids):
+    """Erase the repositories of the nodes with the given uuids.
+
+    :param uuids: list of node uuids
+    """
+    from aiida.orm.utils.repository import Repository
+
+    for uuid in uuids:
+        Repository(uuid=uuid, is_stored=True).erase(force=True)
+
+
+def delete_nodes_in_batches(nodes, batch_size=DEFAULT_BATCH_SIZE, threads=DEFAULT_THREADS, callback=None):
+    """Delete the given nodes from the database in batches and erase their repositories.
+
+    Every batch is deleted in its own transaction, such that no transaction holds locks on a large part of the database
+    for a long time. Once the transaction of a batch is committed, the repositories of its nodes are erased by a pool of
+    threads, while the next batch is being deleted. Nodes that no longer exist are ignored, so the nodes of a deletion
+    that was interrupted can simply be passed again.
+
+    :param nodes: list of tuples of the pk and uuid of the nodes to delete
+    :param batch_size: the number of nodes that are deleted per transaction
+    :param threads: the number of threads that erase the repositories
+    :param callback: optional callable that is called with the number of nodes of each batch that has been deleted
+    """
+    from aiida.manage.manager import get_manager
+
+    backend = get_manager().get_backend()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = []
+
+        for start in range(0, len(nodes), batch_size):
+            batch = nodes[start:start + batch_size]
+            backend.nodes.bulk_delete([pk for pk, _ in batch])
+            futures.append(executor.submit(_erase_repositories, [uuid for _, uuid in batch]))
+
+            if callback is not None:
+                callback(len(batch))
+
+        # Raise the first exception that occurred while erasing the repositories, if any
+        for future in futures:
+            future.result()
+
+
+def delete_nodes(
+    pks,
+    verbosity=0,
+    dry_run=False,
+    force=False,
+    batch_size=DEFAULT_BATCH_SIZE,
+    threads=DEFAULT_THREADS,
+    checkpoint=None,
+    **kwargs
+):
     """Delete nodes by a list of pks.
 
     This command will delete not only the specified nodes, but also the ones that are
@@ -35,6 +200,10 @@ def delete_nodes(pks, verbosity=0, dry_run=False, force=False, **kwargs):
     nodes will be deleted as well, and then any CALC node that may have those as
     inputs, and so on.
 
+    The nodes are deleted in batches, each in its own transaction, see :func:`delete_nodes_in_batches`. If a checkpoint
+    is given, the nodes to delete are recorded in it before the deletion starts, and a deletion that was interrupted
+    is resumed before the given nodes are considered.
+
     :param pks: a list of the PKs of the nodes to delete
     :param bool force: do not ask for confirmation to delete nodes.
     :param int verbosity: 0 prints nothing,
@@ -48,18 +217,30 @@ def delete_nodes(pks, verbosity=0, dry_run=False, force=False, **kwargs):
         to the verbosity level set.
     :param bool force:
         Do not ask for confirmation to delete nodes.
+    :param int batch_size: the number of nodes that are deleted per transaction.
+    :param int threads: the number of threads that erase the repositories of the deleted nodes.
+    :param checkpoint: optional :class:`DeleteCheckpoint` to make the deletion resumable.
     """
     # pylint: disable=too-many-arguments,too-many-branches,too-many-locals,too-many-statements
-    from aiida.backends.utils import delete_nodes_and_connections
-    from aiida.common import exceptions
-    from aiida.orm import Node, QueryBuilder, load_node
+    from aiida.orm import Node, QueryBuilder
     from aiida.tools.graph.graph_traversers import get_nodes_delete
 
+    interrupted = checkpoint.load() if checkpoint is not None else None
+
+    if interrupted:
+        if dry_run:
+            if verbosity > 0:
+                echo.echo('An interrupted deletion of {} nodes would be resumed first'.format(len(interrupted)))
+        else:
+            if verbosity > 0:
+                echo.echo('Resuming the interrupted deletion of {} nodes...'.format(len(interrupted)))
+            _delete_nodes(interrupted, verbosity, batch_size, threads)
+            checkpoint.clear()
+
+    existing_pks = _get_existing_pks(pks) if pks else set()
     starting_pks = []
     for pk in pks:
-        try:
-            load_node(pk)
-        except exceptions.NotExistent:
+        if pk not in existing_pks:
             echo.echo_warning('warning: node with pk<{}> does not exist, skipping'.format(pk))
         else:
             starting_pks.append(pk)
@@ -106,21 +287,31 @@ def delete_nodes(pks, verbosity=0, dry_run=False, force=False, **kwargs):
             echo.echo('Exiting without deleting')
             return
 
-    # Recover the list of folders to delete before actually deleting the nodes. I will delete the folders only later,
-    # so that if there is a problem during the deletion of the nodes in the DB, I don't delete the folders
-    repositories = [load_node(pk)._repository for pk in pks_set_to_delete]  # pylint: disable=protected-access
+    # Recover the uuids of the nodes before actually deleting them, since they determine the repositories to erase
+    nodes = _get_uuids(pks_set_to_delete, batch_size)
 
-    if verbosity > 0:
-        echo.echo('Starting node deletion...')
-    delete_nodes_and_connections(pks_set_to_delete)
+    if checkpoint is not None:
+        checkpoint.save(nodes)
 
-    if verbosity > 0:
-        echo.echo('Nodes deleted from database, deleting files from the repository now...')
+    _delete_nodes(nodes, verbosity, batch_size, threads)
 
-    # If we are here, we managed to delete the entries from the DB.
-    # I can now delete the folders
-    for repository in repositories:
-        repository.erase(force=True)
+    if checkpoint is not None:
+        checkpoint.clear()
 
     if verbosity > 0:
         echo.echo('Deletion completed.')
+
+
+def _delete_nodes(nodes, verbosity, batch_size, threads):
+    """Delete the given nodes in batches, reporting the progress if the verbosity is larger than zero.
+
+    :param nodes: list of tuples of the pk and uuid of the nodes to delete
+    :param int verbosity: the verbosity level
+    :param int batch_size: the number of nodes that are deleted per transaction
+    :param int threads: the number of threads that erase the repositories
+    """
+    if verbosity > 0:
+        with click.progressbar(length=len(nodes), label='Deleting nodes:') as progress:
+            delete_nodes_in_batches(nodes, batch_size, threads, callback=progress.update)
+    else:
+        delete_nodes_in_batches(nodes, batch_size, threads)
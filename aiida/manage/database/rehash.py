@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Recompute the hashes of nodes in the database in batches, optionally in parallel and resumable after interruption."""
+import collections
+import os
+import time
+
+__all__ = (
+    'RehashCheckpoint', 'compute_node_hashes', 'count_nodes', 'get_checkpoint', 'iter_node_pk_batches', 'rehash_nodes'
+)
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class RehashCheckpoint:
+    """Record of the progress of a rehash run, stored in a file, such that an interrupted run can be resumed.
+
+    Nodes are rehashed in order of increasing pk, so it is sufficient to record the pk of the last node whose hash has
+    been written. The selection of nodes is recorded as well, such that a checkpoint is only ever used to resume the
+    exact same selection.
+    """
+
+    def __init__(self, filepath, selection):
+        """Construct a new instance.
+
+        :param filepath: absolute path of the checkpoint file
+        :param selection: string that uniquely identifies the selection of nodes that is being rehashed
+        """
+        self._filepath = filepath
+        self._selection = selection
+
+    @property
+    def filepath(self):
+        """Return the absolute path of the checkpoint file."""
+        return self._filepath
+
+    def load(self):
+        """Return the pk of the last node that was rehashed by an interrupted run for the same selection, if any.
+
+        :return: the pk or None if there is no checkpoint or it was written for a different selection
+        """
+        from aiida.common import json
+
+        try:
+            with open(self._filepath, 'r', encoding='utf8') as handle:
+                checkpoint = json.load(handle)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if checkpoint.get('selection') != self._selection:
+            return None
+
+        return checkpoint.get('last_pk', None)
+
+    def save(self, last_pk):
+        """Record the pk of the last node that has been rehashed.
+
+        The file is written atomically, such that an interruption while saving cannot corrupt the checkpoint.
+
+        :param last_pk: the pk of the last node that has been rehashed
+        """
+        from aiida.common import json
+
+        temporary = '{}.tmp'.format(self._filepath)
+
+        with open(temporary, 'w', encoding='utf8') as handle:
+            json.dump({'selection': self._selection, 'last_pk': last_pk}, handle)
+
+        os.replace(temporary, self._filepath)
+
+    def clear(self):
+        """Remove the checkpoint file."""
+        try:
+            os.remove(self._filepath)
+        except FileNotFoundError:
+            pass
+
+
+def get_checkpoint(entry_point, profile=None):
+    """Return the `RehashCheckpoint` of the given selection of nodes for a profile.
+
+    :param entry_point: the node class or tuple of node classes that are rehashed
+    :param profile: the profile, by default the currently loaded profile
+    :return: `RehashCheckpoint` instance
+    """
+    from aiida.manage.configuration import get_profile, settings
+
+    profile = profile or get_profile()
+    entry_points = entry_point if isinstance(entry_point, tuple) else (entry_point,)
+    selection = ','.join(sorted('{}.{}'.format(cls.__module__, cls.__name__) for cls in entry_points))
+    filepath = os.path.join(settings.AIIDA_CONFIG_FOLDER, 'rehash_checkpoint_{}.json'.format(profile.name))
+
+    return RehashCheckpoint(filepath, selection)
+
+
+def _get_node_query(entry_point, pks=None, start_pk=None):
+    """Return a `QueryBuilder` that projects the pks of the nodes that match the given selection in increasing order.
+
+    :param entry_point: the node class or tuple of node classes to select
+    :param pks: optional list of pks to restrict the selection to
+    :param start_pk: only select nodes whose pk is strictly larger than this value
+    :return: `QueryBuilder` instance
+    """
+    from aiida.orm import QueryBuilder
+
+    conditions = []
+
+    if pks is not None:
+        conditions.append({'in': list(pks)})
+
+    if start_pk is not None:
+        conditions.append({'>': start_pk})
+
+    filters = {'id': {'and': conditions}} if conditions else {}
+    builder = QueryBuilder().append(entry_point, tag='node', filters=filters, project=['id'])
+    builder.order_by({'node': {'id': 'asc'}})
+
+    return builder
+
+
+def count_nodes(entry_point, pks=None, start_pk=None):
+    """Return the number of nodes that match the given selection.
+
+    :param entry_point: the node class or tuple of node classes to select
+    :param pks: optional list of pks to restrict the selection to
+    :param start_pk: only count nodes whose pk is strictly larger than this value
+    :return: the number of nodes
+    """
+    return _get_node_query(entry_point, pks, start_pk).count()
+
+
+def iter_node_pk_batches(entry_point, batch_size=DEFAULT_BATCH_SIZE, pks=None, start_pk=None):
+    """Return an iterator over batches of pks of the nodes that match the given selection, in order of increasing pk.
+
+    The batches are retrieved with keyset pagination instead of `QueryBuilder.iterall`, because the latter is not safe
+    when a commit takes place while iterating, which is exactly what happens when the hashes of each batch are written.
+
+    :param entry_point: the node class or tuple of node classes to select
+    :param batch_size: the maximum number of pks per batch
+    :param pks: optional list of pks to restrict the selection to
+    :param start_pk: only select nodes whose pk is strictly larger than this value
+    :return: iterator of lists of pks
+    """
+    last_pk = start_pk
+
+    while True:
+        batch = [pk for pk, in _get_node_query(entry_point, pks, last_pk).limit(batch_size).iterall()]
+
+        if not batch:
+            return
+
+        yield batch
+        last_pk = batch[-1]
+
+
+def compute_node_hashes(pks):
+    """Load the nodes with the given pks and compute their hash.
+
+    :param pks: list of node pks
+    :return: dictionary mapping the pk of each node onto its hash
+    """
+    from aiida.orm import Node, QueryBuilder
+
+    builder = QueryBuilder().append(Node, filters={'id': {'in': pks}}, project=['*'])
+
+    return {node.pk: node.get_hash() for node, in builder.iterall()}
+
+
+def _initialise_worker(profile_name):
+    """Load the profile in a worker process of the pool that computes the hashes.
+
+    :param profile_name: the name of the profile to load
+    """
+    from aiida.manage.configuration import load_profile
+    from aiida.manage.manager import get_manager
+
+    load_profile(profile_name)
+    get_manager().get_backend()
+
+
+def rehash_nodes(entry_point, pks=None, batch_size=DEFAULT_BATCH_SIZE, processes=1, checkpoint=None, callback=None):
+    """Recompute and store the hash of the nodes that match the given selection.
+
+    Nodes are processed in batches of increasing pk. For each batch, the hashes are computed, either in this process or
+    in a pool of worker processes, and then written to the database with a single query. After every batch the pk of
+    its last node is recorded in the checkpoint, if one is given, such that an interrupted run can be resumed.
+
+    :param entry_point: the node class or tuple of node classes to rehash
+    :param pks: optional list of pks to restrict the selection to
+    :param batch_size: the number of nodes per batch
+    :param processes: the number of worker processes that compute the hashes; with one, the hashes are computed in the
+        current process
+    :param checkpoint: optional `RehashCheckpoint`; if it contains the progress of an interrupted run, that run is resumed
+    :param callback: optional callable that is called with the number of nodes of each batch whose hashes are written
+    :return: tuple of the number of rehashed nodes and the elapsed wall time in seconds
+    """
+    import multiprocessing
+
+    from aiida.common.hashing import _HASH_EXTRA_KEY
+    from aiida.manage.configuration import get_profile
+    from aiida.manage.manager import get_manager
+
+    backend = get_manager().get_backend()
+    start_pk = checkpoint.load() if checkpoint is not None else None
+    batches = iter_node_pk_batches(entry_point, batch_size, pks=pks, start_pk=start_pk)
+    num_nodes = 0
+    start = time.time()
+
+    def write(batch, hashes):
+        """Write the hashes of a batch and record the progress."""
+        backend.nodes.bulk_set_extra(_HASH_EXTRA_KEY, hashes)
+
+        if checkpoint is not None:
+            checkpoint.save(batch[-1])
+
+        if callback is not None:
+            callback(len(batch))
+
+        return len(batch)
+
+    if processes <= 1:
+        for batch in batches:
+            num_nodes += write(batch, compute_node_hashes(batch))
+    else:
+        # Worker processes are spawned rather than forked, such that they do not share the database connection of this
+        # process, and open their own connection when loading the profile. To bound the memory usage, only a limited
+        # number of batches is in flight at any time. The results are collected in the order in which the batches were
+        # submitted, which guarantees that the checkpoint never skips over a batch whose hashes have not been written.
+        context = multiprocessing.get_context('spawn')
+        pending = collections.deque()
+
+        with context.Pool(processes, initializer=_initialise_worker, initargs=(get_profile().name,)) as pool:
+            for batch in batches:
+                pending.append((batch, pool.apply_async(compute_node_hashes, (batch,))))
+
+                if len(pending) >= 2 * processes:
+                    batch, result = pending.popleft()
+                    num_nodes += write(batch, result.get())
+
+            while pending:
+                batch, result = pending.popleft()
+                num_nodes += write(batch, result.get())
+
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    return num_nodes, time.time() - start
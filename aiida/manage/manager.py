@@ -266,8 +266,14 @@ class Manager:
         config = get_config()
         profile = self.get_profile()
         poll_interval = 0.0 if profile.is_test_profile else config.get_option('runner.poll.interval')
-
-        settings = {'rmq_submit': False, 'poll_interval': poll_interval}
+        batch_window = 0 if profile.is_test_profile else config.get_option('scheduler.batch_window')
+
+        settings = {
+            'rmq_submit': False,
+            'poll_interval': poll_interval,
+            'transport_idle_timeout': config.get_option('transport.idle_timeout'),
+            'scheduler_batch_window': batch_window,
+        }
         settings.update(kwargs)
 
         if 'communicator' not in settings:
@@ -279,18 +285,23 @@ class Manager:
 
         return runners.Runner(**settings)
 
-    def create_daemon_runner(self, loop=None):
+    def create_daemon_runner(self, loop=None, slot_scheduler=None):
         """Create and return a new daemon runner.
 
         This is used by workers when the daemon is running and in testing.
 
         :param loop: the (optional) tornado event loop to use
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param slot_scheduler: the (optional) slot scheduler that decides which tasks the runner accepts, which has to
+            be stopped by the caller. By default, one with as many slots as the task prefetch count of the communicator
+            is created, which is stopped when the runner is closed.
+        :type slot_scheduler: :class:`aiida.engine.daemon.slots.SlotScheduler`
         :return: a runner configured to work in the daemon configuration
         :rtype: :class:`aiida.engine.runners.Runner`
         """
         import plumpy
         from aiida.engine import persistence
+        from aiida.engine.daemon.slots import SlotScheduler
         from aiida.manage.external import rmq
         runner = self.create_runner(rmq_submit=True, loop=loop)
         runner_loop = runner.loop
@@ -303,8 +314,18 @@ class Manager:
             loader=persistence.get_object_loader()
         )
 
+        if slot_scheduler is None:
+            slot_scheduler = SlotScheduler(rmq._RMQ_TASK_PREFETCH_COUNT)  # pylint: disable=protected-access
+            runner.add_close_callback(slot_scheduler.stop)
+
+        slot_scheduler.add_statistics('transports', runner.transport.get_statistics)
+        slot_scheduler.add_statistics('scheduler', runner.job_manager.get_statistics)
+        slot_scheduler.add_statistics('commands', runner.job_manager.get_command_statistics)
+        slot_scheduler.start(runner_loop)
+        receive = slot_scheduler.wrap(task_receiver)
+
         def callback(*args, **kwargs):
-            return plumpy.create_task(functools.partial(task_receiver, *args, **kwargs), loop=runner_loop)
+            return plumpy.create_task(functools.partial(receive, *args, **kwargs), loop=runner_loop)
 
         runner.communicator.add_task_subscriber(callback)
 
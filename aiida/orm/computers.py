@@ -47,6 +47,8 @@ class Computer(entities.Entity):
     PROPERTY_MINIMUM_SCHEDULER_POLL_INTERVAL__DEFAULT = 10.  # pylint: disable=invalid-name
     PROPERTY_WORKDIR = 'workdir'
     PROPERTY_SHEBANG = 'shebang'
+    PROPERTY_REMOTE_CACHE_DIRECTORY = 'remote_cache_directory'
+    PROPERTY_REMOTE_CACHE_LINK_MODE = 'remote_cache_link_mode'
 
     class Collection(entities.Collection):
         """The collection of Computer entries."""
@@ -210,6 +212,23 @@ class Computer(entities.Entity):
         if not os.path.isabs(convertedwd):
             raise exceptions.ValidationError('The workdir must be an absolute path')
 
+    @classmethod
+    def _remote_cache_directory_validator(cls, directory):
+        """
+        Validates the remote cache directory string.
+        """
+        try:
+            converted = directory.format(username='test')
+        except KeyError as exc:
+            raise exceptions.ValidationError(
+                'In the remote cache directory there is an unknown replacement field {}'.format(exc.args[0])
+            )
+        except ValueError as exc:
+            raise exceptions.ValidationError("Error in the string: '{}'".format(exc))
+
+        if not os.path.isabs(converted):
+            raise exceptions.ValidationError('The remote cache directory must be an absolute path')
+
     def _mpirun_command_validator(self, mpirun_cmd):
         """
         Validates the mpirun_command variable. MUST be called after properly
@@ -498,6 +517,46 @@ class Computer(entities.Entity):
     def set_workdir(self, val):
         self.set_property(self.PROPERTY_WORKDIR, val)
 
+    def get_remote_cache_directory(self):
+        """
+        Get the directory on this computer in which the objects of node repositories that are copied to calculations
+        are cached, see :py:class:`aiida.engine.daemon.remote_cache.RemoteCache`.
+        :return: The currently configured remote cache directory, or None if the remote cache is disabled
+        :rtype: str
+        """
+        return self.get_property(self.PROPERTY_REMOTE_CACHE_DIRECTORY, None)
+
+    def set_remote_cache_directory(self, val):
+        """
+        :param str val: absolute path of the remote cache directory, which may contain the `{username}` replacement
+            field like the working directory, or None to disable the remote cache
+        """
+        if val is None:
+            self.delete_property(self.PROPERTY_REMOTE_CACHE_DIRECTORY, raise_exception=False)
+            return
+
+        self._remote_cache_directory_validator(val)
+        self.set_property(self.PROPERTY_REMOTE_CACHE_DIRECTORY, val)
+
+    def get_remote_cache_link_mode(self):
+        """
+        Get how objects in the remote cache are linked into the working directories of calculations.
+        :return: `symlink` or `hardlink`
+        :rtype: str
+        """
+        return self.get_property(self.PROPERTY_REMOTE_CACHE_LINK_MODE, 'symlink')
+
+    def set_remote_cache_link_mode(self, val):
+        """
+        :param str val: `symlink` or `hardlink`
+        """
+        from aiida.engine.daemon.remote_cache import LINK_MODES
+
+        if val not in LINK_MODES:
+            raise exceptions.ValidationError('invalid link mode `{}`, should be one of {}'.format(val, LINK_MODES))
+
+        self.set_property(self.PROPERTY_REMOTE_CACHE_LINK_MODE, val)
+
     def get_shebang(self):
         return self.get_property(self.PROPERTY_SHEBANG, '#!/bin/bash')
 
@@ -532,3 +532,107 @@ class DjangoNodeCollection(BackendNodeCollection):
             models.DbNode.objects.filter(pk=pk).delete()  # pylint: disable=no-member
         except ObjectDoesNotExist:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def bulk_store(self, nodes, links=None):
+        """Store multiple unstored nodes and their incoming links with multi-row inserts in a single transaction.
+
+        The values of the nodes should already have been cleaned. If storing fails, the transaction is rolled back and
+        all nodes remain unstored.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list of tuples of source node, target node, link type and link label, where the source
+            is a stored `BackendNode` and the target is one of the nodes that are being stored
+        """
+        from aiida.backends.djsite.db.models import suppress_auto_now
+        from aiida.common import timezone
+
+        dbmodels = [node.dbmodel for node in nodes]
+        now = timezone.now()
+
+        # The modification time of nodes that define it explicitly, as for example imported nodes, should be kept
+        for dbmodel in dbmodels:
+            if dbmodel.mtime is None:
+                dbmodel.mtime = now
+
+        try:
+            with transaction.atomic():
+                with suppress_auto_now([(models.DbNode, ['mtime'])]):
+                    models.DbNode.objects.bulk_create(dbmodels)
+
+                models.DbLink.objects.bulk_create([
+                    models.DbLink(input_id=source.id, output_id=target.id, label=link_label, type=link_type.value)
+                    for source, target, link_type, link_label in links or []
+                ])
+        except Exception:
+            # The primary keys have been assigned by the insert but the transaction was rolled back, so unset them
+            for dbmodel in dbmodels:
+                dbmodel.pk = None
+                dbmodel._state.adding = True  # pylint: disable=protected-access
+            raise
+
+    def get_pks_by_hash(self, node_hash, node_type, attributes=None):
+        """Return the pks of the stored nodes with the given hash and node type, in order of increasing pk.
+
+        :param node_hash: the hash of the nodes
+        :param node_type: the exact node type of the nodes
+        :param attributes: optional dictionary of string values that the attributes with the given keys should have
+        :return: list of node pks
+        """
+        from django.db import connection
+        from aiida.orm.implementation.sql.utils import get_pks_by_hash_statement
+
+        with connection.cursor() as cursor:
+            cursor.execute(*get_pks_by_hash_statement(node_hash, node_type, attributes))
+            return [row[0] for row in cursor.fetchall()]
+
+    def bulk_set_extra(self, key, values):
+        """Set the extra with the given key for multiple stored nodes in a single query.
+
+        The values are stored as is, so they should already be cleaned, and the change is committed immediately.
+
+        :param key: the key of the extra
+        :param values: dictionary mapping the pk of each node onto the JSON-serializable value of the extra
+        """
+        from django.db import connection
+        from aiida.orm.implementation.sql.utils import get_bulk_set_extra_statement
+
+        if not values:
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(*get_bulk_set_extra_statement(key, values))
+
+    def bulk_delete(self, pks):
+        """Delete multiple stored nodes, including their links, group memberships, logs and comments, in a single
+        transaction.
+
+        :param pks: list of the pks of the nodes to delete
+        """
+        from django.db import connection
+        from aiida.orm.implementation.sql.utils import get_bulk_delete_statements
+
+        if not pks:
+            return
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement, parameters in get_bulk_delete_statements(pks):
+                cursor.execute(statement, parameters)
+
+    def iter_graph_traversal(self, pks, types_forward, types_backward, get_links=False, batch_size=10000):
+        """Return an iterator over the nodes, and optionally the links, that are reached by traversing the graph.
+
+        :param pks: list of the pks of the starting nodes
+        :param types_forward: list of the link type values of the links to follow in the forward direction
+        :param types_backward: list of the link type values of the links to follow in the backward direction
+        :param get_links: whether to also return the links that are followed
+        :param batch_size: the number of rows that are transferred from the database per batch
+        :return: iterator over tuples, which are `(pk, None, None, None)` for the nodes, including the starting nodes,
+            and `(source_id, target_id, link_type, link_label)` for the links
+        """
+        from django.db import connection
+        from aiida.orm.implementation.sql.utils import get_traverse_graph_statement, iter_rows_in_batches
+
+        statement, parameters = get_traverse_graph_statement(pks, types_forward, types_backward, get_links)
+        connection.ensure_connection()
+
+        return iter_rows_in_batches(connection.connection, statement, parameters, batch_size)
@@ -400,3 +400,63 @@ class BackendNodeCollection(backends.BackendCollection[BackendNode]):
 
         :param pk: id of the node to delete
         """
+
+    @abc.abstractmethod
+    def bulk_store(self, nodes, links=None):
+        """Store multiple unstored nodes and their incoming links with multi-row inserts in a single transaction.
+
+        The values of the nodes should already have been cleaned. If storing fails, the transaction is rolled back and
+        all nodes remain unstored.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list of tuples of source node, target node, link type and link label, where the source
+            is a stored `BackendNode` and the target is one of the nodes that are being stored
+        """
+
+    @abc.abstractmethod
+    def get_pks_by_hash(self, node_hash, node_type, attributes=None):
+        """Return the pks of the stored nodes with the given hash and node type, in order of increasing pk.
+
+        :param node_hash: the hash of the nodes
+        :param node_type: the exact node type of the nodes
+        :param attributes: optional dictionary of string values that the attributes with the given keys should have
+        :return: list of node pks
+        """
+
+    @abc.abstractmethod
+    def bulk_set_extra(self, key, values):
+        """Set the extra with the given key for multiple stored nodes in a single query.
+
+        The values are stored as is, so they should already be cleaned, and the change is committed immediately.
+
+        :param key: the key of the extra
+        :param values: dictionary mapping the pk of each node onto the JSON-serializable value of the extra
+        """
+
+    @abc.abstractmethod
+    def bulk_delete(self, pks):
+        """Delete multiple stored nodes, including their links, group memberships, logs and comments, in a single
+        transaction.
+
+        The pks of nodes that do not exist are ignored. The caller is responsible for deleting a set of nodes that
+        leaves the provenance graph consistent.
+
+        :param pks: list of the pks of the nodes to delete
+        """
+
+    @abc.abstractmethod
+    def iter_graph_traversal(self, pks, types_forward, types_backward, get_links=False, batch_size=10000):
+        """Return an iterator over the nodes, and optionally the links, that are reached by traversing the graph.
+
+        The traversal follows the links of the forward types from source to target and those of the backward types from
+        target to source, starting from the given nodes, until no new nodes are found. It is performed entirely by the
+        database and the result is transferred in batches.
+
+        :param pks: list of the pks of the starting nodes
+        :param types_forward: list of the link type values of the links to follow in the forward direction
+        :param types_backward: list of the link type values of the links to follow in the backward direction
+        :param get_links: whether to also return the links that are followed
+        :param batch_size: the number of rows that are transferred from the database per batch
+        :return: iterator over tuples, which are `(pk, None, None, None)` for the nodes, including the starting nodes,
+            and `(source_id, target_id, link_type, link_label)` for the links
+        """
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Utilities shared by the SQL based backend implementations."""
+
+
+def get_bulk_set_extra_statement(key, values):
+    """Return the SQL statement and its parameters to set an extra for multiple nodes in a single query.
+
+    The statement uses the `pyformat` parameter style and can be executed by a raw database cursor.
+
+    :param key: the key of the extra
+    :param values: dictionary mapping the pk of each node onto the JSON-serializable value of the extra
+    :return: tuple of the SQL statement and its positional parameters
+    """
+    from aiida.common import json
+
+    rows = ', '.join(['(%s, %s::jsonb)'] * len(values))
+    statement = (
+        'UPDATE db_dbnode AS node SET extras = jsonb_set(coalesce(node.extras, \'{{}}\'::jsonb), ARRAY[%s], data.value) '
+        'FROM (VALUES {}) AS data(id, value) WHERE node.id = data.id'.format(rows)
+    )
+
+    parameters = [key]
+    for pk, value in values.items():
+        parameters.extend([pk, json.dumps(value)])
+
+    return statement, tuple(parameters)
+
+
+def get_pks_by_hash_statement(node_hash, node_type, attributes=None):
+    """Return the SQL statement and its parameters to select the pks of the nodes of a given type with a given hash.
+
+    The hash is compared through the expression `extras ->> '_aiida_hash'`, which matches the expression of the index
+    that is defined on it, such that the lookup does not require a scan of the node table.
+
+    :param node_hash: the hash of the nodes
+    :param node_type: the exact node type of the nodes
+    :param attributes: optional dictionary of string values that the attributes with the given keys should have
+    :return: tuple of the SQL statement and its positional parameters
+    """
+    from aiida.common.hashing import _HASH_EXTRA_KEY
+
+    conditions = ["extras ->> '{}' = %s".format(_HASH_EXTRA_KEY), 'node_type = %s']
+    parameters = [node_hash, node_type]
+
+    for key, value in (attributes or {}).items():
+        conditions.append('attributes ->> %s = %s')
+        parameters.extend([key, value])
+
+    statement = 'SELECT id FROM db_dbnode WHERE {} ORDER BY id'.format(' AND '.join(conditions))
+
+    return statement, tuple(parameters)
+
+
+def get_bulk_delete_statements(pks):
+    """Return the SQL statements and their parameters to delete multiple nodes and everything that refers to them.
+
+    The group memberships, logs and comments of the nodes and all links from and to the nodes are deleted before the
+    nodes themselves. The statements have to be executed in this order and in a single transaction.
+
+    :param pks: list of the pks of the nodes to delete
+    :return: list of tuples of an SQL statement and its parameters as a dictionary
+    """
+    parameters = {'pks': list(pks)}
+    statements = [
+        'DELETE FROM db_dbgroup_dbnodes WHERE dbnode_id = ANY(%(pks)s)',
+        'DELETE FROM db_dblog WHERE dbnode_id = ANY(%(pks)s)',
+        'DELETE FROM db_dbcomment WHERE dbnode_id = ANY(%(pks)s)',
+        'DELETE FROM db_dblink WHERE input_id = ANY(%(pks)s) OR output_id = ANY(%(pks)s)',
+        'DELETE FROM db_dbnode WHERE id = ANY(%(pks)s)',
+    ]
+
+    return [(statement, parameters) for statement in statements]
+
+
+def get_traverse_graph_statement(pks, types_forward, types_backward, get_links=False):
+    """Return the SQL statement and its parameters to select all nodes that are connected to the given nodes.
+
+    The traversal is a single recursive query: starting from the given nodes, links of the forward types are followed
+    from source to target and links of the backward types from target to source, until no new nodes are found. Since
+    the recursion uses `UNION`, every node is visited only once, so the query terminates even if the followed links
+    form cycles. The selected rows are the pks of the nodes, as `(pk, NULL, NULL, NULL)`, and if links are requested,
+    all followed links between these nodes as `(source_id, target_id, link_type, link_label)`.
+
+    :param pks: list of the pks of the starting nodes
+    :param types_forward: list of the link type values of the links to follow in the forward direction
+    :param types_backward: list of the link type values of the links to follow in the backward direction
+    :param get_links: whether to also select the links that are followed
+    :return: tuple of the SQL statement and its parameters as a dictionary
+    """
+    edges = []
+    links = []
+    parameters = {'pks': list(pks), 'types_forward': tuple(types_forward), 'types_backward': tuple(types_backward)}
+
+    if types_forward:
+        edges.append('SELECT input_id AS source, output_id AS target FROM db_dblink WHERE type IN %(types_forward)s')
+        links.append(
+            'SELECT link.input_id, link.output_id, link.type, link.label FROM db_dblink AS link '
+            'JOIN nodes ON link.input_id = nodes.id WHERE link.type IN %(types_forward)s'
+        )
+
+    if types_backward:
+        edges.append('SELECT output_id AS source, input_id AS target FROM db_dblink WHERE type IN %(types_backward)s')
+        links.append(
+            'SELECT link.input_id, link.output_id, link.type, link.label FROM db_dblink AS link '
+            'JOIN nodes ON link.output_id = nodes.id WHERE link.type IN %(types_backward)s'
+        )
+
+    if not edges:
+        raise ValueError('at least one link type to follow in either direction is required')
+
+    # The edges are a subquery rather than a common table expression, such that the join condition on the source is
+    # pushed into both branches of the union and the indexes on the link table are used in every iteration
+    statement = (
+        'WITH RECURSIVE nodes(id) AS ('
+        'SELECT unnest(%(pks)s::integer[]) '
+        'UNION '
+        'SELECT edges.target FROM nodes JOIN ({}) AS edges ON edges.source = nodes.id'
+        ') SELECT id, NULL, NULL, NULL FROM nodes'.format(' UNION ALL '.join(edges))
+    )
+
+    if get_links:
+        statement += ' UNION ALL ' + ' UNION ALL '.join(links)
+
+    return statement, parameters
+
+
+def iter_rows_in_batches(connection, statement, parameters, batch_size):
+    """Execute a statement with a server side cursor and return an iterator over the rows of its result.
+
+    The rows are transferred from the database in batches, such that the complete result never has to be held in memory.
+
+    :param connection: a psycopg2 connection
+    :param statement: the SQL statement
+    :param parameters: the parameters of the statement
+    :param batch_size: the number of rows that are transferred per batch
+    :return: iterator over the rows
+    """
+    import uuid
+
+    # A cursor with `withhold` can also be used outside of a transaction, as is the case for a connection in autocommit
+    cursor = connection.cursor(name='aiida_{}'.format(uuid.uuid4().hex), withhold=True)
+    cursor.itersize = batch_size
+
+    try:
+        cursor.execute(statement, parameters)
+        for row in cursor:
+            yield row
+    finally:
+        cursor.close()
@@ -10,6 +10,7 @@
 """SqlAlchemy implementation of the `BackendNode` and `BackendNodeCollection` classes."""
 
 # pylint: disable=no-name-in-module,import-error
+from contextlib import closing
 from datetime import datetime
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import SQLAlchemyError
@@ -550,3 +551,143 @@ class SqlaNodeCollection(BackendNodeCollection):
             session.commit()
         except NoResultFound:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def bulk_store(self, nodes, links=None):
+        """Store multiple unstored nodes and their incoming links with multi-row inserts in a single transaction.
+
+        The values of the nodes should already have been cleaned. If storing fails, the transaction is rolled back and
+        all nodes remain unstored.
+
+        :param nodes: list of unstored `BackendNode` instances
+        :param links: optional list of tuples of source node, target node, link type and link label, where the source
+            is a stored `BackendNode` and the target is one of the nodes that are being stored
+        """
+        from sqlalchemy.orm import make_transient_to_detached
+        from aiida.common import timezone
+
+        session = get_scoped_session()
+        table = models.DbNode.__table__
+        now = timezone.now()
+        rows = []
+
+        for node in nodes:
+            dbmodel = node.dbmodel
+            # Make sure that the model instance is not inserted a second time when the session is flushed
+            if dbmodel in session:
+                session.expunge(dbmodel)
+            row = {column.name: getattr(dbmodel, column.name) for column in table.columns if column.name != 'id'}
+            # The foreign keys are only populated from the relationships by a flush, which is bypassed here
+            row['user_id'] = dbmodel.user.id
+            row['dbcomputer_id'] = dbmodel.dbcomputer.id if dbmodel.dbcomputer is not None else None
+            row['mtime'] = row['mtime'] or now
+            rows.append(row)
+
+        try:
+            pks = []
+            if rows:
+                pks = [pk for pk, in session.execute(table.insert().values(rows).returning(table.c.id))]
+
+            pks_by_node = {id(node): pk for node, pk in zip(nodes, pks)}
+            link_rows = [{
+                'input_id': source.id,
+                'output_id': pks_by_node[id(target)],
+                'label': link_label,
+                'type': link_type.value
+            } for source, target, link_type, link_label in links or []]
+
+            if link_rows:
+                session.execute(models.DbLink.__table__.insert().values(link_rows))
+
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+        # Only now that the transaction has been committed, the model instances are attached to the session as if they
+        # had been loaded from the database, such that they remain untouched if storing fails.
+        for node, pk, row in zip(nodes, pks, rows):
+            dbmodel = node.dbmodel
+            for key, value in row.items():
+                setattr(dbmodel, key, value)
+            dbmodel.id = pk
+            make_transient_to_detached(dbmodel)
+            session.add(dbmodel)
+
+    def get_pks_by_hash(self, node_hash, node_type, attributes=None):
+        """Return the pks of the stored nodes with the given hash and node type, in order of increasing pk.
+
+        :param node_hash: the hash of the nodes
+        :param node_type: the exact node type of the nodes
+        :param attributes: optional dictionary of string values that the attributes with the given keys should have
+        :return: list of node pks
+        """
+        from aiida.orm.implementation.sql.utils import get_pks_by_hash_statement
+
+        session = get_scoped_session()
+
+        with closing(session.connection().connection.cursor()) as cursor:
+            cursor.execute(*get_pks_by_hash_statement(node_hash, node_type, attributes))
+            return [row[0] for row in cursor.fetchall()]
+
+    def bulk_set_extra(self, key, values):
+        """Set the extra with the given key for multiple stored nodes in a single query.
+
+        The values are stored as is, so they should already be cleaned, and the change is committed immediately.
+
+        :param key: the key of the extra
+        :param values: dictionary mapping the pk of each node onto the JSON-serializable value of the extra
+        """
+        from aiida.orm.implementation.sql.utils import get_bulk_set_extra_statement
+
+        if not values:
+            return
+
+        session = get_scoped_session()
+
+        try:
+            with closing(session.connection().connection.cursor()) as cursor:
+                cursor.execute(*get_bulk_set_extra_statement(key, values))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def bulk_delete(self, pks):
+        """Delete multiple stored nodes, including their links, group memberships, logs and comments, in a single
+        transaction.
+
+        :param pks: list of the pks of the nodes to delete
+        """
+        from aiida.orm.implementation.sql.utils import get_bulk_delete_statements
+
+        if not pks:
+            return
+
+        session = get_scoped_session()
+
+        try:
+            with closing(session.connection().connection.cursor()) as cursor:
+                for statement, parameters in get_bulk_delete_statements(pks):
+                    cursor.execute(statement, parameters)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def iter_graph_traversal(self, pks, types_forward, types_backward, get_links=False, batch_size=10000):
+        """Return an iterator over the nodes, and optionally the links, that are reached by traversing the graph.
+
+        :param pks: list of the pks of the starting nodes
+        :param types_forward: list of the link type values of the links to follow in the forward direction
+        :param types_backward: list of the link type values of the links to follow in the backward direction
+        :param get_links: whether to also return the links that are followed
+        :param batch_size: the number of rows that are transferred from the database per batch
+        :return: iterator over tuples, which are `(pk, None, None, None)` for the nodes, including the starting nodes,
+            and `(source_id, target_id, link_type, link_label)` for the links
+        """
+        from aiida.orm.implementation.sql.utils import get_traverse_graph_statement, iter_rows_in_batches
+
+        statement, parameters = get_traverse_graph_statement(pks, types_forward, types_backward, get_links)
+        connection = get_scoped_session().connection().connection
+
+        return iter_rows_in_batches(connection, statement, parameters, batch_size)
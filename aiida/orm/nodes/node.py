@@ -20,7 +20,7 @@ from aiida.common.lang import classproperty, type_check
 from aiida.common.links import LinkType
 from aiida.common.warnings import AiidaDeprecationWarning
 from aiida.manage.manager import get_manager
-from aiida.orm.utils.links import LinkManager, LinkTriple
+from aiida.orm.utils.links import LinkManager, LinkTriple, get_link_triples, invalidate_link_cache
 from aiida.orm.utils.repository import Repository
 from aiida.orm.utils.node import AbstractNodeMeta, validate_attribute_extra_key
 
@@ -74,6 +74,164 @@ class Node(Entity, metaclass=AbstractNodeMeta):
             self._backend.nodes.delete(node_id)
             repository.erase(force=True)
 
+        def get_incoming(self, nodes, node_class=None, link_type=(), link_label_filter=None, project='*'):
+            """Return the link triples that are (directly) incoming into each of the given stored nodes.
+
+            Unlike calling `Node.get_incoming` on each node, the links of all nodes are retrieved with a single query.
+
+            :param nodes: iterable of stored nodes or their pks
+            :param node_class: If specified, should be a class or tuple of classes, and it filters only
+                elements of that specific type (or a subclass of 'type')
+            :param link_type: If specified should be a `LinkType` or tuple of `LinkType` to get the inputs of this
+                link type, if empty tuple then returns all inputs of all link types.
+            :param link_label_filter: filters the incoming nodes by its link label.
+                Here wildcards (% and _) can be passed in link label filter as we are using "like" in QB.
+            :param project: the property of the incoming nodes to project onto the `LinkTriple.node` entries, for
+                example `id`, `uuid` or `node_type`, or `*` for the node instance
+            :return: dictionary mapping the pk of each node onto a `LinkManager` of its incoming link triples
+            :raise ValueError: if any of the nodes is not stored
+            """
+            return self._get_link_managers(nodes, 'incoming', node_class, link_type, link_label_filter, project)
+
+        def get_outgoing(self, nodes, node_class=None, link_type=(), link_label_filter=None, project='*'):
+            """Return the link triples that are (directly) outgoing of each of the given stored nodes.
+
+            Unlike calling `Node.get_outgoing` on each node, the links of all nodes are retrieved with a single query.
+
+            :param nodes: iterable of stored nodes or their pks
+            :param node_class: If specified, should be a class or tuple of classes, and it filters only
+                elements of that specific type (or a subclass of 'type')
+            :param link_type: If specified should be a `LinkType` or tuple of `LinkType` to get the outputs of this
+                link type, if empty tuple then returns all outputs of all link types.
+            :param link_label_filter: filters the outgoing nodes by its link label.
+                Here wildcards (% and _) can be passed in link label filter as we are using "like" in QB.
+            :param project: the property of the outgoing nodes to project onto the `LinkTriple.node` entries, for
+                example `id`, `uuid` or `node_type`, or `*` for the node instance
+            :return: dictionary mapping the pk of each node onto a `LinkManager` of its outgoing link triples
+            :raise ValueError: if any of the nodes is not stored
+            """
+            return self._get_link_managers(nodes, 'outgoing', node_class, link_type, link_label_filter, project)
+
+        @staticmethod
+        def _get_link_managers(nodes, link_direction, node_class, link_type, link_label_filter, project):
+            """Return the stored link triples of the given nodes in the given direction as a `LinkManager` per pk."""
+            node_pks = []
+
+            for node in nodes:
+                if isinstance(node, Node):
+                    if not node.is_stored:
+                        raise ValueError('Node<{}> is not stored'.format(node.uuid))
+                    node = node.pk
+                node_pks.append(node)
+
+            link_triples = get_link_triples(node_pks, link_direction, node_class, link_type, link_label_filter, project)
+
+            return {pk: LinkManager(triples) for pk, triples in link_triples.items()}
+
+        def bulk_store(self, nodes, links=None):
+            """Store a batch of unstored nodes, together with their incoming links, in a single transaction.
+
+            The result is the same as adding each link with `Node.add_incoming` and calling `Node.store` on each node,
+            but the links are validated in batch and the nodes and links are written with multi-row inserts. Nodes for
+            which caching is enabled and a valid cache exists are stored from that cache individually. Nodes whose class
+            overrides `store`, `_store` or `validate_incoming` are linked and stored individually as well, such that
+            these overrides are honoured.
+
+            :param nodes: list of unstored nodes
+            :param links: optional list of tuples of source node, target node, link type and link label, where each
+                source is a stored node and each target is one of the nodes to store
+            :return: the list of stored nodes
+            :raise aiida.common.ModificationNotAllowed: if a node is already stored or a link source is not stored
+            :raise aiida.common.StoringNotAllowed: if a node cannot be stored
+            :raise ValueError: if any of the links is invalid
+            """
+            # pylint: disable=protected-access
+            from aiida.manage.caching import get_use_cache
+            from aiida.orm.utils.links import validate_links
+
+            links = list(links or [])
+            uuids = set()
+
+            for node in nodes:
+                if node.is_stored:
+                    raise exceptions.ModificationNotAllowed('Node<{}> is already stored'.format(node.id))
+
+                if not node._storable:
+                    raise exceptions.StoringNotAllowed(node._unstorable_message)
+
+                node._validate()
+                node.verify_are_parents_stored()
+                uuids.add(node.uuid)
+
+            for source, target, _, _ in links:
+                if not source.is_stored:
+                    raise exceptions.ModificationNotAllowed('source Node<{}> of link is not stored'.format(source.uuid))
+
+                if target.uuid not in uuids:
+                    raise ValueError('target Node<{}> of link is not one of the nodes to store'.format(target.uuid))
+
+            validate_links(links)
+
+            for source, target, link_type, link_label in links:
+                if self._is_bulk_storable(target):
+                    # The validation of `Node.validate_incoming` is done in batch by `validate_links`
+                    source.validate_outgoing(target, link_type, link_label)
+                    target._add_incoming_cache(source, link_type, link_label)
+                else:
+                    target.add_incoming(source, link_type, link_label)
+
+            nodes_to_store = []
+            nodes_to_group = []
+
+            for node in nodes:
+                if not self._is_bulk_storable(node):
+                    # This also adds the node to the current autogroup
+                    node.store()
+                    continue
+
+                nodes_to_group.append(node)
+                node._backend_entity.clean_values()
+                same_node = node._get_same_node() if get_use_cache(identifier=node.process_type) else None
+
+                if same_node is not None:
+                    node._store_from_cache(same_node, with_transaction=True)
+                else:
+                    # The hash does not depend on the node being stored, so it can be inserted along with the node
+                    node._backend_entity.set_extra(_HASH_EXTRA_KEY, node._get_hash())
+                    nodes_to_store.append(node)
+
+            backend_links = [(link_triple.node.backend_entity, node.backend_entity, link_triple.link_type,
+                              link_triple.link_label) for node in nodes_to_store for link_triple in node._incoming_cache]
+
+            # As in `Node._store`, the repository folders are stored first, and restored if storing the nodes fails
+            for node in nodes_to_store:
+                node._repository.store()
+
+            try:
+                self._backend.nodes.bulk_store([node.backend_entity for node in nodes_to_store], backend_links)
+            except Exception:
+                for node in nodes_to_store:
+                    node._repository.restore()
+                raise
+
+            for node in nodes_to_store:
+                node._incoming_cache = list()
+
+            invalidate_link_cache(*[source.backend_entity.pk for source, _, _, _ in backend_links])
+
+            Node._add_to_current_autogroup(nodes_to_group)
+
+            return nodes
+
+        @staticmethod
+        def _is_bulk_storable(node):
+            """Return whether the node can be stored in bulk.
+
+            This requires that its class does not customize how it is stored or how its incoming links are validated.
+            """
+            names = ('store', '_store', 'validate_incoming')
+            return all(getattr(type(node), name) is getattr(Node, name) for name in names)
+
     # This will be set by the metaclass call
     _logger = None
 
@@ -647,6 +805,14 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         """
         return self._repository.get_object_content(key, mode)
 
+    def get_object_digest(self, key):
+        """Return the digest of the content of the object identified by key.
+
+        :param key: fully qualified identifier for the object within the repository
+        :return: the hexadecimal digest
+        """
+        return self._repository.get_object_digest(key)
+
     def put_object_from_tree(self, path, key=None, contents_only=True, force=False):
         """Store a new object under `key` with the contents of the directory located at `path` on this file system.
 
@@ -776,6 +942,7 @@ class Node(Entity, metaclass=AbstractNodeMeta):
 
         if self.is_stored and source.is_stored:
             self.backend_entity.add_incoming(source.backend_entity, link_type, link_label)
+            invalidate_link_cache(source.pk, self.pk)
         else:
             self._add_incoming_cache(source, link_type, link_label)
 
@@ -854,44 +1021,8 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         :param link_direction: `incoming` or `outgoing` to get the incoming or outgoing links, respectively.
         :param only_uuid: project only the node UUID instead of the instance onto the `NodeTriple.node` entries
         """
-        if not isinstance(link_type, tuple):
-            link_type = (link_type,)
-
-        if link_type and not all([isinstance(t, LinkType) for t in link_type]):
-            raise TypeError('link_type should be a LinkType or tuple of LinkType: got {}'.format(link_type))
-
-        node_class = node_class or Node
-        node_filters = {'id': {'==': self.id}}
-        edge_filters = {}
-
-        if link_type:
-            edge_filters['type'] = {'in': [t.value for t in link_type]}
-
-        if link_label_filter:
-            edge_filters['label'] = {'like': link_label_filter}
-
-        builder = QueryBuilder()
-        builder.append(Node, filters=node_filters, tag='main')
-
-        node_project = ['uuid'] if only_uuid else ['*']
-        if link_direction == 'outgoing':
-            builder.append(
-                node_class,
-                with_incoming='main',
-                project=node_project,
-                edge_project=['type', 'label'],
-                edge_filters=edge_filters
-            )
-        else:
-            builder.append(
-                node_class,
-                with_outgoing='main',
-                project=node_project,
-                edge_project=['type', 'label'],
-                edge_filters=edge_filters
-            )
-
-        return [LinkTriple(entry[0], LinkType(entry[1]), entry[2]) for entry in builder.all()]
+        project = 'uuid' if only_uuid else '*'
+        return get_link_triples([self.pk], link_direction, node_class, link_type, link_label_filter, project)[self.pk]
 
     def get_incoming(self, node_class=None, link_type=(), link_label_filter=None, only_uuid=False):
         """Return a list of link triples that are (directly) incoming into this node.
@@ -1024,20 +1155,31 @@ class Node(Entity, metaclass=AbstractNodeMeta):
                 self._store(with_transaction=with_transaction, clean=True)
 
             # Set up autogrouping used by verdi run
-            from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
-            from aiida.orm import Group
+            self._add_to_current_autogroup([self])
 
-            if current_autogroup is not None:
-                if not isinstance(current_autogroup, Autogroup):
-                    raise exceptions.ValidationError('`current_autogroup` is not of type `Autogroup`')
+        return self
 
-                if current_autogroup.is_to_be_grouped(self):
-                    group_label = current_autogroup.get_group_name()
-                    if group_label is not None:
-                        group = Group.objects.get_or_create(label=group_label, type_string=VERDIAUTOGROUP_TYPE)[0]
-                        group.add_nodes(self)
+    @staticmethod
+    def _add_to_current_autogroup(nodes):
+        """Add those of the given stored nodes that should be grouped to the group of the current autogroup, if any.
 
-        return self
+        :param nodes: list of stored nodes
+        """
+        from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+        from aiida.orm import Group
+
+        if current_autogroup is None:
+            return
+
+        if not isinstance(current_autogroup, Autogroup):
+            raise exceptions.ValidationError('`current_autogroup` is not of type `Autogroup`')
+
+        nodes_to_group = [node for node in nodes if current_autogroup.is_to_be_grouped(node)]
+        group_label = current_autogroup.get_group_name()
+
+        if nodes_to_group and group_label is not None:
+            group = Group.objects.get_or_create(label=group_label, type_string=VERDIAUTOGROUP_TYPE)[0]
+            group.add_nodes(nodes_to_group)
 
     def _store(self, with_transaction=True, clean=True):
         """Store the node in the database while saving its attributes and repository directory.
@@ -1061,6 +1203,8 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         self._incoming_cache = list()
         self._backend_entity.set_extra(_HASH_EXTRA_KEY, self.get_hash())
 
+        invalidate_link_cache(*[link_triple.node.pk for link_triple in links])
+
         return self
 
     def verify_are_parents_stored(self):
@@ -1098,10 +1242,15 @@ class Node(Entity, metaclass=AbstractNodeMeta):
 
     def _add_outputs_from_cache(self, cache_node):
         """Replicate the output links and nodes from the cached node onto this node."""
+        nodes = []
+        links = []
+
         for entry in cache_node.get_outgoing(link_type=LinkType.CREATE):
             new_node = entry.node.clone()
-            new_node.add_incoming(self, link_type=LinkType.CREATE, link_label=entry.link_label)
-            new_node.store()
+            nodes.append(new_node)
+            links.append((self, new_node, LinkType.CREATE, entry.link_label))
+
+        Node.objects(self.backend).bulk_store(nodes, links)
 
     def get_hash(self, ignore_errors=True, **kwargs):
         """Return the hash for this node based on its attributes."""
@@ -1131,7 +1280,7 @@ class Node(Entity, metaclass=AbstractNodeMeta):
                 for key, val in self.attributes_items()
                 if key not in self._hash_ignored_attributes and key not in self._updatable_attributes  # pylint: disable=unsupported-membership-test
             },
-            self._repository._get_base_folder(),  # pylint: disable=protected-access
+            self._repository.get_content_digests(),
             self.computer.uuid if self.computer is not None else None
         ]
         return objects
@@ -1200,9 +1349,10 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         if not node_hash or not self._cachable:
             return iter(())
 
-        builder = QueryBuilder()
-        builder.append(self.__class__, filters={'extras._aiida_hash': node_hash}, project='*', subclassing=False)
-        nodes_identical = (n[0] for n in builder.iterall())
+        # Only the pks are selected through the index on the hash, and nodes are loaded one by one, such that the
+        # iteration can stop at the first valid cache without loading all other candidates.
+        pks = self.backend.nodes.get_pks_by_hash(node_hash, self.node_type, self._get_cache_attribute_filters())
+        nodes_identical = (self.__class__.objects(self.backend).get(id=pk) for pk in pks)
 
         return (node for node in nodes_identical if node.is_valid_cache)
 
@@ -1212,6 +1362,16 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         # pylint: disable=no-self-use
         return True
 
+    @classmethod
+    def _get_cache_attribute_filters(cls):
+        """Return the attribute values that any node has to have to be considered a valid cache.
+
+        This allows the part of `is_valid_cache` that only depends on attributes to be evaluated in the database.
+
+        :return: dictionary of attribute keys and their required string values
+        """
+        return {}
+
     def get_description(self):
         """Return a string with a description of the node.
 
@@ -497,6 +497,18 @@ class ProcessNode(Sealable, Node):
 
         return is_valid_cache_func(self)
 
+    @classmethod
+    def _get_cache_attribute_filters(cls):
+        """Return the attribute values that any node has to have to be considered a valid cache.
+
+        Only process nodes that have finished can be a valid cache.
+
+        :return: dictionary of attribute keys and their required string values
+        """
+        filters = super()._get_cache_attribute_filters()
+        filters[cls.PROCESS_STATE_KEY] = ProcessState.FINISHED.value
+        return filters
+
     def _get_objects_to_hash(self):
         """
         Return a list of objects which should be included in the hash.
@@ -10,16 +10,22 @@
 """Utilities for dealing with links between nodes."""
 from collections import namedtuple, OrderedDict
 from collections.abc import Mapping
+from contextlib import contextmanager
 
 from aiida.common import exceptions
 from aiida.common.lang import type_check
 
-__all__ = ('LinkPair', 'LinkTriple', 'LinkManager', 'validate_link')
+__all__ = (
+    'LinkPair', 'LinkTriple', 'LinkManager', 'LinkCache', 'enable_link_cache', 'get_link_cache', 'get_link_triples',
+    'validate_link', 'validate_links', 'validate_links_by_uuid'
+)
 
 LinkPair = namedtuple('LinkPair', ['link_type', 'link_label'])
 LinkTriple = namedtuple('LinkTriple', ['node', 'link_type', 'link_label'])
 LinkQuadruple = namedtuple('LinkQuadruple', ['source_id', 'target_id', 'link_type', 'link_label'])
 
+_LINK_CACHE = None
+
 
 def link_triple_exists(source, target, link_type, link_label):
     """Return whether a link with the given type and label exists between the given source and target node.
@@ -50,6 +56,114 @@ def link_triple_exists(source, target, link_type, link_label):
     return builder.count() != 0
 
 
+def _validate_link_types(source, target, link_type, link_label):
+    """Validate the types of the nodes and the label of a proposed link and return the degree character of its type.
+
+    :param source: the node from which the link is coming
+    :param target: the node to which the link is going
+    :param link_type: the type of link
+    :param link_label: link label
+    :return: tuple of the outdegree and indegree character of the link type
+    :raise TypeError: if `source` or `target` is not a Node instance, or `link_type` is not a `LinkType` enum
+    :raise ValueError: if the proposed link is invalid
+    """
+    from aiida.common.links import LinkType
+    from aiida.orm import Node
+
+    type_check(link_type, LinkType, 'link_type should be a LinkType enum but got: {}'.format(type(link_type)))
+    type_check(source, Node, 'source should be a `Node` but got: {}'.format(type(source)))
+    type_check(target, Node, 'target should be a `Node` but got: {}'.format(type(target)))
+
+    if source.uuid is None or target.uuid is None:
+        raise ValueError('source or target node does not have a UUID')
+
+    return _validate_link_classes(source.uuid, target.uuid, type(source), type(target), link_type, link_label)
+
+
+def _validate_link_classes(source_uuid, target_uuid, source_class, target_class, link_type, link_label):
+    """Validate the classes of the nodes and the label of a proposed link and return the degree character of its type.
+
+    :param source_uuid: the UUID of the node from which the link is coming
+    :param target_uuid: the UUID of the node to which the link is going
+    :param source_class: the class of the node from which the link is coming
+    :param target_class: the class of the node to which the link is going
+    :param link_type: the type of link
+    :param link_label: link label
+    :return: tuple of the outdegree and indegree character of the link type
+    :raise ValueError: if the proposed link is invalid
+    """
+    # yapf: disable
+    from aiida.common.links import LinkType, validate_link_label
+    from aiida.orm import Data, CalculationNode, WorkflowNode
+
+    if source_uuid == target_uuid:
+        raise ValueError('cannot add a link to oneself')
+
+    try:
+        validate_link_label(link_label)
+    except ValueError as exception:
+        raise ValueError('invalid link label `{}`: {}'.format(link_label, exception))
+
+    # For each link type, define a tuple that defines the valid types for the source and target node, as well as
+    # the outdegree and indegree character. If the degree is `unique` that means that there can only be a single
+    # link of this type regardless of the label. If instead it is `unique_label`, an infinite amount of links of that
+    # type can be defined, as long as the link label is unique for the sub set of links of that type. Finally, for
+    # `unique_triple` the triple of node, link type and link label has to be unique.
+    link_mapping = {
+        LinkType.CALL_CALC: (WorkflowNode, CalculationNode, 'unique_triple', 'unique'),
+        LinkType.CALL_WORK: (WorkflowNode, WorkflowNode, 'unique_triple', 'unique'),
+        LinkType.CREATE: (CalculationNode, Data, 'unique_pair', 'unique'),
+        LinkType.INPUT_CALC: (Data, CalculationNode, 'unique_triple', 'unique_pair'),
+        LinkType.INPUT_WORK: (Data, WorkflowNode, 'unique_triple', 'unique_pair'),
+        LinkType.RETURN: (WorkflowNode, Data, 'unique_pair', 'unique_triple'),
+    }
+
+    type_source, type_target, outdegree, indegree = link_mapping[link_type]
+
+    if not issubclass(source_class, type_source) or not issubclass(target_class, type_target):
+        raise ValueError('cannot add a {} link from {} to {}'.format(link_type, source_class, target_class))
+
+    return outdegree, indegree
+
+
+def _validate_link_degrees(source_uuid, target_uuid, link_type, link_label, degrees, outgoing, incoming):
+    """Validate that a proposed link does not violate the uniqueness constraints of the existing links of its nodes.
+
+    :param source_uuid: the UUID of the node from which the link is coming
+    :param target_uuid: the UUID of the node to which the link is going
+    :param link_type: the type of link
+    :param link_label: link label
+    :param degrees: tuple of the outdegree and indegree character of the link type
+    :param outgoing: collection of `LinkTriple` of the existing outgoing links of the source, with the UUID as node
+    :param incoming: collection of `LinkTriple` of the existing incoming links of the target, with the UUID as node
+    :raise ValueError: if the proposed link is invalid
+    """
+    # yapf: disable
+    outdegree, indegree = degrees
+
+    if outdegree == 'unique' and any(triple.link_type == link_type for triple in outgoing):
+        raise ValueError('node<{}> already has an outgoing {} link'.format(source_uuid, link_type))
+
+    elif outdegree == 'unique_pair' and any(triple[1:] == (link_type, link_label) for triple in outgoing):
+        raise ValueError('node<{}> already has an outgoing {} link with label "{}"'.format(
+            source_uuid, link_type, link_label))
+
+    elif outdegree == 'unique_triple' and LinkTriple(target_uuid, link_type, link_label) in outgoing:
+        raise ValueError('node<{}> already has an outgoing {} link with label "{}" from node<{}>'.format(
+            source_uuid, link_type, link_label, target_uuid))
+
+    if indegree == 'unique' and any(triple.link_type == link_type for triple in incoming):
+        raise ValueError('node<{}> already has an incoming {} link'.format(target_uuid, link_type))
+
+    elif indegree == 'unique_pair' and any(triple[1:] == (link_type, link_label) for triple in incoming):
+        raise ValueError('node<{}> already has an incoming {} link with label "{}"'.format(
+            target_uuid, link_type, link_label))
+
+    elif indegree == 'unique_triple' and LinkTriple(source_uuid, link_type, link_label) in incoming:
+        raise ValueError('node<{}> already has an incoming {} link with label "{}" from node<{}>'.format(
+            target_uuid, link_type, link_label, source_uuid))
+
+
 def validate_link(source, target, link_type, link_label):
     """
     Validate adding a link of the given type and label from a given node to ourself.
@@ -113,42 +227,7 @@ def validate_link(source, target, link_type, link_label):
     :raise ValueError: if the proposed link is invalid
     """
     # yapf: disable
-    from aiida.common.links import LinkType, validate_link_label
-    from aiida.orm import Node, Data, CalculationNode, WorkflowNode
-
-    type_check(link_type, LinkType, 'link_type should be a LinkType enum but got: {}'.format(type(link_type)))
-    type_check(source, Node, 'source should be a `Node` but got: {}'.format(type(source)))
-    type_check(target, Node, 'target should be a `Node` but got: {}'.format(type(target)))
-
-    if source.uuid is None or target.uuid is None:
-        raise ValueError('source or target node does not have a UUID')
-
-    if source.uuid == target.uuid:
-        raise ValueError('cannot add a link to oneself')
-
-    try:
-        validate_link_label(link_label)
-    except ValueError as exception:
-        raise ValueError('invalid link label `{}`: {}'.format(link_label, exception))
-
-    # For each link type, define a tuple that defines the valid types for the source and target node, as well as
-    # the outdegree and indegree character. If the degree is `unique` that means that there can only be a single
-    # link of this type regardless of the label. If instead it is `unique_label`, an infinite amount of links of that
-    # type can be defined, as long as the link label is unique for the sub set of links of that type. Finally, for
-    # `unique_triple` the triple of node, link type and link label has to be unique.
-    link_mapping = {
-        LinkType.CALL_CALC: (WorkflowNode, CalculationNode, 'unique_triple', 'unique'),
-        LinkType.CALL_WORK: (WorkflowNode, WorkflowNode, 'unique_triple', 'unique'),
-        LinkType.CREATE: (CalculationNode, Data, 'unique_pair', 'unique'),
-        LinkType.INPUT_CALC: (Data, CalculationNode, 'unique_triple', 'unique_pair'),
-        LinkType.INPUT_WORK: (Data, WorkflowNode, 'unique_triple', 'unique_pair'),
-        LinkType.RETURN: (WorkflowNode, Data, 'unique_pair', 'unique_triple'),
-    }
-
-    type_source, type_target, outdegree, indegree = link_mapping[link_type]
-
-    if not isinstance(source, type_source) or not isinstance(target, type_target):
-        raise ValueError('cannot add a {} link from {} to {}'.format(link_type, type(source), type(target)))
+    outdegree, indegree = _validate_link_types(source, target, link_type, link_label)
 
     if outdegree == 'unique_triple' or indegree == 'unique_triple':
         # For a `unique_triple` degree we just have to check if an identical triple already exist, either in the cache
@@ -186,6 +265,78 @@ def validate_link(source, target, link_type, link_label):
             target.uuid, link_type, link_label, source.uuid))
 
 
+def validate_links(links):
+    """Validate a batch of links that are to be added at once.
+
+    The result is the same as calling `validate_link` for each link in turn, where every link is considered to have
+    been added once it has been validated, such that links within the batch cannot violate each others uniqueness
+    constraints either. However, instead of querying the database for every single link, the existing links of each
+    node involved are retrieved only once.
+
+    :param links: list of tuples of source node, target node, link type and link label
+    :raise TypeError: if a `source` or `target` is not a Node instance, or a `link_type` is not a `LinkType` enum
+    :raise ValueError: if any of the proposed links is invalid
+    """
+    existing_outgoing = {}
+    existing_incoming = {}
+
+    for source, target, link_type, link_label in links:
+
+        degrees = _validate_link_types(source, target, link_type, link_label)
+
+        if source.uuid not in existing_outgoing:
+            existing_outgoing[source.uuid] = source.get_outgoing(only_uuid=True).all() if source.is_stored else []
+
+        if target.uuid not in existing_incoming:
+            existing_incoming[target.uuid] = target.get_incoming(only_uuid=True).all()
+
+        outgoing = existing_outgoing[source.uuid]
+        incoming = existing_incoming[target.uuid]
+
+        _validate_link_degrees(source.uuid, target.uuid, link_type, link_label, degrees, outgoing, incoming)
+
+        outgoing.append(LinkTriple(target.uuid, link_type, link_label))
+        incoming.append(LinkTriple(source.uuid, link_type, link_label))
+
+
+def validate_links_by_uuid(links, node_classes, existing_outgoing, existing_incoming):
+    """Validate a batch of links between nodes that are identified by their UUID and return the ones that are new.
+
+    This is the equivalent of `validate_links` for when loading the nodes is too expensive, for example when importing
+    an archive: the classes of the nodes and their existing links have to be provided instead. Unlike `validate_links`,
+    a link whose triple already exists is not considered invalid but is skipped, since adding it would have no effect.
+
+    :param links: iterable of tuples of source UUID, target UUID, link type and link label
+    :param node_classes: dictionary mapping the UUID of every node involved onto its class
+    :param existing_outgoing: dictionary mapping the UUID of nodes onto a set of `LinkTriple` of their existing outgoing
+        links, with the UUID as node. Nodes that are not included have no outgoing links. The validated links are added.
+    :param existing_incoming: dictionary mapping the UUID of nodes onto a set of `LinkTriple` of their existing incoming
+        links, with the UUID as node. Nodes that are not included have no incoming links. The validated links are added.
+    :return: list of the links that do not exist yet, in the order in which they were passed
+    :raise ValueError: if any of the proposed links is invalid
+    """
+    new_links = []
+
+    for source_uuid, target_uuid, link_type, link_label in links:
+
+        outgoing = existing_outgoing.setdefault(source_uuid, set())
+        incoming = existing_incoming.setdefault(target_uuid, set())
+
+        if LinkTriple(target_uuid, link_type, link_label) in outgoing:
+            continue
+
+        degrees = _validate_link_classes(
+            source_uuid, target_uuid, node_classes[source_uuid], node_classes[target_uuid], link_type, link_label
+        )
+        _validate_link_degrees(source_uuid, target_uuid, link_type, link_label, degrees, outgoing, incoming)
+
+        outgoing.add(LinkTriple(target_uuid, link_type, link_label))
+        incoming.add(LinkTriple(source_uuid, link_type, link_label))
+        new_links.append((source_uuid, target_uuid, link_type, link_label))
+
+    return new_links
+
+
 class LinkManager:
     """
     Class to convert a list of LinkTriple tuples into an iterator.
@@ -340,3 +491,208 @@ class LinkManager:
             return OrderedDict(sorted(nested.items(), key=lambda x: (not isinstance(x[1], Mapping), x)))
 
         return nested
+
+
+class LinkCache:
+    """Cache of the stored link triples of nodes, keyed on the pk of the node and the direction of the links.
+
+    The cached link triples contain the full node instances, such that any filter or projection can be applied to them.
+    """
+
+    def __init__(self):
+        self._link_triples = {}
+
+    def get(self, node_pk, link_direction):
+        """Return the cached link triples of the given node in the given direction.
+
+        :param node_pk: the pk of the node
+        :param link_direction: `incoming` or `outgoing`
+        :return: list of `LinkTriple` or None if the links of the node are not cached
+        """
+        return self._link_triples.get((node_pk, link_direction), None)
+
+    def set(self, node_pk, link_direction, link_triples):
+        """Cache the link triples of the given node in the given direction.
+
+        :param node_pk: the pk of the node
+        :param link_direction: `incoming` or `outgoing`
+        :param link_triples: list of all the stored `LinkTriple` of the node in that direction
+        """
+        self._link_triples[(node_pk, link_direction)] = link_triples
+
+    def invalidate(self, *node_pks):
+        """Remove the cached link triples, in both directions, of the given nodes.
+
+        :param node_pks: the pks of the nodes
+        """
+        for node_pk in node_pks:
+            for link_direction in ('incoming', 'outgoing'):
+                self._link_triples.pop((node_pk, link_direction), None)
+
+    def clear(self):
+        """Remove all cached link triples."""
+        self._link_triples.clear()
+
+
+@contextmanager
+def enable_link_cache():
+    """Context manager within which the stored links of nodes are cached.
+
+    Repeatedly navigating the same part of the provenance graph, with `Node.get_incoming`, `Node.get_outgoing` or the
+    bulk variants of the `Node.objects` collection, then queries the links of each node only once. Links that are added
+    through this interpreter invalidate the cached links of the nodes involved.
+
+    .. warning:: links added by other interpreters, for example the daemon, and deleted nodes are not reflected by
+        the cache, which is why it has to be enabled explicitly.
+
+    Nested contexts share the cache of the outermost context.
+
+    :return: the `LinkCache` instance
+    """
+    # pylint: disable=global-statement
+    global _LINK_CACHE
+
+    if _LINK_CACHE is not None:
+        yield _LINK_CACHE
+        return
+
+    _LINK_CACHE = LinkCache()
+
+    try:
+        yield _LINK_CACHE
+    finally:
+        _LINK_CACHE = None
+
+
+def get_link_cache():
+    """Return the current link cache.
+
+    :return: the `LinkCache` instance if the link cache is enabled, None otherwise
+    """
+    return _LINK_CACHE
+
+
+def invalidate_link_cache(*node_pks):
+    """Remove the cached links of the given nodes, if the link cache is enabled.
+
+    :param node_pks: the pks of the nodes
+    """
+    if _LINK_CACHE is not None:
+        _LINK_CACHE.invalidate(*node_pks)
+
+
+def get_link_triples(
+    node_pks, link_direction='incoming', node_class=None, link_type=(), link_label_filter=None, project='*'
+):
+    """Return the stored link triples directly incoming to or outgoing of each of the given nodes.
+
+    The link triples of all nodes are retrieved with a single query, per batch of `db.batch_size` nodes. If the link
+    cache is enabled, see `enable_link_cache`, only the links of nodes that are not yet cached are queried.
+
+    Note this will only return link triples that are stored in the database. Anything in the cache of unstored links
+    of a node is ignored.
+
+    :param node_pks: iterable of the pks of the nodes
+    :param link_direction: `incoming` or `outgoing` to get the incoming or outgoing links, respectively.
+    :param node_class: If specified, should be a class, and it filters only elements of that (subclass of) type
+    :param link_type: Only get links of this link type, if empty tuple then returns all links of all link types.
+    :param link_label_filter: filters the linked nodes by their link label. This should be a pattern as one would pass
+        directly to a QueryBuilder filter statement with the 'like' operation.
+    :param project: the property of the linked nodes to project onto the `LinkTriple.node` entries, for example
+        `id`, `uuid` or `node_type`, or `*` for the node instance
+    :return: dictionary mapping each of the pks onto the list of its `LinkTriple`
+    :raise TypeError: if `link_type` is not a `LinkType` or tuple of `LinkType`
+    :raise ValueError: if `link_direction` is invalid
+    """
+    from aiida.common.escaping import sql_string_match
+    from aiida.common.links import LinkType
+
+    if link_direction not in ('incoming', 'outgoing'):
+        raise ValueError("link_direction should be 'incoming' or 'outgoing' but got: {}".format(link_direction))
+
+    if not isinstance(link_type, tuple):
+        link_type = (link_type,)
+
+    if link_type and not all([isinstance(t, LinkType) for t in link_type]):
+        raise TypeError('link_type should be a LinkType or tuple of LinkType: got {}'.format(link_type))
+
+    node_pks = list(OrderedDict.fromkeys(node_pks))
+    result = {pk: [] for pk in node_pks}
+    cache = get_link_cache()
+
+    if cache is None:
+        for pk, link_triple in _query_link_triples(
+            node_pks, link_direction, node_class, link_type, link_label_filter, project
+        ):
+            result[pk].append(link_triple)
+        return result
+
+    # The cache contains all the links of a node, such that the filters and the projection are applied in Python
+    uncached = {pk: [] for pk in node_pks if cache.get(pk, link_direction) is None}
+
+    for pk, link_triple in _query_link_triples(list(uncached), link_direction, None, (), None, '*'):
+        uncached[pk].append(link_triple)
+
+    for pk, link_triples in uncached.items():
+        cache.set(pk, link_direction, link_triples)
+
+    for pk in node_pks:
+        for link_triple in cache.get(pk, link_direction):
+
+            if node_class is not None and not isinstance(link_triple.node, node_class):
+                continue
+
+            if link_type and link_triple.link_type not in link_type:
+                continue
+
+            if link_label_filter and not sql_string_match(string=link_triple.link_label, pattern=link_label_filter):
+                continue
+
+            if project != '*':
+                node = getattr(link_triple.node, project)
+                link_triple = LinkTriple(node, link_triple.link_type, link_triple.link_label)
+
+            result[pk].append(link_triple)
+
+    return result
+
+
+def _query_link_triples(node_pks, link_direction, node_class, link_type, link_label_filter, project):
+    """Query the stored link triples of the given nodes, in batches of `db.batch_size` nodes.
+
+    See `get_link_triples` for the meaning of the arguments.
+
+    :return: generator of tuples of the pk of the node and a `LinkTriple`
+    """
+    from aiida.common.links import LinkType
+    from aiida.manage.configuration import get_config_option
+    from aiida.orm import Node, QueryBuilder
+
+    edge_filters = {}
+
+    if link_type:
+        edge_filters['type'] = {'in': [t.value for t in link_type]}
+
+    if link_label_filter:
+        edge_filters['label'] = {'like': link_label_filter}
+
+    if link_direction == 'outgoing':
+        relationship = {'with_incoming': 'main'}
+    else:
+        relationship = {'with_outgoing': 'main'}
+
+    batch_size = get_config_option('db.batch_size')
+
+    for start in range(0, len(node_pks), batch_size):
+        builder = QueryBuilder()
+        builder.append(Node, filters={'id': {'in': node_pks[start:start + batch_size]}}, project=['id'], tag='main')
+        builder.append(
+            node_class or Node,
+            project=[project],
+            edge_project=['type', 'label'],
+            edge_filters=edge_filters,
+            **relationship
+        )
+
+        for pk, node, link_type_value, link_label in builder.all():
+            yield pk, LinkTriple(node, LinkType(link_type_value), link_label)
@@ -11,10 +11,13 @@
 
 import collections
 import enum
+import functools
+import io
 import os
 
 from aiida.common import exceptions
 from aiida.common.folders import RepositoryFolder, SandboxFolder
+from aiida.manage.configuration import get_config_option
 
 
 class FileType(enum.Enum):
@@ -33,10 +36,19 @@ class Repository:
     _section_name = 'node'
 
     def __init__(self, uuid, is_stored, base_path=None):
+        self._uuid = uuid
         self._is_stored = is_stored
         self._base_path = base_path
         self._temp_folder = None
         self._repo_folder = RepositoryFolder(section=self._section_name, uuid=uuid)
+        self._container = None
+        self._manifest = None
+        self._digests = None
+        self._digests_persisted = False
+
+        if get_config_option('repository.backend') == 'container':
+            from aiida.repository import get_container
+            self._container = get_container()
 
     def __del__(self):
         """Clean the sandboxfolder if it was instantiated."""
@@ -68,6 +80,20 @@ class Repository:
         :param key: fully qualified identifier for the object within the repository
         :return: a list of `File` named tuples representing the objects present in directory with the given key
         """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            directory = self._get_manifest_entry(manifest, key)
+
+            if not isinstance(directory, dict):
+                raise NotADirectoryError('object {} is not a directory'.format(key))
+
+            objects = [
+                File(name, FileType.DIRECTORY if isinstance(value, dict) else FileType.FILE)
+                for name, value in directory.items()
+            ]
+            return sorted(objects, key=lambda x: x.name)
+
         folder = self._get_base_folder()
 
         if key:
@@ -97,6 +123,24 @@ class Repository:
         :param key: fully qualified identifier for the object within the repository
         :param mode: the mode under which to open the handle
         """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            if any(char in mode for char in 'wax+'):
+                raise exceptions.ModificationNotAllowed('cannot modify the repository after the node has been stored')
+
+            hashkey = self._get_manifest_entry(manifest, key)
+
+            if isinstance(hashkey, dict):
+                raise IsADirectoryError('object {} is a directory'.format(key))
+
+            handle = self._get_container().open_object(hashkey)
+
+            if 'b' in mode:
+                return handle
+
+            return io.TextIOWrapper(handle, encoding='utf8')
+
         return open(self._get_base_folder().get_abs_path(key), mode=mode)
 
     def get_object(self, key):
@@ -113,6 +157,16 @@ class Repository:
         except ValueError:
             directory, filename = None, key
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            try:
+                entry = self._get_manifest_entry(manifest, key)
+            except FileNotFoundError:
+                raise IOError('object {} does not exist'.format(key))
+
+            return File(filename, FileType.DIRECTORY if isinstance(entry, dict) else FileType.FILE)
+
         folder = self._get_base_folder()
 
         if directory:
@@ -168,6 +222,8 @@ class Repository:
         else:
             folder.insert_path(path)
 
+        self._update_manifest()
+
     def put_object_from_file(self, path, key, mode=None, encoding=None, force=False):
         """Store a new object under `key` with contents of the file located at `path` on this file system.
 
@@ -233,6 +289,8 @@ class Repository:
 
         folder.create_file_from_filelike(handle, key, mode=mode, encoding=encoding)
 
+        self._update_manifest()
+
     def delete_object(self, key, force=False):
         """Delete the object from the repository.
 
@@ -250,6 +308,8 @@ class Repository:
 
         self._get_base_folder().remove_path(key)
 
+        self._update_manifest()
+
     def erase(self, force=False):
         """Delete the repository folder.
 
@@ -262,14 +322,68 @@ class Repository:
         if not force:
             self.validate_mutability()
 
+        if self._get_manifest() is not None:
+            self._get_container().delete_manifest(self._uuid)
+            self._manifest = None
+
+            if self._temp_folder is not None:
+                self._temp_folder.erase()
+                self._temp_folder = None
+
         self._repo_folder.erase()
 
+        if self._container is not None or self._get_container().is_initialised:
+            self._get_container().delete_file_digests(self._uuid)
+
+        self._digests = None
+        self._digests_persisted = False
+
+    def exists(self):
+        """Return whether the repository of the stored node exists.
+
+        :return: boolean, True if either the manifest or the repository folder of the node exists
+        """
+        return self._get_manifest() is not None or self._repo_folder.exists()
+
+    def replace_with_tree(self, path, move=False):
+        """Replace the entire content of the stored repository, including the base path, with the directory at `path`.
+
+        .. warning:: This bypasses the mutability check and should only be used when creating the repository of a node
+            that has been stored through other means than `Node.store`, for example when importing an archive.
+
+        :param path: absolute path of the directory whose content to use
+        :param move: if True, the content is moved instead of copied where possible
+        """
+        if self._container is not None:
+            self._repo_folder.erase()
+            self._manifest = self._get_container().add_tree(path, move=move)
+            self._container.set_manifest(self._uuid, self._manifest)
+        else:
+            self._repo_folder.replace_with_folder(path, move=move, overwrite=True)
+
     def store(self):
         """Store the contents of the sandbox folder into the repository folder."""
         if self._is_stored:
             raise exceptions.ModificationNotAllowed('repository is already stored')
 
-        self._repo_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+        if self._container is not None:
+            # Digests cached for the sandbox files are validated by size and modification time, but for objects in the
+            # container by their hash key, so only the digests that are still valid are carried over.
+            digests = self._get_valid_digests()
+
+            # The sandbox is in the repository, so moving the files into the container avoids rewriting their content
+            self._manifest = self._get_container().add_tree(self._get_temp_folder().abspath, move=True)
+            self._container.set_manifest(self._uuid, self._manifest)
+            self._temp_folder.erase()
+            self._temp_folder = None
+
+            self._digests = {
+                relpath: (self._get_manifest_entry(self._manifest, relpath), digest)
+                for relpath, digest in digests.items()
+            }
+        else:
+            self._repo_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
+
         self._is_stored = True
 
     def restore(self):
@@ -277,15 +391,248 @@ class Repository:
         if not self._is_stored:
             raise exceptions.ModificationNotAllowed('repository is not yet stored')
 
-        self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+        if self._get_manifest() is not None:
+            # Materialize the objects in the sandbox folder before removing the manifest
+            self._get_temp_folder()
+            self._get_container().delete_manifest(self._uuid)
+            self._manifest = None
+        else:
+            self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+
         self._is_stored = False
 
+    def get_content_digests(self):
+        """Return the digests of the content of all objects in the repository, for the purpose of hashing the node.
+
+        The content of each object is streamed to compute its digest, which is then cached together with a validator:
+        the size and modification time for a file in a folder and the hash key for an object in the object container.
+        A digest is only recomputed if its validator changed. Once the node is stored, the digests are persisted, such
+        that hashing a stored node does not require reading the content of its objects again.
+
+        :return: a `FolderDigests` instance whose hash is identical to that of the base folder of the repository
+        """
+        from aiida.common.hashing import FolderDigests
+
+        cache = self._get_digest_cache()
+        used = {}
+        computed = {}
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            entry = self._get_manifest_entry(manifest, None)
+            digests = self._get_manifest_digests(entry, '', cache, used, computed)
+        else:
+            digests = self._get_folder_digests(self._get_base_folder().abspath, '', cache, used, computed)
+
+        cache.update(computed)
+
+        if self._is_stored and (computed or not self._digests_persisted):
+            self._get_container().set_file_digests(self._uuid, computed if self._digests_persisted else used)
+            self._digests_persisted = True
+
+        return FolderDigests(digests)
+
+    def get_object_digest(self, key):
+        """Return the digest of the content of the object identified by key.
+
+        The digest is the same as the one used for hashing the node, see `get_content_digests`, and is taken from the
+        same cache, such that the content of the object is only read if its digest is not known yet.
+
+        :param key: fully qualified identifier for the object within the repository
+        :return: the hexadecimal digest
+        :raises IsADirectoryError: if the object is a directory
+        :raises FileNotFoundError: if no object with the given key exists
+        """
+        self.validate_object_key(key)
+
+        cache = self._get_digest_cache()
+        computed = {}
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            hashkey = self._get_manifest_entry(manifest, key)
+
+            if isinstance(hashkey, dict):
+                raise IsADirectoryError('object {} is a directory'.format(key))
+
+            validator = hashkey
+            opener = functools.partial(self._get_container().open_object, hashkey)
+        else:
+            filepath = self._get_base_folder().get_abs_path(key)
+
+            if os.path.isdir(filepath):
+                raise IsADirectoryError('object {} is a directory'.format(key))
+
+            stat = os.stat(filepath)
+            validator = '{}:{}'.format(stat.st_size, stat.st_mtime_ns)
+            opener = functools.partial(open, filepath, 'rb')
+
+        digest = self._get_digest(os.path.normpath(key), validator, opener, cache, {}, computed)
+        cache.update(computed)
+
+        if self._is_stored and computed and self._digests_persisted:
+            self._get_container().set_file_digests(self._uuid, computed)
+
+        return digest.hex()
+
+    def iter_tree(self):
+        """Return an iterator over the entire content of the stored repository, including the base path.
+
+        Contrary to `_get_tree_folder`, the objects of a repository that are kept in the object container are not copied
+        to a sandbox folder first, such that their content can be streamed elsewhere directly.
+
+        :return: iterator over tuples of the path of an object relative to the root of the repository and a callable
+            that returns a binary file handle to its content. The callable is None for directories, which are yielded
+            before the objects they contain.
+        :raises IOError: if the repository does not exist
+        """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            return self._iter_manifest(manifest, '')
+
+        if not self._repo_folder.exists():
+            raise IOError('the repository of node {} does not exist'.format(self._uuid))
+
+        return self._iter_folder(self._repo_folder.abspath, '')
+
+    def _iter_manifest(self, manifest, relpath):
+        """Return an iterator over the objects of the given manifest, see `iter_tree`."""
+        for name, value in sorted(manifest.items()):
+            entry_relpath = os.path.join(relpath, name)
+
+            if isinstance(value, dict):
+                yield entry_relpath, None
+                yield from self._iter_manifest(value, entry_relpath)
+            else:
+                yield entry_relpath, functools.partial(self._get_container().open_object, value)
+
+    def _iter_folder(self, path, relpath):
+        """Return an iterator over the files in the directory at `path`, see `iter_tree`."""
+        for entry in sorted(os.scandir(path), key=lambda entry: entry.name):
+            entry_relpath = os.path.join(relpath, entry.name)
+
+            if entry.is_dir():
+                yield entry_relpath, None
+                yield from self._iter_folder(entry.path, entry_relpath)
+            else:
+                yield entry_relpath, functools.partial(open, entry.path, 'rb')
+
+    def _get_digest_cache(self):
+        """Return the cache of file digests, loading the persisted digests if the repository is stored.
+
+        :return: dictionary mapping the path of each file relative to the base folder onto a tuple of validator and
+            hexadecimal digest
+        """
+        if self._digests is None:
+            self._digests = {}
+
+            if self._is_stored and (self._container is not None or self._get_container().is_initialised):
+                self._digests = self._get_container().get_file_digests(self._uuid)
+                self._digests_persisted = True
+
+        return self._digests
+
+    def _get_valid_digests(self):
+        """Return the cached digests of the files in the sandbox folder whose size and modification time did not change.
+
+        :return: dictionary mapping the path of each file relative to the base folder onto its hexadecimal digest
+        """
+        base_path = self._get_base_folder().abspath
+        digests = {}
+
+        for relpath, (validator, digest) in self._get_digest_cache().items():
+            try:
+                stat = os.stat(os.path.join(base_path, relpath))
+            except OSError:
+                continue
+
+            if validator == '{}:{}'.format(stat.st_size, stat.st_mtime_ns):
+                digests[relpath] = digest
+
+        return digests
+
+    def _get_folder_digests(self, path, relpath, cache, used, computed):
+        """Return the nested dictionary of content digests of the files in the directory at `path`.
+
+        :param path: absolute path of the directory
+        :param relpath: path of the directory relative to the base folder
+        :param cache: the digest cache, see `_get_digest_cache`
+        :param used: dictionary to which all digests that are returned are added in the format of the cache
+        :param computed: dictionary to which all digests that had to be computed are added in the format of the cache
+        :return: nested dictionary of digests
+        """
+        digests = {}
+
+        for entry in os.scandir(path):
+            entry_relpath = os.path.join(relpath, entry.name)
+
+            if entry.is_dir():
+                digests[entry.name] = self._get_folder_digests(entry.path, entry_relpath, cache, used, computed)
+            else:
+                stat = entry.stat()
+                validator = '{}:{}'.format(stat.st_size, stat.st_mtime_ns)
+                opener = functools.partial(open, entry.path, 'rb')
+                digests[entry.name] = self._get_digest(entry_relpath, validator, opener, cache, used, computed)
+
+        return digests
+
+    def _get_manifest_digests(self, manifest, relpath, cache, used, computed):
+        """Return the nested dictionary of content digests of the objects in the given manifest.
+
+        :param manifest: the manifest dictionary of a directory
+        :param relpath: path of the directory relative to the base folder
+        :param cache: the digest cache, see `_get_digest_cache`
+        :param used: dictionary to which all digests that are returned are added in the format of the cache
+        :param computed: dictionary to which all digests that had to be computed are added in the format of the cache
+        :return: nested dictionary of digests
+        """
+        digests = {}
+
+        for name, value in manifest.items():
+            entry_relpath = os.path.join(relpath, name)
+
+            if isinstance(value, dict):
+                digests[name] = self._get_manifest_digests(value, entry_relpath, cache, used, computed)
+            else:
+                opener = functools.partial(self._get_container().open_object, value)
+                digests[name] = self._get_digest(entry_relpath, value, opener, cache, used, computed)
+
+        return digests
+
+    @staticmethod
+    def _get_digest(relpath, validator, opener, cache, used, computed):
+        """Return the content digest of a single object, from the cache if the validator matches.
+
+        :param relpath: path of the object relative to the base folder
+        :param validator: string that changes whenever the content of the object changes
+        :param opener: callable that returns a binary file handle to the object
+        :return: the digest as bytes
+        """
+        from aiida.common.hashing import get_file_content_digest
+
+        cached = cache.get(relpath)
+
+        if cached is not None and cached[0] == validator:
+            digest = cached[1]
+        else:
+            with opener() as handle:
+                digest = get_file_content_digest(handle).hex()
+            computed[relpath] = (validator, digest)
+
+        used[relpath] = (validator, digest)
+
+        return bytes.fromhex(digest)
+
     def _get_base_folder(self):
         """Return the base sub folder in the repository.
 
+        .. note:: for a stored repository whose objects are kept in the object container, the objects are copied to a
+            sandbox folder the first time this is called, so the returned folder should be treated as read-only.
+
         :return: a Folder object.
         """
-        if self._is_stored:
+        if self._is_stored and self._get_manifest() is None:
             folder = self._repo_folder
         else:
             folder = self._get_temp_folder()
@@ -296,6 +643,23 @@ class Repository:
 
         return folder
 
+    def _get_tree_folder(self):
+        """Return the folder with the entire content of the stored repository, including the base path.
+
+        .. note:: for a repository whose objects are kept in the object container, the objects are copied to a sandbox
+            folder, so the returned folder should be treated as read-only.
+
+        :return: a Folder object.
+        :raises IOError: if the repository does not exist
+        """
+        if self._get_manifest() is not None:
+            return self._get_temp_folder()
+
+        if not self._repo_folder.exists():
+            raise IOError('the repository of node {} does not exist'.format(self._uuid))
+
+        return self._repo_folder
+
     def _get_temp_folder(self):
         """Return the temporary sandbox folder.
 
@@ -304,4 +668,75 @@ class Repository:
         if self._temp_folder is None:
             self._temp_folder = SandboxFolder()
 
+            manifest = self._get_manifest()
+
+            if manifest is not None:
+                self._get_container().extract_tree(manifest, self._temp_folder.abspath)
+
         return self._temp_folder
+
+    def _get_container(self):
+        """Return the object container, even if the container backend is not the one that is currently configured.
+
+        :return: a `Container` instance
+        """
+        if self._container is not None:
+            return self._container
+
+        from aiida.repository import get_container
+        return get_container()
+
+    def _get_manifest(self):
+        """Return the manifest of the stored repository if its objects are kept in the object container.
+
+        Nodes stored with the folder backend remain readable when the container backend is configured and vice versa,
+        so that the repository of a profile can be migrated incrementally.
+
+        :return: the manifest dictionary or None if the repository is not stored or is stored as a folder
+        """
+        if not self._is_stored:
+            return None
+
+        if self._manifest is None:
+            if self._container is not None:
+                self._manifest = self._container.get_manifest(self._uuid)
+            elif not self._repo_folder.exists():
+                container = self._get_container()
+                if container.is_initialised:
+                    self._manifest = container.get_manifest(self._uuid)
+
+        return self._manifest
+
+    def _get_manifest_entry(self, manifest, key):
+        """Return the entry of the manifest for the object identified by key.
+
+        :param manifest: the manifest dictionary
+        :param key: fully qualified identifier for the object within the repository
+        :return: a dictionary if the object is a directory, otherwise the hash key of the object
+        :raises FileNotFoundError: if no object with the given key exists
+        """
+        entry = manifest
+
+        if self._base_path is not None:
+            for part in self._base_path.split(os.sep):
+                entry = entry.get(part, {})
+
+        if not key:
+            return entry
+
+        for part in os.path.normpath(key).split(os.sep):
+            if part == os.curdir:
+                continue
+
+            if not isinstance(entry, dict) or part not in entry:
+                raise FileNotFoundError('object {} does not exist'.format(key))
+
+            entry = entry[part]
+
+        return entry
+
+    def _update_manifest(self):
+        """Update the manifest from the sandbox folder after the repository of a stored node was forcibly modified."""
+        if self._get_manifest() is not None:
+            self._manifest = self._get_container().add_tree(self._temp_folder.abspath)
+            self._get_container().set_manifest(self._uuid, self._manifest)
@@ -30,6 +30,11 @@ _ATTRIBUTE_DICT_TAG = '!aiida_attributedict'
 _PLUMPY_ATTRIBUTES_FROZENDICT_TAG = '!plumpy:attributes_frozendict'
 _PLUMPY_BUNDLE = '!plumpy:bundle'
 
+# Use the bindings to the LibYAML C library for emitting and parsing if they are available, which is significantly
+# faster than the pure Python implementation. The representers and constructors are implemented in Python either way.
+_DUMPER_BASE = yaml.CDumper if yaml.__with_libyaml__ else yaml.Dumper
+_LOADER_BASE = yaml.CFullLoader if yaml.__with_libyaml__ else yaml.FullLoader
+
 
 def represent_node(dumper, node):
     """Represent a node in yaml.
@@ -159,10 +164,11 @@ def bundle_constructor(loader, bundle):
     return bundle
 
 
-class AiiDADumper(yaml.Dumper):
+class AiiDADumper(_DUMPER_BASE):
     """Custom AiiDA yaml dumper.
 
     Needed so that we don't have to encode each type in the AiiDA graph hierarchy separately using a custom representer.
+    If LibYAML is available, the `CDumper` is subclassed instead of the pure Python `Dumper`.
     """
 
     def represent_data(self, data):
@@ -176,13 +182,14 @@ class AiiDADumper(yaml.Dumper):
         return super().represent_data(data)
 
 
-class AiiDALoader(yaml.FullLoader):
+class AiiDALoader(_LOADER_BASE):
     """AiiDA specific yaml loader
 
     .. note:: we subclass the `FullLoader` which is the one that since `pyyaml>=5.1` is the loader that prevents
         arbitrary code execution. Even though this is in principle only used internally, one could imagine someone
         sharing a database with a maliciously crafted process instance dump, which when reloaded could execute arbitrary
         code. This load prevents this: https://github.com/yaml/pyyaml/wiki/PyYAML-yaml.load(input)-Deprecation
+        If LibYAML is available, the equivalent `CFullLoader` is subclassed instead.
     """
 
 
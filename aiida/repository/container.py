@@ -0,0 +1,638 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Content-addressable object store in which the content of each file is stored only once.
+
+Objects are identified by the SHA-256 hash of their content. Newly added objects are first written as individual
+"loose" files, sharded on the first two characters of their hash. Loose objects can then be concatenated into a small
+number of large pack files through `Container.pack_loose_objects`, which drastically reduces the number of inodes that
+are used by the repository. The location of each packed object is recorded in an SQLite index that is stored in the
+container folder as well. The same index also stores the manifests that map the file hierarchy of each node onto the
+hash keys of its objects.
+"""
+import contextlib
+import errno
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+__all__ = ('Container', 'get_container')
+
+# Size of the chunks in which objects are read when hashing or copying them
+CHUNK_SIZE = 2**16
+
+# Approximate size in bytes after which a new pack file will be started
+PACK_SIZE_TARGET = 4 * 1024**3
+
+# Number of objects after which the index is committed while packing loose objects
+PACK_COMMIT_INTERVAL = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packed_object (
+    hashkey TEXT PRIMARY KEY,
+    pack_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manifest (
+    uuid TEXT PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_digest (
+    uuid TEXT NOT NULL,
+    path TEXT NOT NULL,
+    validator TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (uuid, path)
+);
+"""
+
+_CONTAINERS = {}
+
+
+def get_container():
+    """Return the object container of the currently loaded profile.
+
+    :return: a `Container` instance located in the repository folder of the current profile
+    """
+    from aiida.manage.configuration import get_profile
+
+    folder = os.path.join(get_profile().repository_path, 'container')
+
+    try:
+        return _CONTAINERS[folder]
+    except KeyError:
+        container = Container(folder)
+        _CONTAINERS[folder] = container
+        return container
+
+
+class PackedObjectReader(io.RawIOBase):
+    """Read-only file-like object that exposes a single object that is stored in a pack file."""
+
+    def __init__(self, fhandle, offset, length):
+        """Construct a new reader.
+
+        :param fhandle: a binary file handle of the pack file, that will be closed when this reader is closed
+        :param offset: the offset in bytes of the start of the object within the pack file
+        :param length: the length in bytes of the object
+        """
+        super().__init__()
+        self._fhandle = fhandle
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = pos
+        elif whence == io.SEEK_CUR:
+            position = self._pos + pos
+        elif whence == io.SEEK_END:
+            position = self._length + pos
+        else:
+            raise ValueError('invalid value for `whence`: {}'.format(whence))
+
+        if position < 0:
+            raise ValueError('negative seek position {}'.format(position))
+
+        self._pos = position
+        return position
+
+    def readinto(self, buffer):
+        remaining = self._length - self._pos
+
+        if remaining <= 0:
+            return 0
+
+        size = min(len(buffer), remaining)
+        self._fhandle.seek(self._offset + self._pos)
+        data = self._fhandle.read(size)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._fhandle.close()
+        super().close()
+
+
+class Container:
+    """Content-addressable object store located in a single folder on the local file system."""
+
+    _index_filename = 'index.sqlite'
+    _loose_dirname = 'loose'
+    _packs_dirname = 'packs'
+    _sandbox_dirname = 'sandbox'
+    _lock_filename = 'packs.lock'
+
+    def __init__(self, folder):
+        """Construct a new container instance.
+
+        :param folder: absolute path of the folder of the container, which will be created when first used
+        """
+        self._folder = folder
+        self._local = threading.local()
+
+    def __repr__(self):
+        return '<{}: {}>'.format(self.__class__.__name__, self._folder)
+
+    @property
+    def folder(self):
+        """Return the absolute path of the folder of the container."""
+        return self._folder
+
+    @property
+    def is_initialised(self):
+        """Return whether the container folder and its index have been created."""
+        return os.path.isfile(os.path.join(self._folder, self._index_filename))
+
+    def init_container(self):
+        """Create the container folder structure and the index, if they do not already exist."""
+        for dirname in [self._loose_dirname, self._packs_dirname, self._sandbox_dirname]:
+            os.makedirs(os.path.join(self._folder, dirname), exist_ok=True)
+
+        connection = sqlite3.connect(os.path.join(self._folder, self._index_filename), timeout=60)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            connection.commit()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def get_hash_from_filelike(handle):
+        """Return the hash key for the content of the given binary file-like object, reading it in chunks.
+
+        :param handle: a binary file-like object
+        :return: the hexadecimal SHA-256 digest of the content
+        """
+        hasher = hashlib.sha256()
+
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def add_object(self, handle):
+        """Add an object with the content of the given binary file-like object.
+
+        The content is streamed to a temporary file while being hashed, such that the memory usage is independent of
+        the object size. If an object with the same content already exists, the new copy is discarded.
+
+        :param handle: a binary file-like object
+        :return: the hash key of the object
+        """
+        hasher = hashlib.sha256()
+        fdesc, temp_path = tempfile.mkstemp(dir=self._get_sandbox_folder())
+
+        try:
+            with os.fdopen(fdesc, 'wb') as target:
+                for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+                    target.write(chunk)
+            hashkey = hasher.hexdigest()
+            self._move_to_loose(temp_path, hashkey)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return hashkey
+
+    def add_object_from_path(self, path, move=False):
+        """Add an object with the content of the file at the given path.
+
+        :param path: absolute path of the file on the local file system
+        :param move: if True, the file is moved into the container instead of copied, which avoids rewriting the
+            content when the file is on the same file system. The file at `path` will no longer exist afterwards.
+        :return: the hash key of the object
+        """
+        if not move:
+            with open(path, 'rb') as handle:
+                return self.add_object(handle)
+
+        with open(path, 'rb') as handle:
+            hashkey = self.get_hash_from_filelike(handle)
+
+        self._move_to_loose(path, hashkey)
+
+        return hashkey
+
+    def has_object(self, hashkey):
+        """Return whether an object with the given hash key exists in the container.
+
+        :param hashkey: the hash key of the object
+        """
+        return os.path.isfile(self._get_loose_path(hashkey)) or self._get_packed_location(hashkey) is not None
+
+    def open_object(self, hashkey):
+        """Return a binary file handle to the object with the given hash key.
+
+        :param hashkey: the hash key of the object
+        :return: a readable and seekable binary file-like object
+        :raises FileNotFoundError: if the object does not exist
+        """
+        # The loose object has to be checked before the index, because when objects are packed the index is updated
+        # before the loose objects are removed, so in this order a concurrent packing will never be missed.
+        try:
+            return open(self._get_loose_path(hashkey), 'rb')
+        except FileNotFoundError:
+            pass
+
+        location = self._get_packed_location(hashkey)
+
+        if location is None:
+            raise FileNotFoundError('object with hash key `{}` does not exist'.format(hashkey))
+
+        pack_id, offset, length = location
+        fhandle = open(self._get_pack_path(pack_id), 'rb', buffering=0)
+
+        return io.BufferedReader(PackedObjectReader(fhandle, offset, length), buffer_size=CHUNK_SIZE)
+
+    def get_object_content(self, hashkey):
+        """Return the content of the object with the given hash key.
+
+        :param hashkey: the hash key of the object
+        :return: the content as bytes
+        :raises FileNotFoundError: if the object does not exist
+        """
+        with self.open_object(hashkey) as handle:
+            return handle.read()
+
+    def copy_object_to_path(self, hashkey, path):
+        """Write the content of the object with the given hash key to a file at the given path.
+
+        :param hashkey: the hash key of the object
+        :param path: absolute path of the file that is to be written
+        """
+        with self.open_object(hashkey) as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target, CHUNK_SIZE)
+
+    def add_tree(self, path, move=False):
+        """Add all files in the directory at `path`, recursively, and return the corresponding manifest.
+
+        :param path: absolute path of a directory on the local file system
+        :param move: if True, the files are moved into the container instead of copied
+        :return: the manifest dictionary, see `get_manifest` for the format
+        """
+        manifest = {}
+
+        for entry in os.scandir(path):
+            if entry.is_dir(follow_symlinks=False):
+                manifest[entry.name] = self.add_tree(entry.path, move=move)
+            elif entry.is_file():
+                manifest[entry.name] = self.add_object_from_path(entry.path, move=move)
+
+        return manifest
+
+    def extract_tree(self, manifest, path):
+        """Write the file hierarchy described by the given manifest to the directory at `path`.
+
+        :param manifest: the manifest dictionary, see `get_manifest` for the format
+        :param path: absolute path of an existing directory on the local file system
+        """
+        for name, value in manifest.items():
+            target = os.path.join(path, name)
+
+            if isinstance(value, dict):
+                os.makedirs(target, exist_ok=True)
+                self.extract_tree(value, target)
+            else:
+                self.copy_object_to_path(value, target)
+
+    def get_manifest(self, uuid):
+        """Return the manifest of the node with the given UUID.
+
+        A manifest is a nested dictionary that represents the file hierarchy of the repository of a node. Directories
+        are represented by dictionaries and files by the hash key of the object with their content.
+
+        :param uuid: the UUID of the node
+        :return: the manifest dictionary or None if no manifest exists for the given UUID
+        """
+        row = self._get_connection().execute('SELECT content FROM manifest WHERE uuid = ?', (str(uuid),)).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def set_manifest(self, uuid, manifest):
+        """Set the manifest for the node with the given UUID, replacing any existing one.
+
+        :param uuid: the UUID of the node
+        :param manifest: the manifest dictionary, see `get_manifest` for the format
+        """
+        connection = self._get_connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO manifest (uuid, content) VALUES (?, ?)', (str(uuid), json.dumps(manifest))
+            )
+
+    def delete_manifest(self, uuid):
+        """Delete the manifest for the node with the given UUID, if it exists.
+
+        .. note:: the objects referenced by the manifest are not deleted, since other manifests can reference them.
+            Unreferenced objects can be removed with `delete_unreferenced_loose_objects`.
+
+        :param uuid: the UUID of the node
+        """
+        connection = self._get_connection()
+        with connection:
+            connection.execute('DELETE FROM manifest WHERE uuid = ?', (str(uuid),))
+
+    def iter_manifests(self):
+        """Return an iterator over all manifests in the container.
+
+        :return: iterator of tuples of node UUID and manifest dictionary
+        """
+        for uuid, content in self._get_connection().execute('SELECT uuid, content FROM manifest'):
+            yield uuid, json.loads(content)
+
+    def get_file_digests(self, uuid):
+        """Return the file digests that were cached for the node with the given UUID.
+
+        File digests are opaque to the container: they are computed by clients, for example to compute the hash of a
+        node, and come with a validator string that the client can use to decide whether a cached digest is still
+        valid for the current content of the file.
+
+        :param uuid: the UUID of the node
+        :return: dictionary mapping the relative path of each file onto a tuple of validator and digest
+        """
+        cursor = self._get_connection().execute(
+            'SELECT path, validator, digest FROM file_digest WHERE uuid = ?', (str(uuid),)
+        )
+        return {path: (validator, digest) for path, validator, digest in cursor}
+
+    def set_file_digests(self, uuid, digests):
+        """Cache file digests for the node with the given UUID, replacing existing digests for the same paths.
+
+        :param uuid: the UUID of the node
+        :param digests: dictionary mapping the relative path of each file onto a tuple of validator and digest
+        """
+        connection = self._get_connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO file_digest (uuid, path, validator, digest) VALUES (?, ?, ?, ?)',
+                [(str(uuid), path, validator, digest) for path, (validator, digest) in digests.items()]
+            )
+
+    def delete_file_digests(self, uuid):
+        """Delete all file digests cached for the node with the given UUID.
+
+        :param uuid: the UUID of the node
+        """
+        connection = self._get_connection()
+        with connection:
+            connection.execute('DELETE FROM file_digest WHERE uuid = ?', (str(uuid),))
+
+    def pack_loose_objects(self, pack_size_target=PACK_SIZE_TARGET):
+        """Concatenate all loose objects into pack files and remove the loose copies.
+
+        This operation can safely be performed while other processes are reading from or writing to the container.
+
+        :param pack_size_target: approximate maximum size in bytes of a single pack file
+        :return: the number of loose objects that were packed
+        """
+        connection = self._get_connection()
+        num_packed = 0
+
+        with self._lock_packs():
+            pack_id = self._get_last_pack_id()
+            pack_handle = open(self._get_pack_path(pack_id), 'ab')
+            offset = pack_handle.tell()
+            pending_rows = []
+            pending_paths = []
+
+            def commit_pending():
+                """Make sure the pack is written to disk, then update the index and finally remove the loose files."""
+                pack_handle.flush()
+                os.fsync(pack_handle.fileno())
+                with connection:
+                    connection.executemany(
+                        'INSERT OR IGNORE INTO packed_object (hashkey, pack_id, offset, length) VALUES (?, ?, ?, ?)',
+                        pending_rows
+                    )
+                for loose_path in pending_paths:
+                    os.remove(loose_path)
+                del pending_rows[:]
+                del pending_paths[:]
+
+            try:
+                for hashkey, loose_path in self._iter_loose_objects():
+
+                    if self._get_packed_location(hashkey) is not None:
+                        os.remove(loose_path)
+                        continue
+
+                    if offset >= pack_size_target:
+                        commit_pending()
+                        pack_handle.close()
+                        pack_id += 1
+                        pack_handle = open(self._get_pack_path(pack_id), 'ab')
+                        offset = pack_handle.tell()
+
+                    with open(loose_path, 'rb') as source:
+                        shutil.copyfileobj(source, pack_handle, CHUNK_SIZE)
+
+                    length = pack_handle.tell() - offset
+                    pending_rows.append((hashkey, pack_id, offset, length))
+                    pending_paths.append(loose_path)
+                    offset += length
+                    num_packed += 1
+
+                    if len(pending_rows) >= PACK_COMMIT_INTERVAL:
+                        commit_pending()
+
+                commit_pending()
+            finally:
+                pack_handle.close()
+
+        return num_packed
+
+    def delete_unreferenced_loose_objects(self):
+        """Delete all loose objects that are not referenced by any manifest.
+
+        .. warning:: this should only be called when no other process is writing to the container, because an object
+            that has been added but whose manifest has not yet been written, would be considered unreferenced.
+
+        :return: the number of deleted objects
+        """
+        referenced = self.get_referenced_hashkeys()
+        num_deleted = 0
+
+        for hashkey, loose_path in self._iter_loose_objects():
+            if hashkey not in referenced:
+                os.remove(loose_path)
+                num_deleted += 1
+
+        return num_deleted
+
+    def get_referenced_hashkeys(self):
+        """Return the set of hash keys that are referenced by at least one manifest."""
+
+        def iter_hashkeys(manifest):
+            for value in manifest.values():
+                if isinstance(value, dict):
+                    yield from iter_hashkeys(value)
+                else:
+                    yield value
+
+        referenced = set()
+
+        for _, manifest in self.iter_manifests():
+            referenced.update(iter_hashkeys(manifest))
+
+        return referenced
+
+    def get_statistics(self):
+        """Return statistics on the objects stored in the container.
+
+        :return: dictionary with the number of loose objects, packed objects, pack files and manifests, as well as the
+            total size in bytes of the loose objects and the pack files
+        """
+        connection = self._get_connection()
+        loose_count = 0
+        loose_size = 0
+
+        for _, loose_path in self._iter_loose_objects():
+            loose_count += 1
+            loose_size += os.path.getsize(loose_path)
+
+        pack_paths = [entry.path for entry in os.scandir(self._get_packs_folder()) if entry.name.endswith('.pack')]
+
+        return {
+            'loose_count': loose_count,
+            'loose_size': loose_size,
+            'packed_count': connection.execute('SELECT COUNT(*) FROM packed_object').fetchone()[0],
+            'pack_count': len(pack_paths),
+            'pack_size': sum(os.path.getsize(path) for path in pack_paths),
+            'manifest_count': connection.execute('SELECT COUNT(*) FROM manifest').fetchone()[0],
+        }
+
+    def _get_connection(self):
+        """Return the connection to the SQLite index for the current thread, initialising the container if needed."""
+        connection = getattr(self._local, 'connection', None)
+
+        if connection is None:
+            # Initialising is idempotent and also adds tables that are missing in containers created by older versions
+            self.init_container()
+            connection = sqlite3.connect(os.path.join(self._folder, self._index_filename), timeout=60)
+            self._local.connection = connection
+
+        return connection
+
+    def _get_sandbox_folder(self):
+        """Return the folder in which temporary files are written before being moved to their final location."""
+        folder = os.path.join(self._folder, self._sandbox_dirname)
+
+        if not os.path.isdir(folder):
+            self.init_container()
+
+        return folder
+
+    def _get_packs_folder(self):
+        return os.path.join(self._folder, self._packs_dirname)
+
+    def _get_pack_path(self, pack_id):
+        return os.path.join(self._get_packs_folder(), '{}.pack'.format(pack_id))
+
+    def _get_loose_path(self, hashkey):
+        return os.path.join(self._folder, self._loose_dirname, hashkey[:2], hashkey[2:])
+
+    def _get_last_pack_id(self):
+        """Return the id of the last pack file, or zero if there are no pack files yet."""
+        pack_ids = [
+            int(entry.name[:-len('.pack')])
+            for entry in os.scandir(self._get_packs_folder())
+            if entry.name.endswith('.pack')
+        ]
+        return max(pack_ids, default=0)
+
+    def _get_packed_location(self, hashkey):
+        """Return the location of the packed object with the given hash key.
+
+        :return: tuple of pack id, offset and length or None if the object is not packed
+        """
+        return self._get_connection().execute(
+            'SELECT pack_id, offset, length FROM packed_object WHERE hashkey = ?', (hashkey,)
+        ).fetchone()
+
+    def _iter_loose_objects(self):
+        """Return an iterator over all loose objects.
+
+        :return: iterator of tuples of hash key and absolute path of the loose object
+        """
+        loose_folder = os.path.join(self._folder, self._loose_dirname)
+
+        if not os.path.isdir(loose_folder):
+            return
+
+        for shard in os.scandir(loose_folder):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                yield shard.name + entry.name, entry.path
+
+    def _move_to_loose(self, path, hashkey):
+        """Move the file at the given path to the location of the loose object with the given hash key.
+
+        If the object already exists in the container, the file is simply removed.
+
+        :param path: absolute path of the file with the content of the object
+        :param hashkey: the hash key of the content
+        """
+        if self.has_object(hashkey):
+            os.remove(path)
+            return
+
+        loose_path = self._get_loose_path(hashkey)
+        os.makedirs(os.path.dirname(loose_path), exist_ok=True)
+
+        try:
+            os.replace(path, loose_path)
+        except OSError as exception:
+            if exception.errno != errno.EXDEV:
+                raise
+            # The file is on another file system: copy it into the sandbox first such that the final move is atomic
+            fdesc, temp_path = tempfile.mkstemp(dir=self._get_sandbox_folder())
+            os.close(fdesc)
+            shutil.move(path, temp_path)
+            os.replace(temp_path, loose_path)
+
+    @contextlib.contextmanager
+    def _lock_packs(self):
+        """Context manager that holds an exclusive lock for writing to the pack files."""
+        import fcntl
+
+        if not self.is_initialised:
+            self.init_container()
+
+        with open(os.path.join(self._folder, self._lock_filename), 'w') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Migration of node repository folders to the content-addressable object container."""
+import os
+
+__all__ = ('iter_repository_folders', 'migrate_repository_folders')
+
+
+def iter_repository_folders(repository_path):
+    """Return an iterator over all node repository folders in the folder layout of the given repository.
+
+    The node repository folders are sharded on the first two and the next two characters of the UUID of the node.
+
+    :param repository_path: absolute path of the repository of a profile
+    :return: iterator of tuples of node UUID and absolute path of its repository folder
+    """
+    from aiida.orm.utils.repository import Repository
+
+    section_path = os.path.join(repository_path, 'repository', Repository._section_name)  # pylint: disable=protected-access
+
+    if not os.path.isdir(section_path):
+        return
+
+    for level_one in os.scandir(section_path):
+        if not level_one.is_dir():
+            continue
+        for level_two in os.scandir(level_one.path):
+            if not level_two.is_dir():
+                continue
+            for entry in os.scandir(level_two.path):
+                if entry.is_dir():
+                    yield level_one.name + level_two.name + entry.name, entry.path
+
+
+def migrate_repository_folders(container, repository_path, remove_folders=False):
+    """Migrate the repository folders of all nodes to the object container.
+
+    The migration can be interrupted and resumed: folders of nodes that already have a manifest in the container are
+    skipped. Note that the migrated objects are stored as loose objects, so `Container.pack_loose_objects` should be
+    called afterwards to actually reduce the number of inodes.
+
+    :param container: the `Container` instance to migrate to
+    :param repository_path: absolute path of the repository of the profile
+    :param remove_folders: if True, the files are moved into the container and the node folders are removed
+    :return: iterator that yields the UUID of each node whose folder has been processed and whether it was migrated
+    """
+    import shutil
+
+    for uuid, path in iter_repository_folders(repository_path):
+
+        if container.get_manifest(uuid) is not None:
+            migrated = False
+        else:
+            container.set_manifest(uuid, container.add_tree(path, move=remove_folders))
+            migrated = True
+
+        if remove_folders:
+            shutil.rmtree(path)
+
+        yield uuid, migrated
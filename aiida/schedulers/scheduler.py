@@ -9,6 +9,8 @@
 ###########################################################################
 """Implementation of `Scheduler` base class."""
 from abc import abstractmethod
+import re
+import uuid
 
 import aiida.common
 from aiida.common.lang import classproperty
@@ -428,6 +430,51 @@ stderr:
         )
         return self._parse_submit_output(retval, stdout, stderr)
 
+    def submit_from_scripts(self, submissions):
+        """
+        Submit multiple scripts, each from its own working directory, with a
+        single remote command.
+
+        Typically, this function does not need to be modified by the plugins.
+
+        :param submissions: list of tuples of the working directory and the
+            path of the submit script relative to it
+        :return: list with, for each submission, either the string with the
+            JobID or the exception that was raised while parsing its output
+        """
+        commands = [
+            (working_directory, self._get_submit_command(escape_for_bash(submit_script)))
+            for working_directory, submit_script in submissions
+        ]
+        return self._parse_submit_outputs(self._exec_command_batch(commands))
+
+    def _parse_submit_outputs(self, outputs):
+        """
+        Parse the outputs of a batch of submit commands, as returned by
+        `_exec_command_batch`, by passing each to `_parse_submit_output`.
+
+        The failure of one submission does not prevent the JobIDs of the other
+        submissions from being returned.
+
+        :param outputs: list with, for each submit command, a tuple of its exit
+            status, stdout and stderr, or None if its output is missing
+        :return: list with, for each submit command, either the string with the
+            JobID or the exception that was raised
+        """
+        results = []
+
+        for output in outputs:
+            if output is None:
+                results.append(SchedulerError('the output of the submit command is missing from the batch output'))
+                continue
+
+            try:
+                results.append(self._parse_submit_output(*output))
+            except Exception as exception:  # pylint: disable=broad-except
+                results.append(exception)
+
+        return results
+
     def kill(self, jobid):
         """
         Kill a remote job, and try to parse the output message of the scheduler
@@ -443,6 +490,107 @@ stderr:
         retval, stdout, stderr = self.transport.exec_command_wait(self._get_kill_command(jobid))
         return self._parse_kill_output(retval, stdout, stderr)
 
+    def kill_jobs(self, jobids):
+        """
+        Kill multiple remote jobs with a single remote command, and parse the
+        output of the kill command of each job.
+
+        :param list jobids: the job ids to be killed
+        :return: list with, for each job, True if everything seems ok, False
+            otherwise.
+        """
+        outputs = self._exec_command_batch([(None, self._get_kill_command(jobid)) for jobid in jobids])
+        return [output is not None and self._parse_kill_output(*output) for output in outputs]
+
+    def _exec_command_batch(self, commands):
+        """
+        Execute multiple commands with a single remote command and return the
+        output of each of them.
+
+        Each command is run in its own subshell, after changing to its working
+        directory if one is given. The stdout and stderr of the commands are
+        delimited by marker lines with a random token, with which the output of
+        the remote command is demultiplexed. A single command is executed as is.
+
+        :param commands: list of tuples of the working directory, or None, and
+            the command
+        :return: list with, for each command, a tuple of its exit status, stdout
+            and stderr, or None if its output is missing, e.g. because the
+            remote command was interrupted
+        """
+        if not commands:
+            return []
+
+        if len(commands) == 1:
+            working_directory, command = commands[0]
+            if working_directory is not None:
+                self.transport.chdir(working_directory)
+            return [self.transport.exec_command_wait(command)]
+
+        token = 'AIIDA-BATCH-{}'.format(uuid.uuid4().hex)
+        lines = ['tmpfile=$(mktemp) || exit 1']
+
+        for index, (working_directory, command) in enumerate(commands):
+            lines.append("printf '\\n%s\\n' '{} {} stdout'".format(token, index))
+            lines.append('(')
+            if working_directory is not None:
+                lines.append('cd {} || exit 1'.format(escape_for_bash(working_directory)))
+            lines.append(command)
+            lines.append(') 2>"$tmpfile"')
+            lines.append('retval=$?')
+            lines.append("printf '\\n%s\\n' '{} {} stderr'".format(token, index))
+            lines.append('cat "$tmpfile"')
+            lines.append("printf '\\n%s %d\\n' '{} {} retval' \"$retval\"".format(token, index))
+
+        lines.append('rm -f "$tmpfile"')
+
+        # The script is run in a subshell, since transports may prefix the command with a change of directory
+        retval, stdout, stderr = self.transport.exec_command_wait('(\n{}\n)'.format('\n'.join(lines)))
+
+        outputs = self._demultiplex_output(stdout, token, len(commands))
+
+        if None in outputs:
+            self.logger.warning(
+                'the output of {} out of {} commands is missing from the batch output: retval={}; stderr={}'.format(
+                    outputs.count(None), len(commands), retval, stderr
+                )
+            )
+
+        return outputs
+
+    @staticmethod
+    def _demultiplex_output(stdout, token, count):
+        """
+        Split the stdout of a batch of commands, as executed by
+        `_exec_command_batch`, into the output of each command.
+
+        :param stdout: the stdout of the batch
+        :param token: the token of the marker lines
+        :param count: the number of commands in the batch
+        :return: list with, for each command, a tuple of its exit status, stdout
+            and stderr, or None if its output is missing
+        """
+        regex = re.compile(r'\n{} (\d+) (stdout|stderr|retval)(?: (-?\d+))?\n'.format(re.escape(token)))
+        matches = list(regex.finditer(stdout))
+        sections = {}
+
+        for match, next_match in zip(matches, matches[1:] + [None]):
+            index, stream, retval = match.groups()
+            end = next_match.start() if next_match is not None else len(stdout)
+            sections[(int(index), stream)] = int(retval) if stream == 'retval' else stdout[match.end():end]
+
+        outputs = []
+
+        for index in range(count):
+            if (index, 'retval') not in sections:
+                outputs.append(None)
+            else:
+                outputs.append((
+                    sections[(index, 'retval')], sections.get((index, 'stdout'), ''), sections.get((index, 'stderr'), '')
+                ))
+
+        return outputs
+
     def _get_kill_command(self, jobid):
         """
         Return the command to kill the job with specified jobid.
@@ -12,6 +12,8 @@
 from numpy import inf
 from aiida.common.links import GraphTraversalRules, LinkType
 
+TRAVERSAL_BATCH_SIZE = 10000
+
 
 def get_nodes_delete(starting_pks, get_links=False, **kwargs):
     """
@@ -164,6 +166,11 @@ def traverse_graph(starting_pks, max_iterations=None, get_links=False, links_for
     to a list of initial nodes through any sequence of specified links.
     Optionally, it may also return the links that connect these nodes.
 
+    If the number of iterations is not limited, the complete traversal is
+    performed by the database in a single recursive query, of which only the
+    final sets of nodes and links are transferred, in batches. Otherwise the
+    rules are applied iteratively, one iteration per query.
+
     :type starting_pks: list or tuple or set
     :param starting_pks: Contains the (valid) pks of the starting nodes.
 
@@ -231,6 +238,9 @@ def traverse_graph(starting_pks, max_iterations=None, get_links=False, links_for
             'The following pks are not in the database and must be pruned before this   call: {}'.format(missing_pks)
         )
 
+    if max_iterations is inf:
+        return _traverse_graph_sql(operational_set, get_links, links_forward, links_backward)
+
     rules = []
     basket = Basket(nodes=operational_set)
 
@@ -274,3 +284,39 @@ def traverse_graph(starting_pks, max_iterations=None, get_links=False, links_for
         output['links'] = results['nodes_nodes'].keyset
 
     return output
+
+
+def _traverse_graph_sql(starting_pks, get_links, links_forward, links_backward):
+    """
+    Traverse the graph until no new nodes are found with a single recursive query
+    that is executed by the database.
+
+    :param starting_pks: set with the pks of the starting nodes, which have to exist.
+    :param bool get_links: Pass True to also return the links between all nodes.
+    :param links_forward: List with the links to traverse in the forward direction.
+    :param links_backward: List with the links to traverse in the backward direction.
+    """
+    from aiida.manage.manager import get_manager
+    from aiida.orm.utils.links import LinkQuadruple
+
+    nodes = set(starting_pks)
+    links = set() if get_links else None
+
+    if not links_forward and not links_backward:
+        return {'nodes': nodes, 'links': links}
+
+    rows = get_manager().get_backend().nodes.iter_graph_traversal(
+        list(starting_pks),
+        types_forward=[link_type.value for link_type in links_forward],
+        types_backward=[link_type.value for link_type in links_backward],
+        get_links=get_links,
+        batch_size=TRAVERSAL_BATCH_SIZE
+    )
+
+    for source_id, target_id, link_type, link_label in rows:
+        if target_id is None:
+            nodes.add(source_id)
+        else:
+            links.add(LinkQuadruple(source_id, target_id, link_type, link_label))
+
+    return {'nodes': nodes, 'links': links}
@@ -9,18 +9,22 @@
 ###########################################################################
 """Utility functions and classes to interact with AiiDA export archives."""
 
+from distutils.version import StrictVersion
 import os
+import struct
 import sys
 import tarfile
+import threading
 import zipfile
 
 from wrapt import decorator
 
 from aiida.common import json
-from aiida.common.exceptions import ContentNotExistent, InvalidOperation
+from aiida.common.exceptions import ContentNotExistent, InvalidOperation, NotExistent
 from aiida.common.folders import SandboxFolder
-from aiida.tools.importexport.common.config import NODES_EXPORT_SUBFOLDER
+from aiida.tools.importexport.common.config import NODE_ENTITY_NAME, NODES_EXPORT_SUBFOLDER
 from aiida.tools.importexport.common.exceptions import CorruptArchive
+from aiida.tools.importexport.common.utils import export_shard_uuid
 
 __all__ = ('Archive', 'extract_zip', 'extract_tar', 'extract_tree')
 
@@ -30,7 +34,9 @@ class Archive:
 
     The main usage should be to construct the class with the filepath of the export archive as an argument.
     The contents will be lazily unpacked into a sand box folder which is constructed upon entering the instance
-    within a context and which will be automatically cleaned upon leaving that context. Example::
+    within a context and which will be automatically cleaned upon leaving that context. Only the files that are
+    accessed are unpacked: the data and metadata files are read without unpacking the repository folders of the
+    nodes and the folder of a single node can be unpacked with `get_node_folder`. Example::
 
         with Archive('/some/path/archive.aiida') as archive:
             archive.version
@@ -38,14 +44,23 @@ class Archive:
     """
 
     FILENAME_DATA = 'data.json'
+    FILENAME_INDEX = 'index.json'
     FILENAME_METADATA = 'metadata.json'
 
+    # The first version of the archive format that includes the index
+    INDEX_VERSION = '0.9'
+
     def __init__(self, filepath):
         self._filepath = filepath
         self._folder = None
         self._unpacked = False
         self._data = None
         self._meta_data = None
+        self._index = None
+        self._format = None
+        self._zip_members = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
 
     def __enter__(self):
         """Instantiate a SandboxFolder into which the archive can be lazily unpacked."""
@@ -65,14 +80,6 @@ class Archive:
 
         return wrapped(*args, **kwargs)  # pylint: disable=not-callable
 
-    @decorator
-    def ensure_unpacked(wrapped, instance, args, kwargs):  # pylint: disable=no-self-argument
-        """Decorator to ensure that the archive is unpacked before entering the decorated function."""
-        if instance and not instance.unpacked:
-            instance.unpack()
-
-        return wrapped(*args, **kwargs)  # pylint: disable=not-callable
-
     @ensure_within_context
     def unpack(self):
         """Unpack the archive and store the contents in a sandbox."""
@@ -130,6 +137,31 @@ class Archive:
 
         return self._meta_data
 
+    @property
+    @ensure_within_context
+    def index(self):
+        """Return the loaded content of the index file, or None if the archive format predates the index.
+
+        The index contains the location of the exported values in the data file, as a list of their offset and length
+        in bytes, under the `data` key, mirroring its structure up to the values of single entities, e.g. the
+        attributes of a single node. It also maps the unique identifier of the entities of each entity type onto their
+        pk in the data file under the `uuids` key, lists the relative paths of the content of the repository of each
+        node by UUID under the `repository` key, where those of directories end with a forward slash, and contains the
+        number of links under the `links` key.
+
+        If the format includes the index but the archive does not, for example because it was migrated with
+        `migrate_recursively` and written without it, the index is built from the unpacked archive instead.
+
+        :return: dictionary with contents of index file
+        """
+        if self._index is None and StrictVersion(self.version_format) >= StrictVersion(self.INDEX_VERSION):
+            try:
+                self._index = self._read_json_file(self.FILENAME_INDEX)
+            except CorruptArchive:
+                self._index = self._build_index()
+
+        return self._index
+
     @property
     @ensure_within_context
     def unpacked(self):
@@ -158,8 +190,13 @@ class Archive:
 
         :return: a dictionary with basic details
         """
-        export_data = self.data.get('export_data', {})
-        links_data = self.data.get('links_uuid', {})
+        # The index contains enough information to count the entities without reading the data file
+        if self.index is not None:
+            export_data = self.index['data'].get('export_data', {})
+            links_data = range(self.index['links'])
+        else:
+            export_data = self.data.get('export_data', {})
+            links_data = self.data.get('links_uuid', {})
 
         computers = export_data.get('Computer', {})
         groups = export_data.get('Group', {})
@@ -207,14 +244,302 @@ class Archive:
             return None
 
     @ensure_within_context
-    @ensure_unpacked
+    def open_data_file(self):
+        """Return a text file handle to the data file, to read it incrementally, unpacking only that file if necessary.
+
+        :return: the file handle, which should be closed by the caller
+        """
+        return open(self._extract_file(self.FILENAME_DATA), 'r', encoding='utf8')
+
+    @ensure_within_context
+    def get_entity(self, entity_name, identifier):
+        """Return the exported fields of a single entity.
+
+        If the archive has an index, only the fields of the entity are read from the data file, without reading or
+        unpacking the rest of the archive where the format allows it.
+
+        :param entity_name: the name of the entity type, e.g. `Node`
+        :param identifier: the unique identifier of the entity, i.e. its UUID or the email for users
+        :return: dictionary with the exported fields
+        :raises `~aiida.common.exceptions.NotExistent`: if the archive does not contain the entity
+        """
+        return self._read_value('export_data', entity_name, self._get_pk(entity_name, identifier))
+
+    @ensure_within_context
+    def get_node_attributes(self, uuid):
+        """Return the attributes of a single node, see `get_entity`.
+
+        :param uuid: the UUID of the node
+        :return: dictionary with the attributes
+        :raises `~aiida.common.exceptions.NotExistent`: if the archive does not contain the node
+        """
+        return self._read_value('node_attributes', self._get_pk(NODE_ENTITY_NAME, uuid))
+
+    @ensure_within_context
+    def get_node_extras(self, uuid):
+        """Return the extras of a single node, see `get_entity`.
+
+        :param uuid: the UUID of the node
+        :return: dictionary with the extras
+        :raises `~aiida.common.exceptions.NotExistent`: if the archive does not contain the node
+        """
+        return self._read_value('node_extras', self._get_pk(NODE_ENTITY_NAME, uuid))
+
+    @ensure_within_context
+    def get_node_repository(self, uuid):
+        """Return the relative paths of the content of the repository of a single node.
+
+        If the archive has an index, the paths are read from it. Otherwise, the folder of the node is unpacked.
+
+        :param uuid: the UUID of the node
+        :return: the sorted relative paths, where those of directories end with a forward slash
+        :raises `~aiida.common.exceptions.NotExistent`: if the archive does not contain the node
+        """
+        from aiida.tools.importexport.dbexport.utils import list_folder
+
+        if self.index is None:
+            self._get_pk(NODE_ENTITY_NAME, uuid)
+            return list_folder(self.get_node_folder(uuid)[0])
+
+        try:
+            return self.index['repository'][uuid]
+        except KeyError:
+            raise NotExistent('the archive does not contain the node with UUID={}'.format(uuid))
+
+    def _get_pk(self, entity_name, identifier):
+        """Return the pk in the data file of the entity with the given unique identifier.
+
+        :raises `~aiida.common.exceptions.NotExistent`: if the archive does not contain the entity
+        """
+        if self.index is not None:
+            pks = self.index['uuids'].get(entity_name, {})
+            if identifier in pks:
+                return str(pks[identifier])
+        else:
+            unique_identifier = self.meta_data['unique_identifiers'][entity_name]
+            for pk, entity in self.data['export_data'].get(entity_name, {}).items():
+                if entity[unique_identifier] == identifier:
+                    return pk
+
+        raise NotExistent('the archive does not contain the {} with identifier {}'.format(entity_name, identifier))
+
+    def _read_value(self, *keys):
+        """Return a value of the data file, reading only that value if the archive has an index.
+
+        :param keys: the keys of the value in the nested dictionaries of the data file
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the data file does not contain it
+        """
+        value = self.index['data'] if self.index is not None else self.data
+
+        try:
+            for key in keys:
+                value = value[key]
+        except KeyError:
+            raise CorruptArchive('the data file does not contain the value of {}'.format('.'.join(keys)))
+
+        if self.index is None:
+            return value
+
+        offset, length = value
+        return json.loads(self._read_data_range(offset, length).decode('utf8'))
+
+    def _read_data_range(self, offset, length):
+        """Return a range of bytes of the data file.
+
+        For a zip file whose data file is not compressed and for a directory, the bytes are read directly. For a zip
+        file whose data file is compressed, the data file is decompressed up to the range, without unpacking it. A tar
+        file does not support random access, so its data file is unpacked the first time.
+
+        :param offset: the offset of the range in bytes
+        :param length: the length of the range in bytes
+        :return: the bytes
+        """
+        if self._get_format() != 'zip' or self.unpacked:
+            with open(self._extract_file(self.FILENAME_DATA), 'rb') as handle:
+                handle.seek(offset)
+                return handle.read(length)
+
+        info = self._get_zip_file().getinfo(self.FILENAME_DATA)
+
+        if info.compress_type == zipfile.ZIP_STORED:
+            with open(self.filepath, 'rb') as handle:
+                # The content of a member follows its local header, whose size is given by the lengths at its end
+                handle.seek(info.header_offset)
+                header = handle.read(zipfile.sizeFileHeader)
+                name_length, extra_length = struct.unpack('<HH', header[-4:])
+                handle.seek(info.header_offset + len(header) + name_length + extra_length + offset)
+                return handle.read(length)
+
+        with self._get_zip_file().open(info) as handle:
+            while offset > 0:
+                chunk = handle.read(min(offset, 2**20))
+                if not chunk:
+                    break
+                offset -= len(chunk)
+            return handle.read(length)
+
+    @ensure_within_context
+    def get_node_folder(self, uuid):
+        """Return the absolute path of the folder with the repository of the node with the given UUID.
+
+        The files of the node are unpacked into the sandbox folder, unless the archive is a directory, in which case the
+        folder in the archive itself is returned. A tar file is unpacked entirely the first time, since it does not
+        support random access, whereas of a zip file only the files of the node are unpacked. This method is thread
+        safe, such that the folders of multiple nodes can be unpacked in parallel.
+
+        :param uuid: the UUID of the node
+        :return: tuple of the absolute path of the folder and a boolean that is True if the folder is in the sandbox
+            folder, in which case its content may be moved rather than copied
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the archive does not contain the
+            repository folder of the node
+        """
+        relpath = os.path.join(NODES_EXPORT_SUBFOLDER, export_shard_uuid(uuid))
+        archive_format = self._get_format()
+
+        if archive_format == 'folder':
+            path, in_sandbox = os.path.join(self.filepath, relpath), False
+        elif archive_format == 'tar':
+            with self._lock:
+                if not self.unpacked:
+                    self.unpack()
+            path, in_sandbox = self.folder.get_abs_path(relpath), True
+        else:
+            members = self._get_zip_members().get(relpath, [])
+            handle = self._get_zip_file()
+            if members:
+                # The parent folders are shared with the nodes that are unpacked by other threads. `ZipFile.extract`
+                # fails if another thread creates one of them concurrently, so the folder of the node is created first.
+                os.makedirs(self.folder.get_abs_path(relpath), exist_ok=True)
+            for member in members:
+                handle.extract(member, path=self.folder.abspath)
+            path, in_sandbox = self.folder.get_abs_path(relpath), True
+
+        if not os.path.isdir(path):
+            raise CorruptArchive(
+                'Unable to find the repository folder for Node with UUID={} in the exported file'.format(uuid)
+            )
+
+        return path, in_sandbox
+
+    def _get_format(self):
+        """Return the format of the archive.
+
+        :return: 'folder', 'tar' or 'zip'
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the format is not recognized
+        """
+        if self._format is None:
+            if os.path.isdir(self.filepath):
+                self._format = 'folder'
+            elif tarfile.is_tarfile(self.filepath):
+                self._format = 'tar'
+            elif zipfile.is_zipfile(self.filepath):
+                self._format = 'zip'
+            else:
+                raise CorruptArchive('unrecognized archive format')
+
+        return self._format
+
+    def _get_zip_file(self):
+        """Return the zip file of the archive opened for reading, with a separate handle for each thread."""
+        handle = getattr(self._local, 'zip_file', None)
+
+        if handle is None:
+            handle = zipfile.ZipFile(self.filepath, 'r', allowZip64=True)
+            self._local.zip_file = handle
+
+        return handle
+
+    def _get_zip_members(self):
+        """Return the names of the members of the zip file, grouped by the repository folder of the node they are in.
+
+        :return: dictionary mapping the relative path of the folder of each node onto the names of its members
+        """
+        with self._lock:
+            if self._zip_members is None:
+                members = {}
+
+                for name in self._get_zip_file().namelist():
+                    parts = name.split('/')
+                    # The folder of a node is at `nodes/xx/yy/zzzz...`, see `export_shard_uuid`
+                    if parts[0] == NODES_EXPORT_SUBFOLDER and len(parts) > 4:
+                        members.setdefault(os.path.join(*parts[:4]), []).append(name)
+
+                self._zip_members = members
+
+        return self._zip_members
+
+    def _extract_file(self, filename):
+        """Return the absolute path of a file at the top level of the archive, unpacking only that file if necessary.
+
+        :param filename: the filename relative to the root of the archive
+        :return: the absolute path of the file
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the archive does not contain the file
+        """
+        archive_format = self._get_format()
+
+        # A file that has already been unpacked on its own
+        if archive_format != 'folder' and os.path.isfile(self.folder.get_abs_path(filename)):
+            return self.folder.get_abs_path(filename)
+
+        if archive_format == 'folder' or self.unpacked:
+            root = self.folder.abspath if self.unpacked else self.filepath
+            if not os.listdir(root):
+                raise CorruptArchive('the provided archive {} is empty'.format(self.filepath))
+            path = os.path.join(root, filename)
+            if not os.path.isfile(path):
+                raise CorruptArchive('required file `{}` is not included'.format(filename))
+            return path
+
+        if archive_format == 'tar':
+            with tarfile.open(self.filepath, 'r:*', format=tarfile.PAX_FORMAT) as handle:
+                # Iterate instead of using `getmember`, which would read the headers of all members of the archive
+                # The index follows the data file, which is skipped over without being extracted
+                for member in handle:
+                    if os.path.normpath(member.name) == filename and member.isfile():
+                        handle.extract(member, path=self.folder.abspath)
+                        break
+                else:
+                    raise CorruptArchive('required file `{}` is not included'.format(filename))
+        else:
+            handle = self._get_zip_file()
+            if not handle.namelist():
+                raise CorruptArchive('no files detected')
+            try:
+                handle.extract(filename, path=self.folder.abspath)
+            except KeyError:
+                raise CorruptArchive('required file `{}` is not included'.format(filename))
+
+        return self.folder.get_abs_path(filename)
+
+    def _build_index(self):
+        """Build the index of an archive that does not include it.
+
+        The locations in the index refer to the data file as it is written by `write_data_and_index`, which may differ
+        from the data file in the archive. Therefore, the archive is unpacked and its data file in the sandbox folder,
+        from which the values are read from then on, is rewritten together with the index.
+
+        :return: dictionary with the contents of the index
+        """
+        from aiida.tools.importexport.dbexport.utils import get_archive_index, write_data_and_index
+
+        metadata, data = self.meta_data, self.data
+
+        if not self.unpacked:
+            self.unpack()
+
+        index = get_archive_index(metadata, data, self.folder)
+        write_data_and_index(self.folder, data, index)
+
+        return index
+
+    @ensure_within_context
     def _read_json_file(self, filename):
-        """Read the contents of a JSON file from the unpacked archive contents.
+        """Read the contents of a JSON file from the archive, without unpacking the repository folders of the nodes.
 
-        :param filename: the filename relative to the sandbox folder
+        :param filename: the filename relative to the root of the archive
         :return: a dictionary with the loaded JSON content
         """
-        with open(self.folder.get_abs_path(filename), 'r', encoding='utf8') as fhandle:
+        with open(self._extract_file(filename), 'r', encoding='utf8') as fhandle:
             return json.load(fhandle)
 
 
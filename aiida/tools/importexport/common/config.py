@@ -15,7 +15,7 @@ from aiida.orm import Computer, Group, GroupTypeString, Node, User, Log, Comment
 __all__ = ('EXPORT_VERSION',)
 
 # Current export version
-EXPORT_VERSION = '0.8'
+EXPORT_VERSION = '0.9'
 
 IMPORTGROUP_TYPE = GroupTypeString.IMPORTGROUP_TYPE.value
 DUPL_SUFFIX = ' (Imported #{})'
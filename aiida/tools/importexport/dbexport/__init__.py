@@ -10,32 +10,42 @@
 # pylint: disable=fixme,too-many-branches,too-many-locals,too-many-statements,too-many-arguments
 """Provides export functionalities."""
 
+from collections import defaultdict
+import itertools
 import os
-import tarfile
 import time
 
 from aiida import get_version, orm
 from aiida.common import json
-from aiida.common.folders import RepositoryFolder
 from aiida.orm.utils.repository import Repository
 
 from aiida.tools.importexport.common import exceptions
 from aiida.tools.importexport.common.config import EXPORT_VERSION, NODES_EXPORT_SUBFOLDER
 from aiida.tools.importexport.common.config import (
-    NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME
+    NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME, USER_ENTITY_NAME
 )
 from aiida.tools.importexport.common.config import (
     get_all_fields_info, file_fields_to_model_fields, entity_names_to_entities, model_fields_to_file_fields
 )
 from aiida.tools.importexport.common.utils import export_shard_uuid
 from aiida.tools.importexport.dbexport.utils import (
-    check_licenses, fill_in_query, serialize_dict, check_process_nodes_sealed
+    check_licenses, fill_in_query, serialize_dict, check_process_nodes_sealed, write_data_and_index, write_atomically,
+    StreamedDict, StreamedList
 )
 
+from .tar import TarFolder
 from .zip import ZipFolder
 
 __all__ = ('export', 'export_zip')
 
+# The number of rows that are fetched from the database at a time while streaming the content of the archive
+EXPORT_BATCH_SIZE = 1000
+
+# The order in which the entities are written, such that entities come after all the entities that may reference them
+EXPORT_ENTITY_ORDER = (
+    GROUP_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME, NODE_ENTITY_NAME, COMPUTER_ENTITY_NAME, USER_ENTITY_NAME
+)
+
 
 def export_zip(what, outfile='testzip', overwrite=False, silent=False, use_compression=True, **kwargs):
     """Export in a zipped folder
@@ -85,8 +95,9 @@ def export_zip(what, outfile='testzip', overwrite=False, silent=False, use_compr
         raise exceptions.ArchiveExportError("the output file '{}' already exists".format(outfile))
 
     time_start = time.time()
-    with ZipFolder(outfile, mode='w', use_compression=use_compression) as folder:
-        export_tree(what, folder=folder, silent=silent, **kwargs)
+    with write_atomically(outfile) as temporary:
+        with ZipFolder(temporary, mode='w', use_compression=use_compression) as folder:
+            export_tree(what, folder=folder, silent=silent, **kwargs)
     if not silent:
         print('File written in {:10.3g} s.'.format(time.time() - time_start))
 
@@ -106,7 +117,9 @@ def export_tree(
     :param what: a list of entity instances; they can belong to different models/entities.
     :type what: list
 
-    :param folder: a temporary folder to build the archive before compression.
+    :param folder: the folder to write the archive to. The content of files is streamed into it, so for a
+        :py:class:`~aiida.tools.importexport.dbexport.zip.ZipFolder` or a
+        :py:class:`~aiida.tools.importexport.dbexport.tar.TarFolder` the archive is written without a staging copy.
     :type folder: :py:class:`~aiida.common.folders.Folder`
 
     :param allowed_licenses: List or function. If a list, then checks whether all licenses of Data nodes are in the
@@ -137,7 +150,6 @@ def export_tree(
         exporting.
     :raises `~aiida.common.exceptions.LicensingException`: if any node is licensed under forbidden license.
     """
-    from collections import defaultdict
     from aiida.tools.graph.graph_traversers import get_nodes_export
 
     if not silent:
@@ -219,7 +231,7 @@ def export_tree(
 
     # We will iteratively explore the AiiDA graph to find further nodes that
     # should also be exported.
-    # At the same time, we will create the links_uuid list of dicts to be exported
+    # The links between them are serialized to the links_uuid list of dicts while data.json is written
 
     if not silent:
         print('RETRIEVING LINKED NODES AND STORING LINKS...')
@@ -229,27 +241,6 @@ def export_tree(
     to_be_exported = traverse_output['nodes']
     graph_traversal_rules = traverse_output['rules']
 
-    # I create a utility dictionary for mapping pk to uuid.
-    if traverse_output['nodes']:
-        qbuilder = orm.QueryBuilder().append(
-            orm.Node,
-            project=('id', 'uuid'),
-            filters={'id': {
-                'in': traverse_output['nodes']
-            }},
-        )
-        pk_2_uuid_dict = dict(qbuilder.all())
-    else:
-        pk_2_uuid_dict = {}
-
-    # The set of tuples now has to be transformed to a list of dicts
-    links_uuid = [{
-        'input': pk_2_uuid_dict[link.source_id],
-        'output': pk_2_uuid_dict[link.target_id],
-        'label': link.link_label,
-        'type': link.link_type
-    } for link in traverse_output['links']]
-
     ## Universal "entities" attributed to all types of nodes
     # Logs
     if include_logs and to_be_exported:
@@ -330,113 +321,21 @@ def export_tree(
         node_licenses = list((a, b) for [a, b] in builder.all() if b is not None)
         check_licenses(node_licenses, allowed_licenses, forbidden_licenses)
 
-    ############################################################
-    ##### Start automatic recursive export data generation #####
-    ############################################################
-    if not silent:
-        print('STORING DATABASE ENTRIES...')
-
-    export_data = dict()
-    entity_separator = '_'
-    for entity_name, partial_query in entries_to_add.items():
-
-        foreign_fields = {
-            k: v
-            for k, v in all_fields_info[entity_name].items()
-            # all_fields_info[model_name].items()
-            if 'requires' in v
-        }
-
-        for value in foreign_fields.values():
-            ref_model_name = value['requires']
-            fill_in_query(partial_query, entity_name, ref_model_name, [entity_name], entity_separator)
-
-        for temp_d in partial_query.iterdict():
-            for k in temp_d.keys():
-                # Get current entity
-                current_entity = k.split(entity_separator)[-1]
-
-                # This is a empty result of an outer join.
-                # It should not be taken into account.
-                if temp_d[k]['id'] is None:
-                    continue
-
-                temp_d2 = {
-                    temp_d[k]['id']:
-                    serialize_dict(
-                        temp_d[k], remove_fields=['id'], rename_fields=model_fields_to_file_fields[current_entity]
-                    )
-                }
-                try:
-                    export_data[current_entity].update(temp_d2)
-                except KeyError:
-                    export_data[current_entity] = temp_d2
-
-    #######################################
-    # Manually manage attributes and extras
-    #######################################
-    # I use .get because there may be no nodes to export
-    all_nodes_pk = list()
-    if NODE_ENTITY_NAME in export_data:
-        all_nodes_pk.extend(export_data.get(NODE_ENTITY_NAME).keys())
-
-    if sum(len(model_data) for model_data in export_data.values()) == 0:
+    if not entries_to_add:
         if not silent:
             print('No nodes to store, exiting...')
         return
 
-    if not silent:
-        print(
-            'Exporting a total of {} db entries, of which {} nodes.'.format(
-                sum(len(model_data) for model_data in export_data.values()), len(all_nodes_pk)
-            )
-        )
-
-    # ATTRIBUTES and EXTRAS
-    if not silent:
-        print('STORING NODE ATTRIBUTES AND EXTRAS...')
-    node_attributes = {}
-    node_extras = {}
-
-    # A second QueryBuilder query to get the attributes and extras. See if this can be optimized
-    if all_nodes_pk:
-        all_nodes_query = orm.QueryBuilder()
-        all_nodes_query.append(orm.Node, filters={'id': {'in': all_nodes_pk}}, project=['id', 'attributes', 'extras'])
-        for res_pk, res_attributes, res_extras in all_nodes_query.iterall():
-            node_attributes[str(res_pk)] = res_attributes
-            node_extras[str(res_pk)] = res_extras
-
-    if not silent:
-        print('STORING GROUP ELEMENTS...')
-    groups_uuid = dict()
-    # If a group is in the exported date, we export the group/node correlation
-    if GROUP_ENTITY_NAME in export_data:
-        for curr_group in export_data[GROUP_ENTITY_NAME]:
-            group_uuid_qb = orm.QueryBuilder()
-            group_uuid_qb.append(
-                entity_names_to_entities[GROUP_ENTITY_NAME],
-                filters={'id': {
-                    '==': curr_group
-                }},
-                project=['uuid'],
-                tag='group'
-            )
-            group_uuid_qb.append(entity_names_to_entities[NODE_ENTITY_NAME], project=['uuid'], with_group='group')
-            for res in group_uuid_qb.iterall():
-                if str(res[0]) in groups_uuid:
-                    groups_uuid[str(res[0])].append(str(res[1]))
-                else:
-                    groups_uuid[str(res[0])] = [str(res[1])]
-
     #######################################
     # Final check for unsealed ProcessNodes
     #######################################
-    process_nodes = set()
-    for node_pk, content in export_data.get(NODE_ENTITY_NAME, {}).items():
-        if content['node_type'].startswith('process.'):
-            process_nodes.add(node_pk)
+    if to_be_exported:
+        builder = orm.QueryBuilder()
+        builder.append(orm.ProcessNode, filters={'id': {'in': to_be_exported}}, project=['id'])
+        check_process_nodes_sealed({pk for pk, in builder.iterall(batch_size=EXPORT_BATCH_SIZE)})
 
-    check_process_nodes_sealed(process_nodes)
+    # The repositories are listed in the index, which is written before them
+    repository_index = _get_repository_index(to_be_exported)
 
     ######################################
     # Now I store
@@ -444,22 +343,6 @@ def export_tree(
     # subfolder inside the export package
     nodesubfolder = folder.get_subfolder(NODES_EXPORT_SUBFOLDER, create=True, reset_limit=True)
 
-    if not silent:
-        print('STORING DATA...')
-
-    data = {
-        'node_attributes': node_attributes,
-        'node_extras': node_extras,
-        'export_data': export_data,
-        'links_uuid': links_uuid,
-        'groups_uuid': groups_uuid
-    }
-
-    # N.B. We're really calling zipfolder.open (if exporting a zipfile)
-    with folder.open('data.json', mode='w') as fhandle:
-        # fhandle.write(json.dumps(data, cls=UUIDEncoder))
-        fhandle.write(json.dumps(data))
-
     # Add proper signature to unique identifiers & all_fields_info
     # Ignore if a key doesn't exist in any of the two dictionaries
 
@@ -479,30 +362,233 @@ def export_tree(
     with folder.open('metadata.json', 'w') as fhandle:
         fhandle.write(json.dumps(metadata))
 
+    if not silent:
+        print('STORING DATA...')
+
+    # The content of `data.json` is streamed from the queries into the archive, such that it is never held in memory
+    entry_ids = {
+        GROUP_ENTITY_NAME: given_group_entry_ids,
+        NODE_ENTITY_NAME: to_be_exported,
+        COMPUTER_ENTITY_NAME: given_computer_entry_ids,
+        LOG_ENTITY_NAME: given_log_entry_ids,
+        COMMENT_ENTITY_NAME: given_comment_entry_ids,
+    }
+    uuids = defaultdict(dict)
+    export_data = _iter_export_data(entries_to_add, entry_ids, all_fields_info, unique_identifiers, uuids)
+
+    data = StreamedDict([
+        ('node_attributes', StreamedDict(_iter_node_column(to_be_exported, 'attributes'))),
+        ('node_extras', StreamedDict(_iter_node_column(to_be_exported, 'extras'))),
+        ('export_data', StreamedDict(export_data)),
+        ('links_uuid', StreamedList(_iter_links_uuid(traverse_output['links'], to_be_exported))),
+        ('groups_uuid', StreamedDict(_iter_groups_uuid(given_group_entry_ids))),
+    ])
+
+    # The index records the location of every entity in `data.json`, a lookup table of the unique identifiers of the
+    # entities onto their pk and the content of the repository of every node, see `Archive`
+    index = {
+        'uuids': uuids,
+        'repository': repository_index,
+        'links': len(traverse_output['links']) if to_be_exported else 0,
+    }
+
+    # N.B. We're really calling zipfolder.open (if exporting a zipfile)
+    write_data_and_index(folder, data, index)
+
+    if not silent:
+        print(
+            'Exported a total of {} db entries, of which {} nodes.'.format(
+                sum(len(entities) for entities in uuids.values()), len(uuids[NODE_ENTITY_NAME])
+            )
+        )
+
     if silent is not True:
         print('STORING REPOSITORY FILES...')
 
     # If there are no nodes, there are no repository files to store
-    if all_nodes_pk:
-        # Large speed increase by not getting the node itself and looping in memory in python, but just getting the uuid
-        uuid_query = orm.QueryBuilder()
-        uuid_query.append(orm.Node, filters={'id': {'in': all_nodes_pk}}, project=['uuid'])
-        for res in uuid_query.all():
-            uuid = str(res[0])
-            sharded_uuid = export_shard_uuid(uuid)
-
-            # Important to set create=False, otherwise creates twice a subfolder. Maybe this is a bug of insert_path?
-            thisnodefolder = nodesubfolder.get_subfolder(sharded_uuid, create=False, reset_limit=True)
-
-            # Make sure the node's repository folder was not deleted
-            src = RepositoryFolder(section=Repository._section_name, uuid=uuid)  # pylint: disable=protected-access
-            if not src.exists():
-                raise exceptions.ArchiveExportError(
-                    'Unable to find the repository folder for Node with UUID={} in the local repository'.format(uuid)
+    for uuid in repository_index:
+        sharded_uuid = export_shard_uuid(uuid)
+
+        # Important to set create=False, otherwise creates twice a subfolder. Maybe this is a bug of insert_path?
+        thisnodefolder = nodesubfolder.get_subfolder(sharded_uuid, create=False, reset_limit=True)
+
+        # In this way, I copy the content of the folder, and not the folder itself
+        _export_repository(Repository(uuid=uuid, is_stored=True), thisnodefolder)
+
+
+def _iter_node_column(node_pks, column):
+    """Return an iterator over the pks of the given nodes and the values of the given column, e.g. their attributes.
+
+    :param node_pks: the pks of the nodes
+    :param column: the name of the column to project
+    :return: iterator over tuples of pk and value
+    """
+    if not node_pks:
+        return
+
+    builder = orm.QueryBuilder()
+    builder.append(orm.Node, filters={'id': {'in': node_pks}}, project=['id', column])
+    yield from builder.iterall(batch_size=EXPORT_BATCH_SIZE)
+
+
+def _get_repository_index(node_pks):
+    """Return the relative paths of the content of the repositories of the given nodes, for the index of the archive.
+
+    :param node_pks: the pks of the nodes
+    :return: dictionary mapping the uuid of each node onto the sorted relative paths of the files and directories in
+        its repository, where those of directories end with a forward slash
+    :raises `~aiida.tools.importexport.common.exceptions.ArchiveExportError`: if the repository of a node is missing
+    """
+    repository_index = {}
+
+    if not node_pks:
+        return repository_index
+
+    # Large speed increase by not getting the node itself and looping in memory in python, but just getting the uuid
+    uuid_query = orm.QueryBuilder()
+    uuid_query.append(orm.Node, filters={'id': {'in': node_pks}}, project=['uuid'])
+    for res in uuid_query.iterall(batch_size=EXPORT_BATCH_SIZE):
+        uuid = str(res[0])
+
+        # Make sure the node's repository folder was not deleted
+        repository = Repository(uuid=uuid, is_stored=True)
+        if not repository.exists():
+            raise exceptions.ArchiveExportError(
+                'Unable to find the repository folder for Node with UUID={} in the local repository'.format(uuid)
+            )
+
+        repository_index[uuid] = sorted(
+            relpath + '/' if opener is None else relpath for relpath, opener in repository.iter_tree()
+        )
+
+    return repository_index
+
+
+def _iter_export_data(entries_to_add, entry_ids, all_fields_info, unique_identifiers, uuids):
+    """Return an iterator over the serialized entities of each entity type, for the `export_data` of `data.json`.
+
+    Besides the entities of its own type, the query of each type also returns the entities that they reference, e.g.
+    the users and computers of nodes. Those that are not returned by the query of their own type are kept in memory and
+    added once the entities of their type are written. These are only users and computers that were not explicitly
+    exported, since the nodes of exported logs and comments are always exported themselves.
+
+    :param entries_to_add: mapping of entity names onto the `QueryBuilder` instances that return the entities
+    :param entry_ids: mapping of entity names onto the pks of the entities to export
+    :param all_fields_info: the exported fields of each entity type, see `get_all_fields_info`
+    :param unique_identifiers: the name of the field that uniquely identifies the entities of each entity type
+    :param uuids: a dictionary in which the unique identifiers of the exported entities are mapped onto their pk per
+        entity name
+    :return: iterator over tuples of entity name and a `StreamedDict` with the serialized entities by pk
+    """
+    entity_separator = '_'
+    referenced = defaultdict(dict)
+
+    def iter_entities(entity_name, partial_query):
+        """Return an iterator over the serialized entities returned by the query of the given entity type."""
+        for value in all_fields_info[entity_name].values():
+            if 'requires' in value:
+                fill_in_query(partial_query, entity_name, value['requires'], [entity_name], entity_separator)
+
+        for temp_d in partial_query.iterdict(batch_size=EXPORT_BATCH_SIZE):
+            for k in temp_d.keys():
+                # Get current entity
+                current_entity = k.split(entity_separator)[-1]
+
+                # This is a empty result of an outer join.
+                # It should not be taken into account.
+                if temp_d[k]['id'] is None:
+                    continue
+
+                serialized = serialize_dict(
+                    temp_d[k], remove_fields=['id'], rename_fields=model_fields_to_file_fields[current_entity]
                 )
 
-            # In this way, I copy the content of the folder, and not the folder itself
-            thisnodefolder.insert_path(src=src.abspath, dest_name='.')
+                if current_entity == entity_name:
+                    uuids[entity_name][serialized[unique_identifiers[entity_name]]] = temp_d[k]['id']
+                    yield temp_d[k]['id'], serialized
+                elif temp_d[k]['id'] not in entry_ids.get(current_entity, ()):
+                    referenced[current_entity][temp_d[k]['id']] = serialized
+
+        for pk, serialized in referenced.pop(entity_name, {}).items():
+            uuids[entity_name][serialized[unique_identifiers[entity_name]]] = pk
+            yield pk, serialized
+
+    # Entities of a type have to be written after all the entities that may reference them
+    for entity_name in sorted(entries_to_add, key=EXPORT_ENTITY_ORDER.index):
+        yield entity_name, StreamedDict(iter_entities(entity_name, entries_to_add[entity_name]))
+
+    for entity_name in list(referenced):
+        for pk, serialized in referenced[entity_name].items():
+            uuids[entity_name][serialized[unique_identifiers[entity_name]]] = pk
+        yield entity_name, StreamedDict(referenced.pop(entity_name).items())
+
+
+def _iter_links_uuid(links, node_pks):
+    """Return an iterator over the serialized links, for the `links_uuid` of `data.json`.
+
+    :param links: iterable of `LinkQuadruple` between the exported nodes
+    :param node_pks: the pks of the exported nodes
+    :return: iterator over dictionaries with the uuids of the nodes, the label and the type of each link
+    """
+    if not node_pks:
+        return
+
+    # I create a utility dictionary for mapping pk to uuid.
+    builder = orm.QueryBuilder()
+    builder.append(orm.Node, project=('id', 'uuid'), filters={'id': {'in': node_pks}})
+    pk_2_uuid_dict = dict(builder.iterall(batch_size=EXPORT_BATCH_SIZE))
+
+    for link in links:
+        yield {
+            'input': pk_2_uuid_dict[link.source_id],
+            'output': pk_2_uuid_dict[link.target_id],
+            'label': link.link_label,
+            'type': link.link_type
+        }
+
+
+def _iter_groups_uuid(group_pks):
+    """Return an iterator over the uuids of the nodes of each group, for the `groups_uuid` of `data.json`.
+
+    :param group_pks: the pks of the exported groups
+    :return: iterator over tuples of the uuid of a group and a `StreamedList` of the uuids of its nodes. Groups without
+        nodes are skipped.
+    """
+    if not group_pks:
+        return
+
+    builder = orm.QueryBuilder()
+    builder.append(orm.Group, filters={'id': {'in': group_pks}}, project=['id', 'uuid'])
+
+    for group_pk, group_uuid in builder.all():
+        nodes_query = orm.QueryBuilder()
+        nodes_query.append(orm.Group, filters={'id': group_pk}, tag='group')
+        nodes_query.append(orm.Node, project=['uuid'], with_group='group')
+        node_uuids = (str(node_uuid) for node_uuid, in nodes_query.iterall(batch_size=EXPORT_BATCH_SIZE))
+
+        try:
+            first = next(node_uuids)
+        except StopIteration:
+            continue
+
+        yield str(group_uuid), StreamedList(itertools.chain([first], node_uuids))
+
+
+def _export_repository(repository, folder):
+    """Stream the entire content of the repository of a node into the folder of the archive, without a staging copy.
+
+    :param repository: the repository of a stored node
+    :type repository: :class:`aiida.orm.utils.repository.Repository`
+    :param folder: the folder of the node in the archive
+    """
+    folder.create()
+
+    for relpath, opener in repository.iter_tree():
+        if opener is None:
+            folder.get_subfolder(relpath, reset_limit=True).create()
+        else:
+            with opener() as handle:
+                folder.create_file_from_filelike(handle, relpath)
 
 
 def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=False, **kwargs):
@@ -546,33 +632,19 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=Fal
         exporting.
     :raises `~aiida.common.exceptions.LicensingException`: if any node is licensed under forbidden license.
     """
-    from aiida.common.folders import SandboxFolder
-
     if not overwrite and os.path.exists(outfile):
         raise exceptions.ArchiveExportError("The output file '{}' already exists".format(outfile))
 
-    folder = SandboxFolder()
-    time_export_start = time.time()
-    export_tree(what, folder=folder, silent=silent, **kwargs)
-
-    time_export_end = time.time()
-
-    if not silent:
-        print('COMPRESSING...')
+    time_start = time.time()
 
-    time_compress_start = time.time()
-    with tarfile.open(outfile, 'w:gz', format=tarfile.PAX_FORMAT, dereference=True) as tar:
-        tar.add(folder.abspath, arcname='')
-    time_compress_end = time.time()
+    # The archive is compressed while it is written, such that it does not have to be built in a sandbox folder first
+    with write_atomically(outfile) as temporary:
+        with TarFolder(temporary, mode='w:gz') as folder:
+            export_tree(what, folder=folder, silent=silent, **kwargs)
 
     if not silent:
-        filecr_time = time_export_end - time_export_start
-        filecomp_time = time_compress_end - time_compress_start
-        print(
-            'Exported in {:6.2g}s, compressed in {:6.2g}s, total: {:6.2g}s.'.format(
-                filecr_time, filecomp_time, filecr_time + filecomp_time
-            )
-        )
+        print('Exported and compressed in {:6.2g}s.'.format(time.time() - time_start))
 
     if not silent:
         print('DONE.')
+
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Export a (compressed) tar-file."""
+# pylint: disable=redefined-builtin
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+
+from .zip import get_remaining_size
+
+
+class MyWritingTarFile:
+    """Text file handle whose content is added as a member of a tar archive when it is closed.
+
+    The header of a member contains the size of its content, so the content is spooled to a temporary file first.
+    """
+
+    def __init__(self, tar_file, fname):
+        self._tarfile = tar_file
+        self._fname = fname
+        self._handle = None
+
+    def open(self):
+        if self._handle is not None:
+            raise IOError('Cannot open again!')
+        self._handle = io.TextIOWrapper(tempfile.TemporaryFile(), encoding='utf8')
+
+    def write(self, data):
+        self._handle.write(data)
+
+    def close(self):
+        self._handle.flush()
+        handle = self._handle.detach()
+        self._handle = None
+
+        try:
+            handle.seek(0)
+            self._tarfile.addfile(create_tarinfo(self._fname, size=get_remaining_size(handle)), handle)
+        finally:
+            handle.close()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+class TarFolder:
+    """Folder-like interface to write a tar archive, with the same interface as the `ZipFolder` used for writing.
+
+    The content of files is streamed into the archive, such that the archive does not have to be built in a folder on
+    disk first.
+    """
+
+    def __init__(self, tarfolder_or_fname, mode=None, subfolder='.'):
+        """
+        :param tarfolder_or_fname: either another TarFolder instance, of which you want to get a subfolder, or a
+            filename to create.
+        :param mode: the file mode; see the tarfile.open docs for valid strings, defaults to a gzip compressed archive.
+            Note: can be specified only if tarfolder_or_fname is a string (the filename to generate)
+        :param subfolder: the subfolder that specified the "current working directory" in the tar file. If
+            tarfolder_or_fname is a TarFolder, subfolder is a relative path from tarfolder_or_fname.subfolder
+        """
+        if isinstance(tarfolder_or_fname, str):
+            self._tarfile = tarfile.open(
+                tarfolder_or_fname, mode=mode or 'w:gz', format=tarfile.PAX_FORMAT, dereference=True
+            )
+            self._names = set()
+            self._pwd = subfolder
+        else:
+            if mode is not None:
+                raise ValueError("Cannot specify 'mode' when passing a TarFolder")
+            self._tarfile = tarfolder_or_fname._tarfile  # pylint: disable=protected-access
+            self._names = tarfolder_or_fname._names  # pylint: disable=protected-access
+            self._pwd = os.path.join(tarfolder_or_fname.pwd, subfolder)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        self._tarfile.close()
+
+    @property
+    def pwd(self):
+        return self._pwd
+
+    def open(self, fname, mode='w'):
+        """Open a new file for writing in the current folder of the tar file.
+
+        :param fname: the name of the file
+        :param mode: the file mode, only 'w' is supported since the tar file is opened for writing
+        """
+        if mode != 'w':
+            raise ValueError('a TarFolder can only be written')
+
+        return MyWritingTarFile(tar_file=self, fname=self._get_internal_path(fname))
+
+    def addfile(self, tarinfo, fileobj=None):
+        """Add a member to the tar file, keeping track of its name."""
+        self._tarfile.addfile(tarinfo, fileobj)
+        self._names.add(tarinfo.name)
+
+    def _get_internal_path(self, filename):
+        return os.path.normpath(os.path.join(self.pwd, filename))
+
+    # pylint: disable=unused-argument
+    def get_subfolder(self, subfolder, create=False, reset_limit=False):
+        # reset_limit: ignored
+        # create: ignored, for the time being
+        return TarFolder(self, subfolder=subfolder)
+
+    def exists(self, path):
+        """Check whether path already exists in the TarFolder"""
+        return path in self._names
+
+    def create(self):
+        """Add the entry of the directory of this folder to the tar file, if it does not exist yet."""
+        dirname = self._get_internal_path('.')
+
+        if dirname != '.' and not self.exists(dirname):
+            tarinfo = create_tarinfo(dirname)
+            tarinfo.type = tarfile.DIRTYPE
+            tarinfo.mode = 0o755
+            self.addfile(tarinfo)
+
+    def create_file_from_filelike(self, filelike, filename, mode='wb', encoding=None):
+        """Create a file with the given filename from a filelike object, streaming its content into the tar file.
+
+        If the size of the content cannot be determined from the filelike object, it is spooled to a temporary file.
+
+        :param filelike: a binary filelike object whose contents to copy
+        :param filename: the filename for the file that is to be created
+        :param mode: ignored, the content is always copied in binary mode
+        :param encoding: ignored, the content is always copied in binary mode
+        :return: the path of the created file within the tar file
+        """
+        filename = self._get_internal_path(str(filename))
+        size = get_remaining_size(filelike)
+
+        if size is not None:
+            self.addfile(create_tarinfo(filename, size=size), filelike)
+            return filename
+
+        with tempfile.TemporaryFile() as handle:
+            shutil.copyfileobj(filelike, handle)
+            size = handle.tell()
+            handle.seek(0)
+            self.addfile(create_tarinfo(filename, size=size), handle)
+
+        return filename
+
+    def insert_path(self, src, dest_name=None, overwrite=True):
+        """Add a file or directory from disk to the tar file.
+
+        :param src: the absolute path of the file or directory to add
+        :param dest_name: if None, the same basename of src is used. Otherwise, the destination filename will have
+            this file name.
+        :param overwrite: if False, raise if the destination already exists
+        """
+        if dest_name is None:
+            base_filename = str(os.path.basename(src))
+        else:
+            base_filename = str(dest_name)
+
+        base_filename = self._get_internal_path(base_filename)
+
+        src = str(src)
+
+        if not os.path.isabs(src):
+            raise ValueError('src must be an absolute path in insert_file')
+
+        if not overwrite and self.exists(base_filename):
+            raise IOError('destination already exists: {}'.format(base_filename))
+
+        def track(tarinfo):
+            self._names.add(tarinfo.name)
+            return tarinfo
+
+        self._tarfile.add(src, arcname=base_filename, filter=track)
+
+
+def create_tarinfo(name, size=0):
+    """Return the header of a regular file in a tar archive.
+
+    :param name: the name of the member
+    :param size: the size in bytes of the content
+    :return: the header
+    :rtype: :class:`tarfile.TarInfo`
+    """
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.size = size
+    tarinfo.mtime = time.time()
+    tarinfo.mode = 0o644
+
+    return tarinfo
@@ -9,11 +9,15 @@
 ###########################################################################
 """ Utility functions for export of AiiDA entities """
 # pylint: disable=too-many-locals,too-many-branches,too-many-nested-blocks
+import contextlib
+import os
+from uuid import uuid4
 
 from aiida.orm import QueryBuilder, ProcessNode
 from aiida.tools.importexport.common import exceptions
 from aiida.tools.importexport.common.config import (
-    file_fields_to_model_fields, entity_names_to_entities, get_all_fields_info
+    file_fields_to_model_fields, entity_names_to_entities, get_all_fields_info, NODE_ENTITY_NAME,
+    NODES_EXPORT_SUBFOLDER
 )
 
 
@@ -271,3 +275,193 @@ def check_process_nodes_sealed(nodes):
             'All ProcessNodes must be sealed before they can be exported. '
             'Node(s) with PK(s): {} is/are not sealed.'.format(', '.join(str(pk) for pk in nodes - sealed_nodes))
         )
+
+
+@contextlib.contextmanager
+def write_atomically(outfile):
+    """Return a context manager that yields a temporary path in the directory of the output file to write to.
+
+    The temporary file replaces the output file only when the context exits without an exception. Otherwise, it is
+    removed, such that a failed export or migration neither leaves an incomplete archive behind nor removes an
+    existing one.
+
+    :param outfile: the path of the output file
+    :return: the path of the temporary file
+    """
+    temporary = '{}.{}.tmp'.format(outfile, uuid4().hex)
+
+    try:
+        yield temporary
+        os.replace(temporary, outfile)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+class StreamedDict:
+    """JSON object whose members are produced by an iterable and written one at a time by `dump_streamed`."""
+
+    def __init__(self, items):
+        """
+        :param items: iterable of key, value tuples. Keys are converted to strings, values may be streamed themselves.
+        """
+        self.items = items
+
+
+class StreamedList:
+    """JSON array whose elements are produced by an iterable and written one at a time by `dump_streamed`."""
+
+    def __init__(self, elements):
+        """
+        :param elements: iterable of values, which may be streamed themselves.
+        """
+        self.elements = elements
+
+
+def dump_streamed(data, fhandle, index=None):
+    """Write `data` as JSON to a text file handle, consuming the iterables of streamed objects and arrays lazily.
+
+    Only a single member of a `StreamedDict` or element of a `StreamedList` is kept in memory at any time, such that
+    arbitrarily large documents can be written with bounded memory.
+
+    :param data: a `StreamedDict`, a `StreamedList` or any other JSON serializable value
+    :param fhandle: a text file handle opened for writing, at the start of the file
+    :param index: optional dictionary in which the location in the file of the value of each member of a `StreamedDict`
+        is recorded as a list of its offset and length in bytes of UTF-8. For values that are a `StreamedDict`
+        themselves, the locations of their members are recorded in a nested dictionary instead.
+    """
+    if index is not None:
+        fhandle = _PositionTracker(fhandle)
+
+    _dump_streamed(data, fhandle, index)
+
+
+def _dump_streamed(data, fhandle, index):
+    """Write `data` as JSON to a text file handle, see `dump_streamed`."""
+    from aiida.common import json
+
+    if isinstance(data, StreamedDict):
+        fhandle.write('{')
+        for position, (key, value) in enumerate(data.items):
+            fhandle.write('{}{}: '.format(', ' if position else '', json.dumps(str(key))))
+            if index is None:
+                _dump_streamed(value, fhandle, None)
+            elif isinstance(value, StreamedDict):
+                index[str(key)] = {}
+                _dump_streamed(value, fhandle, index[str(key)])
+            else:
+                offset = fhandle.position
+                _dump_streamed(value, fhandle, None)
+                index[str(key)] = [offset, fhandle.position - offset]
+        fhandle.write('}')
+    elif isinstance(data, StreamedList):
+        fhandle.write('[')
+        for position, value in enumerate(data.elements):
+            if position:
+                fhandle.write(', ')
+            _dump_streamed(value, fhandle, None)
+        fhandle.write(']')
+    else:
+        fhandle.write(json.dumps(data))
+
+
+class _PositionTracker:
+    """Wrapper of a text file handle that keeps track of the position in bytes of UTF-8 of the text written to it."""
+
+    def __init__(self, fhandle):
+        self._fhandle = fhandle
+        self.position = 0
+
+    def write(self, text):
+        self._fhandle.write(text)
+        self.position += len(text.encode('utf8'))
+
+
+def write_data_and_index(folder, data, index):
+    """Write the `data.json` and `index.json` files of an archive, with the index after the data.
+
+    The data is streamed straight into the archive, since the location of its values, which is recorded in the index,
+    is only known once the data has been written. The index is written member by member afterwards. Zip files and
+    folders are read with random access, such that the order of the files does not matter. To read the index of a tar
+    file, the `data.json` member preceding it has to be skipped, which for a compressed tar file means decompressing it.
+
+    :param folder: the folder of the archive, e.g. a `ZipFolder`, a `TarFolder` or a `Folder` of an unpacked archive
+    :param data: the content of `data.json`, either streamed, see `dump_streamed`, or as a dictionary
+    :param index: the content of `index.json` except for the location of the data, which is added under the `data` key
+    """
+    if not isinstance(data, StreamedDict):
+        data = _get_streamed_data(data)
+
+    index['data'] = {}
+
+    with folder.open('data.json', 'w') as fhandle:
+        dump_streamed(data, fhandle, index=index['data'])
+
+    with folder.open('index.json', 'w') as fhandle:
+        dump_streamed(_get_streamed_index(index), fhandle)
+
+
+def _get_streamed_index(index):
+    """Return the content of `index.json` with all its dictionaries replaced by a `StreamedDict`.
+
+    :param index: the content of `index.json` as a dictionary
+    :return: the content of `index.json` as a `StreamedDict`, whose values are written one at a time
+    """
+    return StreamedDict((key, _get_streamed_index(value) if isinstance(value, dict) else value)
+                        for key, value in index.items())
+
+
+def _get_streamed_data(data):
+    """Return the content of `data.json` with the dictionaries whose members are indexed replaced by a `StreamedDict`.
+
+    :param data: the content of `data.json` as a dictionary
+    :return: the content of `data.json` as a `StreamedDict`
+    """
+    export_data = data.get('export_data', {})
+
+    return StreamedDict([
+        ('node_attributes', StreamedDict(data.get('node_attributes', {}).items())),
+        ('node_extras', StreamedDict(data.get('node_extras', {}).items())),
+        ('export_data', StreamedDict((name, StreamedDict(entities.items())) for name, entities in export_data.items())),
+        ('links_uuid', data.get('links_uuid', [])),
+        ('groups_uuid', StreamedDict(data.get('groups_uuid', {}).items())),
+    ])
+
+
+def get_archive_index(metadata, data, folder):
+    """Return the index of an unpacked archive, except for the location of the data, see `write_data_and_index`.
+
+    :param metadata: the content of `metadata.json`
+    :param data: the content of `data.json` as a dictionary
+    :param folder: the folder into which the archive is unpacked
+    :return: the index
+    """
+    from aiida.tools.importexport.common.utils import export_shard_uuid
+
+    uuids = {}
+    for entity_name, entities in data.get('export_data', {}).items():
+        unique_identifier = metadata['unique_identifiers'][entity_name]
+        uuids[entity_name] = {entity[unique_identifier]: pk for pk, entity in entities.items()}
+
+    repository = {}
+    for uuid in uuids.get(NODE_ENTITY_NAME, {}):
+        path = folder.get_abs_path(os.path.join(NODES_EXPORT_SUBFOLDER, export_shard_uuid(uuid)))
+        repository[uuid] = list_folder(path)
+
+    return {'uuids': uuids, 'repository': repository, 'links': len(data.get('links_uuid', []))}
+
+
+def list_folder(path):
+    """Return the relative paths of all files and directories in a folder, recursively, as recorded in the index.
+
+    :param path: the absolute path of the folder
+    :return: the sorted relative paths, where those of directories end with a forward slash
+    """
+    entries = []
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        relpath = os.path.relpath(dirpath, path)
+        entries.extend(os.path.normpath(os.path.join(relpath, dirname)) + '/' for dirname in dirnames)
+        entries.extend(os.path.normpath(os.path.join(relpath, filename)) for filename in filenames)
+
+    return sorted(entry.replace(os.sep, '/') for entry in entries)
@@ -11,28 +11,80 @@
 # pylint: disable=missing-docstring,redefined-builtin
 import io
 import os
+import shutil
+import sys
+import tempfile
+import time
 import zipfile
 
 
+def open_zip_member(zip_file, fname, size=None):
+    """Return a binary file handle that streams what is written to it into a new member of a zip archive.
+
+    Only one member of the archive can be written at a time and the member is only complete once the handle is closed.
+
+    :param zip_file: the zip archive opened for writing
+    :type zip_file: :class:`zipfile.ZipFile`
+    :param fname: the name of the member
+    :param size: the size in bytes of the content, if known in advance. If not, the member is always written with the
+        ZIP64 extensions, such that its content is allowed to exceed 2 GiB.
+    :return: a writable binary file-like object
+    """
+    zinfo = zipfile.ZipInfo(fname, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = zip_file.compression
+    zinfo.external_attr = 0o644 << 16
+
+    if sys.version_info < (3, 6):
+        # Members can only be opened for writing as of Python 3.6, so the content is spooled to a temporary file first
+        return io.BufferedWriter(_TemporaryZipMember(zip_file, zinfo))
+
+    if size is not None:
+        zinfo.file_size = size
+
+    return zip_file.open(zinfo, 'w', force_zip64=size is None)
+
+
+class _TemporaryZipMember(io.FileIO):
+    """Temporary file that is added to a zip archive when it is closed."""
+
+    def __init__(self, zip_file, zinfo):
+        handle, filepath = tempfile.mkstemp()
+        super().__init__(handle, 'wb', closefd=True)
+        self._zipfile = zip_file
+        self._zinfo = zinfo
+        self._filepath = filepath
+
+    def close(self):
+        if self.closed:
+            return
+
+        super().close()
+
+        try:
+            self._zipfile.write(self._filepath, self._zinfo.filename, compress_type=self._zinfo.compress_type)
+        finally:
+            os.remove(self._filepath)
+
+
 class MyWritingZipFile:
+    """Text file handle that streams what is written to it into a member of a zip archive."""
 
     def __init__(self, zip_file, fname):
         self._zipfile = zip_file
         self._fname = fname
-        self._buffer = None
+        self._handle = None
 
     def open(self):
-        if self._buffer is not None:
+        if self._handle is not None:
             raise IOError('Cannot open again!')
-        self._buffer = io.StringIO()
+        self._handle = io.TextIOWrapper(open_zip_member(self._zipfile, self._fname), encoding='utf8')
 
     def write(self, data):
-        self._buffer.write(data)
+        self._handle.write(data)
 
     def close(self):
-        self._buffer.seek(0)
-        self._zipfile.writestr(self._fname, self._buffer.read())
-        self._buffer = None
+        self._handle.close()
+        self._handle = None
 
     def __enter__(self):
         self.open()
@@ -109,6 +161,31 @@ class ZipFolder:
         # create: ignored, for the time being
         return ZipFolder(self, subfolder=subfolder)
 
+    def create(self):
+        """Add the entry of the directory of this folder to the zip file, if it does not exist yet."""
+        dirname = self._get_internal_path('.') + '/'
+
+        if dirname != './' and not self.exists(dirname):
+            zinfo = zipfile.ZipInfo(dirname, date_time=time.localtime(time.time())[:6])
+            zinfo.external_attr = (0o40755 << 16) | 0x10
+            self._zipfile.writestr(zinfo, b'')
+
+    def create_file_from_filelike(self, filelike, filename, mode='wb', encoding=None):
+        """Create a file with the given filename from a filelike object, streaming its content into the zip file.
+
+        :param filelike: a binary filelike object whose contents to copy
+        :param filename: the filename for the file that is to be created
+        :param mode: ignored, the content is always copied in binary mode
+        :param encoding: ignored, the content is always copied in binary mode
+        :return: the path of the created file within the zip file
+        """
+        filename = self._get_internal_path(str(filename))
+
+        with open_zip_member(self._zipfile, filename, size=get_remaining_size(filelike)) as handle:
+            shutil.copyfileobj(filelike, handle)
+
+        return filename
+
     def exists(self, path):
         """Check whether path already exists in the ZipFolder"""
         try:
@@ -150,3 +227,19 @@ class ZipFolder:
                             self._zipfile.write(real_src, real_dest)
         else:
             self._zipfile.write(src, base_filename)
+
+
+def get_remaining_size(filelike):
+    """Return the number of bytes that remain to be read from a filelike object, if it is seekable.
+
+    :param filelike: a binary filelike object
+    :return: the number of bytes or None if it cannot be determined without reading the content
+    """
+    try:
+        position = filelike.tell()
+        size = filelike.seek(0, os.SEEK_END) - position
+        filelike.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    return size
@@ -10,23 +10,28 @@
 # pylint: disable=too-many-nested-blocks,protected-access,fixme,too-many-arguments,too-many-locals,too-many-branches,too-many-statements
 """ SQLAlchemy-specific import of AiiDA entities """
 
+import concurrent.futures
 from distutils.version import StrictVersion
 import os
+import resource
+import sys
 import tarfile
+import time
 import zipfile
 from itertools import chain
 
 from aiida.common import timezone, json
-from aiida.common.folders import SandboxFolder, RepositoryFolder
 from aiida.common.links import LinkType
 from aiida.common.utils import get_object_from_string
-from aiida.orm import QueryBuilder, Node, Group, WorkflowNode, CalculationNode, Data
-from aiida.orm.utils.links import link_triple_exists, validate_link
+from aiida.manage.configuration import get_config_option
+from aiida.orm import QueryBuilder, Group, WorkflowNode, CalculationNode, Data
+from aiida.orm.utils.links import validate_links_by_uuid
+from aiida.orm.utils.node import load_node_class
 from aiida.orm.utils.repository import Repository
 
 from aiida.tools.importexport.common import exceptions
-from aiida.tools.importexport.common.archive import extract_tree, extract_tar, extract_zip
-from aiida.tools.importexport.common.config import DUPL_SUFFIX, IMPORTGROUP_TYPE, EXPORT_VERSION, NODES_EXPORT_SUBFOLDER
+from aiida.tools.importexport.common.archive import Archive
+from aiida.tools.importexport.common.config import DUPL_SUFFIX, IMPORTGROUP_TYPE, EXPORT_VERSION
 from aiida.tools.importexport.common.config import (
     NODE_ENTITY_NAME, GROUP_ENTITY_NAME, COMPUTER_ENTITY_NAME, USER_ENTITY_NAME, LOG_ENTITY_NAME, COMMENT_ENTITY_NAME
 )
@@ -34,10 +39,12 @@ from aiida.tools.importexport.common.config import (
     entity_names_to_signatures, signatures_to_entity_names, entity_names_to_sqla_schema, file_fields_to_model_fields,
     entity_names_to_entities
 )
-from aiida.tools.importexport.common.utils import export_shard_uuid
 from aiida.tools.importexport.dbimport.backends.utils import deserialize_field, merge_comment, merge_extras
 from aiida.tools.importexport.dbimport.backends.sqla.utils import validate_uuid
 
+# The number of threads that copy the repositories of the imported nodes
+IMPORT_REPOSITORY_THREADS = 4
+
 
 def import_data_sqla(
     in_path,
@@ -51,8 +58,10 @@ def import_data_sqla(
     """Import exported AiiDA archive to the AiiDA database and repository.
 
     Specific for the SQLAlchemy backend.
-    If ``in_path`` is a folder, calls extract_tree; otherwise, tries to detect the compression format
-    (zip, tar.gz, tar.bz2, ...) and calls the correct function.
+    ``in_path`` can be a folder or a (possibly compressed) tar or zip file. Only the files of the archive that are
+    needed are unpacked: the repository folders of nodes that already exist are never unpacked from a zip file. The new
+    nodes, their links and group memberships are stored with multi-row inserts in batches of the `db.batch_size` option
+    and the repositories of the new nodes are copied by a pool of threads.
 
     :param in_path: the path to a file or folder that can be imported in AiiDA.
     :type in_path: str
@@ -106,6 +115,9 @@ def import_data_sqla(
     from aiida.backends.sqlalchemy.models.node import DbNode, DbLink
     from aiida.backends.sqlalchemy.utils import flag_modified
 
+    start_time = time.time()
+    batch_size = get_config_option('db.batch_size')
+
     # This is the export version expected by this function
     expected_export_version = StrictVersion(EXPORT_VERSION)
 
@@ -122,33 +134,15 @@ def import_data_sqla(
     ################
     # EXTRACT DATA #
     ################
-    # The sandbox has to remain open until the end
-    with SandboxFolder() as folder:
-        if os.path.isdir(in_path):
-            extract_tree(in_path, folder)
-        else:
-            if tarfile.is_tarfile(in_path):
-                extract_tar(in_path, folder, silent=silent, nodes_export_subfolder=NODES_EXPORT_SUBFOLDER)
-            elif zipfile.is_zipfile(in_path):
-                extract_zip(in_path, folder, silent=silent, nodes_export_subfolder=NODES_EXPORT_SUBFOLDER)
-            else:
-                raise exceptions.ImportValidationError(
-                    'Unable to detect the input file format, it is neither a '
-                    '(possibly compressed) tar file, nor a zip file.'
-                )
+    if not os.path.isdir(in_path) and not tarfile.is_tarfile(in_path) and not zipfile.is_zipfile(in_path):
+        raise exceptions.ImportValidationError(
+            'Unable to detect the input file format, it is neither a (possibly compressed) tar file, nor a zip file.'
+        )
 
-        if not folder.get_content_list():
-            raise exceptions.CorruptArchive('The provided file/folder ({}) is empty'.format(in_path))
-        try:
-            with open(folder.get_abs_path('metadata.json'), encoding='utf8') as fhandle:
-                metadata = json.load(fhandle)
-
-            with open(folder.get_abs_path('data.json'), encoding='utf8') as fhandle:
-                data = json.load(fhandle)
-        except IOError as error:
-            raise exceptions.CorruptArchive(
-                'Unable to find the file {} in the import file or folder'.format(error.filename)
-            )
+    # The archive has to remain open until the end, since the repository folders of the nodes are unpacked on demand
+    with Archive(in_path) as archive:
+        metadata = archive.meta_data
+        data = archive.data
 
         ######################
         # PRELIMINARY CHECKS #
@@ -275,25 +269,11 @@ def import_data_sqla(
                     if unique_identifier is not None:
                         import_unique_ids = set(v[unique_identifier] for v in data['export_data'][entity_name].values())
 
-                        relevant_db_entries = dict()
-                        if import_unique_ids:
-                            builder = QueryBuilder()
-                            builder.append(
-                                entity,
-                                filters={unique_identifier: {
-                                    'in': import_unique_ids
-                                }},
-                                project=['*'],
-                                tag='res'
-                            )
-                            relevant_db_entries = {
-                                str(getattr(v[0], unique_identifier)):  # str() to convert UUID() to string
-                                v[0] for v in builder.all()
-                            }
-
-                            foreign_ids_reverse_mappings[entity_name] = {
-                                k: v.pk for k, v in relevant_db_entries.items()
-                            }
+                        # Only the unique identifier and pk of the entities that already exist are needed
+                        relevant_db_entries = _get_existing_pks(
+                            entity, unique_identifier, import_unique_ids, batch_size
+                        )
+                        foreign_ids_reverse_mappings[entity_name] = relevant_db_entries.copy()
 
                         imported_comp_names = set()
                         for key, value in data['export_data'][entity_name].items():
@@ -403,8 +383,9 @@ def import_data_sqla(
                         print('existing %s: %s (%s->%s)' % (entity_sig, unique_id, import_entry_pk, existing_entry_pk))
 
                 # Store all objects for this model in a list, and store them
-                # all in once at the end.
+                # all in once at the end. Nodes are inserted as rows of the table directly.
                 objects_to_create = list()
+                node_rows = list()
                 # In the following list we add the objects to be updated
                 objects_to_update = list()
                 # This is needed later to associate the import entry with the new pk
@@ -448,68 +429,33 @@ def import_data_sqla(
 
                     db_entity = get_object_from_string(entity_names_to_sqla_schema[entity_name])
 
-                    objects_to_create.append(db_entity(**import_data))
+                    if entity_name == NODE_ENTITY_NAME:
+                        dbnode = db_entity(**import_data)
+                        node_rows.append(_get_node_row(dbnode, import_entry_pk, data, extras_mode_new))
+                    else:
+                        objects_to_create.append(db_entity(**import_data))
                     import_new_entry_pks[unique_id] = import_entry_pk
 
+                # This is needed later to associate the unique identifier of new nodes with their new pk
+                just_saved = dict()
+
                 if entity_sig == entity_names_to_signatures[NODE_ENTITY_NAME]:
                     if not silent:
                         print('STORING NEW NODE REPOSITORY FILES & ATTRIBUTES...')
+                        if node_rows and extras_mode_new == 'import':
+                            print('STORING NEW NODE EXTRAS...')
+                        elif node_rows:
+                            print('SKIPPING NEW NODE EXTRAS...')
 
                     # NEW NODES
-                    for object_ in objects_to_create:
-                        import_entry_uuid = object_.uuid
-                        import_entry_pk = import_new_entry_pks[import_entry_uuid]
-
-                        # Before storing entries in the DB, I store the files (if these are nodes).
-                        # Note: only for new entries!
-                        subfolder = folder.get_subfolder(
-                            os.path.join(NODES_EXPORT_SUBFOLDER, export_shard_uuid(import_entry_uuid))
-                        )
-                        if not subfolder.exists():
-                            raise exceptions.CorruptArchive(
-                                'Unable to find the repository folder for Node with UUID={} in the exported '
-                                'file'.format(import_entry_uuid)
-                            )
-                        destdir = RepositoryFolder(section=Repository._section_name, uuid=import_entry_uuid)
-                        # Replace the folder, possibly destroying existing previous folders, and move the files
-                        # (faster if we are on the same filesystem, and in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath, move=True, overwrite=True)
+                    # Before storing entries in the DB, I store the files. Note: only for new entries!
+                    _import_repositories(archive, list(import_new_entry_pks))
 
-                        # For Nodes, we also have to store Attributes!
-                        # Get attributes from import file
-                        try:
-                            object_.attributes = data['node_attributes'][str(import_entry_pk)]
-                        except KeyError:
-                            raise exceptions.CorruptArchive(
-                                'Unable to find attribute info for Node with UUID={}'.format(import_entry_uuid)
-                            )
-
-                        # For DbNodes, we also have to store extras
-                        # Get extras from import file
-                        if extras_mode_new == 'import':
-                            if not silent:
-                                print('STORING NEW NODE EXTRAS...')
-                            try:
-                                extras = data['node_extras'][str(import_entry_pk)]
-                            except KeyError:
-                                raise exceptions.CorruptArchive(
-                                    'Unable to find extra info for Node with UUID={}'.format(import_entry_uuid)
-                                )
-                            # TODO: remove when aiida extras will be moved somewhere else
-                            # from here
-                            extras = {key: value for key, value in extras.items() if not key.startswith('_aiida_')}
-                            if object_.node_type.endswith('code.Code.'):
-                                extras = {key: value for key, value in extras.items() if not key == 'hidden'}
-                            # till here
-                            object_.extras = extras
-                        elif extras_mode_new == 'none':
-                            if not silent:
-                                print('SKIPPING NEW NODE EXTRAS...')
-                        else:
-                            raise exceptions.ImportValidationError(
-                                "Unknown extras_mode_new value: {}, should be either 'import' or 'none'"
-                                ''.format(extras_mode_new)
-                            )
+                    table = DbNode.__table__
+                    for start in range(0, len(node_rows), batch_size):
+                        statement = table.insert().values(node_rows[start:start + batch_size])
+                        for new_pk, unique_id in session.execute(statement.returning(table.c.id, table.c.uuid)):
+                            just_saved[str(unique_id)] = new_pk
 
                     # EXISTING NODES (Extras)
                     if not silent:
@@ -549,19 +495,8 @@ def import_data_sqla(
 
                 session.flush()
 
-                if import_new_entry_pks.keys():
-                    builder = QueryBuilder()
-                    builder.append(
-                        entity,
-                        filters={unique_identifier: {
-                            'in': list(import_new_entry_pks.keys())
-                        }},
-                        project=[unique_identifier, 'id'],
-                        tag='res'
-                    )
-                    just_saved = {v[0]: v[1] for v in builder.all()}
-                else:
-                    just_saved = dict()
+                if objects_to_create:
+                    just_saved = _get_existing_pks(entity, unique_identifier, import_new_entry_pks, batch_size)
 
                 # Now I have the PKs, print the info
                 # Moreover, add newly created Nodes to foreign_ids_reverse_mappings
@@ -581,59 +516,56 @@ def import_data_sqla(
             if not silent:
                 print('STORING NODE LINKS...')
 
-            import_links = data['links_uuid']
+            node_pks = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+            links_to_add = []
 
-            for link in import_links:
+            for link in data['links_uuid']:
                 # Check for dangling Links within the, supposed, self-consistent archive
-                try:
-                    in_id = foreign_ids_reverse_mappings[NODE_ENTITY_NAME][link['input']]
-                    out_id = foreign_ids_reverse_mappings[NODE_ENTITY_NAME][link['output']]
-                except KeyError:
+                if link['input'] not in node_pks or link['output'] not in node_pks:
                     if ignore_unknown_nodes:
                         continue
                     raise exceptions.ImportValidationError(
                         'Trying to create a link with one or both unknown nodes, stopping (in_uuid={}, out_uuid={}, '
                         'label={}, type={})'.format(link['input'], link['output'], link['label'], link['type'])
                     )
+                links_to_add.append((link['input'], link['output'], LinkType(link['type']), link['label']))
+
+            # Since backend specific Links (DbLink) are not validated upon creation, we will now validate them. Only
+            # the nodes that existed before the import can already have links.
+            existing_outgoing, existing_incoming = _get_existing_links(
+                session, [node_pks[value['uuid']] for value in existing_entries[NODE_ENTITY_NAME].values()], batch_size
+            )
+            node_classes = _get_node_classes(data['export_data'].get(NODE_ENTITY_NAME, {}).values())
 
-                # Since backend specific Links (DbLink) are not validated upon creation, we will now validate them.
-                source = QueryBuilder().append(Node, filters={'id': in_id}, project='*').first()[0]
-                target = QueryBuilder().append(Node, filters={'id': out_id}, project='*').first()[0]
-                link_type = LinkType(link['type'])
+            try:
+                # Links whose triple already exists are skipped
+                links_to_add = validate_links_by_uuid(links_to_add, node_classes, existing_outgoing, existing_incoming)
+            except ValueError as why:
+                raise exceptions.ImportValidationError('Error occurred during Link validation: {}'.format(why))
 
-                # Check for existence of a triple link, i.e. unique triple.
-                # If it exists, then the link already exists, continue to next link, otherwise, validate link.
-                if link_triple_exists(source, target, link_type, link['label']):
-                    continue
+            link_rows = [{
+                'input_id': node_pks[source_uuid],
+                'output_id': node_pks[target_uuid],
+                'label': link_label,
+                'type': link_type.value
+            } for source_uuid, target_uuid, link_type, link_label in links_to_add]
 
-                try:
-                    validate_link(source, target, link_type, link['label'])
-                except ValueError as why:
-                    raise exceptions.ImportValidationError('Error occurred during Link validation: {}'.format(why))
+            for start in range(0, len(link_rows), batch_size):
+                session.execute(DbLink.__table__.insert().values(link_rows[start:start + batch_size]))
 
-                # New link
-                session.add(DbLink(input_id=in_id, output_id=out_id, label=link['label'], type=link['type']))
-                if 'Link' not in ret_dict:
-                    ret_dict['Link'] = {'new': []}
-                ret_dict['Link']['new'].append((in_id, out_id))
+            if link_rows:
+                ret_dict['Link'] = {'new': [(row['input_id'], row['output_id']) for row in link_rows]}
 
             if not silent:
-                print('   ({} new links...)'.format(len(ret_dict.get('Link', {}).get('new', []))))
+                print('   ({} new links...)'.format(len(link_rows)))
 
             if not silent:
                 print('STORING GROUP ELEMENTS...')
-            import_groups = data['groups_uuid']
-            for groupuuid, groupnodes in import_groups.items():
-                # # TODO: cache these to avoid too many queries
-                qb_group = QueryBuilder().append(Group, filters={'uuid': {'==': groupuuid}})
-                group_ = qb_group.first()[0]
-                nodes_ids_to_add = [
-                    foreign_ids_reverse_mappings[NODE_ENTITY_NAME][node_uuid] for node_uuid in groupnodes
-                ]
-                qb_nodes = QueryBuilder().append(Node, filters={'id': {'in': nodes_ids_to_add}})
-                # Adding nodes to group avoiding the SQLA ORM to increase speed
-                nodes_to_add = [n[0].backend_entity for n in qb_nodes.all()]
-                group_.backend_entity.add_nodes(nodes_to_add, skip_orm=True)
+            num_memberships = 0
+            for groupuuid, groupnodes in data['groups_uuid'].items():
+                group_pk = foreign_ids_reverse_mappings[GROUP_ENTITY_NAME][groupuuid]
+                nodes_ids_to_add = [node_pks[node_uuid] for node_uuid in groupnodes]
+                num_memberships += _add_group_nodes(session, group_pk, nodes_ids_to_add, batch_size)
 
             ######################################################
             # Put everything in a specific group
@@ -666,17 +598,10 @@ def import_data_sqla(
                             )
                     group = Group(label=group_label, type_string=IMPORTGROUP_TYPE)
                     session.add(group.backend_entity._dbmodel)
+                    session.flush()
 
                 # Adding nodes to group avoiding the SQLA ORM to increase speed
-                nodes = [
-                    entry[0].backend_entity
-                    for entry in QueryBuilder().append(Node, filters={
-                        'id': {
-                            'in': pks_for_group
-                        }
-                    }).all()
-                ]
-                group.backend_entity.add_nodes(nodes, skip_orm=True)
+                num_memberships += _add_group_nodes(session, group.pk, pks_for_group, batch_size)
                 if not silent:
                     print("IMPORTED NODES ARE GROUPED IN THE IMPORT GROUP LABELED '{}'".format(group.label))
             else:
@@ -693,6 +618,173 @@ def import_data_sqla(
             raise
 
     if not silent:
-        print('DONE.')
+        num_rows = len(ret_dict.get(NODE_ENTITY_NAME, {}).get('new', [])) + len(link_rows) + num_memberships
+        duration = time.time() - start_time
+        print('DONE: {} NEW NODES, LINKS AND GROUP ELEMENTS IN {:.1f} s ({:.0f} ROWS/s), PEAK MEMORY {:.0f} MB'.format(
+            num_rows, duration, num_rows / duration if duration else 0, _get_peak_memory()))
 
     return ret_dict
+
+
+def _get_existing_pks(entity, unique_identifier, unique_ids, batch_size):
+    """Return the pks of the entities with the given unique identifiers that exist in the database.
+
+    :param entity: the ORM class of the entities
+    :param unique_identifier: the name of the field that uniquely identifies the entities
+    :param unique_ids: iterable of the values of the unique identifier
+    :param batch_size: the maximum number of values of the unique identifier per query
+    :return: dictionary mapping the unique identifier, converted to a string, onto the pk of the existing entities
+    """
+    unique_ids = list(unique_ids)
+    existing = {}
+
+    for start in range(0, len(unique_ids), batch_size):
+        builder = QueryBuilder().append(
+            entity, filters={unique_identifier: {
+                'in': unique_ids[start:start + batch_size]
+            }}, project=[unique_identifier, 'id']
+        )
+        # str() to convert UUID() to string
+        existing.update((str(unique_id), pk) for unique_id, pk in builder.iterall(batch_size=batch_size))
+
+    return existing
+
+
+def _get_node_row(dbnode, import_entry_pk, data, extras_mode_new):
+    """Return the row of the node table for a new node, including its attributes and extras from the archive.
+
+    :param dbnode: the unstored `DbNode` instance constructed from the deserialized fields of the node
+    :param import_entry_pk: the pk of the node in the archive
+    :param data: the content of the data file of the archive
+    :param extras_mode_new: 'import' to import the extras of the node or 'none' to ignore them
+    :return: dictionary mapping the names of all columns except the pk onto their value
+    """
+    from aiida.backends.sqlalchemy.models.node import DbNode
+
+    # For Nodes, we also have to store Attributes!
+    try:
+        dbnode.attributes = data['node_attributes'][str(import_entry_pk)]
+    except KeyError:
+        raise exceptions.CorruptArchive('Unable to find attribute info for Node with UUID={}'.format(dbnode.uuid))
+
+    # For DbNodes, we also have to store extras
+    if extras_mode_new == 'import':
+        try:
+            extras = data['node_extras'][str(import_entry_pk)]
+        except KeyError:
+            raise exceptions.CorruptArchive('Unable to find extra info for Node with UUID={}'.format(dbnode.uuid))
+        # TODO: remove when aiida extras will be moved somewhere else
+        # from here
+        extras = {key: value for key, value in extras.items() if not key.startswith('_aiida_')}
+        if dbnode.node_type.endswith('code.Code.'):
+            extras = {key: value for key, value in extras.items() if not key == 'hidden'}
+        # till here
+        dbnode.extras = extras
+    elif extras_mode_new != 'none':
+        raise exceptions.ImportValidationError(
+            "Unknown extras_mode_new value: {}, should be either 'import' or 'none'".format(extras_mode_new)
+        )
+
+    # All rows of a multi-row insert need the same columns, so the columns that are not set get their default here
+    return {column.name: getattr(dbnode, column.name) for column in DbNode.__table__.columns if column.name != 'id'}
+
+
+def _import_repositories(archive, uuids):
+    """Copy the repository folders of the nodes with the given UUIDs from the archive into the repository.
+
+    The folders are unpacked from the archive and copied by a pool of threads. Existing repository folders of the nodes
+    are replaced.
+
+    :param archive: the open `Archive` that is being imported
+    :param uuids: list of the UUIDs of the nodes
+    :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the folder of a node is missing
+    """
+
+    def import_repository(uuid):
+        path, in_sandbox = archive.get_node_folder(uuid)
+        # Files that were unpacked into the sandbox folder are moved, which is faster if it is on the same filesystem
+        Repository(uuid=uuid, is_stored=True).replace_with_tree(path, move=in_sandbox)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=IMPORT_REPOSITORY_THREADS) as executor:
+        # Consuming the results raises the first exception that occurred, if any
+        for _ in executor.map(import_repository, uuids):
+            pass
+
+
+def _get_node_classes(nodes):
+    """Return the classes of the given exported nodes, loading the class of each type string only once.
+
+    :param nodes: iterable of the exported fields of the nodes
+    :return: dictionary mapping the UUID of the nodes onto their class
+    """
+    classes = {}
+
+    for node_type in set(node['node_type'] for node in nodes):
+        classes[node_type] = load_node_class(node_type)
+
+    return {node['uuid']: classes[node['node_type']] for node in nodes}
+
+
+def _get_existing_links(session, node_pks, batch_size):
+    """Return the links of the given nodes that exist in the database.
+
+    :param session: the SQLAlchemy session
+    :param node_pks: list of the pks of the nodes
+    :param batch_size: the maximum number of pks per query
+    :return: tuple of two dictionaries mapping the UUID of nodes onto a set of `LinkTriple` of their outgoing and
+        incoming links, respectively, with the UUID as node
+    """
+    from sqlalchemy import or_
+    from sqlalchemy.orm import aliased
+    from aiida.backends.sqlalchemy.models.node import DbNode, DbLink
+    from aiida.orm.utils.links import LinkTriple
+
+    source, target = aliased(DbNode), aliased(DbNode)
+    outgoing = {}
+    incoming = {}
+
+    for start in range(0, len(node_pks), batch_size):
+        batch = node_pks[start:start + batch_size]
+        query = session.query(source.uuid, target.uuid, DbLink.type, DbLink.label).join(
+            DbLink, DbLink.input_id == source.id
+        ).join(target, DbLink.output_id == target.id).filter(or_(source.id.in_(batch), target.id.in_(batch)))
+
+        for source_uuid, target_uuid, link_type, link_label in query:
+            source_uuid, target_uuid, link_type = str(source_uuid), str(target_uuid), LinkType(link_type)
+            outgoing.setdefault(source_uuid, set()).add(LinkTriple(target_uuid, link_type, link_label))
+            incoming.setdefault(target_uuid, set()).add(LinkTriple(source_uuid, link_type, link_label))
+
+    return outgoing, incoming
+
+
+def _add_group_nodes(session, group_pk, node_pks, batch_size):
+    """Add the nodes with the given pks to the group with the given pk, ignoring nodes that are already members.
+
+    The memberships are inserted directly into the table of the group-node relationship, without loading the nodes and
+    without committing, such that they are part of the transaction of the import.
+
+    :param session: the SQLAlchemy session
+    :param group_pk: the pk of the group
+    :param node_pks: list of the pks of the nodes
+    :param batch_size: the maximum number of memberships per query
+    :return: the number of memberships that were requested
+    """
+    from sqlalchemy.dialects.postgresql import insert  # pylint: disable=import-error, no-name-in-module
+    from aiida.backends.sqlalchemy.models.base import Base
+
+    table = Base.metadata.tables['db_dbgroup_dbnodes']
+    rows = [{'dbnode_id': node_pk, 'dbgroup_id': group_pk} for node_pk in node_pks]
+
+    for start in range(0, len(rows), batch_size):
+        statement = insert(table).values(rows[start:start + batch_size])
+        session.execute(statement.on_conflict_do_nothing(index_elements=['dbnode_id', 'dbgroup_id']))
+
+    return len(rows)
+
+
+def _get_peak_memory():
+    """Return the peak resident memory of the current process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The peak resident memory is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
@@ -12,6 +12,7 @@
 from aiida.cmdline.utils import echo
 from aiida.tools.importexport.common.exceptions import DanglingLinkError
 
+from .streaming import migrate_archive
 from .utils import verify_metadata_version
 from .v01_to_v02 import migrate_v1_to_v2
 from .v02_to_v03 import migrate_v2_to_v3
@@ -20,8 +21,9 @@ from .v04_to_v05 import migrate_v4_to_v5
 from .v05_to_v06 import migrate_v5_to_v6
 from .v06_to_v07 import migrate_v6_to_v7
 from .v07_to_v08 import migrate_v7_to_v8
+from .v08_to_v09 import migrate_v8_to_v9
 
-__all__ = ('migrate_recursively', 'verify_metadata_version')
+__all__ = ('migrate_archive', 'migrate_recursively', 'verify_metadata_version')
 
 MIGRATE_FUNCTIONS = {
     '0.1': migrate_v1_to_v2,
@@ -31,6 +33,7 @@ MIGRATE_FUNCTIONS = {
     '0.5': migrate_v5_to_v6,
     '0.6': migrate_v6_to_v7,
     '0.7': migrate_v7_to_v8,
+    '0.8': migrate_v8_to_v9,
 }
 
 
@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Migration of export archives in a single streaming pass over the entities of `data.json`.
+
+The migration functions of the individual versions operate on the complete content of `data.json`. From version 0.4
+onwards, however, each of them only transforms single entities: the fields of an entity, the attributes and extras of
+a single node, given the node itself and its (de)serialization information, or a single link. They can therefore be
+applied, in sequence, to small chunks of `data.json` that contain only some of the entities, such that all migrations
+are composed into a single pass over the file, which is read incrementally, and the chunks can be migrated in parallel.
+"""
+import collections
+import concurrent.futures
+import copy
+from distutils.version import StrictVersion
+import itertools
+import json
+import os
+import re
+
+from aiida.common import json as aiida_json
+from aiida.tools.importexport.common.archive import Archive
+from aiida.tools.importexport.common.config import EXPORT_VERSION, NODE_ENTITY_NAME, NODES_EXPORT_SUBFOLDER
+from aiida.tools.importexport.common.exceptions import ArchiveMigrationError, CorruptArchive
+from aiida.tools.importexport.common.utils import export_shard_uuid
+from aiida.tools.importexport.dbexport.utils import (
+    StreamedDict, StreamedList, get_archive_index, list_folder, write_atomically, write_data_and_index
+)
+
+from .utils import verify_metadata_version
+
+__all__ = ('migrate_archive',)
+
+# The oldest version from which all migrations only transform single entities, see the module docstring. Older archives
+# are migrated in memory, since the migration from version 0.3 redesigns the provenance graph as a whole.
+STREAMED_VERSION = '0.4'
+
+# The number of entities that are migrated together, by a single process
+MIGRATION_CHUNK_SIZE = 1000
+
+
+def migrate_archive(input_file, output_file, archive_format='zip', processes=None):
+    """Migrate an export archive to the newest export version, writing the migrated archive to a new file.
+
+    For archives of version 0.4 or newer, `data.json` is read incrementally and written while it is read, such that it
+    is never held in memory as a whole, except for the type and UUID of every node and the (de)serialization
+    information of attributes and extras that contain dates, which the migrations of single nodes depend on. The
+    attributes and extras of the nodes are migrated in parallel by a pool of processes.
+
+    :param input_file: the path of the archive to migrate, either a zip or tar file or a directory
+    :param output_file: the path of the migrated archive
+    :param archive_format: the format of the migrated archive, one of 'zip', 'zip-uncompressed' or 'tar.gz'
+    :param processes: the number of processes that migrate the entities, defaults to the number of CPUs. If 1, the
+        entities are migrated in the current process.
+    :return: tuple of the old and new export version
+    :raises `~aiida.tools.importexport.common.exceptions.ArchiveMigrationError`: if the archive cannot be migrated
+    :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the archive is invalid
+    """
+    from aiida.tools.importexport.dbexport.tar import TarFolder
+    from aiida.tools.importexport.dbexport.zip import ZipFolder
+    from aiida.tools.importexport.migration import MIGRATE_FUNCTIONS
+
+    if archive_format not in ['zip', 'zip-uncompressed', 'tar.gz']:
+        raise ValueError('invalid archive format `{}`'.format(archive_format))
+
+    with Archive(input_file) as archive:
+        metadata = archive.meta_data
+        old_version = verify_metadata_version(metadata)
+
+        if old_version == EXPORT_VERSION:
+            raise ArchiveMigrationError('the archive is already at the newest export version {}'.format(old_version))
+
+        if old_version not in MIGRATE_FUNCTIONS:
+            raise ArchiveMigrationError('cannot migrate from version {}'.format(old_version))
+
+        versions = [version for version in MIGRATE_FUNCTIONS if StrictVersion(version) >= StrictVersion(old_version)]
+
+        # The migrated archive is written to a temporary file, which replaces the output file only once it is complete
+        with write_atomically(output_file) as temporary:
+            if archive_format == 'tar.gz':
+                output_folder = TarFolder(temporary, mode='w:gz')
+            else:
+                output_folder = ZipFolder(temporary, mode='w', use_compression=archive_format == 'zip')
+
+            with output_folder:
+                if StrictVersion(old_version) >= StrictVersion(STREAMED_VERSION):
+                    _migrate_streamed(archive, versions, output_folder, processes)
+                else:
+                    _migrate_in_memory(archive, versions, output_folder)
+
+    return old_version, verify_metadata_version(metadata)
+
+
+def _migrate_in_memory(archive, versions, folder):
+    """Migrate an archive by loading `data.json` as a whole and write it to the given folder.
+
+    :param archive: the archive to migrate
+    :param versions: the versions from which to migrate, in order
+    :param folder: the folder of the migrated archive
+    """
+    from aiida.tools.importexport.migration import MIGRATE_FUNCTIONS
+
+    # The migrations may change the repository of the nodes, so the archive is unpacked into its sandbox folder
+    archive.unpack()
+    metadata, data = archive.meta_data, archive.data
+
+    for version in versions:
+        MIGRATE_FUNCTIONS[version](metadata, data, archive.folder)
+
+    with folder.open('metadata.json', 'w') as fhandle:
+        fhandle.write(aiida_json.dumps(metadata))
+
+    write_data_and_index(folder, data, get_archive_index(metadata, data, archive.folder))
+
+    if os.path.isdir(archive.folder.get_abs_path(NODES_EXPORT_SUBFOLDER)):
+        folder.insert_path(archive.folder.get_abs_path(NODES_EXPORT_SUBFOLDER), NODES_EXPORT_SUBFOLDER)
+
+
+def _migrate_streamed(archive, versions, folder, processes):
+    """Migrate an archive in a single streaming pass over `data.json` and write it to the given folder.
+
+    :param archive: the archive to migrate
+    :param versions: the versions from which to migrate, in order
+    :param folder: the folder of the migrated archive
+    :param processes: the number of processes that migrate the attributes and extras of the nodes
+    """
+    from aiida.tools.importexport.migration import MIGRATE_FUNCTIONS
+
+    # The original metadata is needed to migrate the chunks of data
+    metadata = copy.deepcopy(archive.meta_data)
+    migrated_metadata = archive.meta_data
+
+    for version in versions:
+        MIGRATE_FUNCTIONS[version](migrated_metadata, _get_chunk_data(), None)
+
+    with archive.open_data_file() as fhandle:
+        nodes, conversions = _scan_data(_JsonReader(fhandle))
+
+    repository = {}
+    for _, uuid in nodes.values():
+        try:
+            path, _ = archive.get_node_folder(uuid)
+        except CorruptArchive:
+            repository[uuid] = (None, [])
+        else:
+            repository[uuid] = (path, list_folder(path))
+
+    with folder.open('metadata.json', 'w') as fhandle:
+        fhandle.write(aiida_json.dumps(migrated_metadata))
+
+    index = {
+        'uuids': collections.defaultdict(dict),
+        'repository': {uuid: listing for uuid, (_, listing) in repository.items()},
+        'links': 0,
+    }
+
+    processes = processes or os.cpu_count() or 1
+    executor = concurrent.futures.ProcessPoolExecutor(processes) if processes > 1 else None
+
+    try:
+        with archive.open_data_file() as fhandle:
+            reader = _JsonReader(fhandle)
+            migration = _StreamedMigration(reader, metadata, versions, nodes, conversions, executor, 2 * processes)
+            data = StreamedDict(migration.iter_data(migrated_metadata['unique_identifiers'], index))
+            write_data_and_index(folder, data, index)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    nodes_folder = folder.get_subfolder(NODES_EXPORT_SUBFOLDER, create=True, reset_limit=True)
+
+    for uuid, (path, _) in repository.items():
+        if path is not None:
+            node_folder = nodes_folder.get_subfolder(export_shard_uuid(uuid), create=False, reset_limit=True)
+            node_folder.insert_path(src=path, dest_name='.')
+
+
+def _scan_data(reader):
+    """Read the information that the migrations of single nodes depend on from `data.json`.
+
+    :param reader: the reader of `data.json`
+    :return: tuple of a dictionary mapping the pk of every node onto a tuple of its type and UUID and a dictionary with
+        the (de)serialization information of the attributes and extras of the nodes, which contain dates, by pk
+    """
+    nodes = {}
+    conversions = {'node_attributes_conversion': {}, 'node_extras_conversion': {}}
+
+    for key in reader.iter_object():
+        if key == 'export_data':
+            for entity_name in reader.iter_object():
+                if entity_name != NODE_ENTITY_NAME:
+                    reader.read_value()
+                    continue
+                for pk in reader.iter_object():
+                    node = reader.read_value()
+                    nodes[pk] = (node.get('node_type'), node.get('uuid'))
+        elif key in conversions:
+            for pk in reader.iter_object():
+                conversion = reader.read_value()
+                if _contains_conversion(conversion):
+                    conversions[key][pk] = conversion
+        else:
+            reader.read_value()
+
+    return nodes, conversions
+
+
+def _contains_conversion(conversion):
+    """Return whether the (de)serialization information of a value requires any conversion."""
+    if isinstance(conversion, dict):
+        return any(_contains_conversion(value) for value in conversion.values())
+    if isinstance(conversion, (list, tuple)):
+        return any(_contains_conversion(value) for value in conversion)
+    return conversion is not None
+
+
+def _get_chunk_data(**sections):
+    """Return the content of `data.json` that consists only of the given sections, with all others empty."""
+    data = {
+        'export_data': {},
+        'node_attributes': {},
+        'node_attributes_conversion': {},
+        'node_extras': {},
+        'node_extras_conversion': {},
+        'links_uuid': [],
+        'groups_uuid': {},
+    }
+    data.update(sections)
+
+    return data
+
+
+def _migrate_chunk(metadata, versions, data):
+    """Apply the migrations of the given versions to a chunk of the content of `data.json`.
+
+    :param metadata: the content of `metadata.json` before the migrations, which is not changed
+    :param versions: the versions from which to migrate, in order
+    :param data: the chunk of `data.json`, see `_get_chunk_data`
+    :return: the migrated chunk
+    """
+    from aiida.tools.importexport.migration import MIGRATE_FUNCTIONS
+
+    metadata = copy.deepcopy(metadata)
+
+    for version in versions:
+        MIGRATE_FUNCTIONS[version](metadata, data, None)
+
+    return data
+
+
+class _StreamedMigration:
+    """Migration of the content of `data.json` while it is read, one chunk of entities at a time."""
+
+    def __init__(self, reader, metadata, versions, nodes, conversions, executor=None, max_pending=None):
+        """
+        :param reader: the reader of `data.json`
+        :param metadata: the content of `metadata.json` before the migrations
+        :param versions: the versions from which to migrate, in order
+        :param nodes: dictionary mapping the pk of every node onto a tuple of its type and UUID, see `_scan_data`
+        :param conversions: the (de)serialization information of the attributes and extras, see `_scan_data`
+        :param executor: optional executor by which the attributes and extras are migrated
+        :param max_pending: the maximum number of chunks that are submitted to the executor at any time
+        """
+        self._reader = reader
+        self._metadata = metadata
+        self._versions = versions
+        self._nodes = nodes
+        self._conversions = conversions
+        self._executor = executor
+        self._max_pending = max_pending
+
+    def iter_data(self, unique_identifiers, index):
+        """Return an iterator over the members of the migrated content of `data.json`, to be written by `StreamedDict`.
+
+        The values of the members are streamed themselves, so the members have to be consumed in order.
+
+        :param unique_identifiers: the unique identifiers of the entity types of the migrated archive
+        :param index: the index of the migrated archive, in which the UUIDs of the entities and the number of links are
+            recorded while they are read
+        """
+        for key in self._reader.iter_object():
+            if key in ['node_attributes', 'node_extras']:
+                yield key, StreamedDict(self._iter_node_columns(key))
+            elif key == 'export_data':
+                yield key, StreamedDict(self._iter_export_data(unique_identifiers, index['uuids']))
+            elif key == 'links_uuid':
+                yield key, StreamedList(self._iter_links(index))
+            elif key == 'groups_uuid':
+                yield key, StreamedDict((uuid, self._reader.read_value()) for uuid in self._reader.iter_object())
+            elif key in self._conversions:
+                # The (de)serialization information is applied to the attributes and extras
+                self._reader.read_value()
+            else:
+                yield key, self._reader.read_value()
+
+    def _iter_chunks(self, iterator):
+        """Return an iterator over lists of the elements of the given iterator, of at most `MIGRATION_CHUNK_SIZE`."""
+        while True:
+            chunk = list(itertools.islice(iterator, MIGRATION_CHUNK_SIZE))
+            if not chunk:
+                return
+            yield chunk
+
+    def _map(self, chunks):
+        """Return an iterator over the migrated chunks, in order, that are migrated by the executor if defined.
+
+        The number of chunks that are submitted to the executor at any time is bounded, such that they are read only
+        as fast as they are migrated and written.
+
+        :param chunks: iterable of chunks of `data.json`, see `_get_chunk_data`
+        """
+        if self._executor is None:
+            for chunk in chunks:
+                yield _migrate_chunk(self._metadata, self._versions, chunk)
+            return
+
+        pending = collections.deque()
+
+        for chunk in chunks:
+            pending.append(self._executor.submit(_migrate_chunk, self._metadata, self._versions, chunk))
+            if len(pending) >= self._max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def _iter_node_columns(self, key):
+        """Return an iterator over the pks of the nodes and their migrated attributes or extras."""
+        conversion_key = '{}_conversion'.format(key)
+        conversions = self._conversions[conversion_key]
+        members = ((pk, self._reader.read_value()) for pk in self._reader.iter_object())
+
+        def get_chunk_data(chunk):
+            """Return the chunk of `data.json` with the given members, along with what their migration depends on."""
+            nodes = {pk: self._nodes[pk] for pk, _ in chunk if pk in self._nodes}
+            nodes = {pk: {'node_type': node_type, 'uuid': uuid} for pk, (node_type, uuid) in nodes.items()}
+            sections = {key: dict(chunk), conversion_key: {pk: conversions.get(pk, None) for pk, _ in chunk}}
+            return _get_chunk_data(export_data={NODE_ENTITY_NAME: nodes}, **sections)
+
+        for data in self._map(get_chunk_data(chunk) for chunk in self._iter_chunks(members)):
+            yield from data[key].items()
+
+    def _iter_export_data(self, unique_identifiers, uuids):
+        """Return an iterator over the entity types and the iterators over their migrated entities."""
+        for entity_name in self._reader.iter_object():
+            yield entity_name, StreamedDict(self._iter_entities(entity_name, unique_identifiers, uuids))
+
+    def _iter_entities(self, entity_name, unique_identifiers, uuids):
+        """Return an iterator over the pks of the entities of the given type and their migrated fields."""
+        members = ((pk, self._reader.read_value()) for pk in self._reader.iter_object())
+
+        for chunk in self._iter_chunks(members):
+            data = _get_chunk_data(export_data={entity_name: dict(chunk)})
+            data = _migrate_chunk(self._metadata, self._versions, data)
+            for pk, entity in data['export_data'][entity_name].items():
+                if entity_name in unique_identifiers:
+                    uuids[entity_name][entity[unique_identifiers[entity_name]]] = pk
+                yield pk, entity
+
+    def _iter_links(self, index):
+        """Return an iterator over the migrated links."""
+        links = (self._reader.read_value() for _ in self._reader.iter_array())
+
+        for chunk in self._iter_chunks(links):
+            data = _migrate_chunk(self._metadata, self._versions, _get_chunk_data(links_uuid=chunk))
+            index['links'] += len(data['links_uuid'])
+            yield from data['links_uuid']
+
+
+class _JsonReader:
+    """Incremental reader of a JSON document, which parses a single value at a time.
+
+    The members of objects and the elements of arrays are iterated over with `iter_object` and `iter_array`, which
+    yield before every member or element, whose value should then be read, either with `read_value` or by iterating
+    over it in turn. Only the value that is read is held in memory, together with a buffer of the text of the file.
+    """
+
+    CHUNK_SIZE = 2**20
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    DELIMITERS = frozenset(' \t\n\r,:]}')
+
+    def __init__(self, fhandle):
+        """
+        :param fhandle: a text file handle opened for reading
+        """
+        self._fhandle = fhandle
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+
+    def _read(self, size):
+        """Add text of the given size from the file to the buffer, dropping what has been parsed.
+
+        :return: False if the end of the file has been reached, True otherwise
+        """
+        if self._eof:
+            return False
+
+        text = self._fhandle.read(size)
+
+        if not text:
+            self._eof = True
+            return False
+
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+
+        return True
+
+    def _peek(self):
+        """Return the next character that is not whitespace, without consuming it.
+
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the end of the file is reached
+        """
+        while True:
+            self._position = self.WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read(self.CHUNK_SIZE):
+                raise CorruptArchive('unexpected end of the data file')
+
+    def _expect(self, characters):
+        """Consume the next character that is not whitespace, which should be one of the given characters.
+
+        :return: the character
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if it is not one of the characters
+        """
+        character = self._peek()
+        if character not in characters:
+            raise CorruptArchive('invalid data file: expected one of `{}` but found `{}`'.format(characters, character))
+        self._position += 1
+        return character
+
+    def read_value(self):
+        """Parse and return the next value.
+
+        :raises `~aiida.tools.importexport.common.exceptions.CorruptArchive`: if the value is not valid JSON
+        """
+        self._peek()
+        size = self.CHUNK_SIZE
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                end = None
+
+            # A value that is not followed by a delimiter, such as a number that is cut off at the end of the buffer,
+            # may continue in the rest of the file
+            if end is not None and (self._eof or self._buffer[end:end + 1] in self.DELIMITERS):
+                self._position = end
+                return value
+
+            if not self._read(size):
+                if end is not None:
+                    self._position = end
+                    return value
+                raise CorruptArchive('invalid data file: unable to parse the value at the end of the file')
+
+            # Double the size that is read, such that the time to parse large values is not quadratic in their size
+            size *= 2
+
+    def iter_object(self):
+        """Return an iterator over the keys of the members of the next object, see the class docstring."""
+        self._expect('{')
+
+        if self._peek() == '}':
+            self._position += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            if self._expect(',}') == '}':
+                return
+
+    def iter_array(self):
+        """Return an iterator over the elements of the next array, which yields None before every element."""
+        self._expect('[')
+
+        if self._peek() == ']':
+            self._position += 1
+            return
+
+        while True:
+            yield None
+            if self._expect(',]') == ']':
+                return
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Migration from v0.8 to v0.9, used by `verdi export migrate` command.
+
+Version 0.9 adds the `index.json` file, which gives the location of every entity in `data.json` and lists the content
+of the repository of every node, such that single entities can be read from an archive without loading or unpacking
+all of it. The content of `data.json` itself is unchanged. Since the index depends on the serialized data, it is not
+created by this migration but by whoever writes the migrated archive, using
+`aiida.tools.importexport.dbexport.utils.write_data_and_index` with the index of `get_archive_index`. For an archive
+that is written without it, the `Archive` class builds the index when it is first accessed.
+"""
+# pylint: disable=invalid-name
+
+from aiida.tools.importexport.migration.utils import verify_metadata_version, update_metadata
+
+
+def migrate_v8_to_v9(metadata, data, *args):  # pylint: disable=unused-argument
+    """Migration of export files from v0.8 to v0.9."""
+    old_version = '0.8'
+    new_version = '0.9'
+
+    verify_metadata_version(metadata, old_version)
+    update_metadata(metadata, new_version)
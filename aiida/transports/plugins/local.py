@@ -301,6 +301,20 @@ class LocalTransport(Transport):
                 else:
                     raise OSError('The local path {} does not exist'.format(localpath))
 
+    def put_object_from_filelike(self, handle, remotepath):
+        """
+        Write the content of a binary file-like object to a file, overwriting it if it already exists.
+
+        :param handle: binary file-like object opened for reading
+        :param remotepath: path to the file to write
+        :raise IOError: if remotepath is not valid
+        """
+        if not remotepath:
+            raise IOError('Input remotepath to put_object_from_filelike must be a non empty string')
+
+        with open(os.path.join(self.curdir, remotepath), 'wb') as target:
+            shutil.copyfileobj(handle, target)
+
     def putfile(self, localpath, remotepath, *args, **kwargs):
         """
         Copies a file from localpath to remotepath.
@@ -529,6 +543,37 @@ class LocalTransport(Transport):
         the_source = os.path.join(self.curdir, remotepath)
         shutil.copytree(the_source, localpath, symlinks=not dereference)
 
+    def iter_objects(self, remotepaths, compress=False):
+        """
+        Iterate over the content of files and folders, reading the files directly.
+
+        Folders are iterated recursively, following symbolic links, and yield their own path before their contents.
+        Each file object can only be read until the next item is requested from the iterator.
+
+        :param remotepaths: list of paths of existing files or folders
+        :param compress: ignored, since the files are not transferred
+        :return: iterator of tuples of the path of each file or folder and a binary file-like object
+            with the content of the file, or None for a folder
+        """
+        for remotepath in remotepaths:
+            the_source = os.path.join(self.curdir, remotepath)
+
+            if not os.path.isdir(the_source):
+                with open(the_source, 'rb') as handle:
+                    yield remotepath, handle
+                continue
+
+            for dirpath, dirnames, filenames in os.walk(the_source, followlinks=True):
+                dirnames.sort()
+                relpath = os.path.relpath(dirpath, the_source)
+                folderpath = remotepath if relpath == os.curdir else os.path.join(remotepath, relpath)
+
+                yield folderpath, None
+
+                for filename in sorted(filenames):
+                    with open(os.path.join(dirpath, filename), 'rb') as handle:
+                        yield os.path.join(folderpath, filename), handle
+
     # please refactor: issue #1780 on github
     # pylint: disable=too-many-branches
     def copy(self, remotesource, remotedestination, dereference=False, recursive=True):
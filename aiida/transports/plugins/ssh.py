@@ -185,6 +185,23 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
                 'help': 'SSH key policy',
                 'non_interactive_default': True
             }
+        ),
+        (
+            'transfer_channels', {
+                'type': click.IntRange(min=1),
+                'prompt': 'Number of SFTP channels',
+                'help': 'number of SFTP channels over which the files of a folder are transferred in parallel',
+                'non_interactive_default': True
+            }
+        ),
+        (
+            'transfer_mode', {
+                'type': click.Choice(['sftp', 'tar']),
+                'prompt': 'Folder transfer mode',
+                'help': 'transfer folders file by file over SFTP, or as a single tar stream, which is faster for '
+                'folders with many small files but requires `tar` on the remote',
+                'non_interactive_default': True
+            }
         )
     ]
 
@@ -308,6 +325,20 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         """
         return 'RejectPolicy'
 
+    @classmethod
+    def _get_transfer_channels_suggestion_string(cls, computer):  # pylint: disable=unused-argument
+        """
+        Return a suggestion for the specific field.
+        """
+        return '1'
+
+    @classmethod
+    def _get_transfer_mode_suggestion_string(cls, computer):  # pylint: disable=unused-argument
+        """
+        Return a suggestion for the specific field.
+        """
+        return 'sftp'
+
     @classmethod
     def _get_gss_auth_suggestion_string(cls, computer):
         """
@@ -349,6 +380,11 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
            if False, do not load the system host keys
         :param key_policy: (optional, default = paramiko.RejectPolicy())
            the policy to use for unknown keys
+        :param transfer_channels: (optional, default 1)
+           the number of SFTP channels over which the files of a folder are transferred in parallel
+        :param transfer_mode: (optional, default 'sftp')
+           'sftp' to transfer folders file by file, or 'tar' to transfer them as a tar stream over a remote command,
+           falling back to SFTP if that fails
 
         Other parameters valid for the ssh connect function (see the
         self._valid_connect_params list) are passed to the connect
@@ -368,6 +404,9 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if self._load_system_host_keys:
             self._client.load_system_host_keys()
 
+        self._transfer_channels = int(kwargs.pop('transfer_channels', 1))
+        self._transfer_mode = kwargs.pop('transfer_mode', 'sftp')
+
         self._missing_key_policy = kwargs.pop('key_policy', 'RejectPolicy')  # This is paramiko default
         if self._missing_key_policy == 'RejectPolicy':
             self._client.set_missing_host_key_policy(paramiko.RejectPolicy())
@@ -445,6 +484,17 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         self._client.close()
         self._is_open = False
 
+    def is_alive(self):
+        """Return whether the transport is open and its SSH connection is still active.
+
+        :return: True if the transport can be used, False otherwise
+        """
+        if not self._is_open:
+            return False
+
+        transport = self._client.get_transport()
+        return transport is not None and transport.is_active()
+
     @property
     def sshclient(self):
         if not self._is_open:
@@ -773,6 +823,20 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
 
         return self.sftp.put(localpath, remotepath, callback=callback)
 
+    def put_object_from_filelike(self, handle, remotepath, callback=None):  # pylint: disable=arguments-differ
+        """
+        Write the content of a binary file-like object to a remote file, streaming it over the SFTP channel.
+
+        :param handle: binary file-like object opened for reading
+        :param remotepath: a remote path
+        :param callback: optional callable, called with the number of bytes transferred so far and the total
+        :raise IOError: if remotepath is not valid
+        """
+        if not remotepath:
+            raise IOError('Input remotepath to put_object_from_filelike must be a non empty string')
+
+        return self.sftp.putfo(handle, remotepath, callback=callback)
+
     def puttree(self, localpath, remotepath, callback=None, dereference=True, overwrite=True):  # pylint: disable=too-many-branches,arguments-differ,unused-argument
         """
         Put a folder recursively from local to remote.
@@ -819,6 +883,11 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             remotepath = os.path.join(remotepath, os.path.split(localpath)[1])
             self.mkdir(remotepath)  # create a nested folder
 
+        if self._transfer_mode == 'tar' and self._puttree_tar(localpath, remotepath):
+            return
+
+        files = []
+
         for this_source in os.walk(localpath):
             # Get the relative path
             this_basename = os.path.relpath(path=this_source[0], start=localpath)
@@ -835,7 +904,9 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             for this_file in this_source[2]:
                 this_local_file = os.path.join(localpath, this_basename, this_file)
                 this_remote_file = os.path.join(remotepath, this_basename, this_file)
-                self.putfile(this_local_file, this_remote_file)
+                files.append((this_local_file, this_remote_file))
+
+        self._transfer_files(lambda sftp, source, destination: sftp.put(source, destination), files)
 
     def get(self, remotepath, localpath, callback=None, dereference=True, overwrite=True, ignore_nonexisting=False):  # pylint: disable=too-many-branches,arguments-differ,too-many-arguments
         """
@@ -923,9 +994,20 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if not dereference:
             raise NotImplementedError
 
+        return self._sftp_get(self.sftp, remotepath, localpath, callback)
+
+    @staticmethod
+    def _sftp_get(sftp, remotepath, localpath, callback=None):
+        """
+        Get a file from remote to local over the given SFTP channel.
+
+        :param sftp: the `paramiko.SFTPClient` to use
+        :param remotepath: a remote path
+        :param localpath: an (absolute) local path
+        """
         # Workaround for bug #724 in paramiko -- remove localpath on IOError
         try:
-            return self.sftp.get(remotepath, localpath, callback)
+            return sftp.get(remotepath, localpath, callback)
         except IOError:
             try:
                 os.remove(localpath)
@@ -974,16 +1056,302 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             localpath = os.path.join(localpath, os.path.split(remotepath)[1])
             os.mkdir(localpath)  # create a nested folder
 
-        item_list = self.listdir(remotepath)
-        dest = str(localpath)
+        if self._transfer_mode == 'tar' and self._gettree_tar(remotepath, localpath):
+            return
+
+        directories, files = self._walk_remote(remotepath)
 
-        for item in item_list:
-            item = str(item)
+        for directory in directories:
+            os.makedirs(os.path.join(localpath, directory), exist_ok=True)
 
-            if self.isdir(os.path.join(remotepath, item)):
-                self.gettree(os.path.join(remotepath, item), os.path.join(dest, item))
-            else:
-                self.getfile(os.path.join(remotepath, item), os.path.join(dest, item))
+        files = [(os.path.join(remotepath, path), os.path.join(localpath, path)) for path in files]
+        self._transfer_files(self._sftp_get, files)
+
+    def iter_objects(self, remotepaths, compress=False):
+        """
+        Iterate over the content of remote files and folders, without storing it in local files first.
+
+        Folders are iterated recursively, following symbolic links, and yield their own path before their contents.
+        Each file object can only be read until the next item is requested from the iterator.
+
+        All paths are transferred as a single tar stream of one remote command, regardless of the transfer mode. If the
+        command fails before any content was read, e.g. because `tar` is not available on the remote, each file is
+        transferred separately over SFTP.
+
+        :param remotepaths: list of paths of existing remote files or folders
+        :param compress: if True, the tar stream is compressed with gzip on the remote
+        :return: iterator of tuples of the path of each file or folder and a binary file-like object
+            with the content of the file, or None for a folder
+        :raise IOError: if the transfer fails after content was read
+        """
+        import tarfile
+
+        if not remotepaths:
+            return
+
+        # The names of the archive members are normalized by `tar`, so map them back onto the requested paths
+        prefixes = {self._normalize_tar_member_name(path): path for path in remotepaths}
+        escaped_paths = ' '.join(escape_for_bash(path) for path in remotepaths)
+        command = 'tar -ch{}f - -- {}'.format('z' if compress else '', escaped_paths)
+        stdin, stdout, stderr, channel = self._exec_command_internal(command)
+        stdin.channel.shutdown_write()
+        hardlinks = []
+
+        try:
+            try:
+                archive = tarfile.open(fileobj=stdout, mode='r|gz' if compress else 'r|')
+            except (OSError, tarfile.TarError) as exception:
+                self.logger.warning(
+                    'tar transfer of {} failed, falling back to SFTP: {}'.format(remotepaths, exception)
+                )
+                yield from super().iter_objects(remotepaths)
+                return
+
+            with archive:
+                for member in archive:
+                    path = self._get_tar_member_path(member.name, prefixes)
+
+                    if member.isdir():
+                        yield path, None
+                    elif member.isfile():
+                        yield path, archive.extractfile(member)
+                    elif member.islnk():
+                        # Members that are hard links to earlier members have no content in the stream
+                        hardlinks.append(path)
+
+            if channel.recv_exit_status() != 0:
+                raise IOError('tar transfer of {} failed: {}'.format(remotepaths, stderr.read().decode('utf-8')))
+        except tarfile.TarError as exception:
+            raise IOError('tar transfer of {} failed: {}'.format(remotepaths, exception))
+        finally:
+            channel.close()
+
+        yield from super().iter_objects(hardlinks)
+
+    @staticmethod
+    def _normalize_tar_member_name(path):
+        """Return the name of the member of a tar archive created with the given path, as normalized by `tar`."""
+        name = os.path.normpath(path).lstrip('/')
+
+        while name.startswith('../'):
+            name = name[3:]
+
+        return name
+
+    @staticmethod
+    def _get_tar_member_path(name, prefixes):
+        """Return the remote path of a tar archive member.
+
+        :param name: the name of the member
+        :param prefixes: dictionary of the normalized names of the requested paths onto the requested paths
+        :return: the remote path of the member, as a subpath of the requested path that it belongs to
+        """
+        name = os.path.normpath(name)
+        prefix = name
+
+        while prefix not in prefixes:
+            if prefix == os.curdir:
+                raise IOError('unexpected member in tar stream: {}'.format(name))
+            prefix = os.path.dirname(prefix) or os.curdir
+
+        if prefix == name:
+            return prefixes[prefix]
+
+        return os.path.join(prefixes[prefix], os.path.relpath(name, prefix))
+
+    def _walk_remote(self, remotepath):
+        """
+        Return the relative paths of all folders and files in a remote folder, following symbolic links.
+
+        Each folder is listed with a single request that also returns the attributes of its contents, such that only
+        symbolic links have to be stat'ed separately.
+
+        :param remotepath: a remote path of a folder
+        :return: tuple of the list of relative folder paths, parents before children, and the list of relative file paths
+        """
+        from stat import S_ISLNK
+
+        directories = []
+        files = []
+        to_visit = ['']
+
+        while to_visit:
+            relative = to_visit.pop(0)
+
+            for attributes in self.sftp.listdir_attr(os.path.join(remotepath, relative)):
+                path = os.path.join(relative, attributes.filename)
+                mode = attributes.st_mode
+
+                if S_ISLNK(mode):
+                    try:
+                        mode = self.sftp.stat(os.path.join(remotepath, path)).st_mode
+                    except IOError:
+                        # Broken link: treat it as a file, such that the transfer raises as it would have before
+                        pass
+
+                if S_ISDIR(mode):
+                    directories.append(path)
+                    to_visit.append(path)
+                else:
+                    files.append(path)
+
+        return directories, files
+
+    def _transfer_files(self, transfer, files):
+        """
+        Transfer files, in parallel over multiple SFTP channels on the same connection if so configured.
+
+        The channels are opened for the duration of the transfer in addition to the main SFTP channel. If the server
+        refuses to open as many channels as configured, the transfer continues over the channels that could be opened.
+
+        :param transfer: callable that transfers a single file, called with a `paramiko.SFTPClient`, the source path
+            and the destination path
+        :param files: list of tuples of source and destination paths
+        """
+        import queue
+        from concurrent.futures import ThreadPoolExecutor
+
+        num_channels = min(self._transfer_channels, len(files))
+
+        if num_channels <= 1:
+            for source, destination in files:
+                transfer(self.sftp, source, destination)
+            return
+
+        channels = queue.Queue()
+        channels.put(self.sftp)
+        extra_channels = []
+
+        def transfer_file(source, destination):
+            """Transfer a single file over the first channel that is free."""
+            sftp = channels.get()
+            try:
+                transfer(sftp, source, destination)
+            finally:
+                channels.put(sftp)
+
+        try:
+            for _ in range(num_channels - 1):
+                try:
+                    sftp = self._client.open_sftp()
+                except Exception as exception:  # pylint: disable=broad-except
+                    self.logger.warning('could only open {} SFTP channels: {}'.format(channels.qsize(), exception))
+                    break
+                sftp.chdir(self.getcwd())
+                extra_channels.append(sftp)
+                channels.put(sftp)
+
+            with ThreadPoolExecutor(max_workers=channels.qsize()) as executor:
+                futures = [executor.submit(transfer_file, source, destination) for source, destination in files]
+                for future in futures:
+                    future.result()
+        finally:
+            for sftp in extra_channels:
+                sftp.close()
+
+    def _gettree_tar(self, remotepath, localpath):
+        """
+        Get the contents of a remote folder into an existing local folder as a tar stream over a remote command.
+
+        :param remotepath: a remote path of a folder
+        :param localpath: an (absolute) local path of an existing folder
+        :return: True if the transfer succeeded, False if it failed and the folder should be transferred otherwise
+        """
+        import tarfile
+
+        command = 'tar -C {} -chf - .'.format(escape_for_bash(remotepath))
+        stdin, stdout, stderr, channel = self._exec_command_internal(command)
+        stdin.channel.shutdown_write()
+
+        try:
+            with tarfile.open(fileobj=stdout, mode='r|') as archive:
+                for member in archive:
+                    if os.path.isabs(member.name) or '..' in member.name.split('/'):
+                        raise tarfile.TarError('invalid path in tar stream: {}'.format(member.name))
+                    archive.extract(member, localpath)
+        except (OSError, tarfile.TarError) as exception:
+            self.logger.warning('tar transfer of {} failed, falling back to SFTP: {}'.format(remotepath, exception))
+            channel.close()
+            return False
+
+        retval = channel.recv_exit_status()
+
+        if retval != 0:
+            self.logger.warning(
+                'tar transfer of {} failed, falling back to SFTP: {}'.format(remotepath, stderr.read().decode('utf-8'))
+            )
+            return False
+
+        return True
+
+    def _puttree_tar(self, localpath, remotepath):
+        """
+        Put the contents of a local folder into an existing remote folder as a tar stream over a remote command.
+
+        :param localpath: an (absolute) local path of a folder
+        :param remotepath: a remote path of an existing folder
+        :return: True if the transfer succeeded, False if it failed and the folder should be transferred otherwise
+        """
+        return self._puttrees_tar([(localpath, remotepath)])
+
+    def puttrees(self, trees):
+        """
+        Put the contents of multiple local folders into existing remote folders.
+        Files that already exist in a remote folder are overwritten.
+
+        All folders are transferred as a single tar stream that is unpacked by one remote command, regardless of the
+        transfer mode. If that fails, e.g. because `tar` is not available on the remote, each entry of each folder is
+        put separately over SFTP.
+
+        :param trees: list of tuples of the absolute path of a local folder and
+            the path of the existing remote folder to put its contents into
+        """
+        if not trees or self._puttrees_tar(trees):
+            return
+
+        super().puttrees(trees)
+
+    def _puttrees_tar(self, trees):
+        """
+        Put the contents of local folders into existing remote folders as a single tar stream over a remote command.
+
+        :param trees: list of tuples of an (absolute) local path of a folder and a remote path of an existing folder
+        :return: True if the transfer succeeded, False if it failed and the folders should be transferred otherwise
+        """
+        import tarfile
+
+        try:
+            # The archive is unpacked in the deepest folder that contains all remote folders
+            basepath = os.path.commonpath([remotepath for _, remotepath in trees])
+        except ValueError as exception:
+            self.logger.warning('tar transfer failed, falling back to SFTP: {}'.format(exception))
+            return False
+
+        command = 'tar -C {} -xf -'.format(escape_for_bash(basepath))
+        stdin, _, stderr, channel = self._exec_command_internal(command)
+
+        try:
+            with tarfile.open(fileobj=stdin, mode='w|', dereference=True) as archive:
+                for localpath, remotepath in trees:
+                    prefix = os.path.relpath(remotepath, basepath)
+                    for name in sorted(os.listdir(localpath)):
+                        archive.add(os.path.join(localpath, name), arcname=os.path.normpath(os.path.join(prefix, name)))
+            stdin.flush()
+        except (OSError, tarfile.TarError) as exception:
+            self.logger.warning('tar transfer to {} failed, falling back to SFTP: {}'.format(basepath, exception))
+            channel.close()
+            return False
+
+        channel.shutdown_write()
+        retval = channel.recv_exit_status()
+
+        if retval != 0:
+            self.logger.warning(
+                'tar transfer to {} failed, falling back to SFTP: {}'.format(basepath, stderr.read().decode('utf-8'))
+            )
+            return False
+
+        return True
 
     def get_attribute(self, path):
         """
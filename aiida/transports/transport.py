@@ -15,6 +15,7 @@ import fnmatch
 import sys
 from collections import OrderedDict
 
+from aiida.common.escaping import escape_for_bash
 from aiida.common.exceptions import InternalError
 from aiida.common.lang import classproperty
 
@@ -109,6 +110,16 @@ class Transport(abc.ABC):
     def is_open(self):
         return self._is_open
 
+    def is_alive(self):
+        """Return whether the transport is open and its connection still works.
+
+        The check should be cheap, since it is done every time an idle transport is reused. By default, it is only
+        checked whether the transport is open, which plugins with a connection that can be lost should refine.
+
+        :return: True if the transport can be used, False otherwise
+        """
+        return self.is_open
+
     def open(self):
         """
         Opens a local transport channel
@@ -414,6 +425,42 @@ class Transport(abc.ABC):
         """
         raise NotImplementedError
 
+    def iter_objects(self, remotepaths, compress=False):  # pylint: disable=unused-argument
+        """
+        Iterate over the content of remote files and folders, without storing it in local files first.
+
+        Folders are iterated recursively, following symbolic links, and yield their own path before their contents.
+        Each file object can only be read until the next item is requested from the iterator.
+
+        The default implementation gets each file into a local temporary file,
+        plugins should override it to stream the content of all paths at once.
+
+        :param remotepaths: list of paths of existing remote files or folders
+        :param compress: if True, the content is compressed on the remote while it is transferred,
+            if the plugin supports it. This reduces the transferred data for large text files.
+        :return: iterator of tuples of the path of each file or folder and a binary file-like object
+            with the content of the file, or None for a folder
+        """
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            localpath = os.path.join(tmpdir, 'object')
+            remaining = list(reversed(remotepaths))
+
+            while remaining:
+                remotepath = remaining.pop()
+
+                if self.isdir(remotepath):
+                    yield remotepath, None
+                    names = sorted(self.listdir(remotepath), reverse=True)
+                    remaining.extend(os.path.join(remotepath, name) for name in names)
+                    continue
+
+                self.getfile(remotepath, localpath)
+
+                with open(localpath, 'rb') as handle:
+                    yield remotepath, handle
+
     def getcwd(self):
         """
         Get working directory
@@ -577,6 +624,28 @@ class Transport(abc.ABC):
         """
         raise NotImplementedError
 
+    def put_object_from_filelike(self, handle, remotepath):
+        """
+        Write the content of a binary file-like object to a remote file, overwriting it if it already exists.
+
+        The default implementation spools the content to a local temporary file that is then put with `putfile`,
+        plugins should override it to stream the content to the remote file directly.
+
+        :param handle: binary file-like object opened for reading
+        :param str remotepath: path to remote file
+        :raise IOError: if remotepath is not valid
+        """
+        import shutil
+        import tempfile
+
+        if not remotepath:
+            raise IOError('Input remotepath to put_object_from_filelike must be a non empty string')
+
+        with tempfile.NamedTemporaryFile(mode='wb+') as spooled:
+            shutil.copyfileobj(handle, spooled)
+            spooled.flush()
+            self.putfile(spooled.name, remotepath)
+
     def puttree(self, localpath, remotepath, *args, **kwargs):
         """
         Put a folder recursively from local src to remote dst.
@@ -587,6 +656,21 @@ class Transport(abc.ABC):
         """
         raise NotImplementedError
 
+    def puttrees(self, trees):
+        """
+        Put the contents of multiple local folders into existing remote folders.
+        Files that already exist in a remote folder are overwritten.
+
+        The default implementation puts each entry of each folder separately,
+        plugins should override it to transfer all folders at once.
+
+        :param trees: list of tuples of the absolute path of a local folder and
+            the path of the existing remote folder to put its contents into
+        """
+        for localpath, remotepath in trees:
+            for name in sorted(os.listdir(localpath)):
+                self.put(os.path.join(localpath, name), os.path.join(remotepath, name))
+
     def remove(self, path):
         """
         Remove the file at the given path. This only works on files;
@@ -689,6 +773,54 @@ class Transport(abc.ABC):
         """
         return list(self.iglob(pathname))
 
+    def glob_many(self, pathnames):
+        """Return the lists of paths matching multiple pathname patterns, with a single remote command.
+
+        The patterns are expanded by the remote shell, which follows the same rules as `glob`. Patterns without
+        wildcards match the path itself, if it exists. Unlike with `glob`, dangling symbolic links are not matched,
+        since there is nothing to retrieve from them.
+
+        :param pathnames: list of pathname patterns
+        :return: list with, for each pattern, the sorted list of matching paths
+        :raise IOError: if the remote command fails
+        """
+        if not pathnames:
+            return []
+
+        lines = []
+
+        for index, pathname in enumerate(pathnames):
+            lines.append(
+                'for path in {}; do if [ -e "$path" ]; then printf \'%s\\0\' {} "$path"; fi; done'.
+                format(self._escape_glob_pattern(pathname), index)
+            )
+
+        # The script is run in a subshell, since transports may prefix the command with a change of directory
+        retval, stdout, stderr = self.exec_command_wait('(\n{}\n)'.format('\n'.join(lines)))
+
+        if retval != 0:
+            raise IOError('listing of {} failed with exit status {}: {}'.format(pathnames, retval, stderr.strip()))
+
+        matches = [[] for _ in pathnames]
+        fields = stdout.split('\0')
+
+        for index, path in zip(fields[0::2], fields[1::2]):
+            matches[int(index)].append(path)
+
+        return matches
+
+    @staticmethod
+    def _escape_glob_pattern(pathname):
+        """Escape a pathname pattern for bash, such that only its wildcards are expanded.
+
+        :param pathname: a pathname pattern
+        :return: the escaped pattern
+        """
+        parts = re.split(r'(\*|\?|\[[^/\]]+\])', pathname)
+
+        # The parts with odd indices are the wildcards, which should remain unquoted
+        return ''.join(part if index % 2 else escape_for_bash(part) for index, part in enumerate(parts) if part)
+
     def iglob(self, pathname):
         """Return an iterator which yields the paths matching a pathname pattern.
 
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=import-error,no-name-in-module,invalid-name
+"""Tests for the migration that adds an index on the hash extra of nodes."""
+
+from django.db import connection
+
+from .test_migrations_common import TestMigrations
+
+
+class TestDbNodeExtrasHashIndexMigration(TestMigrations):
+    """Test the migration that adds an index on the `_aiida_hash` extra of nodes."""
+
+    migrate_from = '0043_default_link_label'
+    migrate_to = '0044_dbnode_extras_hash_index'
+
+    def setUpBeforeMigration(self):
+        node = self.DbNode(node_type='data.dict.Dict.', user_id=self.default_user.id, extras={'_aiida_hash': 'abc'})
+        node.save()
+        self.node_id = node.id
+
+    def test_index_created(self):
+        """Verify that the index exists and that it is used to look up existing nodes by their hash."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'db_dbnode'")
+            self.assertIn('db_dbnode_extras_aiida_hash', [row[0] for row in cursor.fetchall()])
+
+            cursor.execute("SELECT id FROM db_dbnode WHERE extras ->> '_aiida_hash' = 'abc'")
+            self.assertEqual([row[0] for row in cursor.fetchall()], [self.node_id])
@@ -1655,3 +1655,18 @@ class TestDefaultLinkLabelMigration(TestMigrationsSQLA):
 
             finally:
                 session.close()
+
+
+class TestDbNodeExtrasHashIndexMigration(TestMigrationsSQLA):
+    """Test the migration that adds an index on the `_aiida_hash` extra of nodes."""
+
+    migrate_from = '118349c10896'
+    migrate_to = '3bd7f1c8ea9d'
+
+    def test_index_created(self):
+        """Verify that the index on the hash extra has been created."""
+        from sqlalchemy.sql import text  # pylint: disable=import-error,no-name-in-module
+
+        with sa.ENGINE.begin() as connection:
+            result = connection.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'db_dbnode'"))
+            self.assertIn('db_dbnode_extras_aiida_hash', [row[0] for row in result])
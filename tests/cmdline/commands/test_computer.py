@@ -20,6 +20,7 @@ from aiida.backends.testbase import AiidaTestCase
 from aiida.cmdline.commands.cmd_computer import computer_setup
 from aiida.cmdline.commands.cmd_computer import computer_show, computer_list, computer_rename, computer_delete
 from aiida.cmdline.commands.cmd_computer import computer_test, computer_configure, computer_duplicate
+from aiida.cmdline.commands.cmd_computer import computer_cache
 
 
 def generate_setup_options_dict(replace_args=None, non_interactive=True):
@@ -624,6 +625,39 @@ class TestVerdiComputerCommands(AiidaTestCase):
         # Exceptions should arise
         self.assertIsNotNone(result.exception)
 
+    def test_computer_cache(self):
+        """
+        Test the 'verdi computer cache' commands
+        """
+        cache_directory = tempfile.mkdtemp()
+
+        try:
+            result = self.cli_runner.invoke(computer_cache, ['show', self.computer_name])
+            self.assertIsNotNone(result.exception)
+
+            result = self.cli_runner.invoke(computer_cache, ['enable', self.computer_name, 'relative/path'])
+            self.assertIsNotNone(result.exception)
+
+            options = ['enable', self.computer_name, cache_directory, '--link-mode', 'hardlink']
+            result = self.cli_runner.invoke(computer_cache, options)
+            self.assertClickResultNoException(result)
+            computer = orm.Computer.objects.get(name=self.computer_name)
+            self.assertEqual(computer.get_remote_cache_directory(), cache_directory)
+            self.assertEqual(computer.get_remote_cache_link_mode(), 'hardlink')
+
+            result = self.cli_runner.invoke(computer_cache, ['show', self.computer_name])
+            self.assertClickResultNoException(result)
+            self.assertIn(cache_directory, result.output)
+
+            result = self.cli_runner.invoke(computer_cache, ['clean', self.computer_name, '--older-than', '1', '-f'])
+            self.assertClickResultNoException(result)
+
+            result = self.cli_runner.invoke(computer_cache, ['disable', self.computer_name])
+            self.assertClickResultNoException(result)
+            self.assertIsNone(orm.Computer.objects.get(name=self.computer_name).get_remote_cache_directory())
+        finally:
+            os.rmdir(cache_directory)
+
     def test_computer_rename(self):
         """
         Test if 'verdi computer rename' command works
@@ -13,6 +13,7 @@ from click.testing import CliRunner
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.cmdline.commands import cmd_rehash
+from aiida.orm import load_node
 
 
 class TestVerdiRehash(AiidaTestCase):
@@ -95,6 +96,42 @@ class TestVerdiRehash(AiidaTestCase):
         self.assertClickResultNoException(result)
         self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
 
+    def test_rehash_batched(self):
+        """The hashes of all nodes should be written, also when the batch size is smaller than the number of nodes."""
+        nodes = [self.node_base, self.node_bool_true, self.node_bool_false, self.node_float, self.node_int]
+
+        for node in nodes:
+            node.clear_hash()
+
+        options = ['-f', '--batch-size', '2']
+        result = self.cli_runner.invoke(cmd_rehash.rehash, options)
+        self.assertClickResultNoException(result)
+        self.assertTrue('5 nodes' in result.output)
+
+        for node in nodes:
+            self.assertEqual(load_node(node.pk).get_extra('_aiida_hash'), node.get_hash())
+
+    def test_rehash_resume(self):
+        """A run with a checkpoint of an interrupted run should only rehash the remaining nodes and then clear it."""
+        from aiida.manage.database.rehash import get_checkpoint
+        from aiida.orm import Data, ProcessNode
+
+        checkpoint = get_checkpoint((Data, ProcessNode))
+        checkpoint.save(self.node_bool_false.pk)
+
+        try:
+            result = self.cli_runner.invoke(cmd_rehash.rehash, ['-f'])
+            self.assertClickResultNoException(result)
+            self.assertTrue('2 nodes' in result.output)
+            self.assertIsNone(checkpoint.load())
+
+            checkpoint.save(self.node_bool_false.pk)
+            result = self.cli_runner.invoke(cmd_rehash.rehash, ['-f', '--restart'])
+            self.assertClickResultNoException(result)
+            self.assertTrue('5 nodes' in result.output)
+        finally:
+            checkpoint.clear()
+
     def test_rehash_entry_point_no_matches(self):
         """Limiting the queryset by defining explicit entry point, with no nodes should exit with non-zero status."""
         options = ['-f', '-e', 'aiida.data:structure']
@@ -8,6 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Tests for daemon command line utilities."""
+import time
 from unittest.mock import patch
 
 from aiida.cmdline.utils.daemon import get_daemon_status
@@ -116,11 +117,11 @@ def test_daemon_working():
     literal = """\
 Daemon is running as PID 111015 since 2019-12-17 11:42:18
 Active workers [1]:
-  PID    MEM %    CPU %  started
------  -------  -------  -------------------
- 4990    0.231        0  2019-12-17 12:27:38
+  PID    MEM %    CPU %  started              slots    latency [s]
+-----  -------  -------  -------------------  -------  -------------
+ 4990    0.231        0  2019-12-17 12:27:38  -        -
 Use verdi daemon [incr | decr] [num] to increase / decrease the amount of workers"""
-    assert get_daemon_status(client) == literal
+    compare_string_literals(get_daemon_status(client), literal)
     assert client.is_daemon_running
 
 
@@ -134,8 +135,54 @@ def test_daemon_worker_timeout():
     literal = """\
 Daemon is running as PID 111015 since 2019-12-17 11:42:18
 Active workers [1]:
-  PID  MEM %    CPU %    started
------  -------  -------  ---------
- 4990  -        -        -
+  PID  MEM %    CPU %    started    slots    latency [s]
+-----  -------  -------  ---------  -------  -------------
+ 4990  -        -        -          -        -
 Use verdi daemon [incr | decr] [num] to increase / decrease the amount of workers"""
     compare_string_literals(get_daemon_status(client), literal)
+
+
+@patch.object(DaemonClient, 'is_daemon_running', lambda: True)
+@patch.object(DaemonClient, 'get_daemon_info', get_daemon_info)
+@patch.object(DaemonClient, 'get_worker_info', get_worker_info)
+@patch('aiida.cmdline.utils.common.format_local_time', format_local_time)
+def test_daemon_worker_statistics(tmp_path):
+    """Test `get_daemon_status` output includes the load and statistics that a worker wrote to its load file."""
+    from aiida.common import json
+
+    load_file = str(tmp_path / 'worker.load')
+    metrics = {
+        'time': time.time(),
+        'load': 1.2,
+        'capacity': 200.,
+        'latency': 0.125,
+        'statistics': {
+            'transports': {
+                'requests': 10,
+                'reused': 8,
+                'opened': 2,
+                'closed': 1,
+                'wait_time': 1.5,
+                'max_wait_time': 0.25
+            }
+        }
+    }
+
+    with open(load_file, 'w', encoding='utf8') as handle:
+        json.dump(metrics, handle)
+
+    client = get_daemon_client()
+    literal = """\
+Daemon is running as PID 111015 since 2019-12-17 11:42:18
+Active workers [1]:
+  PID    MEM %    CPU %  started              slots          latency [s]
+-----  -------  -------  -------------------  -----------  -------------
+ 4990    0.231        0  2019-12-17 12:27:38  1.2 / 200.0          0.125
+Worker statistics:
+  PID  statistics    values
+-----  ------------  -------------------------------------------------------------------------------
+ 4990  transports    closed=1, max_wait_time=0.250, opened=2, requests=10, reused=8, wait_time=1.500
+Use verdi daemon [incr | decr] [num] to increase / decrease the amount of workers"""
+
+    with patch.object(DaemonClient, 'get_worker_load_file', lambda self, pid: load_file):
+        compare_string_literals(get_daemon_status(client), literal)
@@ -13,6 +13,7 @@ Unittests for aiida.common.hashing:make_hash with hardcoded hash values
 
 import itertools
 import collections
+import os
 from datetime import datetime
 import uuid
 
@@ -24,7 +25,9 @@ try:
 except ImportError:
     import unittest
 
-from aiida.common.hashing import make_hash, float_to_text
+from aiida.common.hashing import (
+    make_hash, float_to_text, get_file_content_digest, FolderDigests, FILE_CONTENT_CHUNK_SIZE
+)
 from aiida.common.folders import SandboxFolder
 from aiida.backends.testbase import AiidaTestCase
 from aiida.orm import Dict
@@ -210,6 +213,31 @@ class MakeHashTest(unittest.TestCase):
             self.assertNotEqual(make_hash(folder), folder_hash)
             self.assertEqual(make_hash(folder, ignored_folder_content=['file3.npy', 'some_subdir']), folder_hash)
 
+    def test_folder_digests(self):
+        """The hash of `FolderDigests` should be identical to that of the `Folder` with the same content."""
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            folder.open('file1', 'a').close()
+            with folder.open('file2', 'w') as fhandle:
+                fhandle.write('hello there!\n')
+            subfolder = folder.get_subfolder('some_subdir', create=True)
+            with subfolder.open('file3', 'wb') as fhandle:
+                fhandle.write(b'\x00' * (FILE_CONTENT_CHUNK_SIZE * 3 + 1))
+
+            digests = {}
+            for relpath in ['file1', 'file2', os.path.join('some_subdir', 'file3')]:
+                with folder.open(relpath, 'rb') as fhandle:
+                    digest = get_file_content_digest(fhandle)
+                if os.sep in relpath:
+                    digests.setdefault('some_subdir', {})['file3'] = digest
+                else:
+                    digests[relpath] = digest
+
+            self.assertEqual(make_hash(FolderDigests(digests)), make_hash(folder))
+            self.assertEqual(
+                make_hash(FolderDigests(digests), ignored_folder_content=['some_subdir']),
+                make_hash(folder, ignored_folder_content=['some_subdir'])
+            )
+
 
 class CheckDBRoundTrip(AiidaTestCase):
     """
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Unit tests for the `DaemonAutoscaler` class."""
+from aiida.backends.testbase import AiidaTestCase
+from aiida.engine.daemon.autoscaler import DaemonAutoscaler, DaemonMetrics
+from aiida.engine.daemon.client import get_daemon_client
+
+
+class TestDaemonAutoscaler(AiidaTestCase):
+    """Unit tests for the `DaemonAutoscaler` class."""
+
+    def setUp(self):
+        super().setUp()
+        self.autoscaler = DaemonAutoscaler(get_daemon_client(), minimum_workers=1, maximum_workers=4, interval=1)
+
+    def test_invalid_bounds(self):
+        """Test that invalid bounds raise."""
+        with self.assertRaises(ValueError):
+            DaemonAutoscaler(get_daemon_client(), minimum_workers=0, maximum_workers=4, interval=1)
+
+        with self.assertRaises(ValueError):
+            DaemonAutoscaler(get_daemon_client(), minimum_workers=2, maximum_workers=1, interval=1)
+
+    def test_bounds(self):
+        """Test that the number of workers is brought within the bounds."""
+        target, _ = self.autoscaler.get_target(DaemonMetrics(0, 0, None, None, None, None))
+        self.assertEqual(target, 1)
+
+        target, _ = self.autoscaler.get_target(DaemonMetrics(6, 0, 0, 0., 600., 600))
+        self.assertEqual(target, 4)
+
+    def test_scale_up(self):
+        """Test that workers are added for the waiting tasks if the workers are busy, up to the maximum."""
+        target, reason = self.autoscaler.get_target(DaemonMetrics(1, 150, 100, 90., 100., 100))
+        self.assertEqual(target, 3)
+        self.assertIsNotNone(reason)
+
+        # The workers are not busy, so the waiting tasks will be picked up without adding workers
+        target, reason = self.autoscaler.get_target(DaemonMetrics(1, 150, 10, 10., 100., 100))
+        self.assertEqual(target, 1)
+        self.assertIsNone(reason)
+
+        target, _ = self.autoscaler.get_target(DaemonMetrics(2, 1000, 200, 200., 200., 200))
+        self.assertEqual(target, 4)
+
+    def test_scale_up_calcjobs(self):
+        """Test that workers are added if the workers hold as many calculation jobs as they prefetch."""
+        from aiida.engine.daemon.slots import SlotScheduler
+
+        # The calculation jobs only use a fraction of the capacity, but the workers cannot prefetch more tasks
+        load = 100 * SlotScheduler.WEIGHT_CALCJOB
+        metrics = DaemonMetrics(1, 150, 100, load, 100., 100)
+        self.assertEqual(self.autoscaler.get_utilisation(metrics), 1.)
+
+        target, reason = self.autoscaler.get_target(metrics)
+        self.assertEqual(target, 3)
+        self.assertIsNotNone(reason)
+
+    def test_scale_down(self):
+        """Test that a worker is only removed after the daemon has been idle for a number of consecutive checks."""
+        idle = DaemonMetrics(2, 0, 2, 2., 200., 200)
+
+        for _ in range(DaemonAutoscaler.SCALE_DOWN_CHECKS - 1):
+            target, _ = self.autoscaler.get_target(idle)
+            self.assertEqual(target, 2)
+
+        # A busy check resets the count
+        self.autoscaler.get_target(DaemonMetrics(2, 0, 100, 100., 200., 200))
+
+        for _ in range(DaemonAutoscaler.SCALE_DOWN_CHECKS - 1):
+            target, _ = self.autoscaler.get_target(idle)
+            self.assertEqual(target, 2)
+
+        target, reason = self.autoscaler.get_target(idle)
+        self.assertEqual(target, 1)
+        self.assertIsNotNone(reason)
+
+    def test_scale_down_minimum(self):
+        """Test that the number of workers is never reduced below the minimum."""
+        idle = DaemonMetrics(1, 0, 0, 0., 100., 100)
+
+        for _ in range(2 * DaemonAutoscaler.SCALE_DOWN_CHECKS):
+            target, _ = self.autoscaler.get_target(idle)
+            self.assertEqual(target, 1)
+
+    def test_unknown_load(self):
+        """Test that the daemon is not scaled down if the workers have not reported their load."""
+        unknown = DaemonMetrics(2, 0, None, None, None, None)
+
+        for _ in range(2 * DaemonAutoscaler.SCALE_DOWN_CHECKS):
+            target, _ = self.autoscaler.get_target(unknown)
+            self.assertEqual(target, 2)
+
+        target, _ = self.autoscaler.get_target(DaemonMetrics(2, 10, None, None, None, None))
+        self.assertEqual(target, 3)
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the `aiida.engine.daemon.execmanager` module."""
+import io
+import os
+import shutil
+import tempfile
+
+from aiida import orm
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.datastructures import CalcInfo
+from aiida.common.folders import SandboxFolder
+from aiida.engine.daemon.execmanager import (
+    _copy_objects, retrieve_calculation, retrieve_files_from_list, upload_calculations
+)
+from aiida.engine.daemon.remote_cache import RemoteCache
+from aiida.transports.plugins.local import LocalTransport
+
+
+class TestCopyObjects(AiidaTestCase):
+    """Tests for uploading the objects of the `local_copy_list`."""
+
+    def setUp(self):
+        super().setUp()
+        self.workdir = tempfile.mkdtemp()
+        self.cache_directory = tempfile.mkdtemp()
+        self.node = orm.SinglefileData(io.BytesIO(b'pseudopotential content')).store()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.workdir)
+        shutil.rmtree(self.cache_directory)
+
+    def assert_uploaded(self, filename):
+        """Assert that the file in the work directory is a regular file with the content of the node."""
+        filepath = os.path.join(self.workdir, filename)
+        self.assertFalse(os.path.islink(filepath))
+
+        with open(filepath, 'rb') as handle:
+            self.assertEqual(handle.read(), b'pseudopotential content')
+
+    def test_copy_objects(self):
+        """Test that without a remote cache the content is streamed to the remote path."""
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            result = _copy_objects(transport, None, [(self.node, self.node.filename, 'pseudo.upf')])
+
+        self.assertEqual(result, (0, 1))
+        self.assert_uploaded('pseudo.upf')
+
+    def test_copy_objects_excluded(self):
+        """Test that excluded remote paths are streamed to the remote path, even if the remote cache is enabled."""
+        objects = [(self.node, self.node.filename, 'pseudo.upf'), (self.node, self.node.filename, 'excluded.upf')]
+
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            remote_cache = RemoteCache(transport, self.cache_directory)
+            result = _copy_objects(transport, remote_cache, objects, excluded=['excluded.upf'])
+
+        self.assertEqual(result, (0, 2))
+        self.assertTrue(os.path.islink(os.path.join(self.workdir, 'pseudo.upf')))
+        self.assert_uploaded('excluded.upf')
+
+
+class TestUploadCalculations(AiidaTestCase):
+    """Tests for the batched upload of calculations."""
+
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.workdir = tempfile.mkdtemp()
+        cls.computer_upload = orm.Computer(
+            name='upload', hostname='localhost', transport_type='local', scheduler_type='direct', workdir=cls.workdir
+        ).store()
+
+    @classmethod
+    def tearDownClass(cls, *args, **kwargs):
+        super().tearDownClass(*args, **kwargs)
+        shutil.rmtree(cls.workdir)
+
+    def setUp(self):
+        super().setUp()
+        self.sourcedir = tempfile.mkdtemp()
+
+        with open(os.path.join(self.sourcedir, 'source.txt'), 'w') as handle:
+            handle.write('remote content')
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.sourcedir)
+
+    def create_upload(self, folder, remote_copy_list=None):
+        """Return a tuple for `upload_calculations` of a new calculation whose sandbox folder contains an input file."""
+        node = orm.CalcJobNode(computer=self.computer_upload).store()
+
+        calc_info = CalcInfo()
+        calc_info.uuid = node.uuid
+        calc_info.codes_info = []
+        calc_info.remote_copy_list = remote_copy_list or []
+
+        with open(folder.get_abs_path('aiida.in'), 'w') as handle:
+            handle.write('input content')
+
+        return node, calc_info, folder, None
+
+    def test_upload_calculations(self):
+        """Test that calculations are uploaded together and that a failing remote copy only fails its calculation."""
+        source = os.path.join(self.sourcedir, 'source.txt')
+
+        with SandboxFolder() as folder_first, SandboxFolder() as folder_second:
+            uploads = [
+                self.create_upload(folder_first, [(self.computer_upload.uuid, source, 'copied.txt')]),
+                self.create_upload(folder_second, [(self.computer_upload.uuid, '/nonexistent/path', 'copied.txt')]),
+            ]
+
+            with LocalTransport() as transport:
+                results = upload_calculations(uploads, transport)
+
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], IOError)
+
+        node = uploads[0][0]
+        workdir = node.get_remote_workdir()
+        self.assertEqual(workdir, os.path.join(self.workdir, node.uuid[:2], node.uuid[2:4], node.uuid[4:]))
+        self.assertEqual(sorted(os.listdir(workdir)), ['aiida.in', 'copied.txt'])
+        self.assertEqual(node.get_object_content('aiida.in'), 'input content')
+        self.assertEqual(node.get_outgoing(orm.RemoteData).one().node.get_remote_path(), workdir)
+
+        # The working directory of the failed calculation is created, but it does not get a `remote_folder`
+        self.assertTrue(os.path.isdir(uploads[1][0].get_remote_workdir()))
+        self.assertIsNone(uploads[1][0].get_outgoing(orm.RemoteData).first())
+
+    def test_upload_calculations_override_code_file(self):
+        """Test that a file of the sandbox folder overrides a code file that would be linked from the remote cache."""
+        from aiida.common.datastructures import CodeInfo
+
+        for filename, content in [('run.sh', '#!/bin/bash'), ('default.txt', 'default content')]:
+            with open(os.path.join(self.sourcedir, filename), 'w') as handle:
+                handle.write(content)
+
+        code = orm.Code(
+            local_executable='run.sh',
+            files=[os.path.join(self.sourcedir, 'run.sh'), os.path.join(self.sourcedir, 'default.txt')]
+        ).store()
+        cache_directory = os.path.join(self.sourcedir, 'cache')
+        self.computer_upload.set_remote_cache_directory(cache_directory)
+
+        try:
+            with SandboxFolder() as folder:
+                upload = self.create_upload(folder)
+                code_info = CodeInfo()
+                code_info.code_uuid = code.uuid
+                upload[1].codes_info = [code_info]
+
+                with open(folder.get_abs_path('default.txt'), 'w') as handle:
+                    handle.write('overridden content')
+
+                with LocalTransport() as transport:
+                    self.assertEqual(upload_calculations([upload], transport), [None])
+        finally:
+            self.computer_upload.set_remote_cache_directory(None)
+
+        workdir = upload[0].get_remote_workdir()
+        self.assertFalse(os.path.islink(os.path.join(workdir, 'default.txt')))
+
+        with open(os.path.join(workdir, 'default.txt')) as handle:
+            self.assertEqual(handle.read(), 'overridden content')
+
+        # Neither the overridden file nor the executable is cached
+        cached = os.listdir(cache_directory) if os.path.isdir(cache_directory) else []
+        self.assertEqual([name for name in cached if name != RemoteCache.STATISTICS_FILENAME], [])
+
+    def test_upload_calculations_failing_copy(self):
+        """Test that a failing remote copy that is not the last command fails its calculation with its own error."""
+        source = os.path.join(self.sourcedir, 'source.txt')
+
+        with SandboxFolder() as folder_first, SandboxFolder() as folder_second, SandboxFolder() as folder_third:
+            uploads = [
+                self.create_upload(folder_first, [
+                    (self.computer_upload.uuid, '/nonexistent/first', 'first.txt'),
+                    (self.computer_upload.uuid, source, 'copied.txt'),
+                ]),
+                self.create_upload(folder_second, [(self.computer_upload.uuid, source, 'copied.txt')]),
+                self.create_upload(folder_third, [
+                    (self.computer_upload.uuid, '/nonexistent/third', 'third.txt'),
+                    (self.computer_upload.uuid, source, 'copied.txt'),
+                ]),
+            ]
+
+            with LocalTransport() as transport:
+                results = upload_calculations(uploads, transport)
+
+        self.assertIsInstance(results[0], IOError)
+        self.assertIn('/nonexistent/first', str(results[0]))
+        self.assertNotIn('/nonexistent/third', str(results[0]))
+        self.assertIsNone(results[1])
+        self.assertIsInstance(results[2], IOError)
+        self.assertIn('/nonexistent/third', str(results[2]))
+        self.assertNotIn('/nonexistent/first', str(results[2]))
+
+        # The commands after the failing copy are not executed
+        self.assertEqual(sorted(os.listdir(uploads[0][0].get_remote_workdir())), ['aiida.in'])
+        self.assertEqual(sorted(os.listdir(uploads[1][0].get_remote_workdir())), ['aiida.in', 'copied.txt'])
+
+    def test_upload_calculations_existing_workdir_failing(self):
+        """Test that the upload fails if an existing working directory cannot be moved to the lost+found directory."""
+        with SandboxFolder() as folder:
+            upload = self.create_upload(folder)
+            node = upload[0]
+            existing = os.path.join(self.workdir, node.uuid[:2], node.uuid[2:4], node.uuid[4:])
+            os.makedirs(os.path.join(existing, 'previous'))
+
+            # A file at the target path in the lost+found directory makes the copy of the working directory fail
+            os.makedirs(os.path.join(self.workdir, 'lost+found'), exist_ok=True)
+            with open(os.path.join(self.workdir, 'lost+found', node.uuid), 'w') as handle:
+                handle.write('existing')
+
+            with LocalTransport() as transport:
+                with self.assertRaises(IOError):
+                    upload_calculations([upload], transport)
+
+        self.assertEqual(os.listdir(existing), ['previous'])
+
+    def test_upload_calculations_existing_workdir(self):
+        """Test that an existing working directory is moved to the lost+found directory."""
+        with SandboxFolder() as folder:
+            upload = self.create_upload(folder)
+            node = upload[0]
+            existing = os.path.join(self.workdir, node.uuid[:2], node.uuid[2:4], node.uuid[4:])
+            os.makedirs(os.path.join(existing, 'previous'))
+
+            with LocalTransport() as transport:
+                self.assertEqual(upload_calculations([upload], transport), [None])
+
+        self.assertEqual(os.listdir(os.path.join(self.workdir, 'lost+found', node.uuid)), ['previous'])
+        self.assertEqual(os.listdir(existing), ['aiida.in'])
+
+
+class TestRetrieveCalculation(AiidaTestCase):
+    """Tests for the retrieval of the files of calculations."""
+
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+        cls.computer_retrieve = orm.Computer(
+            name='retrieve', hostname='localhost', transport_type='local', scheduler_type='direct', workdir='/tmp'
+        ).store()
+
+    def setUp(self):
+        super().setUp()
+        self.workdir = tempfile.mkdtemp()
+        self.temporary_folder = tempfile.mkdtemp()
+
+        filenames = ['aiida.out', 'aiida.err', os.path.join('out', 'data.xml'), os.path.join('out', 'nested', 'a.xml')]
+
+        for filename in filenames:
+            os.makedirs(os.path.dirname(os.path.join(self.workdir, filename)), exist_ok=True)
+            with open(os.path.join(self.workdir, filename), 'w') as handle:
+                handle.write(filename)
+
+        os.makedirs(os.path.join(self.workdir, 'out', 'empty'))
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.workdir)
+        shutil.rmtree(self.temporary_folder)
+
+    def test_retrieve_calculation(self):
+        """Test that the files are streamed into the retrieved folder and the temporary folder."""
+        node = orm.CalcJobNode(computer=self.computer_retrieve)
+        node.set_remote_workdir(self.workdir)
+        node.set_retrieve_list(['aiida.*', 'out', 'missing.txt', ['out/*/*.xml', 'xml', 2]])
+        node.set_retrieve_temporary_list(['out/data.xml'])
+        node.store()
+
+        with LocalTransport() as transport:
+            retrieve_calculation(node, transport, self.temporary_folder)
+
+        retrieved = node.get_retrieved_node()
+        self.assertEqual(sorted(retrieved.list_object_names()), ['aiida.err', 'aiida.out', 'out', 'xml'])
+        self.assertEqual(sorted(retrieved.list_object_names('out')), ['data.xml', 'empty', 'nested'])
+        self.assertEqual(retrieved.list_object_names(os.path.join('out', 'empty')), [])
+        self.assertEqual(retrieved.get_object_content('aiida.out'), 'aiida.out')
+        self.assertEqual(
+            retrieved.get_object_content(os.path.join('xml', 'nested', 'a.xml')), os.path.join('out', 'nested', 'a.xml')
+        )
+        self.assertEqual(os.listdir(self.temporary_folder), ['data.xml'])
+
+    def test_retrieve_calculation_dangling_symlink(self):
+        """Test that dangling symbolic links that match a pattern of the retrieve list are skipped."""
+        os.symlink(os.path.join(self.workdir, 'missing.txt'), os.path.join(self.workdir, 'aiida.log'))
+
+        node = orm.CalcJobNode(computer=self.computer_retrieve)
+        node.set_remote_workdir(self.workdir)
+        node.set_retrieve_list(['aiida.*', 'aiida.log'])
+        node.store()
+
+        with LocalTransport() as transport:
+            retrieve_calculation(node, transport, self.temporary_folder)
+
+        retrieved = node.get_retrieved_node()
+        self.assertEqual(sorted(retrieved.list_object_names()), ['aiida.err', 'aiida.out'])
+
+    def test_retrieve_files_from_list(self):
+        """Test that the files of a retrieve list are retrieved into a local folder."""
+        node = orm.CalcJobNode(computer=self.computer_retrieve).store()
+
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            retrieve_files_from_list(node, transport, self.temporary_folder, ['aiida.out', ['out/nested', '.', 0]])
+
+        self.assertEqual(sorted(os.listdir(self.temporary_folder)), ['a.xml', 'aiida.out'])
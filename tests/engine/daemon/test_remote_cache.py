@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the `RemoteCache` class."""
+import io
+import os
+import shutil
+import tempfile
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.engine.daemon.remote_cache import RemoteCache
+from aiida.orm import SinglefileData
+from aiida.transports.plugins.local import LocalTransport
+
+
+class TestRemoteCache(AiidaTestCase):
+    """Tests for copying objects of node repositories through the remote cache."""
+
+    def setUp(self):
+        super().setUp()
+        self.workdir = tempfile.mkdtemp()
+        self.basedir = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.basedir, 'cache')
+        self.pseudo = SinglefileData(io.BytesIO(b'pseudopotential content')).store()
+        self.other = SinglefileData(io.BytesIO(b'other content')).store()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.workdir)
+        shutil.rmtree(self.basedir)
+
+    def copy_objects(self, objects, link_mode='symlink'):
+        """Copy the given objects into the work directory through the remote cache and return the hits and misses."""
+        with LocalTransport() as transport:
+            transport.chdir(self.workdir)
+            return RemoteCache(transport, self.cache_directory, link_mode).copy_objects(objects)
+
+    def assert_content(self, filename, content):
+        """Assert that the file in the work directory has the given content."""
+        with open(os.path.join(self.workdir, filename), 'rb') as handle:
+            self.assertEqual(handle.read(), content)
+
+    def test_invalid(self):
+        """Test that an invalid directory or link mode raises."""
+        with self.assertRaises(ValueError):
+            RemoteCache(None, 'relative/path')
+
+        with self.assertRaises(ValueError):
+            RemoteCache(None, self.cache_directory, link_mode='copy')
+
+    def test_copy_objects(self):
+        """Test that objects are uploaded into the cache once and linked into the work directory."""
+        # An existing file at the remote path should be replaced
+        with open(os.path.join(self.workdir, 'second.upf'), 'w') as handle:
+            handle.write('existing')
+
+        objects = [
+            (self.pseudo, self.pseudo.filename, 'first.upf'),
+            (self.pseudo, self.pseudo.filename, 'second.upf'),
+            (self.other, self.other.filename, 'other.txt'),
+        ]
+        self.assertEqual(self.copy_objects(objects), (1, 2))
+        self.assertEqual(self.copy_objects(objects), (3, 0))
+
+        cached_path = os.path.join(self.cache_directory, self.pseudo.get_object_digest(self.pseudo.filename))
+        self.assertEqual(len(os.listdir(self.cache_directory)), 3)  # Two objects and the statistics
+        self.assertFalse(os.stat(cached_path).st_mode & 0o222)
+
+        for filename in ['first.upf', 'second.upf']:
+            self.assertEqual(os.readlink(os.path.join(self.workdir, filename)), cached_path)
+            self.assert_content(filename, b'pseudopotential content')
+
+        self.assert_content('other.txt', b'other content')
+
+    def test_copy_objects_hardlink(self):
+        """Test that objects are hard linked into the work directory with the `hardlink` link mode."""
+        self.copy_objects([(self.pseudo, self.pseudo.filename, 'pseudo.upf')], link_mode='hardlink')
+
+        filepath = os.path.join(self.workdir, 'pseudo.upf')
+        self.assertFalse(os.path.islink(filepath))
+        self.assertEqual(os.stat(filepath).st_nlink, 2)
+        self.assert_content('pseudo.upf', b'pseudopotential content')
+
+    def test_statistics_and_clean(self):
+        """Test the statistics of the cache and that cleaning removes the cached objects."""
+        objects = [(self.pseudo, self.pseudo.filename, 'pseudo.upf')]
+        self.copy_objects(objects)
+        self.copy_objects(objects)
+
+        with LocalTransport() as transport:
+            remote_cache = RemoteCache(transport, self.cache_directory)
+
+            statistics = remote_cache.get_statistics()
+            self.assertEqual((statistics.objects, statistics.hits, statistics.misses), (1, 1, 1))
+            self.assertEqual(statistics.hit_rate, 0.5)
+
+            # The object was just used, so it is not older than one day
+            self.assertEqual(remote_cache.clean(older_than=1), 0)
+            self.assertEqual(remote_cache.clean(), 1)
+
+            statistics = remote_cache.get_statistics()
+            self.assertEqual((statistics.objects, statistics.hits, statistics.misses), (0, 1, 1))
+
+    def test_statistics_nonexistent(self):
+        """Test that a cache whose directory does not exist yet is empty."""
+        with LocalTransport() as transport:
+            remote_cache = RemoteCache(transport, self.cache_directory)
+            self.assertEqual(remote_cache.get_statistics().objects, 0)
+            self.assertIsNone(remote_cache.get_statistics().hit_rate)
+            self.assertEqual(remote_cache.clean(), 0)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Unit tests for the `SlotScheduler` class."""
+import os
+import shutil
+import tempfile
+import time
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.engine.daemon.slots import SlotScheduler, read_worker_load
+from aiida.orm import CalcJobNode, WorkflowNode
+
+
+class TestSlotScheduler(AiidaTestCase):
+    """Unit tests for the `SlotScheduler` class."""
+
+    def setUp(self):
+        super().setUp()
+        self.sandbox = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.sandbox)
+        super().tearDown()
+
+    def test_get_weight(self):
+        """Test that calculation jobs weigh less than other processes."""
+        calcjob = CalcJobNode(computer=self.computer).store()
+        workflow = WorkflowNode().store()
+
+        self.assertEqual(SlotScheduler.get_weight(calcjob.pk), SlotScheduler.WEIGHT_CALCJOB)
+        self.assertEqual(SlotScheduler.get_weight(workflow.pk), SlotScheduler.WEIGHT_DEFAULT)
+        self.assertEqual(SlotScheduler.get_weight(-1), SlotScheduler.WEIGHT_DEFAULT)
+
+    def test_acquire_release(self):
+        """Test that tasks are only accepted while their weight fits in the capacity."""
+        scheduler = SlotScheduler(2)
+
+        first = scheduler.acquire(None)
+        second = scheduler.acquire(None)
+        self.assertIsNotNone(first)
+        self.assertIsNotNone(second)
+        self.assertEqual(scheduler.load, 2.)
+
+        # The worker is at capacity
+        self.assertIsNone(scheduler.acquire(None))
+        self.assertEqual(scheduler.get_metrics()['rejected'], 1)
+
+        scheduler.release(first)
+        self.assertEqual(scheduler.load, 1.)
+        self.assertIsNotNone(scheduler.acquire(None))
+
+    def test_acquire_idle(self):
+        """Test that a worker without tasks always accepts a task, even if it exceeds the capacity."""
+        scheduler = SlotScheduler(0)
+        self.assertIsNotNone(scheduler.acquire(None))
+        self.assertIsNone(scheduler.acquire(None))
+
+    def test_statistics(self):
+        """Test that the added statistics are included in the load metrics."""
+        scheduler = SlotScheduler(1)
+        self.assertEqual(scheduler.get_metrics()['statistics'], {})
+
+        scheduler.add_statistics('counter', lambda: {'count': 1})
+        self.assertEqual(scheduler.get_metrics()['statistics'], {'counter': {'count': 1}})
+
+    def test_read_worker_load(self):
+        """Test that the load metrics written by a worker are read back and considered stale after a while."""
+        load_file = os.path.join(self.sandbox, 'worker.load')
+        scheduler = SlotScheduler(4, load_file)
+        scheduler.acquire(None)
+
+        self.assertIsNone(read_worker_load(load_file))
+
+        scheduler._write_load_file()  # pylint: disable=protected-access
+        metrics = read_worker_load(load_file)
+        self.assertEqual(metrics['tasks'], 1)
+        self.assertEqual(metrics['load'], 1.)
+        self.assertEqual(metrics['capacity'], 4.)
+
+        time.sleep(0.1)
+        self.assertIsNone(read_worker_load(load_file, maximum_age=0.05))
+
+        scheduler.stop()
+        self.assertFalse(os.path.exists(load_file))
@@ -15,7 +15,7 @@ import tornado
 
 from aiida.orm import AuthInfo, User
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine.processes.calcjobs.manager import JobManager, JobsList
+from aiida.engine.processes.calcjobs.manager import JobCommandQueue, JobManager, JobsList
 from aiida.engine.transports import TransportQueue
 
 
@@ -47,6 +47,46 @@ class TestJobManager(AiidaTestCase):
         with self.manager.request_job_info_update(self.auth_info, job_id=1) as request:
             self.assertIsInstance(request, tornado.concurrent.Future)
 
+    def test_get_statistics(self):
+        """Test that `JobManager.get_statistics` sums the statistics of all jobs lists."""
+        self.assertEqual(self.manager.get_statistics(), {'polls': 0, 'broadcasts': 0, 'jobs_resolved': 0})
+
+        jobs_list = self.manager.get_jobs_list(self.auth_info)
+        jobs_list._statistics['polls'] += 2  # pylint: disable=protected-access
+        self.assertEqual(self.manager.get_statistics(), {'polls': 2, 'broadcasts': 0, 'jobs_resolved': 0})
+
+    def test_get_command_statistics(self):
+        """Test that `JobManager.get_command_statistics` reports the statistics of the queues per command."""
+        commands = ['upload', 'submit', 'kill']
+        keys = ['{}_{}'.format(command, key) for command in commands for key in ['batches', 'requests']]
+        self.assertEqual(self.manager.get_command_statistics(), {key: 0 for key in keys})
+
+        queue = self.manager.get_submit_queue(self.auth_info)
+        queue._statistics['batches'] += 1  # pylint: disable=protected-access
+        queue._statistics['requests'] += 3  # pylint: disable=protected-access
+
+        statistics = self.manager.get_command_statistics()
+        self.assertEqual(statistics['submit_batches'], 1)
+        self.assertEqual(statistics['submit_requests'], 3)
+        self.assertEqual(statistics['upload_requests'], 0)
+
+    def test_get_command_queues(self):
+        """Test the methods of `JobManager` that return the queues to upload, submit and kill jobs."""
+        queues = [
+            self.manager.get_upload_queue(self.auth_info),
+            self.manager.get_submit_queue(self.auth_info),
+            self.manager.get_kill_queue(self.auth_info),
+        ]
+
+        for queue in queues:
+            self.assertIsInstance(queue, JobCommandQueue)
+        self.assertEqual(len(set(queues)), 3)
+
+        # Calling the methods again, should return the exact same instances of `JobCommandQueue`
+        self.assertIs(self.manager.get_upload_queue(self.auth_info), queues[0])
+        self.assertIs(self.manager.get_submit_queue(self.auth_info), queues[1])
+        self.assertIs(self.manager.get_kill_queue(self.auth_info), queues[2])
+
 
 class TestJobsList(AiidaTestCase):
     """Test the `aiida.engine.processes.calcjobs.manager.JobsList` class."""
@@ -76,3 +116,129 @@ class TestJobsList(AiidaTestCase):
         last_updated = time.time()
         jobs_list = JobsList(self.auth_info, self.transport_queue, last_updated=last_updated)
         self.assertEqual(jobs_list.last_updated, last_updated)
+
+    def test_update_interval_backoff(self):
+        """Test that the update interval increases as long as no job changes state and is reset when one does."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        minimum_interval = self.jobs_list.get_minimum_update_interval()
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.RUNNING
+
+        def resolve(jobs_cache):
+            with self.jobs_list.request_job_info_update('1') as request:
+                self.jobs_list._resolve_requests(jobs_cache)  # pylint: disable=protected-access
+                self.assertTrue(request.done())
+
+        # A job that is polled for the first time counts as changed
+        resolve({'1': job_info})
+        self.assertEqual(self.jobs_list.get_update_interval(), minimum_interval)
+
+        resolve({'1': job_info})
+        self.assertEqual(self.jobs_list.get_update_interval(), minimum_interval * JobsList.BACKOFF_FACTOR)
+
+        for _ in range(10):
+            resolve({'1': job_info})
+        self.assertEqual(self.jobs_list.get_update_interval(), minimum_interval * JobsList.MAXIMUM_BACKOFF)
+
+        resolve({})
+        self.assertEqual(self.jobs_list.get_update_interval(), minimum_interval)
+
+        self.assertEqual(self.jobs_list.get_statistics()['jobs_resolved'], 13)
+
+    def test_update_received(self):
+        """Test that an update broadcast by another runner only resolves requests made before its poll started."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.QUEUED
+
+        with self.jobs_list.request_job_info_update('1') as request_before:
+            time.sleep(0.01)
+            poll_started = time.time()
+            time.sleep(0.01)
+            with self.jobs_list.request_job_info_update('2') as request_after:
+                body = {
+                    'jobs': {'1': job_info.serialize()},
+                    'job_ids': None,
+                    'poll_started': poll_started,
+                    'last_updated': time.time(),
+                }
+                self.jobs_list._on_update_received(body)  # pylint: disable=protected-access
+
+                self.assertTrue(request_before.done())
+                self.assertEqual(request_before.result().job_state, JobState.QUEUED)
+                self.assertFalse(request_after.done())
+
+        self.assertEqual(self.jobs_list.last_updated, body['last_updated'])
+        self.assertEqual(self.jobs_list.get_statistics()['broadcasts'], 1)
+
+        # An update that is older than the last update should be ignored
+        body['last_updated'] -= 1
+        self.jobs_list._on_update_received(body)  # pylint: disable=protected-access
+        self.assertEqual(self.jobs_list.get_statistics()['broadcasts'], 1)
+
+
+class TestJobCommandQueue(AiidaTestCase):
+    """Test the `aiida.engine.processes.calcjobs.manager.JobCommandQueue` class."""
+
+    def setUp(self):
+        super().setUp()
+        self.loop = tornado.ioloop.IOLoop()
+        self.transport_queue = TransportQueue(self.loop)
+        self.user = User.objects.get_default()
+        self.auth_info = AuthInfo(self.computer, self.user).store()
+        self.batches = []
+
+    def tearDown(self):
+        super().tearDown()
+        AuthInfo.objects.delete(self.auth_info.pk)
+
+    def batch_function(self, items, transport):
+        """Record the batch and return the double of each item, or an exception for negative items."""
+        self.assertTrue(transport.is_open)
+        self.batches.append(items)
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+    def test_batch(self):
+        """Test that requests made within the window are resolved with the results of a single batch."""
+        command_queue = JobCommandQueue(self.auth_info, self.transport_queue, self.batch_function, window=0.1)
+
+        @tornado.gen.coroutine
+        def request(item):
+            with command_queue.request(item) as future:
+                result = yield future
+                raise tornado.gen.Return(result)
+
+        @tornado.gen.coroutine
+        def run():
+            results = yield [request(item) for item in [1, 2, 3]]
+            self.assertEqual(results, [2, 4, 6])
+
+            with self.assertRaises(ValueError):
+                yield request(-1)
+
+        self.loop.run_sync(run)
+
+        self.assertEqual(self.batches, [[1, 2, 3], [-1]])
+        self.assertEqual(command_queue.get_statistics(), {'batches': 2, 'requests': 4})
+
+    def test_cancelled_request(self):
+        """Test that a request that is cancelled before the batch is run is not passed to the batch function."""
+        command_queue = JobCommandQueue(self.auth_info, self.transport_queue, self.batch_function)
+
+        @tornado.gen.coroutine
+        def run():
+            with command_queue.request(1):
+                pass
+
+            with command_queue.request(2) as future:
+                result = yield future
+
+            self.assertEqual(result, 4)
+
+        self.loop.run_sync(run)
+
+        self.assertEqual(self.batches, [[2]])
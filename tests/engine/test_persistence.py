@@ -11,7 +11,7 @@
 import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine.persistence import AiiDAPersister
+from aiida.engine.persistence import AiiDAPersister, decode_checkpoint
 from aiida.engine import Process, run
 
 from tests.utils.processes import DummyProcess
@@ -65,3 +65,30 @@ class TestAiiDAPersister(AiidaTestCase):
 
         self.persister.delete_checkpoint(process.pid)
         self.assertEqual(process.node.checkpoint, None)
+
+    def test_compressed_checkpoint(self):
+        """Test that the checkpoint is stored compressed and that uncompressed checkpoints can still be loaded."""
+        from aiida.orm.utils import serialize
+
+        process = DummyProcess()
+        bundle_saved = self.persister.save_checkpoint(process)
+
+        checkpoint = process.node.checkpoint
+        self.assertNotEqual(decode_checkpoint(checkpoint), checkpoint)
+        self.assertDictEqual(serialize.deserialize(decode_checkpoint(checkpoint)), bundle_saved)
+
+        process.node.set_checkpoint(serialize.serialize(bundle_saved))
+        self.assertDictEqual(self.persister.load_checkpoint(process.node.pk), bundle_saved)
+
+    def test_unchanged_checkpoint(self):
+        """Test that a checkpoint that is identical to the last saved one is not written again."""
+        process = DummyProcess()
+        self.persister.save_checkpoint(process)
+
+        process.node.set_checkpoint('sentinel')
+        self.persister.save_checkpoint(process)
+        self.assertEqual(process.node.checkpoint, 'sentinel')
+
+        self.persister.delete_checkpoint(process.pid)
+        self.persister.save_checkpoint(process)
+        self.assertNotEqual(process.node.checkpoint, None)
@@ -8,6 +8,8 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Module to test process runners."""
+from unittest.mock import patch
+
 import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
@@ -55,6 +57,88 @@ class TestWorkchain(AiidaTestCase):
 
         self.assertTrue(future.result())
 
+    def test_call_on_calculation_finish_multiple(self):
+        """Test that the callbacks of multiple awaited calculations are all called when they terminate."""
+        procs = [Proc(runner=self.runner) for _ in range(3)]
+        finished = []
+
+        def calc_done(pk):
+            finished.append(pk)
+            if len(finished) == len(procs):
+                self.runner.loop.stop()
+
+        for proc in procs:
+            self.runner.call_on_calculation_finish(proc.node.pk, calc_done)
+            self.runner.loop.add_callback(proc.step_until_terminated)
+
+        self._run_loop_for(5.)
+
+        self.assertEqual(sorted(finished), sorted(proc.node.pk for proc in procs))
+
+    def test_call_on_calculation_finish_terminated(self):
+        """Test that the callback is called for a calculation that has already terminated."""
+        node = WorkflowNode()
+        node.set_process_state(plumpy.ProcessState.FINISHED)
+        node.store()
+        finished = []
+
+        def calc_done(pk):
+            finished.append(pk)
+            self.runner.loop.stop()
+
+        self.runner.call_on_calculation_finish(node.pk, calc_done)
+        self._run_loop_for(5.)
+
+        self.assertEqual(finished, [node.pk])
+
+    def test_close_callback(self):
+        """Test that the close callbacks are called when the runner is closed."""
+        runner = get_manager().create_runner(with_persistence=False)
+        closed = []
+
+        runner.add_close_callback(lambda: closed.append(True))
+        self.assertEqual(closed, [])
+
+        runner.close()
+        self.assertEqual(closed, [True])
+
+    def test_daemon_runner_stops_slot_scheduler(self):
+        """Test that the slot scheduler created for a daemon runner is stopped when the runner is closed."""
+        from aiida.engine.daemon.slots import SlotScheduler
+
+        with patch.object(SlotScheduler, 'stop') as stop:
+            runner = get_manager().create_daemon_runner(loop=self.runner.loop)
+            stop.assert_not_called()
+            runner.close()
+            stop.assert_called_once_with()
+
+    def test_daemon_runner_external_slot_scheduler(self):
+        """Test that a slot scheduler passed to the daemon runner is left to be stopped by the caller."""
+        from aiida.engine.daemon.slots import SlotScheduler
+
+        slot_scheduler = SlotScheduler(1)
+        with patch.object(SlotScheduler, 'stop') as stop:
+            runner = get_manager().create_daemon_runner(loop=self.runner.loop, slot_scheduler=slot_scheduler)
+            runner.close()
+            stop.assert_not_called()
+        slot_scheduler.stop()
+
+    def test_daemon_runner_statistics(self):
+        """Test that the daemon runner adds its statistics to the load metrics of its slot scheduler."""
+        from aiida.engine.daemon.slots import SlotScheduler
+
+        slot_scheduler = SlotScheduler(1)
+        runner = get_manager().create_daemon_runner(loop=self.runner.loop, slot_scheduler=slot_scheduler)
+
+        try:
+            statistics = slot_scheduler.get_metrics()['statistics']
+            self.assertEqual(statistics['transports'], runner.transport.get_statistics())
+            self.assertEqual(statistics['scheduler'], runner.job_manager.get_statistics())
+            self.assertEqual(statistics['commands'], runner.job_manager.get_command_statistics())
+        finally:
+            runner.close()
+            slot_scheduler.stop()
+
     def _run_loop_for(self, seconds):
         loop = self.runner.loop
         loop.call_later(seconds, the_hans_klok_comeback, self.runner.loop)
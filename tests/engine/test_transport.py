@@ -8,7 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Module to test transport."""
-from tornado.gen import coroutine, Return
+from tornado.gen import coroutine, sleep, Return
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.engine.transports import TransportQueue
@@ -139,3 +139,98 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval  # pylint: disable=protected-access
+
+    def test_idle_timeout(self):
+        """Test that a transport is kept open for the idle timeout and reused by requests in the meantime."""
+        queue = TransportQueue(idle_timeout=0.5)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans1 = yield request
+
+            self.assertTrue(trans1.is_open)
+
+            with queue.request_transport(self.authinfo) as request:
+                trans2 = yield request
+                self.assertIs(trans1, trans2)
+
+            raise Return(trans1)
+
+        transport = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        statistics = queue.get_statistics()
+        self.assertEqual(statistics['requests'], 2)
+        self.assertEqual(statistics['reused'], 1)
+        self.assertEqual(statistics['opened'], 1)
+        self.assertEqual(statistics['closed'], 0)
+
+        loop.run_sync(lambda: sleep(1.))
+        self.assertFalse(transport.is_open)
+        self.assertEqual(queue.get_statistics()['closed'], 1)
+
+    def test_idle_timeout_exception(self):
+        """Test that a transport that was in use when an exception was raised is closed instead of kept open."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+        transports = []
+
+        @coroutine
+        def test():
+            with self.assertRaises(RuntimeError):
+                with queue.request_transport(self.authinfo) as request:
+                    transports.append((yield request))
+                    raise RuntimeError('connection lost')
+
+            self.assertFalse(transports[0].is_open)
+
+            with queue.request_transport(self.authinfo) as request:
+                transports.append((yield request))
+                self.assertIsNot(transports[1], transports[0])
+                self.assertTrue(transports[1].is_open)
+
+        loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        self.assertEqual(queue.get_statistics()['opened'], 2)
+        queue.close()
+
+    def test_idle_timeout_not_alive(self):
+        """Test that an idle transport that is no longer alive is not reused, but a new transport is opened."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans1 = yield request
+
+            # Simulate a lost connection of the idle transport
+            trans1.close()
+
+            with queue.request_transport(self.authinfo) as request:
+                trans2 = yield request
+                self.assertIsNot(trans1, trans2)
+                self.assertTrue(trans2.is_open)
+
+        loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        statistics = queue.get_statistics()
+        self.assertEqual(statistics['opened'], 2)
+        self.assertEqual(statistics['reused'], 0)
+        queue.close()
+
+    def test_close(self):
+        """Test that closing the queue closes the transports that are kept open while idle."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        transport = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        self.assertTrue(transport.is_open)
+
+        queue.close()
+        self.assertFalse(transport.is_open)
+        self.assertEqual(queue.get_statistics()['closed'], 1)
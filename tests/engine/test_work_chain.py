@@ -632,6 +632,48 @@ class TestWorkchain(AiidaTestCase):
 
         run_and_check_success(MainWorkChain)
 
+    def test_tocontext_schedule_workchains_outputs(self):
+        """Test that the awaitables of many sub processes that finish together are all resolved, with their outputs."""
+        from aiida.engine.processes.workchains.awaitable import AwaitableAction, construct_awaitable
+        from aiida.engine.processes.workchains.context import append_
+
+        num_children = 5
+
+        class MainWorkChain(WorkChain):
+
+            @classmethod
+            def define(cls, spec):
+                super().define(spec)
+                spec.outline(cls.do_run, cls.check)
+
+            def do_run(self):
+                for value in range(num_children):
+                    self.to_context(children=append_(self.submit(SubWorkChain, value=Int(value))))
+                    awaitable = construct_awaitable(self.submit(SubWorkChain, value=Int(value)))
+                    awaitable.update({'action': AwaitableAction.APPEND, 'outputs': True})
+                    self.to_context(outputs=awaitable)
+
+            def check(self):
+                assert not self._awaitables
+                assert self.node.process_status is None
+                assert len(self.ctx.children) == num_children
+                assert all(child.is_finished_ok for child in self.ctx.children)
+                assert sorted(outputs['result'].value for outputs in self.ctx.outputs) == list(range(num_children))
+
+        class SubWorkChain(WorkChain):
+
+            @classmethod
+            def define(cls, spec):
+                super().define(spec)
+                spec.input('value', valid_type=Int)
+                spec.output('result', valid_type=Int)
+                spec.outline(cls.do_run)
+
+            def do_run(self):
+                self.out('result', self.inputs.value)
+
+        run_and_check_success(MainWorkChain)
+
     def test_process_status_sub_processes(self):
         """Test that process status is set on node when waiting for sub processes."""
 
@@ -15,7 +15,7 @@ import os
 from aiida.backends.testbase import AiidaTestCase
 from aiida.common import exceptions, LinkType
 from aiida.orm import Data, Node, User, CalculationNode, WorkflowNode, load_node
-from aiida.orm.utils.links import LinkTriple
+from aiida.orm.utils.links import LinkTriple, enable_link_cache, get_link_cache
 
 
 class TestNode(AiidaTestCase):
@@ -44,6 +44,183 @@ class TestNode(AiidaTestCase):
         with self.assertRaises(exceptions.ModificationNotAllowed):
             node.user = self.user
 
+    def test_get_all_same_nodes(self):
+        """Test that nodes with the same hash and type are found through the hash lookup."""
+        from aiida.orm import Int
+
+        node_one = Int(1).store()
+        node_two = Int(1).store()
+        Int(2).store()
+
+        self.assertEqual([node.pk for node in node_one.get_all_same_nodes()], [node_one.pk, node_two.pk])
+
+    def test_get_pks_by_hash_attributes(self):
+        """Test that the hash lookup of the backend only returns nodes with the requested attribute values."""
+        node_finished = CalculationNode()
+        node_finished.set_attribute('process_state', 'finished')
+        node_finished.store()
+
+        node_running = CalculationNode()
+        node_running.set_attribute('process_state', 'running')
+        node_running.store()
+
+        node_hash = node_finished.get_hash()
+        node_running.set_extra('_aiida_hash', node_hash)
+
+        pks = self.backend.nodes.get_pks_by_hash(node_hash, node_finished.node_type)
+        self.assertEqual(pks, [node_finished.pk, node_running.pk])
+
+        pks = self.backend.nodes.get_pks_by_hash(node_hash, node_finished.node_type, {'process_state': 'finished'})
+        self.assertEqual(pks, [node_finished.pk])
+
+
+class TestNodeBulkStore(AiidaTestCase):
+    """Tests for storing nodes in bulk through `Node.objects.bulk_store`."""
+
+    def test_bulk_store(self):
+        """Test that nodes and their incoming links are stored and that the hash of each node is set."""
+        source = CalculationNode().store()
+        nodes = [Data() for _ in range(3)]
+        links = [(source, node, LinkType.CREATE, 'output_{}'.format(index)) for index, node in enumerate(nodes)]
+
+        Node.objects.bulk_store(nodes, links)
+
+        for index, node in enumerate(nodes):
+            self.assertTrue(node.is_stored)
+            self.assertEqual(node.get_extra('_aiida_hash'), node.get_hash())
+
+            loaded = load_node(node.pk)
+            self.assertEqual(loaded.get_extra('_aiida_hash'), node.get_hash())
+            self.assertEqual(loaded.get_incoming().one().link_label, 'output_{}'.format(index))
+
+        self.assertEqual(len(source.get_outgoing().all()), 3)
+
+    def test_bulk_store_custom_store(self):
+        """Test that nodes whose class overrides `store` are stored through it, along with the other nodes."""
+        from aiida.orm import CifData
+
+        filepath = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'fixtures', 'data', 'Si.cif')
+        source = CalculationNode().store()
+        cif = CifData(file=os.path.abspath(filepath))
+        data = Data()
+        links = [(source, cif, LinkType.CREATE, 'cif'), (source, data, LinkType.CREATE, 'data')]
+
+        Node.objects.bulk_store([cif, data], links)
+
+        self.assertTrue(cif.is_stored)
+        self.assertTrue(data.is_stored)
+        self.assertEqual(load_node(cif.pk).get_attribute('md5'), cif.generate_md5())
+        self.assertEqual(cif.get_incoming().one().link_label, 'cif')
+        self.assertEqual(data.get_incoming().one().link_label, 'data')
+
+    def test_bulk_store_invalid_link(self):
+        """Test that no node is stored if any of the links is invalid."""
+        source = CalculationNode().store()
+        nodes = [Data(), Data()]
+        links = [(source, node, LinkType.CREATE, 'output') for node in nodes]
+
+        with self.assertRaises(ValueError):
+            Node.objects.bulk_store(nodes, links)
+
+        for node in nodes:
+            self.assertFalse(node.is_stored)
+
+    def test_bulk_store_unstored_source(self):
+        """Test that the source of each link has to be stored."""
+        node = Data()
+
+        with self.assertRaises(exceptions.ModificationNotAllowed):
+            Node.objects.bulk_store([node], [(CalculationNode(), node, LinkType.CREATE, 'output')])
+
+        self.assertFalse(node.is_stored)
+
+
+class TestNodeBulkLinks(AiidaTestCase):
+    """Tests for retrieving the links of many nodes through `Node.objects.get_incoming` and `get_outgoing`."""
+
+    def setUp(self):
+        super().setUp()
+        self.data = Data().store()
+        self.calculations = []
+        self.outputs = []
+
+        for index in range(3):
+            calculation = CalculationNode()
+            calculation.add_incoming(self.data, LinkType.INPUT_CALC, 'input')
+            calculation.store()
+            output = Data()
+            output.add_incoming(calculation, LinkType.CREATE, 'output_{}'.format(index))
+            output.store()
+            self.calculations.append(calculation)
+            self.outputs.append(output)
+
+    def test_get_incoming(self):
+        """Test that the incoming links of all nodes are returned, keyed on their pk."""
+        incoming = Node.objects.get_incoming(self.calculations, link_type=LinkType.INPUT_CALC)
+
+        self.assertEqual(set(incoming), {calculation.pk for calculation in self.calculations})
+        for calculation in self.calculations:
+            self.assertEqual(incoming[calculation.pk].one().node.uuid, self.data.uuid)
+
+        # Nodes can also be specified by their pk and nodes without links are included
+        outgoing = Node.objects.get_outgoing([self.data.pk, self.outputs[0].pk])
+        self.assertEqual(len(outgoing[self.data.pk].all()), 3)
+        self.assertEqual(outgoing[self.outputs[0].pk].all(), [])
+
+    def test_get_outgoing_project(self):
+        """Test that filters and projections are applied consistently with `Node.get_outgoing`."""
+        for project in ['*', 'uuid', 'node_type']:
+            for enable in [False, True]:
+                if enable:
+                    with enable_link_cache():
+                        outgoing = Node.objects.get_outgoing(
+                            self.calculations, node_class=Data, link_label_filter='output%', project=project
+                        )
+                else:
+                    outgoing = Node.objects.get_outgoing(
+                        self.calculations, node_class=Data, link_label_filter='output%', project=project
+                    )
+
+                for index, calculation in enumerate(self.calculations):
+                    link_triple = outgoing[calculation.pk].one()
+                    expected = calculation.get_outgoing().one()
+                    self.assertEqual(link_triple.link_label, 'output_{}'.format(index))
+                    if project == '*':
+                        self.assertEqual(link_triple.node.uuid, expected.node.uuid)
+                    else:
+                        self.assertEqual(link_triple.node, getattr(expected.node, project))
+
+    def test_get_incoming_unstored(self):
+        """Test that unstored nodes raise."""
+        with self.assertRaises(ValueError):
+            Node.objects.get_incoming([Data()])
+
+    def test_link_cache(self):
+        """Test that the link cache is used within the context and that adding links invalidates it."""
+        self.assertIsNone(get_link_cache())
+
+        with enable_link_cache() as cache:
+            with enable_link_cache() as nested:
+                self.assertIs(nested, cache)
+
+            self.assertEqual(len(self.data.get_outgoing().all()), 3)
+            self.assertEqual(len(cache.get(self.data.pk, 'outgoing')), 3)
+
+            calculation = CalculationNode()
+            calculation.add_incoming(self.data, LinkType.INPUT_CALC, 'input')
+            calculation.store()
+
+            self.assertIsNone(cache.get(self.data.pk, 'outgoing'))
+            self.assertEqual(len(self.data.get_outgoing().all()), 4)
+
+            # Links between stored nodes are added directly and invalidate the cache as well
+            self.assertEqual(calculation.get_outgoing().all(), [])
+            output = Data().store()
+            output.add_incoming(calculation, LinkType.CREATE, 'output')
+            self.assertEqual(calculation.get_outgoing().one().node.uuid, output.uuid)
+
+        self.assertIsNone(get_link_cache())
+
 
 class TestNodeAttributesExtras(AiidaTestCase):
     """Test for node attributes and extras."""
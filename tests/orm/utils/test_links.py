@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the link validation utilities."""
+from aiida.backends.testbase import AiidaTestCase
+from aiida.common.links import LinkType
+from aiida.orm import CalculationNode, Data, WorkflowNode
+from aiida.orm.utils.links import LinkTriple, validate_links_by_uuid
+
+
+class TestValidateLinksByUuid(AiidaTestCase):
+    """Tests for the `validate_links_by_uuid` function."""
+
+    node_classes = {'data': Data, 'calc': CalculationNode, 'work': WorkflowNode, 'output': Data}
+
+    def test_new_links(self):
+        """Test that valid links are returned in order and added to the existing links."""
+        links = [
+            ('data', 'calc', LinkType.INPUT_CALC, 'input'),
+            ('calc', 'output', LinkType.CREATE, 'output'),
+            ('work', 'calc', LinkType.CALL_CALC, 'call'),
+        ]
+        outgoing, incoming = {}, {}
+
+        self.assertEqual(validate_links_by_uuid(links, self.node_classes, outgoing, incoming), links)
+        self.assertEqual(outgoing['data'], {LinkTriple('calc', LinkType.INPUT_CALC, 'input')})
+        self.assertEqual(
+            incoming['calc'],
+            {LinkTriple('data', LinkType.INPUT_CALC, 'input'),
+             LinkTriple('work', LinkType.CALL_CALC, 'call')}
+        )
+
+    def test_existing_links(self):
+        """Test that links whose triple already exists, in the database or earlier in the batch, are skipped."""
+        link = ('data', 'calc', LinkType.INPUT_CALC, 'input')
+        outgoing = {'data': {LinkTriple('calc', LinkType.INPUT_CALC, 'input')}}
+        incoming = {'calc': {LinkTriple('data', LinkType.INPUT_CALC, 'input')}}
+
+        self.assertEqual(validate_links_by_uuid([link], self.node_classes, outgoing, incoming), [])
+        self.assertEqual(validate_links_by_uuid([link, link], self.node_classes, {}, {}), [link])
+
+    def test_invalid_links(self):
+        """Test that invalid links raise."""
+        with self.assertRaises(ValueError):
+            validate_links_by_uuid([('calc', 'data', LinkType.INPUT_CALC, 'input')], self.node_classes, {}, {})
+
+        with self.assertRaises(ValueError):
+            validate_links_by_uuid([('data', 'data', LinkType.INPUT_CALC, 'input')], self.node_classes, {}, {})
+
+        with self.assertRaises(ValueError):
+            validate_links_by_uuid([('data', 'calc', LinkType.INPUT_CALC, 'invalid label')], self.node_classes, {}, {})
+
+        # The indegree of `CREATE` links is unique, also with respect to the existing links
+        incoming = {'output': {LinkTriple('other', LinkType.CREATE, 'result')}}
+        with self.assertRaises(ValueError):
+            validate_links_by_uuid([('calc', 'output', LinkType.CREATE, 'output')], self.node_classes, {}, incoming)
+
+        # The indegree of `INPUT_CALC` links is a unique pair within the batch as well
+        links = [('data', 'calc', LinkType.INPUT_CALC, 'input'), ('output', 'calc', LinkType.INPUT_CALC, 'input')]
+        with self.assertRaises(ValueError):
+            validate_links_by_uuid(links, self.node_classes, {}, {})
@@ -14,8 +14,10 @@ import shutil
 import tempfile
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.orm import Node
+from aiida.common import exceptions
+from aiida.orm import Data, Node
 from aiida.orm.utils.repository import File, FileType
+from aiida.repository import Container
 
 
 class TestRepository(AiidaTestCase):
@@ -147,3 +149,125 @@ class TestRepository(AiidaTestCase):
         key = os.path.join(basepath, 'subdir', 'a.txt')
         content = self.get_file_content(os.path.join('subdir', 'a.txt'))
         self.assertEqual(node.get_object_content(key), content)
+
+
+class TestRepositoryContainer(TestRepository):
+    """Tests for the node `Repository` utility class with the object container backend."""
+
+    def setUp(self):
+        super().setUp()
+        self.container_dir = tempfile.mkdtemp()
+        self.container = Container(self.container_dir)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.container_dir)
+
+    def create_stored_node(self):
+        """Return a stored `Data` node whose repository contains the dummy file tree and is kept in the container."""
+        node = Data()
+        node._repository._container = self.container  # pylint: disable=protected-access
+        node.put_object_from_tree(self.tempdir, '')
+        node.store()
+        return node
+
+    def test_store(self):
+        """Test that storing a node writes the manifest to the container and no repository folder."""
+        node = self.create_stored_node()
+        repository = node._repository  # pylint: disable=protected-access
+
+        self.assertIsNotNone(self.container.get_manifest(node.uuid))
+        self.assertFalse(repository._repo_folder.exists())  # pylint: disable=protected-access
+        self.assertTrue(repository.exists())
+
+    def test_read_stored(self):
+        """Test that the objects of a stored node can be listed and read through the manifest."""
+        node = self.create_stored_node()
+
+        self.assertEqual(node.list_object_names(), ['c.txt', 'subdir'])
+        self.assertEqual(node.list_object_names('subdir'), ['a.txt', 'b.txt', 'nested'])
+        self.assertEqual(node.get_object('subdir'), File('subdir', FileType.DIRECTORY))
+        self.assertEqual(node.get_object('subdir/a.txt'), File('a.txt', FileType.FILE))
+
+        for key in ['c.txt', os.path.join('subdir', 'a.txt'), os.path.join('subdir', 'nested', 'deep.txt')]:
+            content = self.get_file_content(key)
+            self.assertEqual(node.get_object_content(key), content)
+            self.assertEqual(node.get_object_content(key, mode='rb'), content.encode('utf8'))
+
+        with self.assertRaises(IOError):
+            node.get_object('subdir/not_existant')
+
+        with self.assertRaises(exceptions.ModificationNotAllowed):
+            node.open('c.txt', mode='w')
+
+    def test_read_packed(self):
+        """Test that the objects of a stored node can still be read after the container has been packed."""
+        node = self.create_stored_node()
+        self.container.pack_loose_objects()
+
+        key = os.path.join('subdir', 'b.txt')
+        self.assertEqual(node.get_object_content(key), self.get_file_content(key))
+
+    def test_erase(self):
+        """Test that erasing the repository of a stored node removes its manifest."""
+        node = self.create_stored_node()
+        node._repository.erase(force=True)  # pylint: disable=protected-access
+
+        self.assertIsNone(self.container.get_manifest(node.uuid))
+
+    def test_content_digests(self):
+        """Test that the content digests are persisted and hash identically to the base folder."""
+        from aiida.common.hashing import make_hash
+
+        node = self.create_stored_node()
+        repository = node._repository  # pylint: disable=protected-access
+        folder_hash = make_hash(repository._get_base_folder())  # pylint: disable=protected-access
+
+        self.assertEqual(make_hash(repository.get_content_digests()), folder_hash)
+        self.assertEqual(len(self.container.get_file_digests(node.uuid)), 4)
+
+    def test_get_object_digest(self):
+        """Test that the digest of a single object matches the content digests, for unstored and stored nodes."""
+        from aiida.common.hashing import get_file_content_digest
+
+        key = os.path.join('subdir', 'nested', 'deep.txt')
+        with open(os.path.join(self.tempdir, key), 'rb') as handle:
+            digest = get_file_content_digest(handle).hex()
+
+        node = Data()
+        node.put_object_from_tree(self.tempdir, '')
+        self.assertEqual(node.get_object_digest(key), digest)
+
+        node = self.create_stored_node()
+        self.assertEqual(node.get_object_digest(key), digest)
+        self.assertEqual(node.get_object_digest(key), digest)
+
+        with self.assertRaises(IsADirectoryError):
+            node.get_object_digest('subdir')
+
+        with self.assertRaises(FileNotFoundError):
+            node.get_object_digest('not_existent.txt')
+
+    def test_iter_tree(self):
+        """Test that the objects of a stored node are iterated over directly from the container."""
+        node = self.create_stored_node()
+        repository = node._repository  # pylint: disable=protected-access
+
+        directories = []
+        files = {}
+
+        for relpath, opener in repository.iter_tree():
+            if opener is None:
+                directories.append(relpath)
+            else:
+                with opener() as handle:
+                    files[relpath] = handle.read().decode('utf8')
+
+        self.assertEqual(directories, ['path', 'path/subdir', 'path/subdir/nested'])
+        self.assertEqual(
+            files, {
+                os.path.join('path', key): self.get_file_content(key)
+                for key in ['c.txt', 'subdir/a.txt', 'subdir/b.txt', 'subdir/nested/deep.txt']
+            }
+        )
+        self.assertIsNone(repository._temp_folder)  # pylint: disable=protected-access
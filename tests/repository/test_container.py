@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the content-addressable object container."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from aiida.repository import Container
+
+
+class TestContainer(unittest.TestCase):
+    """Tests for the `Container` class."""
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.container = Container(os.path.join(self.tempdir, 'container'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def create_tree(self):
+        """Create a small file tree with a duplicated file and return its path."""
+        tree = tempfile.mkdtemp(dir=self.tempdir)
+        os.makedirs(os.path.join(tree, 'sub'))
+
+        for relpath, content in [('a.txt', b'same'), ('b.txt', b'different'), ('sub/c.txt', b'same')]:
+            with open(os.path.join(tree, relpath), 'wb') as handle:
+                handle.write(content)
+
+        return tree
+
+    def test_add_object_deduplicates(self):
+        """Test that adding the same content twice stores a single object."""
+        hashkey = self.container.add_object(io.BytesIO(b'content'))
+
+        self.assertEqual(self.container.add_object(io.BytesIO(b'content')), hashkey)
+        self.assertEqual(self.container.get_statistics()['loose_count'], 1)
+        self.assertEqual(self.container.get_object_content(hashkey), b'content')
+
+    def test_open_object_not_existent(self):
+        """Test that opening a non-existent object raises."""
+        with self.assertRaises(FileNotFoundError):
+            self.container.open_object('0' * 64)
+
+    def test_add_tree(self):
+        """Test that `add_tree` returns a manifest and `extract_tree` recreates the tree from it."""
+        tree = self.create_tree()
+        manifest = self.container.add_tree(tree)
+
+        self.assertEqual(sorted(manifest), ['a.txt', 'b.txt', 'sub'])
+        self.assertEqual(manifest['a.txt'], manifest['sub']['c.txt'])
+
+        target = tempfile.mkdtemp(dir=self.tempdir)
+        self.container.extract_tree(manifest, target)
+
+        with open(os.path.join(target, 'sub', 'c.txt'), 'rb') as handle:
+            self.assertEqual(handle.read(), b'same')
+
+    def test_add_tree_move(self):
+        """Test that `add_tree` with `move=True` moves the files into the container."""
+        tree = self.create_tree()
+        self.container.add_tree(tree, move=True)
+
+        self.assertFalse(os.path.exists(os.path.join(tree, 'b.txt')))
+
+    def test_manifest(self):
+        """Test setting, getting and deleting manifests."""
+        manifest = self.container.add_tree(self.create_tree())
+        self.container.set_manifest('uuid', manifest)
+
+        self.assertEqual(self.container.get_manifest('uuid'), manifest)
+        self.assertEqual(self.container.get_referenced_hashkeys(), {manifest['a.txt'], manifest['b.txt']})
+
+        self.container.delete_manifest('uuid')
+        self.assertIsNone(self.container.get_manifest('uuid'))
+
+    def test_pack_loose_objects(self):
+        """Test that packed objects remain readable and seekable and that the loose objects are removed."""
+        contents = [os.urandom(1000) for _ in range(5)]
+        hashkeys = [self.container.add_object(io.BytesIO(content)) for content in contents]
+
+        self.assertEqual(self.container.pack_loose_objects(pack_size_target=2000), 5)
+
+        statistics = self.container.get_statistics()
+        self.assertEqual(statistics['loose_count'], 0)
+        self.assertEqual(statistics['packed_count'], 5)
+        self.assertEqual(statistics['pack_count'], 3)
+
+        for hashkey, content in zip(hashkeys, contents):
+            self.assertTrue(self.container.has_object(hashkey))
+            self.assertEqual(self.container.get_object_content(hashkey), content)
+
+            with self.container.open_object(hashkey) as handle:
+                handle.seek(-10, io.SEEK_END)
+                self.assertEqual(handle.read(), content[-10:])
+
+    def test_delete_unreferenced_loose_objects(self):
+        """Test that only the loose objects that are not referenced by a manifest are deleted."""
+        manifest = self.container.add_tree(self.create_tree())
+        self.container.set_manifest('uuid', manifest)
+        unreferenced = self.container.add_object(io.BytesIO(b'unreferenced'))
+
+        self.assertEqual(self.container.delete_unreferenced_loose_objects(), 1)
+        self.assertFalse(self.container.has_object(unreferenced))
+        self.assertTrue(self.container.has_object(manifest['b.txt']))
+
+    def test_file_digests(self):
+        """Test setting, getting and deleting cached file digests."""
+        digests = {'a.txt': ('validator', 'digest'), 'sub/b.txt': ('other', 'digest')}
+        self.container.set_file_digests('uuid', digests)
+
+        self.assertEqual(self.container.get_file_digests('uuid'), digests)
+        self.assertEqual(self.container.get_file_digests('other_uuid'), {})
+
+        self.container.delete_file_digests('uuid')
+        self.assertEqual(self.container.get_file_digests('uuid'), {})
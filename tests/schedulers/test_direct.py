@@ -8,9 +8,13 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 
+import os
+import shutil
+import tempfile
 import unittest
 from aiida.schedulers.plugins.direct import DirectScheduler
 from aiida.schedulers import SchedulerError
+from aiida.transports.plugins.local import LocalTransport
 
 # This was executed with ps -o pid,stat,user,time | tail -n +2
 mac_ps_output_str = """21259 S+   broeder   0:00.04
@@ -86,5 +90,58 @@ class TestParserGetJobList(unittest.TestCase):
         self.assertIn('11383', job_ids)
 
 
+class TestBatchedCommands(unittest.TestCase):
+    """
+    Tests to verify that multiple jobs are submitted and killed with a single
+    remote command, and that the output of each command is demultiplexed
+    """
+
+    def setUp(self):
+        self.workdirs = [tempfile.mkdtemp() for _ in range(2)]
+        for workdir in self.workdirs:
+            with open(os.path.join(workdir, 'aiida.sh'), 'w') as handle:
+                handle.write('sleep 60\n')
+
+    def tearDown(self):
+        for workdir in self.workdirs:
+            shutil.rmtree(workdir)
+
+    def test_submit_and_kill_jobs(self):
+        """
+        Test that a failing submission does not prevent the job ids of the
+        others from being returned, and that the jobs are killed together
+        """
+        scheduler = DirectScheduler()
+
+        with LocalTransport() as transport:
+            scheduler.set_transport(transport)
+            submissions = [(self.workdirs[0], 'aiida.sh'), ('/nonexistent', 'aiida.sh'), (self.workdirs[1], 'aiida.sh')]
+            results = scheduler.submit_from_scripts(submissions)
+
+            self.assertEqual(len(results), 3)
+            self.assertIsInstance(results[1], SchedulerError)
+
+            job_ids = [results[0], results[2]]
+            self.assertTrue(all(job_id.isdigit() for job_id in job_ids))
+            self.assertEqual(sorted(scheduler.get_jobs(jobs=job_ids, as_dict=True)), sorted(job_ids))
+            self.assertEqual(scheduler.kill_jobs(job_ids), [True, True])
+
+    def test_demultiplex_output(self):
+        """
+        Test the demultiplexing of the output of a batch of commands
+        """
+        stdout = '\nTOKEN 0 stdout\nline\nTOKEN 0 stderr\nerror\n\nTOKEN 0 retval 2\n\nTOKEN 1 stdout\nno'
+        outputs = DirectScheduler._demultiplex_output(stdout, 'TOKEN', 2)
+        self.assertEqual(outputs, [(2, 'line', 'error\n'), None])
+
+        scheduler = DirectScheduler()
+
+        with LocalTransport() as transport:
+            scheduler.set_transport(transport)
+            outputs = scheduler._exec_command_batch([(None, 'printf text'), (None, 'echo error >&2; exit 3')])
+
+        self.assertEqual(outputs, [(0, 'text', ''), (3, '', 'error\n')])
+
+
 if __name__ == '__main__':
     unittest.main()
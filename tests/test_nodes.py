@@ -2085,3 +2085,47 @@ class TestNodeDeletion(AiidaTestCase):
         with Capturing():
             delete_nodes((node_list[3].pk,), force=True, create_forward=True)
         self._check_existence(uuids_check_existence, uuids_check_deleted)
+
+    def test_delete_in_batches(self):
+        """
+        Test that deleting in batches deletes the nodes along with their comments,
+        logs and group memberships, and leaves the other nodes untouched.
+        """
+        from aiida.common import timezone
+
+        node_list = self._create_long_graph(5)
+        deleted = node_list[3]
+
+        orm.Comment(deleted, orm.User.objects.get_default(), 'comment').store()
+        orm.Log(timezone.now(), 'loggername', 'WARNING', deleted.pk, 'message').store()
+        group = orm.Group(label='test_delete_in_batches').store()
+        group.add_nodes([node_list[0], deleted])
+
+        uuids_check_existence = [n.uuid for n in node_list[:3]]
+        uuids_check_deleted = [n.uuid for n in node_list[3:]]
+        with Capturing():
+            delete_nodes((deleted.pk,), force=True, batch_size=2)
+        self._check_existence(uuids_check_existence, uuids_check_deleted)
+
+        self.assertEqual(orm.QueryBuilder().append(orm.Comment, filters={'dbnode_id': deleted.pk}).count(), 0)
+        self.assertEqual(orm.QueryBuilder().append(orm.Log, filters={'dbnode_id': deleted.pk}).count(), 0)
+        self.assertEqual([node.uuid for node in group.nodes], [node_list[0].uuid])
+
+    def test_delete_resume(self):
+        """Test that a deletion that was interrupted is completed first when a checkpoint is passed."""
+        import os
+        from aiida.manage.database.delete.nodes import DeleteCheckpoint
+
+        node_list = self._create_long_graph(3)
+        interrupted = node_list[3:]
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            checkpoint = DeleteCheckpoint(os.path.join(dirpath, 'checkpoint.json'))
+            checkpoint.save([(node.pk, node.uuid) for node in interrupted])
+
+            with Capturing():
+                delete_nodes((), force=True, checkpoint=checkpoint)
+
+            self.assertIsNone(checkpoint.load())
+
+        self._check_existence([n.uuid for n in node_list[:3]], [n.uuid for n in interrupted])
@@ -344,6 +344,29 @@ class TestTraverseGraph(AiidaTestCase):
                                         links_backward=links_backward)['nodes']
         self.assertEqual(obtained_nodes, expected_nodes)
 
+    def test_traversal_database_iterative(self):
+        """
+        This will test that the traversal by the database, which is used when the
+        number of iterations is not limited, returns the same nodes and links as
+        the iterative application of the rules, for every combination of starting
+        node and direction.
+        """
+        nodes_dict = create_minimal_graph()
+
+        all_links = [
+            LinkType.INPUT_CALC, LinkType.CALL_CALC, LinkType.CREATE, LinkType.INPUT_WORK, LinkType.CALL_WORK,
+            LinkType.RETURN
+        ]
+        directions = [(all_links, []), ([], all_links), (all_links, all_links), ([LinkType.CREATE], [LinkType.RETURN])]
+
+        for node in nodes_dict.values():
+            for links_forward, links_backward in directions:
+                kwargs = {'get_links': True, 'links_forward': links_forward, 'links_backward': links_backward}
+                database = traverse_graph([node.pk], **kwargs)
+                iterative = traverse_graph([node.pk], max_iterations=len(nodes_dict), **kwargs)
+                self.assertEqual(database['nodes'], iterative['nodes'])
+                self.assertEqual(database['links'], iterative['links'])
+
     def test_traversal_errors(self):
         """This will test the errors of the traversers."""
         from aiida.common.exceptions import NotExistent
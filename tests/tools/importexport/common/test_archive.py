@@ -8,12 +8,16 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Tests for the Archive class."""
+import io
+import os
 
+from aiida import orm
 from aiida.backends.testbase import AiidaTestCase
-from aiida.common.exceptions import InvalidOperation
-from aiida.tools.importexport import Archive, CorruptArchive
+from aiida.common.exceptions import InvalidOperation, NotExistent
+from aiida.tools.importexport import Archive, CorruptArchive, export, export_zip
 
 from tests.utils.archives import get_archive_file
+from tests.utils.configuration import with_temp_dir
 
 
 class TestCommonArchive(AiidaTestCase):
@@ -38,3 +42,131 @@ class TestCommonArchive(AiidaTestCase):
         with self.assertRaises(CorruptArchive):
             with Archive(filepath) as archive:
                 archive.version_format  # pylint: disable=pointless-statement
+
+    @with_temp_dir
+    def test_lazy_unpacking(self, temp_dir):
+        """Verify that the data and the folder of a single node can be read without unpacking the entire archive."""
+        node = orm.Data()
+        node.put_object_from_filelike(io.StringIO('content'), 'file.txt')
+        node.store()
+
+        for function, filename in [(export, 'export.tar.gz'), (export_zip, 'export.zip')]:
+            filepath = os.path.join(temp_dir, filename)
+            function([node], outfile=filepath, silent=True)
+
+            with Archive(filepath) as archive:
+                self.assertIn(node.uuid, [value['uuid'] for value in archive.data['export_data']['Node'].values()])
+                self.assertFalse(archive.unpacked)
+
+                path, in_sandbox = archive.get_node_folder(node.uuid)
+                self.assertTrue(in_sandbox)
+                with open(os.path.join(path, 'path', 'file.txt')) as handle:
+                    self.assertEqual(handle.read(), 'content')
+
+                with self.assertRaises(CorruptArchive):
+                    archive.get_node_folder(orm.Data().uuid)
+
+    @with_temp_dir
+    def test_parallel_unpacking(self, temp_dir):
+        """Verify that the folders of nodes, which share parent folders, can be unpacked from a zip in parallel."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        nodes = []
+        for index in range(20):
+            node = orm.Data()
+            node.put_object_from_filelike(io.StringIO(str(index)), 'file.txt')
+            nodes.append(node.store())
+
+        filepath = os.path.join(temp_dir, 'export.zip')
+        export_zip(nodes, outfile=filepath, silent=True)
+
+        with Archive(filepath) as archive:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                paths = list(executor.map(lambda node: archive.get_node_folder(node.uuid)[0], nodes))
+
+            for index, path in enumerate(paths):
+                with open(os.path.join(path, 'path', 'file.txt')) as handle:
+                    self.assertEqual(handle.read(), str(index))
+
+    @with_temp_dir
+    def test_index(self, temp_dir):
+        """Verify that single entities are read through the index without unpacking the archive."""
+        node = orm.Data()
+        node.set_attribute('key', 'välue')
+        node.set_extra('extra', [1, 2])
+        node.put_object_from_filelike(io.StringIO('content'), 'file.txt')
+        node.store()
+
+        archives = [
+            (export, 'export.tar.gz', {}),
+            (export_zip, 'export.zip', {}),
+            (export_zip, 'export_uncompressed.zip', {'use_compression': False}),
+        ]
+
+        for function, filename, kwargs in archives:
+            filepath = os.path.join(temp_dir, filename)
+            function([node], outfile=filepath, silent=True, **kwargs)
+
+            with Archive(filepath) as archive:
+                self.assertIsNotNone(archive.index)
+                self.assertEqual(archive.get_entity('Node', node.uuid)['uuid'], node.uuid)
+                self.assertEqual(archive.get_entity('User', node.user.email)['email'], node.user.email)
+                self.assertEqual(archive.get_node_attributes(node.uuid), node.attributes)
+                self.assertEqual(archive.get_node_extras(node.uuid), node.extras)
+                self.assertEqual(archive.get_node_repository(node.uuid), ['path/', 'path/file.txt'])
+                self.assertEqual(archive.get_data_statistics()['nodes'], 1)
+                self.assertFalse(archive.unpacked)
+
+                with self.assertRaises(NotExistent):
+                    archive.get_entity('Node', orm.Data().uuid)
+
+    @with_temp_dir
+    def test_index_built(self, temp_dir):
+        """Verify that the index is built for archives whose format includes the index but that do not include it."""
+        import shutil
+        import zipfile
+        from aiida.common import json
+
+        node = orm.Data()
+        node.set_attribute('key', 'value')
+        node.put_object_from_filelike(io.StringIO('content'), 'file.txt')
+        node.store()
+
+        filepath = os.path.join(temp_dir, 'export.zip')
+        export_zip([node], outfile=filepath, silent=True)
+
+        # Write the archive without the index, with a data file whose values are at other locations than in the export
+        folder = os.path.join(temp_dir, 'folder')
+        with zipfile.ZipFile(filepath, 'r') as handle:
+            handle.extractall(folder)
+        os.remove(os.path.join(folder, 'index.json'))
+        with open(os.path.join(folder, 'data.json'), 'r', encoding='utf8') as handle:
+            data = json.load(handle)
+        with open(os.path.join(folder, 'data.json'), 'wb') as handle:
+            json.dump(data, handle, indent=4)
+
+        without_index = os.path.join(temp_dir, 'without_index')
+        shutil.make_archive(without_index, 'zip', folder)
+
+        for path in [folder, without_index + '.zip']:
+            with Archive(path) as archive:
+                self.assertIsNotNone(archive.index)
+                self.assertEqual(archive.get_entity('Node', node.uuid)['uuid'], node.uuid)
+                self.assertEqual(archive.get_node_attributes(node.uuid), node.attributes)
+                self.assertEqual(archive.get_node_repository(node.uuid), ['path/', 'path/file.txt'])
+
+            # The archive itself should not be changed
+            self.assertFalse(os.path.exists(os.path.join(folder, 'index.json')))
+
+    def test_index_missing(self):
+        """Verify that single entities are read from the data file for archives without an index."""
+        filepath = get_archive_file('export_v0.8_simple.aiida', filepath='export/migrate')
+        with Archive(filepath) as archive:
+            self.assertIsNone(archive.index)
+
+            pk, entity = next(iter(archive.data['export_data']['Node'].items()))
+            self.assertEqual(archive.get_entity('Node', entity['uuid']), entity)
+            self.assertEqual(archive.get_node_attributes(entity['uuid']), archive.data['node_attributes'][pk])
+
+            with self.assertRaises(NotExistent):
+                archive.get_node_extras(orm.Data().uuid)
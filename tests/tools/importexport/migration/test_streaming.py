@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Test the migration of export archives in a single streaming pass"""
+import io
+import os
+from unittest.mock import patch
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.tools.importexport import Archive, EXPORT_VERSION as newest_version
+from aiida.tools.importexport.common.exceptions import ArchiveMigrationError, CorruptArchive
+from aiida.tools.importexport.migration import MIGRATE_FUNCTIONS, migrate_archive
+from aiida.tools.importexport.migration.streaming import _JsonReader
+
+from tests.utils.archives import get_archive_file, get_json_files
+from tests.utils.configuration import with_temp_dir
+
+
+class TestStreamedMigration(AiidaTestCase):
+    """Test the `migrate_archive` function"""
+
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+
+        # Utility helpers
+        cls.core_archive = {'filepath': 'export/migrate'}
+
+    @with_temp_dir
+    def test_migrate_archive(self, temp_dir):
+        """Test that the streamed migration gives the same result as the migration of the data in memory"""
+        for version in ['0.4', '0.5', '0.6', '0.7', '0.8']:
+            archive = 'export_v{}_simple.aiida'.format(version)
+            metadata, data = get_json_files(archive, **self.core_archive)
+
+            for migrate_version in list(MIGRATE_FUNCTIONS)[list(MIGRATE_FUNCTIONS).index(version):]:
+                MIGRATE_FUNCTIONS[migrate_version](metadata, data, None)
+
+            for archive_format in ['zip', 'tar.gz']:
+                for processes in [1, 2]:
+                    filepath = os.path.join(temp_dir, 'migrated_{}_{}.{}'.format(version, processes, archive_format))
+                    versions = migrate_archive(
+                        get_archive_file(archive, **self.core_archive),
+                        filepath,
+                        archive_format=archive_format,
+                        processes=processes
+                    )
+                    self.assertEqual(versions, (version, newest_version))
+
+                    with Archive(filepath) as migrated:
+                        self.assertEqual(migrated.meta_data, metadata)
+                        self.assertEqual(migrated.data, data)
+
+                        for pk, node in data['export_data']['Node'].items():
+                            self.assertEqual(migrated.get_node_attributes(node['uuid']), data['node_attributes'][pk])
+                            self.assertIsNotNone(migrated.get_node_folder(node['uuid']))
+
+    @with_temp_dir
+    def test_migrate_newest_version(self, temp_dir):
+        """Test that an archive at the newest version cannot be migrated and that no output file is written"""
+        filepath = os.path.join(temp_dir, 'migrated.aiida')
+        archive = 'export_v{}_simple.aiida'.format(newest_version)
+
+        with self.assertRaises(ArchiveMigrationError):
+            migrate_archive(get_archive_file(archive, **self.core_archive), filepath)
+
+        self.assertFalse(os.path.exists(filepath))
+
+    @with_temp_dir
+    def test_migrate_failing(self, temp_dir):
+        """Test that a failing migration neither leaves an incomplete archive behind nor removes an existing file"""
+        filepath = os.path.join(temp_dir, 'migrated.aiida')
+        archive = 'export_v0.8_simple.aiida'
+
+        with open(filepath, 'w') as handle:
+            handle.write('existing')
+
+        with patch(
+            'aiida.tools.importexport.migration.streaming._migrate_streamed', side_effect=RuntimeError('failed')
+        ):
+            with self.assertRaises(RuntimeError):
+                migrate_archive(get_archive_file(archive, **self.core_archive), filepath)
+
+        self.assertEqual(os.listdir(temp_dir), ['migrated.aiida'])
+        with open(filepath) as handle:
+            self.assertEqual(handle.read(), 'existing')
+
+
+class TestJsonReader(AiidaTestCase):
+    """Test the incremental reader of JSON documents"""
+
+    def read(self, text):
+        """Read a document by iterating over its objects and arrays, with the smallest possible buffer."""
+
+        def read_value(reader):
+            character = reader._peek()  # pylint: disable=protected-access
+            if character == '{':
+                return {key: read_value(reader) for key in reader.iter_object()}
+            if character == '[':
+                return [read_value(reader) for _ in reader.iter_array()]
+            return reader.read_value()
+
+        reader = _JsonReader(io.StringIO(text))
+        reader.CHUNK_SIZE = 1
+
+        return read_value(reader)
+
+    def test_read(self):
+        """Test that documents are read correctly, also if values are cut off at the end of the buffer"""
+        documents = [
+            ('{}', {}),
+            ('[]', []),
+            ('{"a": [], "b": {}}', {'a': [], 'b': {}}),
+            ('{"a": [1, 2.5e10, -3, true, null, "ü"]}', {'a': [1, 2.5e10, -3, True, None, 'ü']}),
+            ('{\n    "a": {\n        "b": [\n            12345\n        ]\n    }\n}', {'a': {'b': [12345]}}),
+        ]
+
+        for text, document in documents:
+            self.assertEqual(self.read(text), document)
+
+    def test_read_invalid(self):
+        """Test that invalid documents raise"""
+        for text in ['{"a": 1', '{"a" 1}', '[1 2]']:
+            with self.assertRaises(CorruptArchive):
+                self.read(text)
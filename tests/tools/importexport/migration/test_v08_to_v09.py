@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Test export file migration from export version 0.8 to 0.9"""
+import os
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.tools.importexport import Archive
+from aiida.tools.importexport.migration.utils import verify_metadata_version
+from aiida.tools.importexport.migration.v08_to_v09 import migrate_v8_to_v9
+
+from tests.utils.archives import get_archive_file, get_json_files, migrate_archive
+from tests.utils.configuration import with_temp_dir
+
+
+class TestMigrateV08toV09(AiidaTestCase):
+    """Test migration of export files from export version 0.8 to 0.9"""
+
+    @classmethod
+    def setUpClass(cls, *args, **kwargs):
+        super().setUpClass(*args, **kwargs)
+
+        # Utility helpers
+        cls.core_archive = {'filepath': 'export/migrate'}
+
+    def test_migrate_v8_to_v9(self):
+        """Test migration for file containing complete v0.8 era possibilities"""
+        from aiida import get_version
+
+        # Get metadata.json and data.json as dicts from v0.8 file archive
+        metadata_v8, data_v8 = get_json_files('export_v0.8_simple.aiida', **self.core_archive)
+        verify_metadata_version(metadata_v8, version='0.8')
+
+        # Get metadata.json and data.json as dicts from v0.9 file archive
+        metadata_v9, data_v9 = get_json_files('export_v0.9_simple.aiida', **self.core_archive)
+        verify_metadata_version(metadata_v9, version='0.9')
+
+        # Migrate to v0.9
+        migrate_v8_to_v9(metadata_v8, data_v8)
+        verify_metadata_version(metadata_v8, version='0.9')
+
+        # Remove AiiDA version, since this may change irregardless of the migration function
+        metadata_v8.pop('aiida_version')
+        metadata_v9.pop('aiida_version')
+
+        # Assert conversion message in `metadata.json` is correct and then remove it for later assertions
+        self.maxDiff = None  # pylint: disable=invalid-name
+        conversion_message = 'Converted from version 0.8 to 0.9 with AiiDA v{}'.format(get_version())
+        self.assertEqual(
+            metadata_v8.pop('conversion_info')[-1],
+            conversion_message,
+            msg='The conversion message after migration is wrong'
+        )
+        metadata_v9.pop('conversion_info')
+
+        # Assert changes were performed correctly
+        self.assertDictEqual(
+            metadata_v8,
+            metadata_v9,
+            msg='After migration, metadata.json should equal intended metadata.json from archives'
+        )
+        self.assertDictEqual(
+            data_v8, data_v9, msg='After migration, data.json should equal intended data.json from archives'
+        )
+
+    @with_temp_dir
+    def test_migrate_v8_to_v9_index(self, temp_dir):
+        """Test that the migrated archive contains an index that locates every entity in data.json"""
+        filepath = os.path.join(temp_dir, 'export_v0.9.aiida')
+        migrate_archive(get_archive_file('export_v0.8_simple.aiida', **self.core_archive), filepath)
+
+        with Archive(filepath) as archive:
+            self.assertIsNotNone(archive.index)
+            self.assertEqual(archive.index['links'], len(archive.data['links_uuid']))
+
+            for pk, node in archive.data['export_data']['Node'].items():
+                self.assertEqual(archive.get_entity('Node', node['uuid']), node)
+                self.assertEqual(archive.get_node_attributes(node['uuid']), archive.data['node_attributes'][pk])
+                self.assertEqual(archive.get_node_extras(node['uuid']), archive.data['node_extras'][pk])
+                self.assertIn(node['uuid'], archive.index['repository'])
@@ -95,6 +95,63 @@ class TestSimple(AiidaTestCase):
             for k in attrs[uuid].keys():
                 self.assertEqual(attrs[uuid][k], node.get_attribute(k))
 
+    @with_temp_dir
+    def test_repository_streamed(self, temp_dir):
+        """Test that the repository content, including empty directories, is preserved in zip and tar archives."""
+        import io
+        from aiida.tools.importexport import export_zip
+
+        node = orm.Data()
+        node.put_object_from_filelike(io.StringIO('content'), 'file.txt')
+        node.put_object_from_filelike(io.StringIO('nested'), 'sub/nested.txt')
+        os.makedirs(os.path.join(node._repository._get_base_folder().abspath, 'empty'))  # pylint: disable=protected-access
+        node.store()
+        uuid = node.uuid
+
+        for export_function, filename in [(export, 'export.tar.gz'), (export_zip, 'export.zip')]:
+            filename = os.path.join(temp_dir, filename)
+            export_function([node], outfile=filename, silent=True)
+
+            self.clean_db()
+            self.create_user()
+            import_data(filename, silent=True)
+
+            imported = orm.load_node(uuid)
+            self.assertEqual(imported.list_object_names(), ['empty', 'file.txt', 'sub'])
+            self.assertEqual(imported.list_object_names('empty'), [])
+            self.assertEqual(imported.get_object_content('file.txt'), 'content')
+            self.assertEqual(imported.get_object_content('sub/nested.txt'), 'nested')
+
+            # Export the imported node with the next format, since the original one was removed from the database
+            node = imported
+
+    @with_temp_dir
+    def test_failed_export(self, temp_dir):
+        """Test that a failed export neither leaves an incomplete archive behind nor removes an existing archive."""
+        from aiida.tools.importexport import export_zip
+
+        struct = orm.StructureData()
+        struct.source = {'license': 'GPL'}
+        struct.store()
+
+        for export_function, filename in [(export, 'export.tar.gz'), (export_zip, 'export.zip')]:
+            filename = os.path.join(temp_dir, filename)
+
+            with self.assertRaises(LicensingException):
+                export_function([struct], outfile=filename, silent=True, forbidden_licenses=['GPL'])
+            self.assertEqual(os.listdir(temp_dir), [])
+
+            with open(filename, 'w') as handle:
+                handle.write('previous archive')
+
+            with self.assertRaises(LicensingException):
+                export_function([struct], outfile=filename, overwrite=True, silent=True, forbidden_licenses=['GPL'])
+
+            with open(filename, 'r') as handle:
+                self.assertEqual(handle.read(), 'previous archive')
+            self.assertEqual(os.listdir(temp_dir), [os.path.basename(filename)])
+            os.remove(filename)
+
     def test_check_for_export_format_version(self):
         """Test the check for the export format version."""
         # Creating a folder for the import/export files
@@ -591,6 +591,155 @@ class TestPutGetFile(unittest.TestCase):
             t.chdir('..')
             t.rmdir(directory)
 
+    @run_for_all_plugins
+    def test_put_object_from_filelike(self, custom_transport):
+        """
+        test that the content of a file-like object is written to a remote file, overwriting it
+        """
+        import io
+        import os
+        import random
+        import string
+
+        local_dir = os.path.join('/', 'tmp')
+        remote_dir = local_dir
+        directory = 'tmp_try'
+
+        with custom_transport as t:
+            t.chdir(remote_dir)
+            while t.isdir(directory):
+                # I append a random letter/number until it is unique
+                directory += random.choice(string.ascii_uppercase + string.digits)
+
+            t.mkdir(directory)
+            t.chdir(directory)
+
+            remote_file_name = 'file_remote.txt'
+            retrieved_file_name = os.path.join(local_dir, directory, 'file_retrieved.txt')
+
+            for content in [b'Viva Verdi\n', b'\x00\xff binary content']:
+                t.put_object_from_filelike(io.BytesIO(content), remote_file_name)
+                t.getfile(remote_file_name, retrieved_file_name)
+
+                with open(retrieved_file_name, 'rb') as fhandle:
+                    self.assertEqual(fhandle.read(), content)
+
+            with self.assertRaises(IOError):
+                t.put_object_from_filelike(io.BytesIO(b''), '')
+
+            t.remove(remote_file_name)
+            os.remove(retrieved_file_name)
+
+            t.chdir('..')
+            t.rmdir(directory)
+
+    @run_for_all_plugins
+    def test_puttrees(self, custom_transport):
+        """
+        test that the contents of multiple local folders are put into existing remote folders
+        """
+        import os
+        import shutil
+        import tempfile
+
+        local_dirs = [tempfile.mkdtemp() for _ in range(2)]
+        remote_base = tempfile.mkdtemp()
+        remote_dirs = [os.path.join(remote_base, 'first'), os.path.join(remote_base, 'second', 'nested')]
+
+        try:
+            for index, local_dir in enumerate(local_dirs):
+                os.mkdir(os.path.join(local_dir, 'sub'))
+                for filename in ['file.txt', os.path.join('sub', 'nested.txt')]:
+                    with open(os.path.join(local_dir, filename), 'w') as fhandle:
+                        fhandle.write('{} {}'.format(filename, index))
+
+            with custom_transport as t:
+                for remote_dir in remote_dirs:
+                    t.makedirs(remote_dir)
+
+                t.puttrees(list(zip(local_dirs, remote_dirs)))
+
+            for index, remote_dir in enumerate(remote_dirs):
+                for filename in ['file.txt', os.path.join('sub', 'nested.txt')]:
+                    with open(os.path.join(remote_dir, filename)) as fhandle:
+                        self.assertEqual(fhandle.read(), '{} {}'.format(filename, index))
+        finally:
+            for directory in local_dirs + [remote_base]:
+                shutil.rmtree(directory)
+
+    @run_for_all_plugins
+    def test_iter_objects(self, custom_transport):
+        """
+        test that the contents of remote files and folders are iterated over, in the given order
+        """
+        import os
+        import shutil
+        import tempfile
+
+        remote_dir = tempfile.mkdtemp()
+
+        try:
+            os.makedirs(os.path.join(remote_dir, 'folder', 'empty'))
+            for filename in ['file.txt', os.path.join('folder', 'nested.txt')]:
+                with open(os.path.join(remote_dir, filename), 'w') as fhandle:
+                    fhandle.write(filename)
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+
+                for compress in [False, True]:
+                    objects = {
+                        path: handle.read() if handle is not None else None
+                        for path, handle in t.iter_objects(['folder', 'file.txt'], compress=compress)
+                    }
+                    self.assertEqual(
+                        objects, {
+                            'folder': None,
+                            os.path.join('folder', 'empty'): None,
+                            os.path.join('folder', 'nested.txt'): os.path.join('folder', 'nested.txt').encode(),
+                            'file.txt': b'file.txt',
+                        }
+                    )
+        finally:
+            shutil.rmtree(remote_dir)
+
+    @run_for_all_plugins
+    def test_glob_many(self, custom_transport):
+        """
+        test that multiple patterns are expanded at once, like with glob
+        """
+        import os
+        import shutil
+        import tempfile
+
+        remote_dir = tempfile.mkdtemp()
+
+        try:
+            os.mkdir(os.path.join(remote_dir, 'sub dir'))
+            for filename in ['a.out', 'b.out', '.hidden.out', "it's.txt", os.path.join('sub dir', 'c.out')]:
+                with open(os.path.join(remote_dir, filename), 'w') as fhandle:
+                    fhandle.write(filename)
+
+            # Dangling symbolic links are not matched
+            os.symlink(os.path.join(remote_dir, 'missing.txt'), os.path.join(remote_dir, 'dangling.out'))
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+                self.assertEqual(t.glob_many([]), [])
+                self.assertEqual(t.glob_many(['dangling.out']), [[]])
+                self.assertEqual(
+                    t.glob_many(['*.out', "it's.txt", 'missing.txt', 'sub dir/*', '[ab].*', '*/c.out']), [
+                        ['a.out', 'b.out'],
+                        ["it's.txt"],
+                        [],
+                        [os.path.join('sub dir', 'c.out')],
+                        ['a.out', 'b.out'],
+                        [os.path.join('sub dir', 'c.out')],
+                    ]
+                )
+        finally:
+            shutil.rmtree(remote_dir)
+
     @run_for_all_plugins
     def test_put_get_abs_path(self, custom_transport):
         """
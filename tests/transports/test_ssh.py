@@ -10,6 +10,10 @@
 """
 Test ssh plugin on localhost
 """
+import filecmp
+import os
+import shutil
+import tempfile
 import unittest
 import logging
 
@@ -54,5 +58,87 @@ class TestBasicConnection(unittest.TestCase):
         logging.disable(logging.NOTSET)
 
 
+class TestFolderTransfer(unittest.TestCase):
+    """
+    Test the transfer of folders over multiple SFTP channels and as a tar stream.
+    """
+
+    def setUp(self):
+        self.sandbox = tempfile.mkdtemp()
+        self.source = os.path.join(self.sandbox, 'source')
+
+        for directory in ['', 'sub', os.path.join('sub', 'nested')]:
+            os.makedirs(os.path.join(self.source, directory), exist_ok=True)
+            for index in range(10):
+                with open(os.path.join(self.source, directory, 'file_{}.txt'.format(index)), 'w') as handle:
+                    handle.write('content {} {}'.format(directory, index))
+
+    def tearDown(self):
+        shutil.rmtree(self.sandbox)
+
+    def assertTreesEqual(self, left, right):  # pylint: disable=invalid-name
+        """Assert that two local folders have the same files with the same content."""
+        comparison = filecmp.dircmp(left, right)
+        self.assertEqual(comparison.left_only, [])
+        self.assertEqual(comparison.right_only, [])
+        self.assertEqual(filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)[1:], ([], []))
+        for subdirectory in comparison.common_dirs:
+            self.assertTreesEqual(os.path.join(left, subdirectory), os.path.join(right, subdirectory))
+
+    def _round_trip(self, **kwargs):
+        """Put the source folder and get it back with a transport constructed with the given parameters."""
+        remote = os.path.join(self.sandbox, 'remote')
+        local = os.path.join(self.sandbox, 'local')
+
+        with SshTransport(
+            machine='localhost', timeout=30, load_system_host_keys=True, key_policy='AutoAddPolicy', **kwargs
+        ) as transport:
+            transport.puttree(self.source, remote)
+            transport.gettree(remote, local)
+
+        self.assertTreesEqual(self.source, remote)
+        self.assertTreesEqual(self.source, local)
+
+    def test_transfer_channels(self):
+        self._round_trip(transfer_channels=4)
+
+    def test_transfer_mode_tar(self):
+        self._round_trip(transfer_mode='tar')
+
+    def test_puttrees(self):
+        """Test that the contents of multiple folders are put into existing remote folders in one tar stream."""
+        remotes = [os.path.join(self.sandbox, 'remote', name) for name in ['first', os.path.join('second', 'nested')]]
+        for remote in remotes:
+            os.makedirs(remote)
+
+        with SshTransport(
+            machine='localhost', timeout=30, load_system_host_keys=True, key_policy='AutoAddPolicy'
+        ) as transport:
+            transport.puttrees([(self.source, remote) for remote in remotes])
+
+        for remote in remotes:
+            self.assertTreesEqual(self.source, remote)
+
+    def test_iter_objects(self):
+        """Test that the contents of absolute paths and hard links are iterated over from a tar stream."""
+        local = os.path.join(self.sandbox, 'local')
+        os.link(os.path.join(self.source, 'file_0.txt'), os.path.join(self.source, 'sub', 'hardlink.txt'))
+
+        with SshTransport(
+            machine='localhost', timeout=30, load_system_host_keys=True, key_policy='AutoAddPolicy'
+        ) as transport:
+            for path, handle in transport.iter_objects([self.source]):
+                localpath = os.path.join(local, os.path.relpath(path, self.source))
+
+                if handle is None:
+                    os.makedirs(localpath)
+                    continue
+
+                with open(localpath, 'wb') as target:
+                    shutil.copyfileobj(handle, target)
+
+        self.assertTreesEqual(self.source, local)
+
+
 if __name__ == '__main__':
     unittest.main()
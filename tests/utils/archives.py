@@ -122,6 +122,7 @@ def migrate_archive(input_file, output_file, silent=True):
     :param input_file: filename with full path for archive to be migrated
     :param output_file: filename with full path for archive to be created after migration
     """
+    from aiida.tools.importexport.dbexport.utils import get_archive_index, write_data_and_index
     from aiida.tools.importexport.migration import migrate_recursively
 
     # Unpack archive, migrate, and re-pack archive
@@ -145,12 +146,11 @@ def migrate_archive(input_file, output_file, silent=True):
         migrate_recursively(metadata, data, folder)
 
         # Write json files
-        with open(folder.get_abs_path('data.json'), 'wb') as fhandle:
-            json.dump(data, fhandle, indent=4)
-
         with open(folder.get_abs_path('metadata.json'), 'wb') as fhandle:
             json.dump(metadata, fhandle, indent=4)
 
+        write_data_and_index(folder, data, get_archive_index(metadata, data, folder))
+
         # Pack archive
         compression = zipfile.ZIP_DEFLATED
         with zipfile.ZipFile(output_file, mode='w', compression=compression, allowZip64=True) as archive:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the latency of the hash lookup of the caching mechanism as a function of the number of nodes.
+
+Nodes with distinct hashes are added to the database in steps. After every step, the lookup of nodes with the same
+hash is timed through the indexed hash lookup that is used by the caching mechanism and, for comparison, through the
+JSONB filter of the `QueryBuilder` that does not use the index.
+
+.. warning:: this script stores nodes in the database of the profile, so only run it on a profile meant for testing.
+
+Example::
+
+    verdi -p benchmark run utils/benchmarks/benchmark_caching.py --steps 1000 10000 100000
+"""
+import time
+
+import click
+from tabulate import tabulate
+
+from aiida.orm import Int, QueryBuilder
+
+
+def time_lookups(callback, num_lookups):
+    """Call the callback the given number of times and return the average duration in milliseconds."""
+    start = time.time()
+    for _ in range(num_lookups):
+        callback()
+    return (time.time() - start) / num_lookups * 1000
+
+
+@click.command()
+@click.option(
+    '--steps', type=int, multiple=True, default=(1000, 10000), show_default=True, help='Table sizes to benchmark.'
+)
+@click.option('--lookups', type=int, default=100, show_default=True, help='Number of lookups to time per step.')
+def main(steps, lookups):
+    """Benchmark the hash lookup latency of the caching mechanism versus the number of nodes."""
+    probe = Int(-1).store()
+    num_nodes = QueryBuilder().append(Int).count()
+    table = []
+
+    for step in sorted(steps):
+        for value in range(num_nodes, step):
+            Int(value).store()
+        num_nodes = max(num_nodes, step)
+
+        def lookup_indexed():
+            return list(probe._iter_all_same_nodes())  # pylint: disable=protected-access
+
+        def lookup_jsonb():
+            builder = QueryBuilder().append(Int, filters={'extras._aiida_hash': probe.get_hash()}, subclassing=False)
+            return builder.all()
+
+        table.append([
+            num_nodes,
+            '{:.2f}'.format(time_lookups(lookup_indexed, lookups)),
+            '{:.2f}'.format(time_lookups(lookup_jsonb, lookups)),
+        ])
+
+    click.echo(tabulate(table, headers=['nodes', 'indexed lookup [ms]', 'JSONB filter [ms]']))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
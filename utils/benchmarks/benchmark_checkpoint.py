@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the size and the save and load time of process checkpoints as a function of the size of the context.
+
+For every context size, a work chain is instantiated whose context contains the given number of stored nodes and of
+plain dictionaries, as a work chain that launches many sub processes and collects their results would have. The size
+of the checkpoint is reported both as plain yaml and compressed as it is stored by the `AiiDAPersister`.
+
+.. warning:: this script stores nodes in the database of the profile, so only run it on a profile meant for testing.
+
+Example::
+
+    verdi -p benchmark run utils/benchmarks/benchmark_checkpoint.py --sizes 10 100 1000
+"""
+import time
+
+import click
+from tabulate import tabulate
+
+from aiida.engine import WorkChain
+from aiida.engine.persistence import AiiDAPersister
+from aiida.orm import Int
+from aiida.orm.utils import serialize
+
+
+class CheckpointWorkChain(WorkChain):
+    """Work chain that is only instantiated to have its checkpoint saved and loaded."""
+
+    @classmethod
+    def define(cls, spec):
+        super().define(spec)
+        spec.outline(cls.run_step)
+
+    def run_step(self):
+        pass
+
+
+def time_call(callback, repetitions):
+    """Call the callback the given number of times and return the average duration in milliseconds."""
+    start = time.time()
+    for _ in range(repetitions):
+        callback()
+    return (time.time() - start) / repetitions * 1000
+
+
+@click.command()
+@click.option(
+    '--sizes', type=int, multiple=True, default=(10, 100, 1000), show_default=True, help='Context sizes to benchmark.'
+)
+@click.option('--repetitions', type=int, default=10, show_default=True, help='Number of saves and loads to time.')
+def main(sizes, repetitions):
+    """Benchmark the size and the save and load time of process checkpoints versus the size of the context."""
+    table = []
+
+    for size in sorted(sizes):
+        process = CheckpointWorkChain()
+        process.ctx.nodes = [Int(value).store() for value in range(size)]
+        process.ctx.results = [{'index': value, 'energy': value * 0.1, 'converged': True} for value in range(size)]
+
+        def save():
+            # Use a new persister for every save, such that the checkpoint is always written
+            AiiDAPersister().save_checkpoint(process)  # pylint: disable=cell-var-from-loop
+
+        def load():
+            AiiDAPersister().load_checkpoint(process.pid)  # pylint: disable=cell-var-from-loop
+
+        time_save = time_call(save, repetitions)
+        time_load = time_call(load, repetitions)
+
+        bundle = AiiDAPersister().save_checkpoint(process)
+        size_plain = len(serialize.serialize(bundle, encoding='utf-8'))
+        size_stored = len(process.node.checkpoint)
+        process.close()
+
+        table.append([size, size_plain, size_stored, '{:.2f}'.format(time_save), '{:.2f}'.format(time_load)])
+
+    headers = ['context size', 'yaml [bytes]', 'stored [bytes]', 'save [ms]', 'load [ms]']
+    click.echo(tabulate(table, headers=headers))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the graph traversal as a function of the size of the provenance graph.
+
+For every size, a synthetic provenance graph is created as a tree: every data node is the input of a number of
+calculations, each of which creates a new data node. The traversal that determines which nodes are deleted along with
+the root of the tree, which therefore reaches the complete graph, is timed for the traversal by the database, which is
+used by default, and, for comparison, for the iterative application of the traversal rules, one query per iteration.
+
+.. warning:: this script stores nodes in the database of the profile, so only run it on a profile meant for testing.
+    The iterative traversal of graphs with millions of nodes takes very long; pass `--no-iterative` to skip it.
+
+Example::
+
+    verdi -p benchmark run utils/benchmarks/benchmark_graph_traversal.py --sizes 100000 1000000
+"""
+import time
+
+import click
+from tabulate import tabulate
+
+from aiida.common.links import GraphTraversalRules, LinkType
+from aiida.orm import CalculationNode, Data, Node
+from aiida.tools.graph.graph_traversers import traverse_graph, validate_traversal_rules
+
+
+def create_tree(size, branching, batch_size=1000):
+    """Create a provenance tree with at least the given number of nodes.
+
+    :param size: the minimum number of nodes of the tree
+    :param branching: the number of calculations that take each data node as input
+    :param batch_size: the number of nodes that are stored per query
+    :return: tuple of the pk of the root of the tree and its number of nodes
+    """
+    root = Data().store()
+    layer = [root]
+    num_nodes = 1
+
+    while num_nodes < size:
+        next_layer = []
+
+        for start in range(0, len(layer), batch_size):
+            inputs = layer[start:start + batch_size]
+            calculations = [CalculationNode() for _ in range(len(inputs) * branching)]
+            links = [(data, calculations[index * branching + branch], LinkType.INPUT_CALC, 'input')
+                     for index, data in enumerate(inputs)
+                     for branch in range(branching)]
+            Node.objects.bulk_store(calculations, links)
+
+            outputs = [Data() for _ in calculations]
+            links = [(calculation, data, LinkType.CREATE, 'output') for calculation, data in zip(calculations, outputs)]
+            Node.objects.bulk_store(outputs, links)
+
+            next_layer.extend(outputs)
+            num_nodes += len(calculations) + len(outputs)
+
+        layer = next_layer
+
+    return root.pk, num_nodes
+
+
+def time_traversal(root, max_iterations):
+    """Time the traversal for the deletion of the root and return the duration and the numbers of nodes and links."""
+    rules = validate_traversal_rules(GraphTraversalRules.DELETE)
+
+    start = time.time()
+    result = traverse_graph([root],
+                            max_iterations=max_iterations,
+                            get_links=True,
+                            links_forward=rules['forward'],
+                            links_backward=rules['backward'])
+
+    return time.time() - start, len(result['nodes']), len(result['links'])
+
+
+@click.command()
+@click.option(
+    '--sizes', type=int, multiple=True, default=(10000, 100000), show_default=True, help='Graph sizes to benchmark.'
+)
+@click.option('--branching', type=int, default=4, show_default=True, help='Number of calculations per data node.')
+@click.option('--iterative/--no-iterative', default=True, show_default=True, help='Also time the iterative traversal.')
+def main(sizes, branching, iterative):
+    """Benchmark the graph traversal of the database versus the iterative traversal versus the size of the graph."""
+    table = []
+
+    for size in sorted(sizes):
+        root, num_nodes = create_tree(size, branching)
+
+        time_database, num_traversed, num_links = time_traversal(root, None)
+        row = [num_nodes, num_traversed, num_links, '{:.2f}'.format(time_database)]
+
+        if iterative:
+            # A finite number of iterations selects the iterative traversal and the number of nodes bounds the depth
+            time_iterative, _, _ = time_traversal(root, num_nodes)
+            row.append('{:.2f}'.format(time_iterative))
+        else:
+            row.append('-')
+
+        table.append(row)
+
+    headers = ['nodes', 'traversed nodes', 'traversed links', 'database [s]', 'iterative [s]']
+    click.echo(tabulate(table, headers=headers))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
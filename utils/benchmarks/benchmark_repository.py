@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the folder layout of the node repository against the content-addressable object container.
+
+For both layouts, a number of synthetic node repositories is written, read back and listed, and the number of inodes
+that is used is counted. Neither a profile nor a database is required: both layouts are created in a temporary folder.
+
+Example::
+
+    python utils/benchmarks/benchmark_repository.py --nodes 2000 --files-per-node 10 --duplicate-fraction 0.5
+"""
+import os
+import shutil
+import tempfile
+import time
+import uuid as uuid_module
+
+import click
+from tabulate import tabulate
+
+from aiida.repository.container import Container
+
+
+def generate_node_trees(sandbox, num_nodes, files_per_node, file_size, duplicate_fraction):
+    """Yield pairs of node UUID and the path of a freshly written file tree with the content of its repository.
+
+    A fraction of the files gets a content that is shared among all nodes, to mimic pseudopotentials, scheduler
+    scripts and other files that are typically duplicated many times over in a profile.
+    """
+    shared_content = os.urandom(file_size)
+    num_duplicates = int(files_per_node * duplicate_fraction)
+
+    for _ in range(num_nodes):
+        uuid = str(uuid_module.uuid4())
+        tree = tempfile.mkdtemp(dir=sandbox)
+        os.makedirs(os.path.join(tree, 'path'))
+
+        for index in range(files_per_node):
+            content = shared_content if index < num_duplicates else os.urandom(file_size)
+            with open(os.path.join(tree, 'path', 'file_{}.dat'.format(index)), 'wb') as handle:
+                handle.write(content)
+
+        yield uuid, tree
+
+
+def count_inodes(path):
+    """Return the number of files and directories under the given path."""
+    count = 0
+    for _, dirnames, filenames in os.walk(path):
+        count += len(dirnames) + len(filenames)
+    return count
+
+
+def get_folder_path(root, uuid):
+    """Return the path of a node repository folder in the sharded folder layout."""
+    return os.path.join(root, 'repository', 'node', uuid[:2], uuid[2:4], uuid[4:])
+
+
+def benchmark_folder(root, sandbox, node_trees):
+    """Benchmark the per node folder layout and return a dictionary of timings."""
+    uuids = []
+
+    start = time.time()
+    for uuid, tree in node_trees:
+        target = get_folder_path(root, uuid)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(tree, target)
+        uuids.append(uuid)
+    time_write = time.time() - start
+
+    start = time.time()
+    for uuid in uuids:
+        for dirpath, _, filenames in os.walk(get_folder_path(root, uuid)):
+            for filename in filenames:
+                with open(os.path.join(dirpath, filename), 'rb') as handle:
+                    handle.read()
+    time_read = time.time() - start
+
+    start = time.time()
+    for uuid in uuids:
+        os.listdir(os.path.join(get_folder_path(root, uuid), 'path'))
+    time_list = time.time() - start
+
+    shutil.rmtree(sandbox, ignore_errors=True)
+
+    return {'write': time_write, 'read': time_read, 'list': time_list, 'pack': 0., 'inodes': count_inodes(root)}
+
+
+def benchmark_container(root, node_trees):
+    """Benchmark the content-addressable object container and return a dictionary of timings."""
+    container = Container(os.path.join(root, 'container'))
+    container.init_container()
+    uuids = []
+
+    start = time.time()
+    for uuid, tree in node_trees:
+        container.set_manifest(uuid, container.add_tree(tree, move=True))
+        shutil.rmtree(tree)
+        uuids.append(uuid)
+    time_write = time.time() - start
+
+    start = time.time()
+    container.pack_loose_objects()
+    time_pack = time.time() - start
+
+    start = time.time()
+    for uuid in uuids:
+        for hashkey in container.get_manifest(uuid)['path'].values():
+            container.get_object_content(hashkey)
+    time_read = time.time() - start
+
+    start = time.time()
+    for uuid in uuids:
+        sorted(container.get_manifest(uuid)['path'])
+    time_list = time.time() - start
+
+    return {'write': time_write, 'read': time_read, 'list': time_list, 'pack': time_pack, 'inodes': count_inodes(root)}
+
+
+@click.command()
+@click.option('--nodes', type=int, default=1000, show_default=True, help='Number of node repositories to write.')
+@click.option('--files-per-node', type=int, default=10, show_default=True, help='Number of files per node.')
+@click.option('--file-size', type=int, default=1024, show_default=True, help='Size in bytes of each file.')
+@click.option(
+    '--duplicate-fraction',
+    type=float,
+    default=0.5,
+    show_default=True,
+    help='Fraction of the files of each node whose content is identical for all nodes.'
+)
+@click.option('--directory', type=click.Path(exists=True, file_okay=False), help='Directory in which to benchmark.')
+def main(nodes, files_per_node, file_size, duplicate_fraction, directory):
+    """Benchmark write, read and list throughput and inode usage of the two repository layouts."""
+    results = {}
+
+    for layout in ['folder', 'container']:
+        root = tempfile.mkdtemp(dir=directory)
+        sandbox = tempfile.mkdtemp(dir=root)
+        node_trees = generate_node_trees(sandbox, nodes, files_per_node, file_size, duplicate_fraction)
+
+        try:
+            if layout == 'folder':
+                results[layout] = benchmark_folder(root, sandbox, node_trees)
+            else:
+                results[layout] = benchmark_container(root, node_trees)
+        finally:
+            shutil.rmtree(root)
+
+    num_files = nodes * files_per_node
+    headers = ['layout', 'write [files/s]', 'read [files/s]', 'list [nodes/s]', 'pack [s]', 'inodes']
+    table = [[
+        layout,
+        '{:.0f}'.format(num_files / result['write']),
+        '{:.0f}'.format(num_files / result['read']),
+        '{:.0f}'.format(nodes / result['list']),
+        '{:.2f}'.format(result['pack']),
+        result['inodes'],
+    ] for layout, result in results.items()]
+
+    click.echo(tabulate(table, headers=headers))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the folder transfer of the `SshTransport` for the different transfer modes and numbers of channels.
+
+A folder with many small files is put to and retrieved from a machine over SSH, by default `localhost`, which requires
+an SSH server that accepts key based logins of the current user. Neither a profile nor a database is required. To mimic
+the latency of a remote cluster on `localhost`, add a delay to the loopback interface, e.g. with::
+
+    sudo tc qdisc add dev lo root netem delay 10ms
+
+Example::
+
+    python utils/benchmarks/benchmark_ssh_transfer.py --files 1000 --channels 1 4 8
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import click
+from tabulate import tabulate
+
+from aiida.transports.plugins.ssh import SshTransport
+
+
+def create_folder(path, num_files, file_size):
+    """Create a folder with the given number of files of random content, spread over ten subfolders."""
+    for index in range(num_files):
+        subfolder = os.path.join(path, 'folder_{}'.format(index % 10))
+        os.makedirs(subfolder, exist_ok=True)
+        with open(os.path.join(subfolder, 'file_{}.dat'.format(index)), 'wb') as handle:
+            handle.write(os.urandom(file_size))
+
+
+@click.command()
+@click.option('--machine', default='localhost', show_default=True, help='Machine to connect to.')
+@click.option('--files', type=int, default=1000, show_default=True, help='Number of files in the folder.')
+@click.option('--file-size', type=int, default=1024, show_default=True, help='Size in bytes of each file.')
+@click.option(
+    '--channels', type=int, multiple=True, default=(1, 4, 8), show_default=True, help='Numbers of SFTP channels.'
+)
+def main(machine, files, file_size, channels):
+    """Benchmark the put and get throughput of folders for the transfer modes of the SSH transport."""
+    sandbox = tempfile.mkdtemp()
+    source = os.path.join(sandbox, 'source')
+    create_folder(source, files, file_size)
+
+    configurations = [('sftp', num_channels) for num_channels in sorted(channels)] + [('tar', 1)]
+    table = []
+
+    try:
+        for mode, num_channels in configurations:
+            local = os.path.join(sandbox, 'local')
+
+            with SshTransport(
+                machine=machine,
+                timeout=30,
+                load_system_host_keys=True,
+                key_policy='AutoAddPolicy',
+                transfer_channels=num_channels,
+                transfer_mode=mode
+            ) as transport:
+                remote = os.path.join(transport.getcwd(), 'aiida_benchmark_{}'.format(os.getpid()))
+
+                start = time.time()
+                transport.puttree(source, remote)
+                time_put = time.time() - start
+
+                start = time.time()
+                transport.gettree(remote, local)
+                time_get = time.time() - start
+
+                transport.rmtree(remote)
+
+            shutil.rmtree(local)
+            table.append([mode, num_channels, '{:.0f}'.format(files / time_put), '{:.0f}'.format(files / time_get)])
+    finally:
+        shutil.rmtree(sandbox)
+
+    click.echo(tabulate(table, headers=['mode', 'channels', 'put [files/s]', 'get [files/s]']))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmark the number of calculations uploaded per minute, one by one and in batches.
+
+Calculation nodes, each with a sandbox folder of small input files and a remote copy, are uploaded to a machine over SSH,
+by default `localhost`, which requires an SSH server that accepts key based logins of the current user. They are first
+uploaded one at a time, as happens when no other uploads for the same computer are pending, and then in batches of the
+given sizes, as happens when many calculations are launched at once. To mimic the latency of a remote cluster on
+`localhost`, add a delay to the loopback interface, e.g. with::
+
+    sudo tc qdisc add dev lo root netem delay 10ms
+
+.. warning:: this script stores nodes in the database of the profile, so only run it on a profile meant for testing.
+
+Example::
+
+    verdi -p benchmark run utils/benchmarks/benchmark_upload.py --calculations 100 --batch-sizes 10 100
+"""
+import os
+import time
+import uuid
+
+import click
+from tabulate import tabulate
+
+from aiida import orm
+from aiida.common.datastructures import CalcInfo
+from aiida.common.folders import SandboxFolder
+from aiida.engine.daemon.execmanager import upload_calculation, upload_calculations
+from aiida.transports.plugins.ssh import SshTransport
+
+
+def create_upload(computer, folder, num_files, file_size, remote_source):
+    """Create a calculation node and write its input files to the sandbox folder.
+
+    :return: tuple of the node, the calculation info, the folder and the inputs, as accepted by `upload_calculations`
+    """
+    node = orm.CalcJobNode(computer=computer).store()
+
+    calc_info = CalcInfo()
+    calc_info.uuid = node.uuid
+    calc_info.codes_info = []
+    calc_info.remote_copy_list = [(computer.uuid, remote_source, 'remote_copy.dat')]
+
+    for index in range(num_files):
+        with open(folder.get_abs_path('input_{}.dat'.format(index)), 'wb') as handle:
+            handle.write(os.urandom(file_size))
+
+    return node, calc_info, folder, None
+
+
+@click.command()
+@click.option('--machine', default='localhost', show_default=True, help='Machine to connect to.')
+@click.option('--calculations', type=int, default=100, show_default=True, help='Number of calculations to upload.')
+@click.option('--files', type=int, default=10, show_default=True, help='Number of input files of each calculation.')
+@click.option('--file-size', type=int, default=1024, show_default=True, help='Size in bytes of each file.')
+@click.option(
+    '--batch-sizes', type=int, multiple=True, default=(10, 100), show_default=True, help='Numbers of calculations '
+    'uploaded per batch.'
+)
+def main(machine, calculations, files, file_size, batch_sizes):
+    """Benchmark the number of calculations uploaded per minute, one by one and in batches."""
+    with SshTransport(machine=machine, timeout=30, load_system_host_keys=True, key_policy='AutoAddPolicy') as transport:
+        workdir = os.path.join(transport.getcwd(), 'aiida_benchmark_{}'.format(os.getpid()))
+        remote_source = os.path.join(workdir, 'remote_source.dat')
+        transport.makedirs(workdir)
+        transport.exec_command_wait('echo content > {}'.format(remote_source))
+
+        computer = orm.Computer(
+            name='benchmark-upload-{}'.format(uuid.uuid4().hex[:8]),
+            hostname=machine,
+            transport_type='ssh',
+            scheduler_type='direct',
+            workdir=workdir
+        ).store()
+
+        table = []
+
+        try:
+            for batch_size in [1] + sorted(batch_sizes):
+                elapsed = 0.
+
+                for offset in range(0, calculations, batch_size):
+                    folders = [SandboxFolder() for _ in range(min(batch_size, calculations - offset))]
+                    uploads = [create_upload(computer, folder, files, file_size, remote_source) for folder in folders]
+
+                    # The creation of the nodes and input files is not part of the upload
+                    start = time.time()
+
+                    if batch_size == 1:
+                        upload_calculation(uploads[0][0], transport, uploads[0][1], uploads[0][2])
+                    else:
+                        upload_calculations(uploads, transport)
+
+                    elapsed += time.time() - start
+
+                    for folder in folders:
+                        folder.erase()
+
+                table.append([
+                    'one by one' if batch_size == 1 else 'batches of {}'.format(batch_size),
+                    '{:.1f}'.format(elapsed), '{:.0f}'.format(calculations / elapsed * 60)
+                ])
+        finally:
+            transport.rmtree(workdir)
+
+    click.echo(tabulate(table, headers=['upload', 'time [s]', 'calculations per minute']))
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter